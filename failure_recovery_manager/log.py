@@ -5,6 +5,7 @@ from storage_manager.models import (
     Condition, 
     DataWrite,
     DataDeletion,
+    DataTruncation,
     DataUpdate
 )
 
@@ -53,7 +54,26 @@ class log:
         }
         print(json.dumps(data, indent=4))
     
-    def to_data_undo(self) -> List[DataWrite | DataDeletion | DataUpdate]:
+    # bulk load (COPY) records keep {table: row count before the load} on one side and the
+    # loaded rows on the other; undoing truncates back to the count instead of deleting
+    # rows by value, so identical rows that existed before the load survive
+    def _bulk_load_undo(self, row_counts: Dict) -> List[DataTruncation]:
+        return [DataTruncation(table=table, num_rows=num_rows) for table, num_rows in row_counts.items()]
+
+    def _bulk_load_redo(self, rows: List) -> List[DataWrite]:
+        return [DataWrite(
+            table = self.table_name,
+            column = row.keys(),
+            conditions = [], # cause insert
+            new_value = [row[c] for c in row.keys()]
+        ) for row in rows]
+
+    def to_data_undo(self) -> List[DataWrite | DataDeletion | DataUpdate | DataTruncation]:
+        # bulk load
+        if isinstance(self.old_data, dict) and self.old_data and isinstance(self.new_data, list):
+            return self._bulk_load_undo(self.old_data)
+        if isinstance(self.new_data, dict) and self.new_data and isinstance(self.old_data, list):
+            return self._bulk_load_redo(self.old_data)
         # anomaly
         if len(self.old_data) == 0 and len(self.new_data) == 0:
             return []
@@ -82,6 +102,11 @@ class log:
             )]
     
     def to_data_redo(self):
+        # bulk load
+        if isinstance(self.old_data, dict) and self.old_data and isinstance(self.new_data, list):
+            return self._bulk_load_redo(self.new_data)
+        if isinstance(self.new_data, dict) and self.new_data and isinstance(self.old_data, list):
+            return self._bulk_load_undo(self.new_data)
         # anomaly
         if len(self.old_data) == 0 and len(self.new_data) == 0:
             return []
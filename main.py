@@ -34,6 +34,8 @@ def print_help():
     print("  DELETE FROM ...             - Execute DELETE query")
     print("  CREATE TABLE ...            - Create a new table")
     print("  DROP TABLE ...              - Drop a table")
+    print("  COPY table FROM 'file'      - Bulk load a .csv / .jsonl file into a table")
+    print("  CLUSTER table USING column  - Rewrite a table in index key order")
     print("  \\algo [algorithm]           - Change concurrency control algorithm")
     print("                                 (lockbased, timestamp, validation, mvcc)")
     print("  \\h or help                  - Show this help message")
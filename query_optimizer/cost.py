@@ -1,7 +1,9 @@
-from typing import Dict, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 from query_optimizer.query_tree import QueryTree
-from storage_manager.models import Statistic
+from storage_manager.clustering import clustered_fetch_cost
+from storage_manager.models import Condition, Statistic
+from storage_manager.partitioning import prune_partitions
 import math
 
 
@@ -83,6 +85,8 @@ class CostCalculator:
             return self._cost_sort(query_tree)
         elif node_type == "LIMIT":
             return self._cost_limit(query_tree)
+        elif node_type == "AGGREGATE":
+            return self._cost_aggregate(query_tree)
         elif node_type == "ALIAS":
             return self._cost_alias(query_tree)
         elif node_type in ["UPDATE_QUERY", "INSERT_QUERY", "DELETE_QUERY"]:
@@ -108,6 +112,9 @@ class CostCalculator:
         if index_info:
             return self._cost_index_scan(table_name, stats, index_info)
         
+        return self._cost_seq_scan(stats)
+    
+    def _cost_seq_scan(self, stats: Statistic) -> CostResult:
         io_cost = stats.b_r * self.SEQUENTIAL_IO_COST
         
         cpu_cost = stats.n_r * self.CPU_PER_TUPLE
@@ -151,18 +158,27 @@ class CostCalculator:
         condition = node.childs[1]
         
         relation_node = self._extract_relation_node(source)
+        pruned_stats = None
         
         if relation_node:
             table_name = relation_node.val
             if table_name in self.statistics:
                 stats = self.statistics[table_name]
                 
+                # Tabel partisi: partisi yang bound-nya ga match kondisi ga discan
+                if stats.partitioning:
+                    pruned_stats = self._prune_partition_stats(stats, condition)
+                    stats = pruned_stats
+                
                 index_info = self._find_usable_index(condition, table_name, stats)
                 
                 if index_info:
                     return self._cost_index_scan(table_name, stats, index_info)
         
-        source_cost = self.get_cost(source)
+        if pruned_stats is not None and source.type in ("RELATION", "ALIAS"):
+            source_cost = self._cost_seq_scan(pruned_stats)
+        else:
+            source_cost = self.get_cost(source)
         subquery_cost = self._cost_subqueries_in_condition(
             condition, 
             outer_cardinality=source_cost.estimated_cardinality
@@ -396,6 +412,8 @@ class CostCalculator:
         
         limit_value = int(node.val) if node.val.isdigit() else 100
         source = node.childs[0]
+        if source.type == "SORT":
+            return self._cost_top_n(source, limit_value)
         source_cost = self.get_cost(source)
         
         if source_cost.estimated_cardinality > 0:
@@ -412,6 +430,78 @@ class CostCalculator:
             estimated_blocks=estimated_blocks
         )
     
+    def _cost_top_n(self, sort_node: QueryTree, limit_value: int) -> CostResult:
+        # LIMIT di atas SORT dijalanin sebagai Top-N: input di-stream lewat heap
+        # berukuran limit, ga ada run sort yang ditulis ke disk
+        source = sort_node
+        while source.type == "SORT" and source.childs:
+            source = source.childs[-1]
+        source_cost = self.get_cost(source)
+        
+        n_tuples = source_cost.estimated_cardinality
+        output_tuples = min(limit_value, n_tuples)
+        if n_tuples > 0:
+            heap_cpu = n_tuples * math.log2(max(2, output_tuples)) * self.CPU_PER_SORT_COMPARE
+            estimated_blocks = int(math.ceil(source_cost.estimated_blocks * output_tuples / n_tuples))
+        else:
+            heap_cpu = 0.0
+            estimated_blocks = source_cost.estimated_blocks
+        
+        return CostResult(
+            io_cost=source_cost.io_cost,
+            cpu_cost=source_cost.cpu_cost + heap_cpu,
+            estimated_cardinality=output_tuples,
+            estimated_blocks=estimated_blocks
+        )
+    
+    def _cost_aggregate(self, node: QueryTree) -> CostResult:
+        # Hash aggregation: input di-stream sekali, satu state per group di hash table;
+        # kalo group-nya ga muat memory, input sisanya ditulis & dibaca lagi per partisi
+        if not node.childs:
+            return CostResult(io_cost=0.0)
+        
+        source = node.childs[-1]
+        group_keys = [child for child in node.childs[:-1] if child.type == "COLUMN_REF"]
+        calls = [child for child in node.childs[:-1] if child.type == "FUNCTION_CALL"]
+        
+        # COUNT(*) tanpa WHERE dan GROUP BY dijawab dari header block tabel
+        table_name = self._extract_table_name(source) if source.type in ("RELATION", "ALIAS") else None
+        if not group_keys and calls and all(call.val == "COUNT" and not call.childs for call in calls) \
+                and table_name in self.statistics:
+            return CostResult(io_cost=self.SEQUENTIAL_IO_COST, estimated_cardinality=1, estimated_blocks=1)
+        
+        source_cost = self.get_cost(source)
+        n_tuples = source_cost.estimated_cardinality
+        
+        if not group_keys:
+            n_groups = 1
+        else:
+            # V(A,r) tiap group key dikali, dibatesin jumlah tuple input
+            n_groups = 1
+            stats = self.statistics.get(self._extract_table_name(source))
+            for key in group_keys:
+                column_name = self._extract_column_name(key)
+                distinct = stats.V_a_r.get(column_name, 0) if stats else 0
+                n_groups *= distinct if distinct > 0 else max(1, n_tuples // 10)
+            n_groups = max(1, min(n_groups, n_tuples))
+        
+        aggregate_cpu = n_tuples * (self.CPU_PER_HASH + len(calls) * self.CPU_PER_TUPLE)
+        
+        io_cost = source_cost.io_cost
+        tuples_per_block = max(1, n_tuples // max(1, source_cost.estimated_blocks))
+        group_blocks = int(math.ceil(n_groups / tuples_per_block))
+        if group_blocks > self.config['memory_blocks']:
+            # Porsi input yang group-nya ga kebagian memory di-spill (tulis + baca)
+            spilled = 1.0 - self.config['memory_blocks'] / group_blocks
+            io_cost += 2 * source_cost.estimated_blocks * spilled
+        
+        return CostResult(
+            io_cost=io_cost,
+            cpu_cost=source_cost.cpu_cost + aggregate_cpu,
+            estimated_cardinality=n_groups,
+            estimated_blocks=max(1, group_blocks)
+        )
+    
     def _cost_alias(self, node: QueryTree) -> CostResult:
         if node.childs:
             return self.get_cost(node.childs[0])
@@ -568,7 +658,8 @@ class CostCalculator:
                             "column": col_name,
                             "type": "hash",
                             "operator": op,
-                            "selectivity": selectivity
+                            "selectivity": selectivity,
+                            "clustering_factor": index_info.get("clustering_factor")
                         }
                 
                 if index_type == "btree" and op in ["=", "<", ">", "<=", ">=", "!="]:
@@ -585,7 +676,8 @@ class CostCalculator:
                             "type": "btree",
                             "height": index_info.get("height", 3),
                             "operator": op,
-                            "selectivity": selectivity
+                            "selectivity": selectivity,
+                            "clustering_factor": index_info.get("clustering_factor")
                         }
         
         elif condition.type == "BETWEEN_EXPR":
@@ -601,7 +693,8 @@ class CostCalculator:
                             "type": "btree",
                             "height": index_info.get("height", 3),
                             "operator": "BETWEEN",
-                            "selectivity": 0.25
+                            "selectivity": 0.25,
+                            "clustering_factor": index_info.get("clustering_factor")
                         }
         
         elif condition.type == "IN_EXPR":
@@ -623,7 +716,8 @@ class CostCalculator:
                             "height": index_info.get("height", 3),
                             "operator": "IN",
                             "selectivity": selectivity,
-                            "n_values": n_values
+                            "n_values": n_values,
+                            "clustering_factor": index_info.get("clustering_factor")
                         }
         
         elif condition.type == "OPERATOR" and condition.val == "AND":
@@ -640,6 +734,53 @@ class CostCalculator:
         
         return None
     
+    def _prune_partition_stats(self, stats: Statistic, condition: QueryTree) -> Statistic:
+        """Statistik gabungan dari partisi yang lolos partition pruning."""
+        if not stats.partitions:
+            return stats
+        
+        conditions = self._extract_simple_conditions(condition)
+        surviving = prune_partitions(stats.partitioning, conditions)
+        if len(surviving) == len(stats.partitions):
+            return stats
+        
+        partitions = [stats.partitions[p] for p in surviving]
+        return Statistic(
+            n_r=sum(p.n_r for p in partitions),
+            b_r=sum(p.b_r for p in partitions),
+            l_r=stats.l_r,
+            f_r=stats.f_r,
+            V_a_r=stats.V_a_r,
+            indexes=stats.indexes,
+            partitioning=stats.partitioning,
+            partitions=partitions
+        )
+    
+    def _extract_simple_conditions(self, condition: QueryTree) -> List[Condition]:
+        """Ambil perbandingan kolom-literal dari condition (AND), sisanya diabaikan."""
+        if condition.type == "OPERATOR" and condition.val == "AND":
+            conditions = []
+            for child in condition.childs:
+                conditions.extend(self._extract_simple_conditions(child))
+            return conditions
+        
+        if condition.type != "COMPARISON" or len(condition.childs) < 2:
+            return []
+        
+        col_name = self._extract_column_name(condition.childs[0])
+        right = condition.childs[1]
+        op = "<>" if condition.val == "!=" else condition.val
+        if not col_name or right.type not in ("LITERAL_NUMBER", "LITERAL_STRING"):
+            return []
+        
+        value = right.val
+        if right.type == "LITERAL_NUMBER":
+            try:
+                value = int(value) if '.' not in value else float(value)
+            except ValueError:
+                return []
+        return [Condition(column=col_name, operation=op, operand=value)]
+    
     def _cost_index_scan(self, table_name: str, stats: Statistic, index_info: dict) -> CostResult:
         index_type = index_info["type"]
         selectivity = index_info["selectivity"]
@@ -692,6 +833,14 @@ class CostCalculator:
                 estimated_blocks=stats.b_r
             )
         
+        # Clustering factor known: data fetch cost follows how ordered the table is
+        clustering_factor = index_info.get("clustering_factor")
+        if clustering_factor is not None:
+            total_io_cost = total_io_cost - data_access_cost + clustered_fetch_cost(
+                stats.n_r, stats.b_r, estimated_tuples, clustering_factor,
+                self.SEQUENTIAL_IO_COST, self.RANDOM_IO_COST
+            )
+        
         if index_info["type"] == "hash":
             cpu_cost = self.CPU_PER_HASH
         else:  #
@@ -912,7 +1061,7 @@ class CostCalculator:
         if node.type == "FILTER" and node.childs:
             return self._extract_relation_node(node.childs[0])
         
-        if node.type == "JOIN":
+        if node.type in ("JOIN", "AGGREGATE"):
             return None
         
         if node.type == "PROJECT" and node.childs:
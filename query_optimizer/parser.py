@@ -4,6 +4,8 @@ from query_optimizer.tokenizer import Tokenizer
 from query_optimizer.query_tree import QueryTree
 from query_optimizer.query_token import Token, TokenType
 
+AGGREGATE_FUNCTIONS = {"COUNT", "SUM", "AVG", "MIN", "MAX"}
+
 class ParserError(Exception):
     def __init__(self, message: str, token: Optional[Token] = None):
         if token:
@@ -75,6 +77,10 @@ class Parser:
             return self.parse_create_table()
         if self.match(TokenType.KEYWORD_DROP):
             return self.parse_drop_table()
+        if self.match(TokenType.KEYWORD_COPY):
+            return self.parse_copy()
+        if self.match(TokenType.KEYWORD_CLUSTER):
+            return self.parse_cluster()
 
         raise ParserError(
             "Expected statement keyword (SELECT, UPDATE, INSERT, DELETE, BEGIN TRANSACTION)",
@@ -96,8 +102,30 @@ class Parser:
         if self.match(TokenType.KEYWORD_WHERE):
             source = self.parse_where(source)
 
+        group_keys = []
+        if self.match(TokenType.KEYWORD_GROUP_BY):
+            group_keys = self.parse_group_by()
+
+        having = None
+        if self.match(TokenType.KEYWORD_HAVING):
+            self.advance()
+            having = self.parse_boolean_expr()
+
+        order_items = []
         if self.match(TokenType.KEYWORD_ORDER_BY):
-            source = self.parse_order(source)
+            order_items = self.parse_order_items()
+
+        aggregates = self.collect_aggregates(columns + ([having] if having else []) + [expr for expr, _ in order_items])
+        if group_keys or having or aggregates:
+            source = self.build_aggregate(source, group_keys, aggregates)
+            if having:
+                having_node = QueryTree("FILTER", "")
+                having_node.add_child(source)
+                having_node.add_child(having)
+                source = having_node
+
+        if order_items:
+            source = self.build_sort(order_items, source)
 
         if self.match(TokenType.KEYWORD_LIMIT):
             source = self.parse_limit(source)
@@ -192,8 +220,69 @@ class Parser:
         filter_node.add_child(condition)
         return filter_node
 
-    def parse_order(self, source: QueryTree) -> QueryTree:
+    def parse_group_by(self) -> List[QueryTree]:
+        self.expect(TokenType.KEYWORD_GROUP_BY)
+        keys = [self.parse_value_expr()]
+        while self.match(TokenType.DELIMITER_COMMA):
+            self.advance()
+            keys.append(self.parse_value_expr())
+        for key in keys:
+            if key.type != "COLUMN_REF":
+                raise ParserError("GROUP BY only supports column references", self.current_token)
+        return keys
+
+    def collect_aggregates(self, exprs: List[QueryTree]) -> List[QueryTree]:
+        # Aggregate calls used by the select list, HAVING and ORDER BY, each distinct call once
+        found = {}
+
+        def visit(node: QueryTree):
+            if node.type == "FUNCTION_CALL" and node.val in AGGREGATE_FUNCTIONS:
+                found.setdefault(node.tree(), node)
+                return
+            if node.type == "PROJECT":
+                # Subquery: aggregates belong to its own SELECT
+                return
+            for child in node.childs:
+                visit(child)
+
+        for expr in exprs:
+            visit(expr)
+        return list(found.values())
+
+    def build_aggregate(self, source: QueryTree, group_keys: List[QueryTree], aggregates: List[QueryTree]) -> QueryTree:
+        # AGGREGATE: group key COLUMN_REFs, aggregate FUNCTION_CALLs, source last
+        aggregate_node = QueryTree("AGGREGATE", "")
+        for key in group_keys:
+            aggregate_node.add_child(key)
+        for call in aggregates:
+            aggregate_node.add_child(self.copy_tree(call))
+        aggregate_node.add_child(source)
+        return aggregate_node
+
+    def copy_tree(self, node: QueryTree) -> QueryTree:
+        copy = QueryTree(node.type, node.val)
+        for child in node.childs:
+            copy.add_child(self.copy_tree(child))
+        return copy
+
+    def parse_order_items(self) -> List[tuple[QueryTree, str]]:
         self.expect(TokenType.KEYWORD_ORDER_BY)
+        items = [self.parse_order_item()]
+        while self.match(TokenType.DELIMITER_COMMA):
+            self.advance()
+            items.append(self.parse_order_item())
+        return items
+
+    def build_sort(self, items: List[tuple[QueryTree, str]], source: QueryTree) -> QueryTree:
+        # One SORT per key, the outermost SORT holds the primary key
+        for order_expr, direction in reversed(items):
+            sort_node = QueryTree("SORT", direction)
+            sort_node.add_child(order_expr)
+            sort_node.add_child(source)
+            source = sort_node
+        return source
+
+    def parse_order_item(self) -> tuple[QueryTree, str]:
         order_expr = self.parse_value_expr()
 
         direction = "ASC"
@@ -201,10 +290,13 @@ class Parser:
             direction = self.current_token.value.upper()
             self.advance()
 
-        sort_node = QueryTree("SORT", direction)
-        sort_node.add_child(order_expr)
-        sort_node.add_child(source)
-        return sort_node
+        if self.match_value("NULLS"):
+            self.advance()
+            if not self.match_value("FIRST", "LAST"):
+                raise ParserError("Expected FIRST or LAST after NULLS", self.current_token)
+            direction += f" NULLS {self.current_token.value.upper()}"
+            self.advance()
+        return order_expr, direction
 
     def parse_limit(self, source: QueryTree) -> QueryTree:
         self.expect(TokenType.KEYWORD_LIMIT)
@@ -345,6 +437,16 @@ class Parser:
         for col_def in column_defs:
             col_list.add_child(col_def)
         create_node.add_child(col_list)
+
+        # optional table option: ENGINE [=] MEMORY | DISK
+        if self.match(TokenType.IDENTIFIER) and self.match_value("ENGINE"):
+            self.advance()
+            self.consume_if(TokenType.OPERATOR_EQUAL)
+            if not self.match(TokenType.IDENTIFIER):
+                raise ParserError("Expected engine name after ENGINE", self.current_token)
+            create_node.add_child(QueryTree("TABLE_ENGINE", self.current_token.value.upper()))
+            self.advance()
+
         self.consume_if(TokenType.DELIMITER_SEMICOLON)
         return create_node
 
@@ -478,6 +580,49 @@ class Parser:
         self.consume_if(TokenType.DELIMITER_SEMICOLON)
         return drop_node
 
+    def parse_copy(self) -> QueryTree:
+        self.expect(TokenType.KEYWORD_COPY)
+
+        if not self.match(TokenType.IDENTIFIER):
+            raise ParserError("Expected table name after COPY", self.current_token)
+        table_name = self.current_token.value
+        self.advance()
+
+        self.expect(TokenType.KEYWORD_FROM)
+
+        if not self.match(TokenType.LITERAL_STRING):
+            raise ParserError("Expected file path string after COPY ... FROM", self.current_token)
+        file_path = self.current_token.value
+        self.advance()
+
+        copy_node = QueryTree("COPY_QUERY", "")
+        copy_node.add_child(QueryTree("RELATION", table_name))
+        copy_node.add_child(QueryTree("LITERAL_STRING", file_path))
+        self.consume_if(TokenType.DELIMITER_SEMICOLON)
+        return copy_node
+
+    def parse_cluster(self) -> QueryTree:
+        self.expect(TokenType.KEYWORD_CLUSTER)
+
+        if not self.match(TokenType.IDENTIFIER):
+            raise ParserError("Expected table name after CLUSTER", self.current_token)
+        table_name = self.current_token.value
+        self.advance()
+
+        cluster_node = QueryTree("CLUSTER_TABLE", "")
+        cluster_node.add_child(QueryTree("IDENTIFIER", table_name))
+
+        # without USING the table is re-clustered on its previous column
+        if self.match(TokenType.KEYWORD_USING):
+            self.advance()
+            if not self.match(TokenType.IDENTIFIER):
+                raise ParserError("Expected column name after USING", self.current_token)
+            cluster_node.add_child(QueryTree("IDENTIFIER", self.current_token.value))
+            self.advance()
+
+        self.consume_if(TokenType.DELIMITER_SEMICOLON)
+        return cluster_node
+
     def parse_begin_transaction(self) -> QueryTree:
         self.expect(TokenType.KEYWORD_BEGIN_TRANSACTION)
         self.consume_if(TokenType.DELIMITER_SEMICOLON)
@@ -753,6 +898,8 @@ class Parser:
             if self.peek_token and self.peek_token.type == TokenType.DELIMITER_LPAREN:
                 self.advance()
                 self.expect(TokenType.DELIMITER_LPAREN)
+                if ident_value.upper() in AGGREGATE_FUNCTIONS:
+                    return self.parse_aggregate_call(ident_value.upper())
                 args = []
                 if not self.match(TokenType.DELIMITER_RPAREN):
                     args.append(self.parse_value_expr())
@@ -769,6 +916,16 @@ class Parser:
 
         raise ParserError("Expected expression", self.current_token)
 
+    def parse_aggregate_call(self, function: str) -> QueryTree:
+        # COUNT(*) has no argument, every other aggregate takes one value expression
+        func_node = QueryTree("FUNCTION_CALL", function)
+        if function == "COUNT" and self.match(TokenType.OPERATOR_MULTIPLY):
+            self.advance()
+        else:
+            func_node.add_child(self.parse_value_expr())
+        self.expect(TokenType.DELIMITER_RPAREN)
+        return func_node
+
     def parse_subquery(self) -> QueryTree:
         return self.parse_select()
 
@@ -1,5 +1,6 @@
 from __future__ import annotations
 from query_optimizer.query_tree import QueryTree
+from query_optimizer.parser import AGGREGATE_FUNCTIONS
 from storage_manager.storage_manager import StorageManager
 
 class QueryValidationError(Exception):
@@ -38,6 +39,7 @@ SOURCE_NODES = {
     "JOIN",
     "SORT",
     "LIMIT",
+    "AGGREGATE",
 }
 
 CONDITION_NODES = {
@@ -57,12 +59,15 @@ DML_NODES = {
     "UPDATE_QUERY",
     "INSERT_QUERY", 
     "DELETE_QUERY",
+    "COPY_QUERY",
     "ASSIGNMENT",
 }
 
 DDL_NODES = {
     "CREATE_TABLE",
     "DROP_TABLE",
+    "CLUSTER_TABLE",
+    "TABLE_ENGINE",
     "COLUMN_DEF",
     "DATA_TYPE",
     "PRIMARY_KEY",
@@ -82,6 +87,13 @@ UTILITY_NODES = {
     "COLUMN_DEF_LIST",
 }
 
+# Value SORT: arah, opsional diikuti urutan NULL
+SORT_DIRECTIONS = {
+    f"{direction}{nulls}"
+    for direction in ("ASC", "DESC")
+    for nulls in ("", " NULLS FIRST", " NULLS LAST")
+}
+
 def check_query(node: QueryTree) -> None:
     """
     1. Semua child harus valid (rekursif)
@@ -142,6 +154,21 @@ def check_query(node: QueryTree) -> None:
         elif node.type == "LIMIT":
             if num_children != 1:
                 raise QueryValidationError(f"<LIMIT> harus punya 1 child (source), dapat {num_children}")
+        
+        elif node.type == "AGGREGATE":
+            if num_children < 1:
+                raise QueryValidationError(f"<AGGREGATE> harus punya minimal 1 child (source), dapat {num_children}")
+            for child in node.childs[:-1]:
+                if child.type not in {"COLUMN_REF", "FUNCTION_CALL"}:
+                    raise QueryValidationError(f"<AGGREGATE> child harus group key COLUMN_REF atau FUNCTION_CALL, dapat {child.type}")
+    
+    elif node.type == "FUNCTION_CALL":
+        if node.val in AGGREGATE_FUNCTIONS:
+            # COUNT(*) ga punya argumen, aggregate lain persis 1
+            if num_children != 1 and not (node.val == "COUNT" and num_children == 0):
+                raise QueryValidationError(f"<FUNCTION_CALL {node.val}> harus punya 1 argumen, dapat {num_children}")
+            if any(contains_aggregate(child) for child in node.childs):
+                raise QueryValidationError(f"Aggregate function tidak boleh nested di dalam {node.val}")
     
     elif node.type in CONDITION_NODES:
         if node.type == "OPERATOR":
@@ -188,12 +215,23 @@ def check_query(node: QueryTree) -> None:
             if num_children < 1 or num_children > 2:
                 raise QueryValidationError(f"<DELETE_QUERY> harus punya 1-2 children, dapat {num_children}")
         
+        elif node.type == "COPY_QUERY":
+            if num_children != 2:
+                raise QueryValidationError(f"<COPY_QUERY> harus punya 2 children, dapat {num_children}")
+            if node.childs[0].type != "RELATION" or node.childs[1].type != "LITERAL_STRING":
+                raise QueryValidationError("<COPY_QUERY> children harus RELATION dan LITERAL_STRING")
+
         elif node.type == "ASSIGNMENT":
             if num_children != 2:
                 raise QueryValidationError(f"<ASSIGNMENT> harus punya 2 children, dapat {num_children}")
     
     elif node.type in DDL_NODES:
-        pass
+        if node.type == "CLUSTER_TABLE":
+            if num_children < 1 or num_children > 2:
+                raise QueryValidationError(f"<CLUSTER_TABLE> harus punya 1-2 children, dapat {num_children}")
+        elif node.type == "TABLE_ENGINE":
+            if node.val not in {"MEMORY", "DISK"}:
+                raise QueryValidationError(f"<TABLE_ENGINE> harus 'MEMORY' atau 'DISK', dapat '{node.val}'")
     
     elif node.type in TRANSACTION_NODES:
         pass
@@ -203,6 +241,51 @@ def check_query(node: QueryTree) -> None:
     
     check_value(node)
 
+def contains_aggregate(node: QueryTree) -> bool:
+    """True kalo expression manggil aggregate function (subquery ga dihitung)."""
+    if node.type == "FUNCTION_CALL" and node.val in AGGREGATE_FUNCTIONS:
+        return True
+    if node.type == "PROJECT":
+        return False
+    return any(contains_aggregate(child) for child in node.childs)
+
+def find_aggregate(source: QueryTree) -> QueryTree | None:
+    """AGGREGATE di bawah rantai LIMIT / SORT / FILTER (HAVING), None kalo ga ada."""
+    while source is not None:
+        if source.type == "AGGREGATE":
+            return source
+        if source.type in {"LIMIT", "FILTER"} and source.childs:
+            source = source.childs[0]
+        elif source.type == "SORT" and source.childs:
+            source = source.childs[-1]
+        else:
+            return None
+    return None
+
+def column_ref_name(node: QueryTree) -> str | None:
+    if node.type == "COLUMN_REF" and node.childs and node.childs[0].childs:
+        return node.childs[0].childs[0].val
+    return None
+
+def group_key_names(aggregate: QueryTree) -> set:
+    """Nama kolom GROUP BY dari node AGGREGATE."""
+    return {column_ref_name(child) for child in aggregate.childs[:-1] if child.type == "COLUMN_REF"}
+
+def check_grouped_expression(expr: QueryTree, group_keys: set, clause: str) -> None:
+    """Kolom di expression (HAVING / ORDER BY) harus group key atau ada di dalam aggregate function."""
+    if expr.type == "FUNCTION_CALL" and expr.val in AGGREGATE_FUNCTIONS:
+        return
+    if expr.type == "PROJECT":
+        # subquery punya scope sendiri
+        return
+    name = column_ref_name(expr)
+    if name is not None:
+        if name not in group_keys:
+            raise QueryValidationError(f"Kolom '{name}' di {clause} harus ada di GROUP BY atau dipakai di aggregate function")
+        return
+    for child in expr.childs:
+        check_grouped_expression(child, group_keys, clause)
+
 def check_value(node: QueryTree) -> None:
     stats = get_metadata()
     
@@ -270,10 +353,37 @@ def check_value(node: QueryTree) -> None:
             raise QueryValidationError(f"<OPERATOR {operator_type}> minimal 2 children, dapat {num_children}")
     
     if node.type == "SORT":
-        if node.val and node.val not in {"ASC", "DESC"}:
-            raise QueryValidationError(f"<SORT> direction harus 'ASC' atau 'DESC', dapat '{node.val}'")
+        if node.val and node.val not in SORT_DIRECTIONS:
+            raise QueryValidationError(f"<SORT> direction harus 'ASC' atau 'DESC' (opsional NULLS FIRST/LAST), dapat '{node.val}'")
+        
+        # ORDER BY di atas GROUP BY cuma boleh group key dan aggregate
+        aggregate = find_aggregate(node.childs[-1]) if node.childs else None
+        if aggregate is not None:
+            group_keys = group_key_names(aggregate)
+            for child in node.childs[:-1]:
+                check_grouped_expression(child, group_keys, "ORDER BY")
     
     if node.type == "PROJECT":
         # If value is "*", seharusnya tidak ada COLUMN_REF children (hanya source)
         if node.val == "*" and len(node.childs) > 1:
             raise QueryValidationError("<PROJECT> dengan value='*' hanya boleh punya 1 child (source)")
+        
+        # SELECT di atas GROUP BY cuma boleh group key dan aggregate
+        aggregate = find_aggregate(node.childs[-1]) if node.childs else None
+        if aggregate is not None:
+            if node.val == "*":
+                raise QueryValidationError("SELECT * tidak bisa dipakai dengan GROUP BY / aggregate function")
+            group_keys = group_key_names(aggregate)
+            for child in node.childs[:-1]:
+                name = column_ref_name(child)
+                if name is not None and name not in group_keys:
+                    raise QueryValidationError(f"Kolom '{name}' harus ada di GROUP BY atau dipakai di aggregate function")
+    
+    if node.type == "FILTER" and len(node.childs) == 2:
+        # Aggregate cuma boleh di HAVING (FILTER di atas AGGREGATE)
+        aggregate = find_aggregate(node.childs[0])
+        if contains_aggregate(node.childs[1]) and aggregate is None:
+            raise QueryValidationError("Aggregate function tidak boleh dipakai di WHERE, pakai HAVING")
+        # HAVING cuma boleh group key dan aggregate
+        if aggregate is not None:
+            check_grouped_expression(node.childs[1], group_key_names(aggregate), "HAVING")
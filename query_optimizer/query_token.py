@@ -6,6 +6,8 @@ class TokenType(enum.Enum):
 
     KEYWORD_BEGIN_TRANSACTION = "BEGIN TRANSACTION"
     KEYWORD_ORDER_BY = "ORDER BY"
+    KEYWORD_GROUP_BY = "GROUP BY"
+    KEYWORD_HAVING = "HAVING"
     KEYWORD_SELECT = "SELECT"
     KEYWORD_FROM = "FROM"
     KEYWORD_WHERE = "WHERE"
@@ -23,6 +25,9 @@ class TokenType(enum.Enum):
     KEYWORD_TABLE = "TABLE"
     KEYWORD_DROP = "DROP"
     KEYWORD_CASCADE = "CASCADE"
+    KEYWORD_COPY = "COPY"
+    KEYWORD_CLUSTER = "CLUSTER"
+    KEYWORD_USING = "USING"
     KEYWORD_RESTRICT = "RESTRICT"
     KEYWORD_AS = "AS"
     KEYWORD_INNER = "INNER"
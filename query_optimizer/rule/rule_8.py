@@ -39,6 +39,10 @@ def push_projection_over_joins(query: ParsedQuery) -> ParsedQuery:
         if node.type in ["FILTER", "SORT"] and parent_projections:
             current_projections = parent_projections
         
+        if node.type == "AGGREGATE":
+            # Di bawah GROUP BY yang dibutuhin cuma group key + argumen aggregate
+            current_projections = extract_projected_columns(node)
+        
         if node.type == "JOIN" and node.val == "INNER" and current_projections:
             if len(node.childs) >= 3:
                 left_source = node.childs[0]
@@ -132,7 +136,7 @@ def extract_projected_columns(project_node: QueryTree) -> Set[str]:
     
     # Extract from all non-source children (skip JOIN/RELATION/FILTER)
     for child in project_node.childs:
-        if child.type not in ["JOIN", "RELATION", "FILTER", "SORT", "LIMIT"]:
+        if child.type not in ["JOIN", "RELATION", "FILTER", "SORT", "LIMIT", "AGGREGATE"]:
             extract_from_node(child)
     
     return columns
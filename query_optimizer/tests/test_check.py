@@ -812,6 +812,24 @@ class TestQueryValidator(unittest.TestCase):
         
         check_query(sort)
     
+    def test_valid_sort_nulls_order(self):
+        # SORT(DESC NULLS FIRST) -> COLUMN_REF, RELATION
+        sort = QueryTree("SORT", "DESC NULLS FIRST")
+        col_ref = QueryTree("COLUMN_REF")
+        col_name = QueryTree("COLUMN_NAME")
+        identifier = QueryTree("IDENTIFIER", "age")
+        col_name.add_child(identifier)
+        col_ref.add_child(col_name)
+        relation = QueryTree("RELATION", "users")
+        sort.add_child(col_ref)
+        sort.add_child(relation)
+        
+        check_query(sort)
+        
+        sort.val = "ASC NULLS MIDDLE"
+        with self.assertRaises(QueryValidationError):
+            check_query(sort)
+    
     def test_invalid_sort_wrong_direction(self):
         # SORT direction must be ASC or DESC
         sort = QueryTree("SORT", "INVALID")
@@ -847,6 +865,47 @@ class TestQueryValidator(unittest.TestCase):
         with self.assertRaises(QueryValidationError):
             check_query(sort)
     
+    # ====================================================================
+    # AGGREGATE TESTS
+    # ====================================================================
+    
+    def _parse(self, sql):
+        from query_optimizer.parser import Parser
+        from query_optimizer.tokenizer import Tokenizer
+        return Parser(Tokenizer(sql)).parse()
+    
+    def test_valid_group_by(self):
+        check_query(self._parse("SELECT city, COUNT(*), MAX(age) FROM users GROUP BY city HAVING SUM(salary) > 10"))
+    
+    def test_invalid_column_not_grouped(self):
+        with self.assertRaises(QueryValidationError):
+            check_query(self._parse("SELECT city, name, COUNT(*) FROM users GROUP BY city"))
+    
+    def test_invalid_select_star_with_aggregate(self):
+        with self.assertRaises(QueryValidationError):
+            check_query(self._parse("SELECT * FROM users GROUP BY city"))
+    
+    def test_invalid_aggregate_in_where(self):
+        with self.assertRaises(QueryValidationError):
+            check_query(self._parse("SELECT city FROM users WHERE COUNT(*) > 1 GROUP BY city"))
+    
+    def test_invalid_having_column_not_grouped(self):
+        with self.assertRaises(QueryValidationError):
+            check_query(self._parse("SELECT city, SUM(salary) FROM users GROUP BY city HAVING salary > 5"))
+    
+    def test_invalid_order_by_column_not_grouped(self):
+        with self.assertRaises(QueryValidationError):
+            check_query(self._parse("SELECT city, COUNT(*) FROM users GROUP BY city ORDER BY name"))
+        with self.assertRaises(QueryValidationError):
+            check_query(self._parse("SELECT COUNT(*) FROM users ORDER BY name"))
+    
+    def test_valid_order_by_group_key_and_aggregate(self):
+        check_query(self._parse("SELECT city, SUM(salary) FROM users GROUP BY city HAVING city <> 'x' ORDER BY city DESC, SUM(salary) LIMIT 3"))
+    
+    def test_invalid_nested_aggregate(self):
+        with self.assertRaises(QueryValidationError):
+            check_query(self._parse("SELECT MAX(COUNT(age)) FROM users"))
+    
     # ====================================================================
     # ALIAS TESTS
     # ====================================================================
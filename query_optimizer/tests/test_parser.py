@@ -45,6 +45,28 @@ class TestSelect(unittest.TestCase):
         self.assertEqual(filt.childs[0].type, "RELATION")
         self.assertEqual(filt.childs[1].type, "COMPARISON")
 
+    def test_order_multiple_keys_with_nulls(self):
+        sql = "SELECT * FROM users ORDER BY age DESC NULLS LAST, name, id ASC NULLS FIRST;"
+        tree = Parser(Tokenizer(sql)).parse()
+        # One SORT per key, primary key outermost
+        first = tree.childs[-1]
+        self.assertEqual(first.type, "SORT")
+        self.assertEqual(first.val, "DESC NULLS LAST")
+        self.assertEqual(col_name(first.childs[0]), "age")
+        second = first.childs[1]
+        self.assertEqual(second.type, "SORT")
+        self.assertEqual(second.val, "ASC")
+        self.assertEqual(col_name(second.childs[0]), "name")
+        third = second.childs[1]
+        self.assertEqual(third.type, "SORT")
+        self.assertEqual(third.val, "ASC NULLS FIRST")
+        self.assertEqual(col_name(third.childs[0]), "id")
+        self.assertEqual(third.childs[1].type, "RELATION")
+
+    def test_order_nulls_requires_first_or_last(self):
+        with self.assertRaises(ParserError):
+            Parser(Tokenizer("SELECT * FROM users ORDER BY age NULLS;")).parse()
+
     def test_limit(self):
         sql = "SELECT * FROM users LIMIT 3;"
         tree = Parser(Tokenizer(sql)).parse()
@@ -59,6 +81,33 @@ class TestSelect(unittest.TestCase):
         func = tree.childs[0]
         self.assertEqual(func.type, "FUNCTION_CALL")
         self.assertEqual(func.val.upper(), "SUM")
+        aggregate = tree.childs[-1]
+        self.assertEqual(aggregate.type, "AGGREGATE")
+        self.assertEqual([c.type for c in aggregate.childs], ["FUNCTION_CALL", "RELATION"])
+
+    def test_group_by_having_order(self):
+        sql = "SELECT city, count(*), AVG(salary) FROM users WHERE age > 5 GROUP BY city HAVING COUNT(*) > 1 ORDER BY AVG(salary) DESC;"
+        tree = Parser(Tokenizer(sql)).parse()
+        self.assertEqual(tree.childs[1].type, "FUNCTION_CALL")
+        self.assertEqual(tree.childs[1].val, "COUNT")
+        self.assertEqual(tree.childs[1].childs, [])
+        # PROJECT -> SORT -> FILTER (HAVING) -> AGGREGATE -> FILTER (WHERE)
+        sort = tree.childs[-1]
+        self.assertEqual(sort.type, "SORT")
+        self.assertEqual(sort.childs[0].val, "AVG")
+        having = sort.childs[1]
+        self.assertEqual(having.type, "FILTER")
+        self.assertEqual(having.childs[1].childs[0].val, "COUNT")
+        aggregate = having.childs[0]
+        self.assertEqual(aggregate.type, "AGGREGATE")
+        self.assertEqual(col_name(aggregate.childs[0]), "city")
+        # Each distinct aggregate call once
+        self.assertEqual([c.val for c in aggregate.childs[1:-1]], ["COUNT", "AVG"])
+        self.assertEqual(aggregate.childs[-1].type, "FILTER")
+
+    def test_group_by_requires_column(self):
+        with self.assertRaises(ParserError):
+            Parser(Tokenizer("SELECT COUNT(*) FROM users GROUP BY age + 1;")).parse()
 
 
 class TestJoin(unittest.TestCase):
@@ -233,6 +282,14 @@ class TestDDL(unittest.TestCase):
         fk = col_list.childs[1].childs[2]
         self.assertEqual(fk.type, "FOREIGN_KEY")
 
+    def test_create_table_engine(self):
+        tree = Parser(Tokenizer("CREATE TABLE codes (id INTEGER, label VARCHAR(20)) ENGINE=MEMORY;")).parse()
+        self.assertEqual(tree.childs[2].type, "TABLE_ENGINE")
+        self.assertEqual(tree.childs[2].val, "MEMORY")
+
+        tree = Parser(Tokenizer("CREATE TABLE codes (id INTEGER) engine memory")).parse()
+        self.assertEqual(tree.childs[2].val, "MEMORY")
+
     def test_drop_table(self):
         sql = "DROP TABLE users CASCADE;"
         tree = Parser(Tokenizer(sql)).parse()
@@ -240,6 +297,15 @@ class TestDDL(unittest.TestCase):
         self.assertEqual(tree.val, "CASCADE")
         self.assertEqual(tree.childs[0].val, "users")
 
+    def test_cluster_table(self):
+        sql = "CLUSTER users USING id;"
+        tree = Parser(Tokenizer(sql)).parse()
+        self.assertEqual(tree.type, "CLUSTER_TABLE")
+        self.assertEqual([c.val for c in tree.childs], ["users", "id"])
+
+        tree = Parser(Tokenizer("CLUSTER users")).parse()
+        self.assertEqual([c.val for c in tree.childs], ["users"])
+
 
 class TestDML(unittest.TestCase):
     def test_update(self):
@@ -262,6 +328,15 @@ class TestDML(unittest.TestCase):
         self.assertEqual(tree.type, "DELETE_QUERY")
         self.assertEqual(tree.childs[-1].type, "FILTER")
 
+    def test_copy(self):
+        sql = "COPY users FROM 'data/users.csv';"
+        tree = Parser(Tokenizer(sql)).parse()
+        self.assertEqual(tree.type, "COPY_QUERY")
+        self.assertEqual(tree.childs[0].type, "RELATION")
+        self.assertEqual(tree.childs[0].val, "users")
+        self.assertEqual(tree.childs[1].type, "LITERAL_STRING")
+        self.assertEqual(tree.childs[1].val, "data/users.csv")
+
 
 class TestTransaction(unittest.TestCase):
     def test_begin_transaction(self):
@@ -16,6 +16,8 @@ class Tokenizer:
         patterns = [
             (TokenType.KEYWORD_BEGIN_TRANSACTION, r'\bBEGIN TRANSACTION\b'),
             (TokenType.KEYWORD_ORDER_BY,  r'\bORDER BY\b'),
+            (TokenType.KEYWORD_GROUP_BY,  r'\bGROUP BY\b'),
+            (TokenType.KEYWORD_HAVING,    r'\bHAVING\b'),
             (TokenType.KEYWORD_SELECT,    r'\bSELECT\b'),
             (TokenType.KEYWORD_FROM,      r'\bFROM\b'),
             (TokenType.KEYWORD_WHERE,     r'\bWHERE\b'),
@@ -34,6 +36,9 @@ class Tokenizer:
             (TokenType.KEYWORD_TABLE,     r'\bTABLE\b'),
             (TokenType.KEYWORD_DROP,      r'\bDROP\b'),
             (TokenType.KEYWORD_CASCADE,   r'\bCASCADE\b'),
+            (TokenType.KEYWORD_COPY,      r'\bCOPY\b'),
+            (TokenType.KEYWORD_CLUSTER,   r'\bCLUSTER\b'),
+            (TokenType.KEYWORD_USING,     r'\bUSING\b'),
             (TokenType.KEYWORD_RESTRICT,  r'\bRESTRICT\b'),
             (TokenType.KEYWORD_AS,        r'\bAS\b'),
             (TokenType.KEYWORD_EXISTS,    r'\bEXISTS\b'),
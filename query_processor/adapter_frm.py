@@ -77,6 +77,25 @@ class AdapterFRM:
             logger.info(f"[FRM] WAL size ({len(self.frm.mem_wal)}) reached threshold ({self.frm.wal_size}). Triggering checkpoint...")
             self.checkpoint()
     
+    def log_bulk_write(self, transaction_id: int, query: str, table_name: str, rows: list,
+                       row_counts: dict) -> None:
+        """
+        Log one batch of a bulk load as a write record and force it to disk before the rows become visible.
+        
+        row_counts holds the row count of each table file before the load; undoing the
+        record truncates back to it instead of deleting rows that equal the loaded ones.
+        """
+        self.log_operation(
+            transaction_id=transaction_id,
+            query=query,
+            action="write",
+            table_name=table_name,
+            old_data=row_counts,
+            new_data=rows
+        )
+        self._flush_to_disk()
+        logger.info(f"[FRM] Bulk write of {len(rows)} row(s) logged for transaction {transaction_id}")
+    
     def _flush_to_disk(self) -> None:
         """Force immediate flush of WAL to disk"""
         if self.frm.mem_wal:
@@ -144,9 +163,14 @@ class AdapterFRM:
                 continue
             
             # Determine operation type and execute
-            from storage_manager.models import DataWrite, DataUpdate, DataDeletion
+            from storage_manager.models import DataWrite, DataUpdate, DataDeletion, DataTruncation
+            
+            if isinstance(data_exec, DataTruncation):
+                # Undo bulk load: cut the table back to its size before the load
+                removed = adapter_storage.truncate_data(table_name, data_exec.num_rows)
+                logger.info(f"[FRM RECOVERY] Undid bulk load into '{table_name}': removed {removed} row(s)")
             
-            if isinstance(data_exec, DataWrite):
+            elif isinstance(data_exec, DataWrite):
                 # Undo INSERT: DELETE the inserted row
                 columns = list(data_exec.data.keys())
                 values = [data_exec.data[col] for col in columns]
@@ -220,7 +244,7 @@ class AdapterFRM:
         
         logger.info(f"[FRM] Applying {len(data_execs)} recovery operation(s) to storage")
         
-        from storage_manager.models import DataWrite, DataUpdate, DataDeletion
+        from storage_manager.models import DataWrite, DataUpdate, DataDeletion, DataTruncation
         
         for i, data_exec in enumerate(data_execs, 1):
             # Get table name
@@ -233,7 +257,12 @@ class AdapterFRM:
                 continue
             
             try:
-                if isinstance(data_exec, DataWrite):
+                if isinstance(data_exec, DataTruncation):
+                    # UNDO bulk load (by truncating back to the pre-load row count)
+                    removed = adapter_storage.truncate_data(table_name, data_exec.num_rows)
+                    logger.info(f"[FRM RECOVERY] {i}. Truncated '{table_name}' to {data_exec.num_rows} row(s), removed {removed}")
+                
+                elif isinstance(data_exec, DataWrite):
                     # REDO INSERT or UNDO DELETE (by inserting)
                     if hasattr(data_exec, 'column') and hasattr(data_exec, 'new_value'):
                         adapter_storage.write_data(
@@ -289,6 +318,12 @@ class AdapterFRM:
         # Flush all buffered transactions to storage
         if self.query_processor:
             self._flush_all_buffers_to_storage()
+            # Buffered index changes stay unmerged; their change log must be durable before the WAL is cut
+            synced = self.query_processor.adapter_storage.sync_index_changes()
+            logger.info(f"[FRM CHECKPOINT] Synced {synced} index change log(s)")
+            # ENGINE=MEMORY tables: snapshot now, later writes are redone from the WAL
+            snapshotted = self.query_processor.adapter_storage.snapshot_memory_tables()
+            logger.info(f"[FRM CHECKPOINT] Snapshotted {snapshotted} memory table(s)")
         
         # Create checkpoint log entry
         self.frm._save_checkpoint()
@@ -5,6 +5,7 @@ from storage_manager.models import (
     DataWrite, 
     DataDeletion,
     DataUpdate,
+    DataTruncation,
     ColumnDefinition,
     ForeignKey
 )
@@ -112,7 +113,32 @@ class AdapterStorage:
             # Fallback for storage managers that don't support transaction_id parameter
             return self.sm.delete_block(data_deletion)
     
-    def create_table(self, table_name, columns, primary_keys=None, foreign_keys=None):
+    def truncate_data(self, table_name, num_rows):
+        """
+        Cut a table back to its first num_rows rows (undo of a bulk load).
+        
+        Args:
+            table_name: Name of the table or partition to truncate
+            num_rows: Number of leading rows to keep
+            
+        Returns:
+            Number of rows removed
+        """
+        return self.sm.truncate_block(DataTruncation(table=table_name, num_rows=num_rows))
+    
+    def count_rows_per_file(self, table_name):
+        """
+        Row count of each file backing a table (one per partition for partitioned tables).
+        
+        Args:
+            table_name: Name of the table
+            
+        Returns:
+            Dict of table or partition name -> row count
+        """
+        return self.sm.count_rows_per_file(table_name)
+    
+    def create_table(self, table_name, columns, primary_keys=None, foreign_keys=None, engine="disk"):
         """
         Create a new table in storage.
         
@@ -121,12 +147,14 @@ class AdapterStorage:
             columns: List of ColumnDefinition objects
             primary_keys: List of primary key column names
             foreign_keys: List of ForeignKey objects
+            engine: "disk" or "memory" (rows kept in RAM, file is a snapshot)
         """
         return self.sm.create_table(
             table_name=table_name,
             columns=columns,
             primary_keys=primary_keys,
-            foreign_keys=foreign_keys
+            foreign_keys=foreign_keys,
+            engine=engine
         )
     
     def drop_table(self, table_name):
@@ -138,6 +166,60 @@ class AdapterStorage:
         """
         return self.sm.drop_table(table_name)
     
+    def cluster_table(self, table_name, column_name=None):
+        """
+        Rewrite a table in the key order of one of its indexes.
+        
+        Args:
+            table_name: Name of the table to cluster
+            column_name: Indexed column to order by (None = previous clustering column)
+            
+        Returns:
+            Dict with the clustering column and row/block counts
+        """
+        return self.sm.cluster_table(table_name, column_name)
+    
+    def bulk_load(self, table_name, file_path, on_batch=None, before_commit=None):
+        """
+        Bulk load a CSV/JSONL file straight into a table's data file.
+        
+        Args:
+            table_name: Name of the target table
+            file_path: Path to the .csv / .jsonl input file
+            on_batch: Optional callback receiving each batch of loaded rows
+            before_commit: Optional callback run before the rows become visible
+            
+        Returns:
+            Number of rows loaded
+        """
+        return self.sm.bulk_load(
+            table_name,
+            file_path,
+            on_batch=on_batch,
+            before_commit=before_commit
+        )
+    
+    def snapshot_memory_tables(self):
+        """
+        Write snapshots of ENGINE=MEMORY tables changed since their last snapshot.
+        
+        Returns:
+            Number of tables snapshotted
+        """
+        return self.sm.snapshot_memory_tables()
+    
+    def sync_index_changes(self):
+        """
+        Fsync the change logs of buffered index changes (group commit).
+        
+        The buffers themselves are merged into the index files later, when full
+        or on lookup.
+        
+        Returns:
+            Number of change log files synced
+        """
+        return self.sm.sync_index_changes()
+    
     def batch_update_data(self, table_name, old_data_list, new_data_list, transaction_id=None):
         """
         Batch update data using old/new data matching (optimized for FRM/transactions).
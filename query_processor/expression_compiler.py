@@ -0,0 +1,263 @@
+"""
+Compiled predicate and expression evaluation
+Condition and value expression trees are turned into nested Python closures
+once per operator instead of being re-walked for every row: node types and
+operators are dispatched at compile time, literals are extracted once,
+column names are bound into the closures and literal-only arithmetic is
+folded to a constant.
+"""
+
+from typing import Any, Callable, Dict, List, Tuple
+
+try:
+    from .vectorized import ARITHMETIC_OPERATORS, COMPARISON_OPERATORS
+except ImportError:
+    from vectorized import ARITHMETIC_OPERATORS, COMPARISON_OPERATORS
+
+Row = Dict[str, Any]
+Predicate = Callable[[Row], bool]
+ValueFunction = Callable[[Row], Any]
+
+
+class _Constant:
+    # Compiled value that does not depend on the row (literals, folded arithmetic)
+    __slots__ = ("value",)
+
+    def __init__(self, value: Any):
+        self.value = value
+
+
+def _always_true(row: Row) -> bool:
+    return True
+
+
+# Three-valued (Kleene) connectives for predicates that can return None (UNKNOWN)
+def _kleene_and(parts: List[Predicate]) -> Predicate:
+    def conjunction(row):
+        unknown = False
+        for part in parts:
+            result = part(row)
+            if result is None:
+                unknown = True
+            elif not result:
+                return False
+        return None if unknown else True
+    return conjunction
+
+
+def _kleene_or(parts: List[Predicate]) -> Predicate:
+    def disjunction(row):
+        unknown = False
+        for part in parts:
+            result = part(row)
+            if result is None:
+                unknown = True
+            elif result:
+                return True
+        return None if unknown else False
+    return disjunction
+
+
+def _kleene_not(inner: Predicate) -> Predicate:
+    def negation(row):
+        result = inner(row)
+        return None if result is None else not result
+    return negation
+
+
+class ExpressionCompiler:
+    """
+    Compiles condition trees into predicates and value expression trees into value functions.
+    Same semantics as the tree-walking evaluation it replaces; IN / EXISTS subqueries
+    probe the statement's subquery hash tables. An IN subquery probe can be UNKNOWN
+    (NULL involved): predicates over one return None for it and NOT / AND / OR
+    propagate it, so only a True result qualifies a row.
+
+    Args:
+        engine: QueryExecution used for tree helpers and subquery probes
+    """
+
+    def __init__(self, engine):
+        self.engine = engine
+
+    def compile_condition(self, condition) -> Predicate:
+        """Return predicate(row) -> bool for a condition tree (None = UNKNOWN, see can_be_unknown)."""
+        node_type = condition.type
+
+        if node_type == "COMPARISON":
+            compare = COMPARISON_OPERATORS.get(condition.val)
+            if compare is None:
+                return _always_true
+            left = self._value(condition.childs[0])
+            right = self._value(condition.childs[1])
+            if isinstance(right, _Constant):
+                operand = right.value
+                if isinstance(left, _Constant):
+                    folded = self._fold(compare, left.value, operand)
+                    if isinstance(folded, _Constant):
+                        result = folded.value
+                        return lambda row: result
+                    return folded
+                column = self._column_name(condition.childs[0])
+                if column is not None:
+                    # column <op> literal, the common WHERE shape
+                    return lambda row: compare(row.get(column), operand)
+                return lambda row: compare(left(row), operand)
+            if isinstance(left, _Constant):
+                operand = left.value
+                return lambda row: compare(operand, right(row))
+            return lambda row: compare(left(row), right(row))
+
+        if node_type == "OPERATOR":
+            if condition.val in ("AND", "OR", "NOT") and self.can_be_unknown(condition):
+                parts = [self.compile_condition(child) for child in condition.childs]
+                if condition.val == "AND":
+                    return _kleene_and(parts)
+                if condition.val == "OR":
+                    return _kleene_or(parts)
+                return _kleene_not(parts[0])
+            if condition.val == "AND":
+                parts = [self.compile_condition(child) for child in condition.childs]
+                if len(parts) == 2:
+                    first, second = parts
+                    return lambda row: bool(first(row) and second(row))
+                return lambda row: all(part(row) for part in parts)
+            if condition.val == "OR":
+                parts = [self.compile_condition(child) for child in condition.childs]
+                if len(parts) == 2:
+                    first, second = parts
+                    return lambda row: bool(first(row) or second(row))
+                return lambda row: any(part(row) for part in parts)
+            if condition.val == "NOT":
+                inner = self.compile_condition(condition.childs[0])
+                return lambda row: not inner(row)
+            return _always_true
+
+        if node_type == "IS_NULL_EXPR":
+            column = self.engine.extract_column_name(condition.childs[0])
+            return lambda row: row.get(column) is None
+
+        if node_type == "IS_NOT_NULL_EXPR":
+            column = self.engine.extract_column_name(condition.childs[0])
+            return lambda row: row.get(column) is not None
+
+        if node_type in ("IN_EXPR", "NOT_IN_EXPR"):
+            column = self.engine.extract_column_name(condition.childs[0])
+            list_or_subquery = condition.childs[1]
+            negated = node_type == "NOT_IN_EXPR"
+
+            if list_or_subquery.type == "LIST":
+                values = [self.engine.extract_literal_value(child) for child in list_or_subquery.childs]
+                try:
+                    values = frozenset(values)
+                except TypeError:
+                    pass
+                if negated:
+                    return lambda row: row.get(column) not in values
+                return lambda row: row.get(column) in values
+
+            # Subquery: hash semi-join (IN) / anti-join (NOT IN) probe, None = UNKNOWN (NULL involved)
+            probe = self.engine._subquery_probe
+
+            def in_subquery(row):
+                outer_key, table = probe(list_or_subquery, "IN")
+                found = table.contains(outer_key(row), row.get(column))
+                if negated and found is not None:
+                    return not found
+                return found
+            return in_subquery
+
+        if node_type in ("EXISTS_EXPR", "NOT_EXISTS_EXPR"):
+            subquery = condition.childs[0]
+            probe = self.engine._subquery_probe
+            negated = node_type == "NOT_EXISTS_EXPR"
+
+            def exists(row):
+                outer_key, table = probe(subquery, "EXISTS")
+                return table.exists(outer_key(row)) != negated
+            return exists
+
+        if node_type in ("BETWEEN_EXPR", "NOT_BETWEEN_EXPR"):
+            column = self.engine.extract_column_name(condition.childs[0])
+            lower = self.compile_value(condition.childs[1])
+            upper = self.compile_value(condition.childs[2])
+            if node_type == "BETWEEN_EXPR":
+                return lambda row: lower(row) <= row.get(column) <= upper(row)
+            return lambda row: not (lower(row) <= row.get(column) <= upper(row))
+
+        return _always_true
+
+    def can_be_unknown(self, condition) -> bool:
+        """Whether the compiled predicate of condition can return None (an IN subquery below it)."""
+        if condition.type in ("IN_EXPR", "NOT_IN_EXPR"):
+            return condition.childs[1].type != "LIST"
+        if condition.type == "OPERATOR":
+            return any(self.can_be_unknown(child) for child in condition.childs)
+        return False
+
+    def compile_value(self, expr) -> ValueFunction:
+        """Return value(row) for a value expression tree."""
+        compiled = self._value(expr)
+        if isinstance(compiled, _Constant):
+            value = compiled.value
+            return lambda row: value
+        return compiled
+
+    def compile_key(self, exprs: List) -> Callable[[Row], Tuple]:
+        """Return key(row) -> tuple of the values of exprs."""
+        parts = [self.compile_value(expr) for expr in exprs]
+        if not parts:
+            return lambda row: ()
+        if len(parts) == 1:
+            only = parts[0]
+            return lambda row: (only(row),)
+        return lambda row: tuple(part(row) for part in parts)
+
+    def _value(self, expr):
+        # Compiled value function, or _Constant for row-independent values
+        if expr.type.startswith("LITERAL_"):
+            return _Constant(self.engine.extract_literal_value(expr))
+
+        if expr.type == "COLUMN_REF":
+            column = self.engine.extract_column_name(expr)
+            return lambda row: row.get(column)
+
+        if expr.type == "FUNCTION_CALL":
+            # Aggregate result, a column of the AGGREGATE output row
+            column = self.engine.output_column_name(expr)
+            return lambda row: row.get(column)
+
+        if expr.type == "ARITH_EXPR":
+            apply = self._arithmetic(expr.val)
+            left = self._value(expr.childs[0])
+            right = self._value(expr.childs[1])
+            if isinstance(left, _Constant) and isinstance(right, _Constant):
+                return self._fold(apply, left.value, right.value)
+            if isinstance(right, _Constant):
+                operand = right.value
+                return lambda row: apply(left(row), operand)
+            if isinstance(left, _Constant):
+                operand = left.value
+                return lambda row: apply(operand, right(row))
+            return lambda row: apply(left(row), right(row))
+
+        return _Constant(None)
+
+    def _arithmetic(self, op: str) -> Callable[[Any, Any], Any]:
+        if op in ARITHMETIC_OPERATORS:
+            return ARITHMETIC_OPERATORS[op]
+        if op == "/":
+            return lambda a, b: a / b if b != 0 else None
+        if op == "%":
+            return lambda a, b: a % b if b != 0 else None
+        return lambda a, b: None
+
+    def _fold(self, function: Callable[[Any, Any], Any], left: Any, right: Any):
+        # Literal-only operands are computed once; a failure (NULL + 1) is still raised per row
+        try:
+            return _Constant(function(left, right))
+        except Exception:
+            return lambda row: function(left, right)
+
+    def _column_name(self, expr):
+        return self.engine.extract_column_name(expr) if expr.type == "COLUMN_REF" else None
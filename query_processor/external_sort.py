@@ -0,0 +1,147 @@
+"""
+External merge sort for row streams
+Sorts up to memory_rows rows in memory. Larger inputs are cut into sorted
+runs written to temporary files, then merged back with a k-way merge, so
+only one row per run (plus the current run buffer) is held in memory.
+Runs that already arrive in key order are not re-sorted, and when the whole
+input was in order the runs are concatenated instead of merged.
+"""
+
+import heapq
+import itertools
+import os
+import pickle
+import tempfile
+from typing import Any, Callable, Dict, Iterable, Iterator, List
+import logging
+logger = logging.getLogger(__name__)
+
+Row = Dict[str, Any]
+
+_NO_KEY = object()
+
+
+class Descending:
+    """Sort key wrapper that orders its key in reverse, for per-key DESC inside a composite key."""
+
+    __slots__ = ("key",)
+
+    def __init__(self, key: Any):
+        self.key = key
+
+    def __lt__(self, other: "Descending") -> bool:
+        return other.key < self.key
+
+    def __gt__(self, other: "Descending") -> bool:
+        return other.key > self.key
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, Descending) and self.key == other.key
+
+
+class ExternalSort:
+    """
+    Spill-capable sort of dict rows.
+
+    Args:
+        key: Function(row) -> sort key (must be totally ordered across rows)
+        memory_rows: Maximum rows sorted in memory at once (one run)
+        merge_fanout: Maximum runs merged in one pass
+        reverse: Sort descending
+    """
+
+    def __init__(self, key: Callable[[Row], Any], memory_rows: int,
+                 merge_fanout: int = 64, reverse: bool = False):
+        self.key = key
+        self.memory_rows = max(memory_rows, 1)
+        self.merge_fanout = max(merge_fanout, 2)
+        self.reverse = reverse
+        # Number of sorted runs written to disk (0 = in-memory sort)
+        self.spilled_runs = 0
+        # Whether every row read so far arrived in key order
+        self.input_in_order = True
+        self._last_key = _NO_KEY
+
+    def sort(self, rows: Iterable[Row]) -> Iterator[Row]:
+        """Yield rows in key order. Temporary run files are removed when the iterator finishes or is closed."""
+        rows = iter(rows)
+        run = self._next_run(rows)
+        peek = next(rows, None) if len(run) >= self.memory_rows else None
+        if peek is None:
+            # Input fits in one run, no spilling
+            yield from run
+            return
+        rows = itertools.chain([peek], rows)
+
+        with tempfile.TemporaryDirectory(prefix="external_sort_") as temp_dir:
+            runs = []
+            while run:
+                runs.append(self._write_run(run, temp_dir))
+                run = self._next_run(rows)
+            logger.info(f"[SORT] Spilled {len(runs)} sorted runs of up to {self.memory_rows} rows")
+
+            if self.input_in_order:
+                # Presorted input: run i holds keys before run i + 1
+                for path in runs:
+                    yield from self._read_run(path)
+                return
+
+            # Merge passes until one pass can merge every run
+            while len(runs) > self.merge_fanout:
+                merged = []
+                for i in range(0, len(runs), self.merge_fanout):
+                    group = runs[i:i + self.merge_fanout]
+                    merged.append(self._write_run(self._merge(group), temp_dir, presorted=True))
+                    for path in group:
+                        os.remove(path)
+                runs = merged
+
+            yield from self._merge(runs)
+
+    def _next_run(self, rows: Iterator[Row]) -> List[Row]:
+        run = []
+        for row in rows:
+            run.append(row)
+            if len(run) >= self.memory_rows:
+                break
+        if not run:
+            return run
+        keys = [self.key(row) for row in run]
+        if self.input_in_order:
+            previous = self._last_key
+            for key in keys:
+                if previous is not _NO_KEY and self._before(key, previous):
+                    self.input_in_order = False
+                    break
+                previous = key
+        if not self.input_in_order:
+            # Stable, keys computed once
+            order = sorted(range(len(run)), key=keys.__getitem__, reverse=self.reverse)
+            run = [run[i] for i in order]
+            keys = [keys[i] for i in order]
+        self._last_key = keys[-1]
+        return run
+
+    def _before(self, key: Any, other: Any) -> bool:
+        # key sorts strictly before other in the output order
+        return other < key if self.reverse else key < other
+
+    def _write_run(self, rows: Iterable[Row], temp_dir: str, presorted: bool = False) -> str:
+        fd, path = tempfile.mkstemp(prefix="run_", suffix=".run", dir=temp_dir)
+        with os.fdopen(fd, 'wb') as f:
+            for row in rows:
+                pickle.dump(row, f, protocol=pickle.HIGHEST_PROTOCOL)
+        if not presorted:
+            self.spilled_runs += 1
+        return path
+
+    def _merge(self, paths: List[str]) -> Iterator[Row]:
+        return heapq.merge(*(self._read_run(path) for path in paths), key=self.key, reverse=self.reverse)
+
+    def _read_run(self, path: str) -> Iterator[Row]:
+        with open(path, 'rb') as f:
+            while True:
+                try:
+                    yield pickle.load(f)
+                except EOFError:
+                    return
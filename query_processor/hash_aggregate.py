@@ -0,0 +1,166 @@
+"""
+Hash aggregation with partition spilling
+Input rows are streamed once into a hash table holding one small state per
+group. When the table is full, rows of groups that are not in memory are
+written to partition files on their group key and aggregated one partition
+at a time afterwards, so memory stays bounded by the number of groups kept.
+"""
+
+import os
+import pickle
+import tempfile
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+import logging
+logger = logging.getLogger(__name__)
+
+Row = Dict[str, Any]
+
+
+# Aggregate state: [number of non-NULL values, running value]
+def _step_count(state: list, value: Any) -> None:
+    if value is not None:
+        state[0] += 1
+
+
+def _step_sum(state: list, value: Any) -> None:
+    if value is not None:
+        state[1] = value if state[0] == 0 else state[1] + value
+        state[0] += 1
+
+
+def _step_min(state: list, value: Any) -> None:
+    if value is not None:
+        if state[0] == 0 or value < state[1]:
+            state[1] = value
+        state[0] += 1
+
+
+def _step_max(state: list, value: Any) -> None:
+    if value is not None:
+        if state[0] == 0 or value > state[1]:
+            state[1] = value
+        state[0] += 1
+
+
+def _final_avg(state: list) -> Any:
+    return state[1] / state[0] if state[0] else None
+
+
+AGGREGATE_STEPS = {
+    "COUNT": (_step_count, lambda state: state[0]),
+    "SUM": (_step_sum, lambda state: state[1]),
+    "AVG": (_step_sum, _final_avg),
+    "MIN": (_step_min, lambda state: state[1]),
+    "MAX": (_step_max, lambda state: state[1]),
+}
+
+
+class HashAggregate:
+    """
+    Groups rows on a key tuple and computes aggregate functions per group.
+
+    Args:
+        group_key: Function(row) -> hashable group key tuple
+        aggregates: (function name, Function(row) -> argument value) per aggregate,
+            argument None for COUNT(*)
+        memory_groups: Maximum groups kept in one in-memory hash table
+        fanout: Number of partitions per spill level
+        max_depth: Maximum repartitioning depth (deeper partitions are aggregated in memory)
+    """
+
+    def __init__(self, group_key: Callable[[Row], Tuple],
+                 aggregates: List[Tuple[str, Optional[Callable[[Row], Any]]]],
+                 memory_groups: int, fanout: int = 8, max_depth: int = 3):
+        self.group_key = group_key
+        self.arguments = [argument for _, argument in aggregates]
+        self.steps = [AGGREGATE_STEPS[name][0] for name, _ in aggregates]
+        self.finals = [AGGREGATE_STEPS[name][1] for name, _ in aggregates]
+        self.memory_groups = max(memory_groups, 1)
+        self.fanout = max(fanout, 2)
+        self.max_depth = max_depth
+        # Number of partitions written to disk (0 = fully in-memory aggregation)
+        self.spilled_partitions = 0
+
+    def run(self, rows: Iterable[Row], scalar: bool = False) -> Iterator[Tuple[Tuple, List[Any]]]:
+        """
+        Yield (group key, aggregate values) per group.
+        scalar: no GROUP BY, an empty input still yields one group with the empty key.
+        """
+        arguments = self.arguments
+
+        def entries():
+            # Only the key and the aggregate arguments are kept (and spilled), not the rows
+            for row in rows:
+                yield self.group_key(row), [1 if argument is None else argument(row) for argument in arguments]
+
+        produced = False
+        with tempfile.TemporaryDirectory(prefix="hash_aggregate_") as temp_dir:
+            for group in self._aggregate(entries(), temp_dir, depth=0):
+                produced = True
+                yield group
+
+        if scalar and not produced:
+            yield (), [final([0, None]) for final in self.finals]
+
+    def _aggregate(self, entries: Iterable[Tuple[Tuple, List[Any]]], temp_dir: str,
+                   depth: int) -> Iterator[Tuple[Tuple, List[Any]]]:
+        table: Dict[Tuple, List[list]] = {}
+        steps = self.steps
+        files = None
+        paths: List[str] = []
+        counts = [0] * self.fanout
+        bounded = depth < self.max_depth
+
+        try:
+            for key, values in entries:
+                states = table.get(key)
+                if states is None:
+                    if bounded and len(table) >= self.memory_groups:
+                        # Table full: groups seen from now on are aggregated later, per partition
+                        if files is None:
+                            paths, files = self._open_partitions(temp_dir, depth)
+                        part = hash((depth, key)) % self.fanout
+                        pickle.dump((key, values), files[part], protocol=pickle.HIGHEST_PROTOCOL)
+                        counts[part] += 1
+                        continue
+                    states = table[key] = [[0, None] for _ in steps]
+                for step, state, value in zip(steps, states, values):
+                    step(state, value)
+        finally:
+            if files is not None:
+                for f in files:
+                    f.close()
+
+        for key, states in table.items():
+            yield key, [final(state) for final, state in zip(self.finals, states)]
+        table.clear()
+
+        if files is None:
+            return
+        self.spilled_partitions += sum(1 for count in counts if count)
+        logger.info(f"[HASH AGGREGATE] Spilled groups into {self.fanout} partitions (depth {depth}): {counts}")
+        try:
+            for part, count in enumerate(counts):
+                if count:
+                    yield from self._aggregate(self._read_partition(paths[part]), temp_dir, depth + 1)
+        finally:
+            for path in paths:
+                if os.path.exists(path):
+                    os.remove(path)
+
+    def _open_partitions(self, temp_dir: str, depth: int):
+        paths = []
+        files = []
+        for part in range(self.fanout):
+            fd, path = tempfile.mkstemp(prefix=f"aggregate_{depth}_{part}_", suffix=".part", dir=temp_dir)
+            paths.append(path)
+            files.append(os.fdopen(fd, 'wb'))
+        return paths, files
+
+    def _read_partition(self, path: str) -> Iterator[Tuple[Tuple, List[Any]]]:
+        with open(path, 'rb') as f:
+            while True:
+                try:
+                    yield pickle.load(f)
+                except EOFError:
+                    return
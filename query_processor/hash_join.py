@@ -0,0 +1,186 @@
+"""
+Hash Join with Grace-style partition spilling
+Builds a hash table on the smaller input and probes it with the other one.
+The build input is streamed into the table; as soon as it holds more rows
+than the memory budget, the held rows and the rest of both inputs are
+partitioned on the join key into temporary files and joined one partition
+pair at a time.
+Also holds the hash table used as build side of IN / EXISTS semi-joins.
+"""
+
+import os
+import pickle
+import tempfile
+from itertools import chain
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+import logging
+logger = logging.getLogger(__name__)
+
+Row = Dict[str, Any]
+
+
+class HashJoin:
+    """
+    Equi-join of a build input and a probe input on key tuples.
+
+    Args:
+        build_key: Function(row) -> hashable key tuple for build rows
+        probe_key: Function(row) -> hashable key tuple for probe rows
+        merge: Function(build_row, probe_row) -> joined row, or None to drop the pair
+        memory_rows: Maximum build rows kept in one in-memory hash table
+        fanout: Number of partitions per spill level
+        max_depth: Maximum repartitioning depth (skewed keys stop splitting here)
+    """
+
+    def __init__(self, build_key: Callable[[Row], Tuple], probe_key: Callable[[Row], Tuple],
+                 merge: Callable[[Row, Row], Optional[Row]], memory_rows: int,
+                 fanout: int = 8, max_depth: int = 3):
+        self.build_key = build_key
+        self.probe_key = probe_key
+        self.merge = merge
+        self.memory_rows = max(memory_rows, 1)
+        self.fanout = max(fanout, 2)
+        self.max_depth = max_depth
+        # Number of partition pairs written to disk (0 = fully in-memory join)
+        self.spilled_partitions = 0
+
+    def run(self, build_rows: Iterable[Row], probe_rows: Iterable[Row]) -> Iterator[Row]:
+        """
+        Yield joined rows. Both inputs are streamed: at most memory_rows + 1 build rows
+        are held before the build side spills, the probe input is read after the build.
+        """
+        build_rows = iter(build_rows)
+        table: Dict[Tuple, List[Row]] = {}
+        held = 0
+        for row in build_rows:
+            table.setdefault(self.build_key(row), []).append(row)
+            held += 1
+            if held > self.memory_rows:
+                break
+        else:
+            yield from self._probe(table, probe_rows)
+            return
+
+        # Over budget: the rows held so far and the rest of the build input are partitioned
+        spilled_rows = chain(chain.from_iterable(table.values()), build_rows)
+        with tempfile.TemporaryDirectory(prefix="hash_join_") as temp_dir:
+            yield from self._join_partitioned(spilled_rows, probe_rows, temp_dir, depth=0)
+
+    def _join_in_memory(self, build_rows: Iterable[Row], probe_rows: Iterable[Row]) -> Iterator[Row]:
+        table: Dict[Tuple, List[Row]] = {}
+        for row in build_rows:
+            table.setdefault(self.build_key(row), []).append(row)
+        return self._probe(table, probe_rows)
+
+    def _probe(self, table: Dict[Tuple, List[Row]], probe_rows: Iterable[Row]) -> Iterator[Row]:
+        for probe_row in probe_rows:
+            matches = table.get(self.probe_key(probe_row))
+            if not matches:
+                continue
+            for build_row in matches:
+                joined = self.merge(build_row, probe_row)
+                if joined is not None:
+                    yield joined
+
+    def _join_partitioned(self, build_rows: Iterable[Row], probe_rows: Iterable[Row],
+                          temp_dir: str, depth: int) -> Iterator[Row]:
+        # Salt the hash with the depth so repartitioning splits a partition differently
+        build_files, build_counts = self._partition(build_rows, self.build_key, temp_dir, depth, "build")
+        probe_files, _ = self._partition(probe_rows, self.probe_key, temp_dir, depth, "probe")
+        self.spilled_partitions += sum(1 for count in build_counts if count)
+        logger.info(f"[HASH JOIN] Spilled build side into {self.fanout} partitions (depth {depth}): {build_counts}")
+
+        try:
+            for part, count in enumerate(build_counts):
+                if not count:
+                    # No build rows, nothing in this probe partition can match
+                    continue
+                partition_probe = self._read_partition(probe_files[part])
+                if count > self.memory_rows and depth + 1 < self.max_depth:
+                    yield from self._join_partitioned(self._read_partition(build_files[part]), partition_probe,
+                                                      temp_dir, depth + 1)
+                else:
+                    yield from self._join_in_memory(self._read_partition(build_files[part]), partition_probe)
+        finally:
+            for path in build_files + probe_files:
+                if os.path.exists(path):
+                    os.remove(path)
+
+    def _partition(self, rows: Iterable[Row], key_fn: Callable[[Row], Tuple], temp_dir: str,
+                   depth: int, side: str) -> Tuple[List[str], List[int]]:
+        paths = []
+        files = []
+        counts = [0] * self.fanout
+        try:
+            for part in range(self.fanout):
+                fd, path = tempfile.mkstemp(prefix=f"{side}_{depth}_{part}_", suffix=".part", dir=temp_dir)
+                paths.append(path)
+                files.append(os.fdopen(fd, 'wb'))
+            for row in rows:
+                part = hash((depth, key_fn(row))) % self.fanout
+                pickle.dump(row, files[part], protocol=pickle.HIGHEST_PROTOCOL)
+                counts[part] += 1
+        finally:
+            for f in files:
+                f.close()
+        return paths, counts
+
+    def _read_partition(self, path: str) -> Iterator[Row]:
+        with open(path, 'rb') as f:
+            while True:
+                try:
+                    yield pickle.load(f)
+                except EOFError:
+                    return
+
+
+class _SemiJoinGroup:
+    __slots__ = ("values", "has_null")
+
+    def __init__(self):
+        self.values = set()
+        self.has_null = False
+
+
+class SemiJoinTable:
+    """
+    Build side of a hash semi-join (IN / EXISTS) or anti-join (NOT IN / NOT EXISTS).
+    Subquery rows are grouped on their correlation key (the empty tuple for an
+    uncorrelated subquery); each group keeps the set of IN values and whether one
+    of them was NULL. Every outer row is then answered by one lookup.
+    """
+
+    def __init__(self):
+        self.groups: Dict[Tuple, _SemiJoinGroup] = {}
+        self.rows = 0
+
+    def add(self, key: Tuple, value: Any = None) -> None:
+        """Add one subquery row. Rows with a NULL key never match (NULL = x is not true)."""
+        self.rows += 1
+        if any(part is None for part in key):
+            return
+        group = self.groups.get(key)
+        if group is None:
+            group = self.groups[key] = _SemiJoinGroup()
+        if value is None:
+            group.has_null = True
+        else:
+            group.values.add(value)
+
+    def exists(self, key: Tuple) -> bool:
+        """EXISTS: the subquery has at least one row for this key."""
+        return key in self.groups
+
+    def contains(self, key: Tuple, value: Any) -> Optional[bool]:
+        """
+        value IN (subquery rows for key) with SQL NULL semantics:
+        True / False, or None (UNKNOWN) when value is NULL or only a NULL could match.
+        """
+        group = self.groups.get(key)
+        if group is None:
+            return False
+        if value is None:
+            return None
+        if value in group.values:
+            return True
+        return None if group.has_null else False
@@ -0,0 +1,136 @@
+"""
+Sort-merge join
+Both input streams go through ExternalSort (inputs that already arrive in
+key order, e.g. from a clustered table or a B+ tree scan, are not re-sorted)
+and the sorted streams are merged in one pass. Equi-joins buffer only the
+current right key group; range joins have to keep the sorted right input,
+every left row matches a whole prefix or suffix of it.
+"""
+
+import bisect
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+import logging
+logger = logging.getLogger(__name__)
+
+try:
+    from .external_sort import ExternalSort
+except ImportError:
+    from external_sort import ExternalSort
+
+Row = Dict[str, Any]
+
+# Range operators as seen from the left input: left_col OP right_col
+RANGE_OPERATORS = ("<", "<=", ">", ">=")
+MIRRORED_OPERATORS = {"<": ">", "<=": ">=", ">": "<", ">=": "<="}
+
+
+# Values of different types are ordered by type first: numbers, strings, then anything else
+_TYPE_RANKS = {bool: 0, int: 0, float: 0, str: 1}
+
+
+def sort_key_value(value: Any) -> Tuple[bool, int, str, Any]:
+    """
+    Totally ordered wrapper for one key value, NULLs sort last and compare equal to each other.
+    Mixed-type keys never raise: values only compare with values of the same type rank.
+    """
+    if value is None:
+        return (True, 0, "", None)
+    rank = _TYPE_RANKS.get(type(value))
+    if rank is None:
+        return (False, 2, type(value).__name__, value)
+    return (False, rank, "", value)
+
+
+class MergeJoin:
+    """
+    Merge join of a left and a right input on their sort keys.
+
+    Args:
+        left_key: Function(row) -> sort key for left rows
+        right_key: Function(row) -> sort key for right rows
+        merge: Function(left_row, right_row) -> joined row, or None to drop the pair
+        memory_rows: Maximum rows sorted in memory per run when an input needs sorting
+    """
+
+    def __init__(self, left_key: Callable[[Row], Any], right_key: Callable[[Row], Any],
+                 merge: Callable[[Row, Row], Optional[Row]], memory_rows: int):
+        self.left_key = left_key
+        self.right_key = right_key
+        self.merge = merge
+        self.memory_rows = memory_rows
+        self._sorters: List[ExternalSort] = []
+
+    @property
+    def spilled_runs(self) -> int:
+        return sum(sorter.spilled_runs for sorter in self._sorters)
+
+    @property
+    def presorted_inputs(self) -> int:
+        # Inputs that arrived in key order and were not re-sorted
+        return sum(1 for sorter in self._sorters if sorter.input_in_order)
+
+    def _sorted(self, rows: Iterable[Row], key: Callable[[Row], Any]) -> Iterator[Row]:
+        sorter = ExternalSort(key, self.memory_rows)
+        self._sorters.append(sorter)
+        return sorter.sort(rows)
+
+    def equi_join(self, left_rows: Iterable[Row], right_rows: Iterable[Row]) -> Iterator[Row]:
+        """Yield joined rows for left_key == right_key, handling duplicate keys on both sides."""
+        left = iter(self._sorted(left_rows, self.left_key))
+        right = iter(self._sorted(right_rows, self.right_key))
+        try:
+            left_row = next(left, None)
+            right_row = next(right, None)
+
+            while left_row is not None and right_row is not None:
+                lk = self.left_key(left_row)
+                rk = self.right_key(right_row)
+                if lk < rk:
+                    left_row = next(left, None)
+                elif lk > rk:
+                    right_row = next(right, None)
+                else:
+                    # Buffer the right key group, stream the left key group against it
+                    group = []
+                    while right_row is not None and self.right_key(right_row) == rk:
+                        group.append(right_row)
+                        right_row = next(right, None)
+                    while left_row is not None and self.left_key(left_row) == lk:
+                        for match in group:
+                            joined = self.merge(left_row, match)
+                            if joined is not None:
+                                yield joined
+                        left_row = next(left, None)
+        finally:
+            # One side can stop early, release its sort runs now
+            for rows in (left, right):
+                if hasattr(rows, "close"):
+                    rows.close()
+
+    def range_join(self, left_rows: Iterable[Row], right_rows: Iterable[Row], operator: str) -> Iterator[Row]:
+        """
+        Yield joined rows for left_key OP right_key with OP in <, <=, >, >=.
+        Rows with a NULL key never match a range predicate and are skipped.
+        The sorted right input is materialized (each left row re-reads a range of it),
+        the left input is streamed.
+        """
+        right_sorted = [row for row in self._sorted(right_rows, self.right_key) if self.right_key(row)[0] is False]
+        right_keys = [self.right_key(row) for row in right_sorted]
+        position = 0
+
+        for left_row in self._sorted(left_rows, self.left_key):
+            lk = self.left_key(left_row)
+            if lk[0]:
+                # NULLs sort last, nothing after this can match
+                break
+            # Left keys ascend, so the boundary only moves forward
+            if operator in ("<", ">="):
+                position = bisect.bisect_right(right_keys, lk, lo=position)
+            else:
+                position = bisect.bisect_left(right_keys, lk, lo=position)
+            matches = right_sorted[position:] if operator in ("<", "<=") else right_sorted[:position]
+            for match in matches:
+                joined = self.merge(left_row, match)
+                if joined is not None:
+                    yield joined
+
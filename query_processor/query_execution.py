@@ -2,6 +2,9 @@ import sys
 import os
 import traceback
 import logging
+import heapq
+from itertools import chain, islice
+from typing import Callable, Iterator
 logger = logging.getLogger(__name__)
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
@@ -26,6 +29,12 @@ try:
     )
     from .adapter_optimizer import AdapterOptimizer
     from .transaction_buffer import TransactionBuffer
+    from .hash_join import HashJoin, SemiJoinTable
+    from .external_sort import Descending, ExternalSort
+    from .merge_join import MergeJoin, RANGE_OPERATORS, MIRRORED_OPERATORS, sort_key_value
+    from .vectorized import BatchEvaluator, BatchHashTable, ColumnBatch, batches_from_rows, rows_from_batches
+    from .expression_compiler import ExpressionCompiler
+    from .hash_aggregate import HashAggregate
 except ImportError:
     from adapter_storage import (
         AdapterStorage,
@@ -36,8 +45,33 @@ except ImportError:
     )
     from adapter_optimizer import AdapterOptimizer
     from transaction_buffer import TransactionBuffer
+    from hash_join import HashJoin, SemiJoinTable
+    from external_sort import Descending, ExternalSort
+    from merge_join import MergeJoin, RANGE_OPERATORS, MIRRORED_OPERATORS, sort_key_value
+    from vectorized import BatchEvaluator, BatchHashTable, ColumnBatch, batches_from_rows, rows_from_batches
+    from expression_compiler import ExpressionCompiler
+    from hash_aggregate import HashAggregate
 
 class QueryExecution:
+    # Hash join: max build rows held in one in-memory hash table before
+    # both inputs are partitioned to disk (Grace hash join)
+    HASH_JOIN_MEMORY_ROWS = 100000
+    HASH_JOIN_PARTITIONS = 8
+    # External sort: max rows sorted in memory per run before spilling to disk
+    SORT_MEMORY_ROWS = 100000
+    # Hash aggregation: max groups held in memory before rows of new groups are
+    # partitioned to disk and aggregated per partition
+    AGGREGATE_MEMORY_GROUPS = 100000
+    AGGREGATE_PARTITIONS = 8
+    # Index nested-loop join: outer rows whose keys are probed in one storage lookup
+    INDEX_JOIN_BATCH_KEYS = 1000
+    # Node types opened as (open/next/close) row iterators, see iterate_node for which of them stream
+    STREAMING_NODES = ("PROJECT", "FILTER", "SORT", "LIMIT", "RELATION", "ALIAS", "JOIN", "AGGREGATE")
+    # Vectorized mode: these operators exchange column batches of BATCH_SIZE rows
+    VECTORIZED = False
+    BATCH_SIZE = 1024
+    VECTORIZED_NODES = ("PROJECT", "FILTER", "LIMIT", "JOIN", "RELATION", "ALIAS")
+
     def __init__(self, storage_adapter=None, ccm_adapter=None, storage_manager=None, frm_adapter=None):
         self.ccm_adapter = ccm_adapter
         self.frm_adapter = frm_adapter
@@ -60,8 +94,14 @@ class QueryExecution:
         # Initialize optimizer adapter for optimization decisions
         self.optimizer_adapter = AdapterOptimizer()
         
-        # Track limit values per transaction for thread safety
-        self.limit = {}
+        # Batch kernels for vectorized mode
+        self.batch_evaluator = BatchEvaluator(self)
+        
+        # Conditions / value expressions are compiled to closures once per operator
+        self.expression_compiler = ExpressionCompiler(self)
+        
+        # IN / EXISTS subquery hash tables of the running statement: id(subquery) -> (subquery, outer key, table)
+        self.subquery_cache = {}
     
     def _validate_with_retry(self, transaction_id: int, table_name: str, action_type: str, max_wait_time: float = 30.0):
         """
@@ -112,21 +152,12 @@ class QueryExecution:
         
     def execute_node(self, query_tree: QueryTree, transaction_id: int = None) -> list[dict] | None:
         node_type = query_tree.type
+        # Subquery results are only valid within one statement
+        self.subquery_cache.clear()
         
-        if node_type == "PROJECT":
-            return self.execute_project(query_tree, transaction_id)
-        elif node_type == "FILTER":
-            return self.execute_filter(query_tree, transaction_id)
-        elif node_type == "SORT":
-            return self.execute_sort(query_tree, transaction_id)
-        elif node_type == "LIMIT":
-            return self.execute_limit(query_tree, transaction_id)
-        elif node_type == "RELATION":
-            return self.execute_relation(query_tree, transaction_id)
-        elif node_type == "ALIAS":
-            return self.execute_alias(query_tree, transaction_id)
-        elif node_type == "JOIN":
-            return self.execute_join(query_tree, transaction_id)
+        if node_type in self.STREAMING_NODES:
+            # Drain the pipelined operator tree
+            return list(self.iterate_node(query_tree, transaction_id))
         elif node_type == "UPDATE_QUERY":
             return self.execute_update(query_tree, transaction_id)
         elif node_type == "INSERT_QUERY":
@@ -139,145 +170,200 @@ class QueryExecution:
             return self.execute_create_table(query_tree, transaction_id)
         elif node_type == "DROP_TABLE":
             return self.execute_drop_table(query_tree, transaction_id)
+        elif node_type == "CLUSTER_TABLE":
+            return self.execute_cluster_table(query_tree, transaction_id)
+        elif node_type == "COPY_QUERY":
+            return self.execute_copy(query_tree, transaction_id)
         else:
             raise ValueError(f"Unsupported node type: {node_type}")
         
-    def execute_project(self, query_tree: QueryTree, transaction_id: int) -> list[dict]:
+    def iterate_node(self, query_tree: QueryTree, transaction_id: int = None) -> Iterator[dict]:
+        """
+        Open a row iterator for a query node.
+        Operators are generators: the first next() opens the operator, each next()
+        pulls one row and close() closes its children (and storage cursors) right away.
+        PROJECT, FILTER, LIMIT, RELATION and ALIAS stream one row at a time. The other
+        operators read (part of) their input before the first row:
+        - SORT and AGGREGATE read their whole input, spilling past SORT_MEMORY_ROWS
+          rows / AGGREGATE_MEMORY_GROUPS groups
+        - hash join reads the build input first, spilling past HASH_JOIN_MEMORY_ROWS rows
+        - merge join sorts both inputs (presorted inputs are passed through)
+        - nested loop join and merge range joins keep their right input in memory
+        - ORDER BY ... LIMIT n keeps n rows (unless an index provides the order)
+        In vectorized mode PROJECT/FILTER/LIMIT/JOIN and table scans run batch-at-a-time
+        and rows are only built at the top of the batch pipeline.
+        """
+        node_type = query_tree.type
+        
+        if self.VECTORIZED and node_type in self.VECTORIZED_NODES:
+            return rows_from_batches(self.iterate_batches(query_tree, transaction_id))
+        
+        if node_type == "PROJECT":
+            return self._iter_project(query_tree, transaction_id)
+        elif node_type == "FILTER":
+            return self._iter_filter(query_tree, transaction_id)
+        elif node_type == "SORT":
+            return self._iter_sort(query_tree, transaction_id)
+        elif node_type == "LIMIT":
+            return self._iter_limit(query_tree, transaction_id)
+        elif node_type == "RELATION":
+            return self._iter_relation(query_tree, transaction_id)
+        elif node_type == "ALIAS":
+            return self._iter_alias(query_tree, transaction_id)
+        elif node_type == "JOIN":
+            return self._iter_join(query_tree, transaction_id)
+        elif node_type == "AGGREGATE":
+            return self._iter_aggregate(query_tree, transaction_id)
+        
+        # Statement nodes are not row sources
+        return iter(self.execute_node(query_tree, transaction_id) or [])
+    
+    def _close_stream(self, rows):
+        if hasattr(rows, 'close'):
+            rows.close()
+    
+    def _peek(self, rows):
+        """Return (first row or None, stream that still yields the first row)."""
+        rows = iter(rows)
+        first = next(rows, None)
+        if first is None:
+            self._close_stream(rows)
+            return None, iter([])
+        return first, self._prepend(first, rows)
+    
+    def _prepend(self, first: dict, rows):
+        try:
+            yield first
+            yield from rows
+        finally:
+            self._close_stream(rows)
+    
+    def _base_relation(self, node: QueryTree) -> str | None:
+        # Existing base table behind a RELATION (optionally aliased), read straight from storage
+        if node.type == "ALIAS" and node.childs:
+            node = node.childs[0]
+        if node.type == "RELATION" and node.val in self.storage_manager.tables:
+            return node.val
+        return None
+    
+    def _iter_table(self, table_name: str, conditions: list[Condition], columns: list[str],
+                    transaction_id: int, label: str, condition_tree: QueryTree = None):
         """
-        Execute PROJECT node (SELECT clause)
+        Stream rows of a base table from a storage cursor with this transaction's
+        buffered operations overlaid. Filter and projection are pushed down to storage
+        when nothing is buffered for the table; otherwise full rows are overlaid first,
+        then checked against condition_tree and projected.
+        """
+        # Validate READ access with CCM
+        if self.ccm_adapter and transaction_id:
+            self._validate_with_retry(transaction_id, table_name, 'read')
+        
+        buffered = self._has_buffered_operations(table_name, transaction_id)
+        # Buffered UPDATEs can make a stored row match, so filter after the overlay
+        data_retrieval = DataRetrieval(
+            table=table_name,
+            column=[] if buffered else columns,  # Empty = all columns
+            conditions=[] if buffered else conditions
+        )
+        rows = self.storage_manager.open_cursor(data_retrieval)
+        if buffered:
+            rows = self._iter_buffered_operations(rows, transaction_id, table_name)
+        
+        matches = None
+        if buffered and condition_tree is not None:
+            matches = self.compile_condition(condition_tree)
+        
+        produced = 0
+        try:
+            for row in rows:
+                if buffered:
+                    if matches is not None and not matches(row):
+                        continue
+                    if columns:
+                        row = {col: row[col] for col in columns if col in row}
+                produced += 1
+                yield row
+        finally:
+            self._close_stream(rows)
+        logger.info(f"[{label}] Streamed {produced} rows from '{table_name}'")
+    
+    def _batch_table(self, table_name: str, conditions: list[Condition], columns: list[str],
+                     transaction_id: int, label: str, condition_tree: QueryTree = None):
+        """
+        Stream column batches of a base table. When nothing is buffered for the table the
+        storage batch cursor decodes blocks straight into column lists with filter and
+        projection pushed down, no row dict is built. Buffered operations are overlaid
+        row-at-a-time by _iter_table and the result is cut into batches.
+        """
+        if self._has_buffered_operations(table_name, transaction_id):
+            rows = self._iter_table(table_name, conditions, columns, transaction_id, label, condition_tree)
+            yield from batches_from_rows(rows, self.BATCH_SIZE)
+            return
+        
+        # Validate READ access with CCM
+        if self.ccm_adapter and transaction_id:
+            self._validate_with_retry(transaction_id, table_name, 'read')
+        
+        data_retrieval = DataRetrieval(table=table_name, column=columns, conditions=conditions)
+        batches = self.storage_manager.open_batch_cursor(data_retrieval, self.BATCH_SIZE)
+        
+        produced = 0
+        try:
+            for batch_columns in batches:
+                size = len(next(iter(batch_columns.values()), []))
+                produced += size
+                yield ColumnBatch(batch_columns, size)
+        finally:
+            self._close_stream(batches)
+        logger.info(f"[{label}] Streamed {produced} rows from '{table_name}' in column batches")
+    
+    def _has_buffered_operations(self, table_name: str, transaction_id: int) -> bool:
+        return bool(transaction_id) and any(
+            op.table_name == table_name
+            for op in self.transaction_buffer.get_buffered_operations(transaction_id)
+        )
+    
+    def _iter_project(self, query_tree: QueryTree, transaction_id: int):
+        """
+        PROJECT operator (SELECT clause)
         Structure:
         - If value="*": PROJECT("*") with 1 child (source)
         - Else: PROJECT with N COLUMN_REF children + 1 source child (last)
         """
         print(f"\n[PROJECT] Executing SELECT...")
         
-        # Get source (last child)
         source = query_tree.childs[-1]
-        
-        # if simple, pushdown
-        if source.type == "RELATION":
-            table_name = source.val
-            
-            # Validate READ access with CCM
-            if self.ccm_adapter and transaction_id:
-                self._validate_with_retry(transaction_id, table_name, 'read')
-            
-            if query_tree.val == "*":
-                logger.info(f"[PROJECT] SELECT * from '{table_name}' (optimized - direct storage call)")
-                try:
-                    
-                    data_retrieval = DataRetrieval(
-                        table=table_name,
-                        column=[],  # Empty = all columns
-                        conditions=[]
-                    )
-                    source_data = self.storage_manager.read_block(data_retrieval)
-                    
-                    # Apply buffered operations for this transaction
-                    if transaction_id:
-                        source_data = self._apply_buffered_operations(source_data, transaction_id, table_name)
-                        logger.info(f"[PROJECT] After applying buffer: {len(source_data)} rows")
-                    
-                    # Apply limit if set for this transaction
-                    if transaction_id in self.limit:
-                        source_data = source_data[:self.limit[transaction_id]]
-                        del self.limit[transaction_id]
-                    
-                    logger.info(f"[PROJECT] Retrieved {len(source_data)} rows")
-                    return source_data
-                
-                except Exception as e:
-                    logger.info(f"[PROJECT] Error: {e}")
-                    return []
-            
-            # SELECT
-            columns = []
-            for i in range(len(query_tree.childs) - 1):  # All except last (source)
-                col_ref = query_tree.childs[i]
-                column_name = self.extract_column_name(col_ref)
-                columns.append(column_name)
-            
-            logger.info(f"[PROJECT] SELECT {', '.join(columns)} from '{table_name}' (optimized - projection pushed down)")
-            try:
-                
-                # Use storage adapter with projection pushdown
-                source_data = self.storage_adapter.read_data(
-                    table_name=table_name,
-                    columns=columns,
-                    conditions=[],
-                    transaction_id=transaction_id
-                )
-                
-                # Apply buffered operations for this transaction
-                if transaction_id:
-                    # First get full rows with buffer applied
-                    full_data_retrieval = DataRetrieval(
-                        table=table_name,
-                        column=[],
-                        conditions=[]
-                    )
-                    full_data = self.storage_manager.read_block(full_data_retrieval)
-                    full_data = self._apply_buffered_operations(full_data, transaction_id, table_name)
-                    
-                    # Then project to requested columns
-                    source_data = []
-                    for row in full_data:
-                        projected_row = {col: row.get(col) for col in columns if col in row}
-                        source_data.append(projected_row)
-                    
-                    logger.info(f"[PROJECT] After applying buffer: {len(source_data)} rows")
-                
-                # Apply limit if set for this transaction
-                if transaction_id in self.limit:
-                    source_data = source_data[:self.limit[transaction_id]]
-                    del self.limit[transaction_id]
-                
-                logger.info(f"[PROJECT] Retrieved {len(source_data)} rows with {len(columns)} columns")
-                return source_data
-            except Exception as e:
-                logger.info(f"[PROJECT] Error: {e}")
-                return []
-        
-        # Complex source, query processor handles it
-        source_data = self.execute_node(source, transaction_id)
-        
-        # Apply limit if set for this transaction
-        if transaction_id in self.limit:
-            source_data = source_data[:self.limit[transaction_id]]
-            del self.limit[transaction_id]
-        
-        if not source_data:
-            print("[PROJECT] No data from source")
-            return []
-        
-        if query_tree.val == "*":
-            logger.info(f"[PROJECT] SELECT * - returning all columns ({len(source_data)} rows)")
-            return source_data
-        
         columns = []
-        for i in range(len(query_tree.childs) - 1):
-            col_ref = query_tree.childs[i]
-            column_name = self.extract_column_name(col_ref)
-            columns.append(column_name)
+        if query_tree.val != "*":
+            columns = [self.output_column_name(expr) for expr in query_tree.childs[:-1]]
         
-        logger.info(f"[PROJECT] SELECT columns: {columns} (in-memory projection)")
-        
-        projected_data = []
-        for row in source_data:
-            projected_row = {}
-            for col in columns:
-                if col in row:
-                    projected_row[col] = row[col]
-                else:
-                    logger.info(f"[PROJECT] Warning: Column '{col}' not found in row")
-            projected_data.append(projected_row)
+        # Simple source: projection pushed down to the storage cursor
+        table_name = self._base_relation(source)
+        if table_name is not None:
+            logger.info(f"[PROJECT] SELECT {', '.join(columns) or '*'} from '{table_name}' (projection pushed down)")
+            yield from self._iter_table(table_name, [], columns, transaction_id, "PROJECT")
+            return
         
-        logger.info(f"[PROJECT] Projected {len(projected_data)} rows")
-        return projected_data
+        rows = self.iterate_node(source, transaction_id)
+        try:
+            if not columns:
+                yield from rows
+                return
+            logger.info(f"[PROJECT] SELECT columns: {columns} (in-memory projection)")
+            for row in rows:
+                projected_row = {}
+                for col in columns:
+                    if col in row:
+                        projected_row[col] = row[col]
+                    else:
+                        logger.info(f"[PROJECT] Warning: Column '{col}' not found in row")
+                yield projected_row
+        finally:
+            self._close_stream(rows)
     
-    def execute_filter(self, query_tree: QueryTree, transaction_id: int) -> list[dict]:
+    def _iter_filter(self, query_tree: QueryTree, transaction_id: int):
         """
-        Execute FILTER node (WHERE clause)
+        FILTER operator (WHERE clause)
         Structure: FILTER with 2 children: [source, condition_tree]
         """
         print(f"\n[FILTER] Executing WHERE clause...")
@@ -288,165 +374,329 @@ class QueryExecution:
         source = query_tree.childs[0]
         condition_tree = query_tree.childs[1]
         
-        # Try to push down to storage manager if source is a simple RELATION
-        if source.type == "RELATION":
-            table_name = source.val
-            method = self._get_execution_method(source)
-            condition_str = self.condition_tree_to_string(condition_tree)
-
-            # Validate READ access with CCM
-            if self.ccm_adapter and transaction_id:
-                self._validate_with_retry(transaction_id, table_name, 'read')
-
-            # Pushdown if possible            
-            try:
-                conditions = self.condition_tree_to_conditions(condition_tree)
-                logger.info(f"[FILTER] -> STORAGE MANAGER: Filter on table '{table_name}' with {len(conditions)} conditions using method: {method}")
-                logger.info(f"[FILTER]    Condition: {condition_str}")
-                
-                # TODO: Use method attribute to leverage indexes when available
-                data_retrieval = DataRetrieval(
-                    table=table_name,
-                    column=[],  # Empty = all columns
-                    conditions=conditions
-                )
-                
-                filtered_data = self.storage_manager.read_block(data_retrieval)
-                logger.info(f"[FILTER] Retrieved {len(filtered_data)} rows (filter pushed down via {method})")
-                
-                # Apply buffered operations for this transaction
-                if transaction_id:
-                    filtered_data = self._apply_buffered_operations(filtered_data, transaction_id, table_name)
-                    logger.info(f"[FILTER] After applying buffer: {len(filtered_data)} rows")
-                
-                return filtered_data
-                
-            except ValueError as e:
-                # Complex condition (OR/NOT) - fallback to in-memory filtering
-                logger.info(f"[FILTER] Cannot push down condition (complex OR/NOT logic): {e}")
-                logger.info(f"[FILTER] Falling back to in-memory filtering")
+        pushed_down = self._open_filter_pushdown(source, condition_tree, transaction_id)
+        if pushed_down is not None:
+            yield from pushed_down
+            return
         
-        # Fallback: Execute source then filter in memory
-        source_data = self.execute_node(source, transaction_id)
-        
-        if not source_data:
-            # [FILTER] No data from source
-            return []
+        # Fallback: stream source and filter in memory
+        matches = self.compile_condition(condition_tree)
+        rows = self.iterate_node(source, transaction_id)
+        try:
+            for row in rows:
+                if matches(row):
+                    yield row
+        finally:
+            self._close_stream(rows)
+    
+    def _open_filter_pushdown(self, source: QueryTree, condition_tree: QueryTree, transaction_id: int):
+        """
+        Push the filter down to storage manager if source is a simple RELATION.
+        Returns the filtered row stream, or None when the condition has to be evaluated in memory.
+        """
+        pushdown = self._filter_pushdown_conditions(source, condition_tree)
+        if pushdown is None:
+            return None
+        table_name, conditions = pushdown
+        return self._iter_table(table_name, conditions, [], transaction_id, "FILTER", condition_tree)
+    
+    def _filter_pushdown_conditions(self, source: QueryTree, condition_tree: QueryTree):
+        """
+        Storage conditions for a filter directly over a simple RELATION.
+        Returns (table_name, conditions), or None when the condition has to be evaluated in memory.
+        """
+        table_name = self._base_relation(source)
+        if table_name is None:
+            return None
         
-        filtered_data = []
-        for row in source_data:
-            if self.evaluate_condition(condition_tree, row):
-                filtered_data.append(row)
+        method = self._get_execution_method(source)
+        try:
+            conditions = self.condition_tree_to_conditions(condition_tree)
+        except ValueError as e:
+            # Complex condition (OR/NOT) - fallback to in-memory filtering
+            logger.info(f"[FILTER] Cannot push down condition (complex OR/NOT logic): {e}")
+            logger.info(f"[FILTER] Falling back to in-memory filtering")
+            return None
         
-        logger.info(f"[FILTER] Filtered {len(source_data)} -> {len(filtered_data)} rows (in-memory)")
-        return filtered_data
+        logger.info(f"[FILTER] -> STORAGE MANAGER: Filter on table '{table_name}' with {len(conditions)} conditions using method: {method}")
+        logger.info(f"[FILTER]    Condition: {self.condition_tree_to_string(condition_tree)}")
+        return table_name, conditions
     
-    def execute_sort(self, query_tree: QueryTree, transaction_id: int) -> list[dict]:
+    def _iter_sort(self, query_tree: QueryTree, transaction_id: int):
         """
-        Execute SORT node (ORDER BY clause)
-        Structure: SORT with 2 children: [COLUMN_REF, source]
-        Value: "ASC" or "DESC"
+        SORT operator (ORDER BY clause), blocking: the whole input is needed before the first row.
+        Rows go through an external merge sort: sorted runs of SORT_MEMORY_ROWS rows are
+        spilled to temporary files and k-way merged.
+        Structure: SORT with 2 children: [order_expr, source]
+        Value: "ASC" or "DESC", optionally followed by "NULLS FIRST" / "NULLS LAST"
+        ORDER BY a, b is a chain of SORT nodes (primary key outermost), sorted in one pass.
         """
         print(f"\n[SORT] Executing ORDER BY...")
         
-        if len(query_tree.childs) != 2:
-            raise ValueError(f"SORT must have exactly 2 children (column + source)")
-        
-        # Get column to sort by, get direction get data
-        col_ref = query_tree.childs[0]
-        column_name = self.extract_column_name(col_ref)
-        direction = query_tree.val if query_tree.val else "ASC"
-        reverse = (direction.upper() == "DESC")
-        source = query_tree.childs[1]
-        source_data = self.execute_node(source, transaction_id)
-        
-        if not source_data:
-            # [SORT] No data to sort
-            return []
+        keys, source = self._sort_keys(query_tree)
+        logger.info(f"[SORT] Sorting by {', '.join(f'{self.value_expr_to_string(expr)} {direction}' for expr, direction in keys)}")
         
-        logger.info(f"[SORT] Sorting by '{column_name}' {direction}")
-        
-        # Sort data
+        sorter = ExternalSort(self._order_by_key(keys), self.SORT_MEMORY_ROWS)
+        rows = self.iterate_node(source, transaction_id)
+        sorted_rows = sorter.sort(rows)
+        produced = 0
         try:
-            sorted_data = sorted(source_data, key=lambda row: row.get(column_name, ""), reverse=reverse)
-            logger.info(f"[SORT] Sorted {len(sorted_data)} rows")
-            return sorted_data
-        except Exception as e:
-            logger.info(f"[SORT] Error sorting: {e}")
-            return source_data
+            for row in sorted_rows:
+                produced += 1
+                yield row
+        finally:
+            sorted_rows.close()
+            self._close_stream(rows)
+        
+        logger.info(f"[SORT] Sorted {produced} rows ({sorter.spilled_runs} runs spilled)")
+    
+    def _sort_keys(self, query_tree: QueryTree) -> tuple[list, QueryTree]:
+        # Collapse a chain of SORT nodes into (order_expr, direction) keys, primary key first
+        keys = []
+        node = query_tree
+        while node.type == "SORT":
+            if len(node.childs) != 2:
+                raise ValueError(f"SORT must have exactly 2 children (column + source)")
+            keys.append((node.childs[0], (node.val or "ASC").upper()))
+            node = node.childs[1]
+        return keys, node
+    
+    def _order_by_key(self, keys: list):
+        """
+        Composite sort key for ORDER BY keys. NULLs sort as the largest value unless
+        NULLS FIRST/LAST is given (last for ASC, first for DESC); values of different
+        types are ordered by type instead of raising.
+        """
+        spec = []
+        for expr, direction in keys:
+            descending = direction.startswith("DESC")
+            if direction.endswith("NULLS FIRST"):
+                nulls_first = True
+            elif direction.endswith("NULLS LAST"):
+                nulls_first = False
+            else:
+                nulls_first = descending
+            spec.append((self.compile_value_expression(expr), descending, nulls_first))
+        
+        def key(row):
+            parts = []
+            for value_of, descending, nulls_first in spec:
+                value = value_of(row)
+                ordered = sort_key_value(value)[1:]
+                # NULL placement is decided before (and independent of) the direction
+                parts.append((value is None) != nulls_first)
+                parts.append(Descending(ordered) if descending else ordered)
+            return tuple(parts)
+        
+        return key
     
-    def execute_limit(self, query_tree: QueryTree, transaction_id: int) -> list[dict]:
+    def _iter_limit(self, query_tree: QueryTree, transaction_id: int):
         """
-        Execute LIMIT node
+        LIMIT operator: pulls at most limit rows, then closes its source so scans stop early
         Structure: LIMIT with 1 child (source), value = limit number
         """
         print(f"\n[LIMIT] Executing LIMIT...")
         
         limit_value = int(query_tree.val)
-        self.limit[transaction_id] = limit_value
-        logger.info(f"[LIMIT] Setting limit to {limit_value} for transaction {transaction_id}")
+        logger.info(f"[LIMIT] Limiting to {limit_value} rows")
         
-        # Execute source
-        source = query_tree.childs[0]
-        return self.execute_node(source, transaction_id)
+        if query_tree.childs[0].type == "SORT":
+            # ORDER BY ... LIMIT runs as one Top-N operator
+            yield from self._iter_top_n(query_tree.childs[0], limit_value, transaction_id)
+            return
+        
+        rows = self.iterate_node(query_tree.childs[0], transaction_id)
+        try:
+            yield from islice(rows, limit_value)
+        finally:
+            self._close_stream(rows)
     
-    def execute_relation(self, query_tree: QueryTree, transaction_id: int) -> list[dict]:
+    def _iter_top_n(self, sort_tree: QueryTree, limit: int, transaction_id: int):
         """
-        Execute RELATION node (table reference)
-        Value: table name
-        Uses method attribute to determine access strategy
+        Top-N operator (SORT fused with the LIMIT above it): reads the whole input through a
+        bounded heap of the limit best rows instead of sorting it, so it is blocking but
+        holds at most limit rows.
+        When a B+ tree index on the only sort column of a base table provides the order,
+        the table is read through an index-ordered cursor that stops after limit rows.
         """
-        table_name = query_tree.val
-        method = self._get_execution_method(query_tree)
+        print(f"\n[TOP-N] Executing ORDER BY ... LIMIT {limit}...")
         
-        print(f"\n[RELATION] Accessing table '{table_name}' using method: {method}")
-        logger.info(f"[RELATION] -> STORAGE MANAGER: Scan table '{table_name}' with transaction_id={transaction_id}")
+        if limit <= 0:
+            return
+        keys, source = self._sort_keys(sort_tree)
+        
+        index_scan = self._plan_index_order_scan(keys, source, transaction_id)
+        if index_scan is not None:
+            yield from self._iter_index_order(index_scan, limit, transaction_id)
+            return
+        
+        logger.info(f"[TOP-N] Keeping the first {limit} rows by {', '.join(f'{self.value_expr_to_string(expr)} {direction}' for expr, direction in keys)}")
+        rows = self.iterate_node(source, transaction_id)
+        try:
+            # nsmallest keeps a heap of at most limit rows, ties keep input order like the full sort
+            top_rows = heapq.nsmallest(limit, rows, key=self._order_by_key(keys))
+        finally:
+            self._close_stream(rows)
+        
+        logger.info(f"[TOP-N] Produced {len(top_rows)} rows (bounded heap)")
+        yield from top_rows
+    
+    def _plan_index_order_scan(self, keys: list, source: QueryTree, transaction_id: int) -> dict | None:
+        """
+        Index-ordered scan for a single-column ORDER BY over a base table (optionally
+        filtered by pushdown-able conditions) with a B+ tree index on that column.
+        Returns None when the rows have to be sorted.
+        """
+        if len(keys) != 1 or keys[0][0].type != "COLUMN_REF":
+            return None
+        expr, direction = keys[0]
+        descending = direction.startswith("DESC")
+        # The index order puts NULLs last for ASC and first for DESC (the default placement)
+        if direction.endswith("NULLS FIRST" if not descending else "NULLS LAST"):
+            return None
+        
+        relation, condition_tree = source, None
+        if source.type == "FILTER" and len(source.childs) == 2:
+            relation, condition_tree = source.childs
+        table_name = self._base_relation(relation)
+        if table_name is None:
+            return None
+        column = self.extract_column_name(expr)
+        if not self.storage_manager.has_index(table_name, column, "btree"):
+            return None
+        # Buffered writes of this transaction would have to be merged into the index order
+        if self._has_buffered_operations(table_name, transaction_id):
+            return None
+        
+        conditions = []
+        if condition_tree is not None:
+            try:
+                conditions = self.condition_tree_to_conditions(condition_tree)
+            except ValueError:
+                return None
+        
+        return {"table": table_name, "column": column, "descending": descending, "conditions": conditions}
+    
+    def _iter_index_order(self, plan: dict, limit: int, transaction_id: int):
+        """Read the first limit rows of a table in B+ tree index order."""
+        table_name, column = plan["table"], plan["column"]
         
         # Validate READ access with CCM
         if self.ccm_adapter and transaction_id:
             self._validate_with_retry(transaction_id, table_name, 'read')
         
-        # Call storage manager to read all rows
-        # TODO: Implement different access methods (hash_index, btree_index) when available
-        data_retrieval = DataRetrieval(
-            table=table_name,
-            column=[],  # Empty = all columns
-            conditions=[]  # No conditions = all rows
+        logger.info(f"[TOP-N] -> STORAGE MANAGER: Index-ordered scan of '{table_name}' on {column} {'DESC' if plan['descending'] else 'ASC'}, stopping after {limit} rows")
+        data_retrieval = DataRetrieval(table=table_name, column=[], conditions=plan["conditions"])
+        rows = self.storage_manager.open_ordered_cursor(data_retrieval, column, plan["descending"], limit)
+        produced = 0
+        try:
+            for row in rows:
+                produced += 1
+                yield row
+        finally:
+            self._close_stream(rows)
+        
+        logger.info(f"[TOP-N] Produced {produced} rows (index order scan)")
+    
+    def _iter_aggregate(self, query_tree: QueryTree, transaction_id: int):
+        """
+        AGGREGATE operator (GROUP BY / aggregate functions), blocking: streams its input once
+        through a hash aggregation holding one state per group. Beyond AGGREGATE_MEMORY_GROUPS
+        groups, rows of new groups are spilled to partition files and aggregated per partition.
+        Structure: AGGREGATE with N group key COLUMN_REF children, M FUNCTION_CALL children
+        (COUNT/SUM/AVG/MIN/MAX, no argument for COUNT(*)) + 1 source child (last)
+        Output rows hold the group key columns and one column per call named after it, e.g. "SUM(salary)".
+        """
+        print(f"\n[AGGREGATE] Executing GROUP BY / aggregates...")
+        
+        source = query_tree.childs[-1]
+        group_keys = [child for child in query_tree.childs[:-1] if child.type == "COLUMN_REF"]
+        calls = {}
+        for child in query_tree.childs[:-1]:
+            if child.type == "FUNCTION_CALL":
+                calls.setdefault(self.output_column_name(child), child)
+        key_columns = [self.extract_column_name(key) for key in group_keys]
+        labels = list(calls)
+        
+        # COUNT(*) of a whole table: answered from the table's row count, no rows are read
+        table_name = self._base_relation(source)
+        if (table_name is not None and not group_keys and calls
+                and all(call.val == "COUNT" and not call.childs for call in calls.values())
+                and not self._has_buffered_operations(table_name, transaction_id)):
+            if self.ccm_adapter and transaction_id:
+                self._validate_with_retry(transaction_id, table_name, 'read')
+            count = self.storage_manager.count_rows(table_name)
+            logger.info(f"[AGGREGATE] -> STORAGE MANAGER: COUNT(*) of '{table_name}' from table statistics: {count}")
+            yield {label: count for label in labels}
+            return
+        
+        aggregator = HashAggregate(
+            self.expression_compiler.compile_key(group_keys),
+            [(call.val, self.compile_value_expression(call.childs[0]) if call.childs else None)
+             for call in calls.values()],
+            self.AGGREGATE_MEMORY_GROUPS, self.AGGREGATE_PARTITIONS
         )
+        logger.info(f"[AGGREGATE] GROUP BY {', '.join(key_columns) or '()'} computing {', '.join(labels) or 'no aggregates'}")
+        
+        if table_name is not None:
+            # Only the grouped and aggregated columns are read from storage
+            columns = list(dict.fromkeys(key_columns + [
+                self.extract_column_name(col_ref)
+                for call in calls.values() for col_ref in self._column_refs(call)
+            ]))
+            rows = self._iter_table(table_name, [], columns, transaction_id, "AGGREGATE")
+        else:
+            rows = self.iterate_node(source, transaction_id)
         
+        produced = 0
         try:
-            data = self.storage_manager.read_block(data_retrieval)
-            logger.info(f"[RELATION] Retrieved {len(data)} rows from '{table_name}' via {method}")
-            
-            # Apply buffered operations for this transaction
-            if transaction_id:
-                data = self._apply_buffered_operations(data, transaction_id, table_name)
-                logger.info(f"[RELATION] After applying buffer: {len(data)} rows")
-            
-            return data
-        except Exception as e:
-            logger.info(f"[RELATION] Error reading from storage manager: {e}")
-            logger.info(f"[RELATION] Returning empty result")
-            return []
+            for key, values in aggregator.run(rows, scalar=not group_keys):
+                row = dict(zip(key_columns, key))
+                row.update(zip(labels, values))
+                produced += 1
+                yield row
+        finally:
+            self._close_stream(rows)
+        
+        logger.info(f"[AGGREGATE] Produced {produced} groups ({aggregator.spilled_partitions} partitions spilled)")
+    
+    def _column_refs(self, expr: QueryTree) -> list:
+        if expr.type == "COLUMN_REF":
+            return [expr]
+        return [col_ref for child in expr.childs for col_ref in self._column_refs(child)]
+    
+    def _iter_relation(self, query_tree: QueryTree, transaction_id: int):
+        """
+        RELATION operator (table scan)
+        Value: table name
+        Uses method attribute to determine access strategy
+        """
+        table_name = query_tree.val
+        method = self._get_execution_method(query_tree)
+        
+        print(f"\n[RELATION] Accessing table '{table_name}' using method: {method}")
+        logger.info(f"[RELATION] -> STORAGE MANAGER: Scan table '{table_name}' with transaction_id={transaction_id}")
+        
+        # TODO: Implement different access methods (hash_index, btree_index) when available
+        return self._iter_table(table_name, [], [], transaction_id, "RELATION")
     
-    def execute_alias(self, query_tree: QueryTree, transaction_id: int) -> list[dict]:
+    def _iter_alias(self, query_tree: QueryTree, transaction_id: int):
         """
-        Execute ALIAS node (table alias)
+        ALIAS operator (table alias), passes its child's rows through
         Structure: ALIAS with 1 child (what is being aliased)
         Value: alias name
         """
-        alias_name = query_tree.val
-        # [ALIAS] Applying alias '{alias_name}'
-        
-        source = query_tree.childs[0]
-        return self.execute_node(source, transaction_id)
+        return self.iterate_node(query_tree.childs[0], transaction_id)
     
-    def execute_join(self, query_tree: QueryTree, transaction_id: int) -> list[dict]:
+    def _iter_join(self, query_tree: QueryTree, transaction_id: int):
         """
-        Execute JOIN node using method specified in node
+        JOIN operator using method specified in node
         Structure:
         - NATURAL: JOIN("NATURAL") with 2 children (left, right relations)
         - INNER: JOIN("INNER") with 3 children (left, right, condition)
+        The left input is streamed. Nested loop keeps the right input in memory,
+        hash join holds its build input up to HASH_JOIN_MEMORY_ROWS rows before spilling,
+        and merge join sorts both inputs with a spill-capable external sort.
         """
         join_type = query_tree.val
         join_method = self._get_execution_method(query_tree)
@@ -461,108 +711,706 @@ class QueryExecution:
         logger.info(f"[JOIN] Left table: '{left_table}'")
         logger.info(f"[JOIN] Right table: '{right_table}'")
         
-        # Execute both sides
-        left_data = self.execute_node(left, transaction_id)
-        right_data = self.execute_node(right, transaction_id)
+        # Nested loop over an indexed base relation: read only the outer side, probe the inner index
+        inner_side = None
+        if join_method in ("nested_loop", "index_nested_loop"):
+            inner_side = self._index_join_inner_side(join_type, query_tree, transaction_id)
+        if inner_side is not None:
+            outer = left if inner_side == "right" else right
+            outer_first, outer_rows = self._peek(self.iterate_node(outer, transaction_id))
+            if outer_first is None:
+                logger.info(f"[JOIN] Outer table empty, returning empty result")
+                return
+            plan = self._plan_index_nested_loop_join(join_type, set(outer_first.keys()), inner_side, query_tree)
+            if plan is not None:
+                rows = self._iter_index_nested_loop_join(join_type, plan, outer_rows, transaction_id)
+                try:
+                    yield from rows
+                finally:
+                    self._close_stream(rows)
+                return
+            # Join keys do not hit the index once the outer columns are known
+            if inner_side == "right":
+                left_rows, right_rows = outer_rows, self.iterate_node(right, transaction_id)
+            else:
+                left_rows, right_rows = self.iterate_node(left, transaction_id), outer_rows
+        else:
+            left_rows = self.iterate_node(left, transaction_id)
+            right_rows = self.iterate_node(right, transaction_id)
+        
+        if join_method in ("hash", "hash_join"):
+            build_side = self._hash_join_build_side(left, right)
+            rows = self._iter_hash_join(join_type, left_rows, right_rows, query_tree, build_side)
+        elif join_method in ("merge", "merge_join"):
+            rows = self._iter_merge_join(join_type, left_rows, right_rows, query_tree)
+        else:
+            if join_method not in ("nested_loop", "index_nested_loop"):
+                logger.info(f"[JOIN] Unknown join method '{join_method}', using nested loop")
+            rows = self._iter_nested_loop_join(join_type, left_rows, right_rows, query_tree)
         
-        if not left_data:
-            logger.info(f"[JOIN] Left table empty, returning empty result")
-            return []
-        if not right_data:
-            logger.info(f"[JOIN] Right table empty, returning empty result")
-            return []
+        try:
+            yield from rows
+        finally:
+            self._close_stream(rows)
+            self._close_stream(left_rows)
+            self._close_stream(right_rows)
+    
+    def _estimate_cardinality(self, node: QueryTree) -> int | None:
+        # Row count estimate from cached storage statistics, None when unknown
+        if node.type == "LIMIT":
+            estimate = self._estimate_cardinality(node.childs[0])
+            return min(estimate, int(node.val)) if estimate is not None else int(node.val)
+        if node.type in ("PROJECT", "SORT"):
+            return self._estimate_cardinality(node.childs[-1])
+        if node.type == "FILTER":
+            return self._estimate_cardinality(node.childs[0])
+        table_name = self._base_relation(node)
+        if table_name is None:
+            return None
+        stats = getattr(self.storage_manager, "stats", {}).get(table_name)
+        return stats.n_r if stats is not None else None
+    
+    def _hash_join_build_side(self, left: QueryTree, right: QueryTree) -> str:
+        # Build on the input with the smaller estimated cardinality (right when unknown)
+        left_estimate = self._estimate_cardinality(left)
+        right_estimate = self._estimate_cardinality(right)
+        if left_estimate is not None and right_estimate is not None and left_estimate < right_estimate:
+            return "left"
+        return "right"
+    
+    def _index_join_inner_side(self, join_type: str, query_tree: QueryTree, transaction_id: int) -> str | None:
+        """
+        Pick the join input to probe through an index: a base relation with an index on a
+        join column, preferring the right input (same order as the optimizer cost model).
         
-        logger.info(f"[JOIN] Left rows: {len(left_data)}, Right rows: {len(right_data)}")
-        
-        if join_method == "nested_loop":
-            result = self._execute_nested_loop_join(join_type, left_data, right_data, query_tree, transaction_id)
-        elif join_method == "hash_join":
-            # TODO: Implement hash join algorithm
-            logger.info(f"[JOIN] Hash join not yet implemented, falling back to nested loop")
-            result = self._execute_nested_loop_join(join_type, left_data, right_data, query_tree, transaction_id)
-        elif join_method == "merge_join":
-            # TODO: Implement merge join algorithm
-            logger.info(f"[JOIN] Merge join not yet implemented, falling back to nested loop")
-            result = self._execute_nested_loop_join(join_type, left_data, right_data, query_tree, transaction_id)
+        Returns:
+            "right", "left" or None
+        """
+        if join_type not in ("NATURAL", "INNER"):
+            return None
+        if join_type == "INNER" and len(query_tree.childs) < 3:
+            return None
+        
+        # Columns compared by column = column conjuncts, NATURAL joins can use any common column
+        join_columns = None
+        if join_type == "INNER":
+            join_columns = set()
+            conjuncts = [query_tree.childs[2]]
+            while conjuncts:
+                condition = conjuncts.pop()
+                if condition.type == "OPERATOR" and condition.val == "AND":
+                    conjuncts.extend(condition.childs)
+                elif (condition.type == "COMPARISON" and condition.val == "="
+                        and all(child.type == "COLUMN_REF" for child in condition.childs)):
+                    join_columns.update(self.extract_column_name(child) for child in condition.childs)
+        
+        buffered_tables = set()
+        if transaction_id:
+            buffered_tables = {op.table_name for op in self.transaction_buffer.get_buffered_operations(transaction_id)}
+        
+        for side, node in (("right", query_tree.childs[1]), ("left", query_tree.childs[0])):
+            table_name = self._base_relation(node)
+            if table_name is None or table_name in buffered_tables:
+                # Uncommitted writes of this transaction are not in the index
+                continue
+            columns = [col["name"] for col in self.storage_manager.tables[table_name]["columns"]]
+            if any(self.storage_manager.has_index(table_name, col) for col in columns
+                   if join_columns is None or col in join_columns):
+                return side
+        return None
+    
+    def _plan_index_nested_loop_join(self, join_type: str, outer_cols: set, inner_side: str,
+                                     query_tree: QueryTree) -> dict | None:
+        """
+        Pick the indexed inner join column for an index nested-loop join.
+        Returns None when no join key of the inner table is indexed.
+        """
+        inner = query_tree.childs[1] if inner_side == "right" else query_tree.childs[0]
+        table_name = self._base_relation(inner)
+        inner_cols = {col["name"] for col in self.storage_manager.tables[table_name]["columns"]}
+        left_cols, right_cols = (outer_cols, inner_cols) if inner_side == "right" else (inner_cols, outer_cols)
+        residual = None
+        
+        if join_type == "NATURAL":
+            left_keys = right_keys = sorted(left_cols & right_cols)
+            all_keys = True
         else:
-            logger.info(f"[JOIN] Unknown join method '{join_method}', using nested loop")
-            result = self._execute_nested_loop_join(join_type, left_data, right_data, query_tree, transaction_id)
+            residual = query_tree.childs[2]
+            left_keys, right_keys, all_keys = self._extract_equi_join_keys(residual, self._join_sides(query_tree, left_cols, right_cols))
         
-        return result
+        inner_keys, outer_keys = (right_keys, left_keys) if inner_side == "right" else (left_keys, right_keys)
+        indexed = [i for i, col in enumerate(inner_keys) if self.storage_manager.has_index(table_name, col)]
+        if not indexed:
+            return None
+        if join_type == "NATURAL" and len(inner_keys) > 1:
+            other_keys = [(outer_keys[i], inner_keys[i]) for i in range(len(inner_keys)) if i != indexed[0]]
+        else:
+            other_keys = []
+        if all_keys and len(inner_keys) == 1:
+            # The index lookup is the whole condition
+            residual = None
+        
+        return {
+            "table": table_name,
+            "inner_side": inner_side,
+            "inner_col": inner_keys[indexed[0]],
+            "outer_col": outer_keys[indexed[0]],
+            "other_keys": other_keys,
+            "residual": residual,
+        }
     
-    def _execute_nested_loop_join(self, join_type: str, left_data: list[dict], right_data: list[dict], 
-                                   query_tree: QueryTree, transaction_id: int) -> list[dict]:
+    def _iter_index_nested_loop_join(self, join_type: str, plan: dict, outer_rows, transaction_id: int):
         """
-        Execute nested loop join algorithm (O(n*m) complexity)
+        Index nested-loop join: outer rows are pulled in batches, each batch's
+        deduplicated join keys are looked up in the inner table's index with one storage call.
         """
-        result = []
+        table_name = plan["table"]
+        inner_col, outer_col = plan["inner_col"], plan["outer_col"]
+        other_keys, residual = plan["other_keys"], plan["residual"]
+        if residual is not None:
+            residual = self.compile_condition(residual)
+        
+        # Validate READ access with CCM
+        if self.ccm_adapter and transaction_id:
+            self._validate_with_retry(transaction_id, table_name, 'read')
+        
+        logger.info(f"[JOIN] {join_type} JOIN probing index on {table_name}.{inner_col} with {outer_col}")
+        
+        produced = 0
+        probes = 0
+        outer_rows = iter(outer_rows)
+        try:
+            while True:
+                batch = list(islice(outer_rows, self.INDEX_JOIN_BATCH_KEYS))
+                if not batch:
+                    break
+                keys = list(dict.fromkeys(row.get(outer_col) for row in batch))
+                probes += len(keys)
+                matches = {}
+                for inner_row in self.storage_manager.read_by_index_keys(table_name, inner_col, keys):
+                    matches.setdefault(inner_row.get(inner_col), []).append(inner_row)
+                
+                for outer_row in batch:
+                    for inner_row in matches.get(outer_row.get(outer_col), []):
+                        if not all(outer_row.get(o) == inner_row.get(i) for o, i in other_keys):
+                            continue
+                        if plan["inner_side"] == "right":
+                            merged_row = {**outer_row, **inner_row}
+                        else:
+                            merged_row = {**inner_row, **outer_row}
+                        if residual is not None and not residual(merged_row):
+                            continue
+                        produced += 1
+                        yield merged_row
+        finally:
+            self._close_stream(outer_rows)
+        
+        logger.info(f"[JOIN] {join_type} JOIN produced {produced} rows (index nested loop, {probes} distinct key probes)")
+    
+    def _iter_hash_join(self, join_type: str, left_rows, right_rows, query_tree: QueryTree, build_side: str):
+        """
+        Hash join for NATURAL and INNER equi-joins (O(n+m) expected).
+        Streams the build input into the hash table, which is partitioned to disk
+        once it holds more than HASH_JOIN_MEMORY_ROWS rows, then streams the probe input.
+        Joins without equality keys fall back to nested loop.
+        """
+        left_first, left_rows = self._peek(left_rows)
+        right_first, right_rows = self._peek(right_rows)
+        if left_first is None or right_first is None:
+            logger.info(f"[JOIN] Input empty, returning empty result")
+            self._close_stream(left_rows)
+            self._close_stream(right_rows)
+            return
+        left_cols, right_cols = set(left_first.keys()), set(right_first.keys())
+        residual = None
         
         if join_type == "NATURAL":
-            logger.info(f"[JOIN] NATURAL JOIN - finding common columns...")
-            
-            if not left_data or not right_data:
-                return []
+            common_cols = sorted(left_cols & right_cols)
+            left_keys = right_keys = common_cols
+        elif join_type == "INNER":
+            if len(query_tree.childs) < 3:
+                raise ValueError("INNER JOIN requires join condition")
+            residual = query_tree.childs[2]
+            left_keys, right_keys, all_keys = self._extract_equi_join_keys(residual, self._join_sides(query_tree, left_cols, right_cols))
+            if all_keys:
+                # Every conjunct is a key equality, no need to re-check the condition
+                residual = None
+        else:
+            left_keys = right_keys = []
+        
+        if not left_keys:
+            logger.info(f"[JOIN] No equi-join keys for {join_type} JOIN, falling back to nested loop")
+            yield from self._iter_nested_loop_join(join_type, left_rows, right_rows, query_tree)
+            return
+        
+        def left_key(row):
+            return tuple(row.get(col) for col in left_keys)
+        
+        def right_key(row):
+            return tuple(row.get(col) for col in right_keys)
+        
+        matches = self.compile_condition(residual) if residual is not None else None
+        
+        def merge(left_row, right_row):
+            merged_row = {**left_row, **right_row}
+            if matches is not None and not matches(merged_row):
+                return None
+            return merged_row
+        
+        # Merged rows keep left columns first whichever input is built
+        if build_side == "right":
+            build_rows, probe_rows = right_rows, left_rows
+            hash_join = HashJoin(right_key, left_key, lambda build, probe: merge(probe, build),
+                                 self.HASH_JOIN_MEMORY_ROWS, self.HASH_JOIN_PARTITIONS)
+        else:
+            build_rows, probe_rows = left_rows, right_rows
+            hash_join = HashJoin(left_key, right_key, merge,
+                                 self.HASH_JOIN_MEMORY_ROWS, self.HASH_JOIN_PARTITIONS)
+        
+        logger.info(f"[JOIN] {join_type} JOIN on keys {list(zip(left_keys, right_keys))}, building on {build_side} input")
+        produced = 0
+        rows = hash_join.run(build_rows, probe_rows)
+        try:
+            for row in rows:
+                produced += 1
+                yield row
+        finally:
+            rows.close()
+            self._close_stream(build_rows)
+            self._close_stream(probe_rows)
+        
+        logger.info(f"[JOIN] {join_type} JOIN produced {produced} rows (hash join, {hash_join.spilled_partitions} partitions spilled)")
+    
+    def _iter_merge_join(self, join_type: str, left_rows, right_rows, query_tree: QueryTree):
+        """
+        Sort-merge join for NATURAL/INNER equi-joins and INNER range joins
+        (left_col <, <=, >, >= right_col). Both input streams go through a spill-capable
+        external merge sort (inputs already in key order are not re-sorted) and the
+        sorted streams are merged. Range joins materialize the sorted right input.
+        """
+        left_first, left_rows = self._peek(left_rows)
+        right_first, right_rows = self._peek(right_rows)
+        if left_first is None or right_first is None:
+            logger.info(f"[JOIN] Input empty, returning empty result")
+            self._close_stream(left_rows)
+            self._close_stream(right_rows)
+            return
+        left_cols = set(left_first.keys())
+        right_cols = set(right_first.keys())
+        residual = None
+        range_key = None
+        
+        if join_type == "NATURAL":
+            left_keys = right_keys = sorted(left_cols & right_cols)
+        elif join_type == "INNER":
+            if len(query_tree.childs) < 3:
+                raise ValueError("INNER JOIN requires join condition")
+            residual = query_tree.childs[2]
+            left_keys, right_keys, all_keys = self._extract_equi_join_keys(residual, self._join_sides(query_tree, left_cols, right_cols))
+            if all_keys:
+                residual = None
+            elif not left_keys:
+                range_key = self._extract_range_join_key(residual, self._join_sides(query_tree, left_cols, right_cols))
+        else:
+            left_keys = right_keys = []
+        
+        if not left_keys and range_key is None:
+            logger.info(f"[JOIN] No equi or range join keys for {join_type} JOIN, falling back to nested loop")
+            yield from self._iter_nested_loop_join(join_type, left_rows, right_rows, query_tree)
+            return
+        
+        matches = self.compile_condition(residual) if residual is not None else None
+        
+        def merge(left_row, right_row):
+            merged_row = {**left_row, **right_row}
+            if matches is not None and not matches(merged_row):
+                return None
+            return merged_row
+        
+        if range_key is None:
+            merge_join = MergeJoin(
+                lambda row: tuple(sort_key_value(row.get(col)) for col in left_keys),
+                lambda row: tuple(sort_key_value(row.get(col)) for col in right_keys),
+                merge, self.SORT_MEMORY_ROWS
+            )
+            logger.info(f"[JOIN] {join_type} JOIN merging on keys {list(zip(left_keys, right_keys))}")
+            rows = merge_join.equi_join(left_rows, right_rows)
+        else:
+            left_col, operator, right_col = range_key
+            merge_join = MergeJoin(
+                lambda row: sort_key_value(row.get(left_col)),
+                lambda row: sort_key_value(row.get(right_col)),
+                merge, self.SORT_MEMORY_ROWS
+            )
+            logger.info(f"[JOIN] {join_type} JOIN merging on range {left_col} {operator} {right_col}")
+            rows = merge_join.range_join(left_rows, right_rows, operator)
+        
+        produced = 0
+        try:
+            for row in rows:
+                produced += 1
+                yield row
+        finally:
+            rows.close()
+            self._close_stream(left_rows)
+            self._close_stream(right_rows)
+        
+        logger.info(f"[JOIN] {join_type} JOIN produced {produced} rows (merge join, {merge_join.presorted_inputs} inputs presorted, {merge_join.spilled_runs} runs spilled)")
+    
+    def _extract_range_join_key(self, condition: QueryTree, sides: dict) -> tuple | None:
+        """
+        Find the first conjunct comparing a left column with a right column using <, <=, > or >=.
+        
+        Returns:
+            (left column, operator seen from the left column, right column) or None
+        """
+        if condition.type == "OPERATOR" and condition.val == "AND":
+            for child in condition.childs:
+                range_key = self._extract_range_join_key(child, sides)
+                if range_key is not None:
+                    return range_key
+            return None
+        
+        if (condition.type == "COMPARISON" and condition.val in RANGE_OPERATORS
+                and all(child.type == "COLUMN_REF" for child in condition.childs)):
+            first = self.extract_column_name(condition.childs[0])
+            second = self.extract_column_name(condition.childs[1])
+            first_side = self._join_column_side(condition.childs[0], sides)
+            second_side = self._join_column_side(condition.childs[1], sides)
             
-            left_cols = set(left_data[0].keys())
-            right_cols = set(right_data[0].keys())
-            common_cols = left_cols & right_cols
+            if first_side == "left" and second_side == "right":
+                return first, condition.val, second
+            if first_side == "right" and second_side == "left":
+                return second, MIRRORED_OPERATORS[condition.val], first
+        
+        return None
+    
+    def _join_sides(self, query_tree: QueryTree, left_cols: set, right_cols: set) -> dict:
+        # Columns and table names / aliases visible on each side of a JOIN node
+        def relation_names(node):
+            names = {node.val} if node.type in ("RELATION", "ALIAS") else set()
+            for child in node.childs:
+                names |= relation_names(child)
+            return names
+        
+        return {
+            "left": (left_cols, relation_names(query_tree.childs[0])),
+            "right": (right_cols, relation_names(query_tree.childs[1])),
+        }
+    
+    def _column_qualifier(self, col_ref: QueryTree) -> str | None:
+        # Table name / alias of a qualified column (table.col), None when unqualified
+        return next(
+            (child.childs[0].val for child in col_ref.childs[1:] if child.type == "TABLE_NAME" and child.childs),
+            None
+        )
+    
+    def _join_column_side(self, col_ref: QueryTree, sides: dict) -> str | None:
+        col = self.extract_column_name(col_ref)
+        qualifier = self._column_qualifier(col_ref)
+        # Qualified column (table.col / alias.col) belongs to the side that has that table
+        for side in ("left", "right"):
+            cols, names = sides[side]
+            if qualifier in names and col in cols:
+                return side
+        # Unqualified: merged rows are {**left, **right}, so right columns shadow left ones
+        if col in sides["right"][0]:
+            return "right"
+        return "left" if col in sides["left"][0] else None
+    
+    def _extract_equi_join_keys(self, condition: QueryTree, sides: dict) -> tuple[list, list, bool]:
+        """
+        Collect column = column conjuncts that compare a left column with a right column.
+        
+        Returns:
+            (left key columns, right key columns, True if every conjunct is a key equality)
+        """
+        if condition.type == "OPERATOR" and condition.val == "AND":
+            left_keys, right_keys, all_keys = [], [], True
+            for child in condition.childs:
+                child_left, child_right, child_all = self._extract_equi_join_keys(child, sides)
+                left_keys.extend(child_left)
+                right_keys.extend(child_right)
+                all_keys = all_keys and child_all
+            return left_keys, right_keys, all_keys
+        
+        if (condition.type == "COMPARISON" and condition.val == "="
+                and all(child.type == "COLUMN_REF" for child in condition.childs)):
+            first = self.extract_column_name(condition.childs[0])
+            second = self.extract_column_name(condition.childs[1])
+            first_side = self._join_column_side(condition.childs[0], sides)
+            second_side = self._join_column_side(condition.childs[1], sides)
             
-            if not common_cols:
-                logger.info(f"[JOIN] No common columns found, performing cartesian product")
-                for left_row in left_data:
-                    for right_row in right_data:
-                        merged_row = {**left_row, **right_row}
-                        result.append(merged_row)
-            else:
-                logger.info(f"[JOIN] Common columns: {common_cols}")
+            if first_side == "left" and second_side == "right":
+                return [first], [second], True
+            if first_side == "right" and second_side == "left":
+                return [second], [first], True
+        
+        return [], [], False
+    
+    def _iter_nested_loop_join(self, join_type: str, left_rows, right_rows, query_tree: QueryTree):
+        """
+        Nested loop join algorithm (O(n*m) complexity)
+        Not a streaming operator: the whole right input is materialized in memory
+        (no spilling) before the first row, then left rows are streamed through it.
+        """
+        right_data = list(right_rows)
+        left_first, left_rows = self._peek(left_rows)
+        if not right_data or left_first is None:
+            logger.info(f"[JOIN] Input empty, returning empty result")
+            self._close_stream(left_rows)
+            return
+        
+        produced = 0
+        try:
+            if join_type == "NATURAL":
+                logger.info(f"[JOIN] NATURAL JOIN - finding common columns...")
+                
+                common_cols = set(left_first.keys()) & set(right_data[0].keys())
+                if not common_cols:
+                    logger.info(f"[JOIN] No common columns found, performing cartesian product")
+                else:
+                    logger.info(f"[JOIN] Common columns: {common_cols}")
                 
-                for left_row in left_data:
+                for left_row in left_rows:
                     for right_row in right_data:
                         match = all(
-                            left_row.get(col) == right_row.get(col) 
+                            left_row.get(col) == right_row.get(col)
                             for col in common_cols
                         )
                         
                         if match:
-                            merged_row = {**left_row, **right_row}
-                            result.append(merged_row)
-            
-            logger.info(f"[JOIN] NATURAL JOIN produced {len(result)} rows (nested loop)")
-            return result
+                            produced += 1
+                            yield {**left_row, **right_row}
+                
+                logger.info(f"[JOIN] NATURAL JOIN produced {produced} rows (nested loop)")
             
-        elif join_type == "INNER":
-            if len(query_tree.childs) < 3:
-                raise ValueError("INNER JOIN requires join condition")
+            elif join_type == "INNER":
+                if len(query_tree.childs) < 3:
+                    raise ValueError("INNER JOIN requires join condition")
+                
+                condition = query_tree.childs[2]
+                condition_str = self.condition_tree_to_string(condition)
+                logger.info(f"[JOIN] INNER JOIN ON {condition_str}")
+                
+                sides = self._join_sides(query_tree, set(left_first.keys()), set(right_data[0].keys()))
+                left_keys, right_keys, _ = self._extract_equi_join_keys(condition, sides)
+                key_pairs = list(zip(left_keys, right_keys))
+                matches = self.compile_condition(condition)
+                
+                for left_row in left_rows:
+                    for right_row in right_data:
+                        # Equi-join keys compare the side they are qualified with (both sides may share a column name)
+                        if not all(left_row.get(l) == right_row.get(r) for l, r in key_pairs):
+                            continue
+                        merged_row = {**left_row, **right_row}
+                        
+                        if matches(merged_row):
+                            produced += 1
+                            yield merged_row
+                
+                logger.info(f"[JOIN] INNER JOIN produced {produced} rows (nested loop)")
             
-            condition = query_tree.childs[2]
-            condition_str = self.condition_tree_to_string(condition)
-            logger.info(f"[JOIN] INNER JOIN ON {condition_str}")
+            elif join_type == "CROSS":
+                logger.info(f"[JOIN] CROSS JOIN - cartesian product")
+                
+                for left_row in left_rows:
+                    for right_row in right_data:
+                        produced += 1
+                        yield {**left_row, **right_row}
+                
+                logger.info(f"[JOIN] CROSS JOIN produced {produced} rows (nested loop)")
+        finally:
+            self._close_stream(left_rows)
+    
+    def iterate_batches(self, query_tree: QueryTree, transaction_id: int = None) -> Iterator[ColumnBatch]:
+        """
+        Open a vectorized stream of ColumnBatch objects for a query node.
+        Nodes without a batch operator run row-at-a-time and are cut into batches.
+        """
+        node_type = query_tree.type
+        
+        if node_type == "PROJECT":
+            return self._batch_project(query_tree, transaction_id)
+        elif node_type == "FILTER":
+            return self._batch_filter(query_tree, transaction_id)
+        elif node_type == "LIMIT":
+            return self._batch_limit(query_tree, transaction_id)
+        elif node_type == "JOIN":
+            return self._batch_join(query_tree, transaction_id)
+        elif node_type == "RELATION":
+            return self._batch_relation(query_tree, transaction_id)
+        elif node_type == "ALIAS":
+            return self.iterate_batches(query_tree.childs[0], transaction_id)
+        
+        return batches_from_rows(self.iterate_node(query_tree, transaction_id), self.BATCH_SIZE)
+    
+    def _batch_relation(self, query_tree: QueryTree, transaction_id: int):
+        """
+        RELATION operator over column batches: blocks are decoded straight into column lists
+        """
+        table_name = query_tree.val
+        print(f"\n[RELATION] Accessing table '{table_name}' (vectorized)")
+        return self._batch_table(table_name, [], [], transaction_id, "RELATION")
+    
+    def _batch_project(self, query_tree: QueryTree, transaction_id: int):
+        """
+        PROJECT operator over column batches: keeps the selected column lists, rows are not copied
+        """
+        print(f"\n[PROJECT] Executing SELECT (vectorized)...")
+        
+        source = query_tree.childs[-1]
+        columns = []
+        if query_tree.val != "*":
+            columns = [self.output_column_name(expr) for expr in query_tree.childs[:-1]]
+        
+        # Simple source: projection pushed down to the storage batch cursor
+        table_name = self._base_relation(source)
+        if table_name is not None:
+            yield from self._batch_table(table_name, [], columns, transaction_id, "PROJECT")
+            return
+        
+        batches = self.iterate_batches(source, transaction_id)
+        try:
+            for batch in batches:
+                yield batch.project(columns) if columns else batch
+        finally:
+            self._close_stream(batches)
+    
+    def _batch_filter(self, query_tree: QueryTree, transaction_id: int):
+        """
+        FILTER operator over column batches: the condition narrows each batch's selection vector
+        """
+        print(f"\n[FILTER] Executing WHERE clause (vectorized)...")
+        
+        if len(query_tree.childs) != 2:
+            raise ValueError(f"FILTER must have exactly 2 children (source + condition)")
+        
+        source = query_tree.childs[0]
+        condition_tree = query_tree.childs[1]
+        
+        pushdown = self._filter_pushdown_conditions(source, condition_tree)
+        if pushdown is not None:
+            table_name, conditions = pushdown
+            yield from self._batch_table(table_name, conditions, [], transaction_id, "FILTER", condition_tree)
+            return
+        
+        batches = self.iterate_batches(source, transaction_id)
+        try:
+            for batch in batches:
+                batch = self.batch_evaluator.filter(condition_tree, batch)
+                if len(batch):
+                    yield batch
+        finally:
+            self._close_stream(batches)
+    
+    def _batch_limit(self, query_tree: QueryTree, transaction_id: int):
+        """
+        LIMIT operator over column batches: trims the last batch and closes its source
+        """
+        print(f"\n[LIMIT] Executing LIMIT (vectorized)...")
+        
+        remaining = int(query_tree.val)
+        if remaining <= 0:
+            return
+        
+        if query_tree.childs[0].type == "SORT":
+            yield from batches_from_rows(self._iter_top_n(query_tree.childs[0], remaining, transaction_id), self.BATCH_SIZE)
+            return
+        
+        batches = self.iterate_batches(query_tree.childs[0], transaction_id)
+        try:
+            for batch in batches:
+                if len(batch) >= remaining:
+                    yield batch.head(remaining)
+                    return
+                remaining -= len(batch)
+                yield batch
+        finally:
+            self._close_stream(batches)
+    
+    def _batch_join(self, query_tree: QueryTree, transaction_id: int):
+        """
+        JOIN operator over column batches. Hash equi-joins build a BatchHashTable
+        once and probe it one batch at a time; other join methods run row-at-a-time.
+        The build side is held in memory up to HASH_JOIN_MEMORY_ROWS rows; a larger
+        build side is streamed into the spilling row-at-a-time hash join instead.
+        """
+        join_type = query_tree.val
+        join_method = self._get_execution_method(query_tree)
+        if join_method not in ("hash", "hash_join") or join_type not in ("NATURAL", "INNER"):
+            yield from batches_from_rows(self._iter_join(query_tree, transaction_id), self.BATCH_SIZE)
+            return
+        
+        print(f"\n[JOIN] Executing {join_type} JOIN using method: {join_method} (vectorized)")
+        
+        left = query_tree.childs[0]
+        right = query_tree.childs[1]
+        build_side = self._hash_join_build_side(left, right)
+        build_node, probe_node = (right, left) if build_side == "right" else (left, right)
+        
+        # Hold build batches until the budget is exceeded, the rest stays in the stream
+        build_source = self.iterate_batches(build_node, transaction_id)
+        build_batches = []
+        build_size = 0
+        probe_source = None
+        try:
+            for batch in build_source:
+                if len(batch):
+                    build_batches.append(batch)
+                    build_size += len(batch)
+                    if build_size > self.HASH_JOIN_MEMORY_ROWS:
+                        break
+            probe_source = self.iterate_batches(probe_node, transaction_id)
+            first = next((batch for batch in probe_source if len(batch)), None)
+            if not build_size or first is None:
+                logger.info(f"[JOIN] Input empty, returning empty result")
+                return
+            probe_batches = chain([first], probe_source)
             
-            matched_count = 0
-            for left_row in left_data:
-                for right_row in right_data:
-                    merged_row = {**left_row, **right_row}
-                    
-                    if self.evaluate_condition(condition, merged_row):
-                        result.append(merged_row)
-                        matched_count += 1
+            probe_cols, build_cols = set(first.columns), set(build_batches[0].columns)
+            left_cols, right_cols = (probe_cols, build_cols) if build_side == "right" else (build_cols, probe_cols)
+            residual = None
+            if join_type == "NATURAL":
+                left_keys = right_keys = sorted(left_cols & right_cols)
+            else:
+                if len(query_tree.childs) < 3:
+                    raise ValueError("INNER JOIN requires join condition")
+                residual = query_tree.childs[2]
+                left_keys, right_keys, all_keys = self._extract_equi_join_keys(residual, self._join_sides(query_tree, left_cols, right_cols))
+                if all_keys:
+                    residual = None
             
-            logger.info(f"[JOIN] INNER JOIN produced {len(result)} rows (nested loop, checked {len(left_data) * len(right_data)} combinations)")
-            return result
-        
-        elif join_type == "CROSS":
-            logger.info(f"[JOIN] CROSS JOIN - cartesian product")
+            if not left_keys or build_size > self.HASH_JOIN_MEMORY_ROWS:
+                # No equality keys (nested loop) or a build side that has to spill: row-at-a-time join
+                build_rows = rows_from_batches(chain(build_batches, build_source))
+                probe_rows = rows_from_batches(probe_batches)
+                if build_side == "right":
+                    rows = self._iter_hash_join(join_type, probe_rows, build_rows, query_tree, build_side)
+                else:
+                    rows = self._iter_hash_join(join_type, build_rows, probe_rows, query_tree, build_side)
+                yield from batches_from_rows(rows, self.BATCH_SIZE)
+                return
             
-            for left_row in left_data:
-                for right_row in right_data:
-                    merged_row = {**left_row, **right_row}
-                    result.append(merged_row)
+            build = ColumnBatch.concat(build_batches)
+            build_keys, probe_keys = (right_keys, left_keys) if build_side == "right" else (left_keys, right_keys)
+            table = BatchHashTable(build, build_keys)
+            logger.info(f"[JOIN] {join_type} JOIN on keys {list(zip(left_keys, right_keys))}, building on {build_side} input ({len(build)} rows)")
             
-            logger.info(f"[JOIN] CROSS JOIN produced {len(result)} rows (nested loop)")
-            return result
-        
-        return []
-        
+            produced = 0
+            for batch in probe_batches:
+                joined = table.probe(batch, probe_keys, build_on_right=(build_side == "right"))
+                if residual is not None and len(joined):
+                    joined = self.batch_evaluator.filter(residual, joined)
+                if len(joined):
+                    produced += len(joined)
+                    yield joined
+            logger.info(f"[JOIN] {join_type} JOIN produced {produced} rows (vectorized hash join)")
+        finally:
+            self._close_stream(build_source)
+            if probe_source is not None:
+                self._close_stream(probe_source)
+    
     def execute_update(self, query_tree: QueryTree, transaction_id: int) -> None:
         """
         Execute UPDATE_QUERY node
@@ -591,16 +1439,12 @@ class QueryExecution:
             i += 1
         
         # Get WHERE condition if exists
-        conditions = []
+        conditions, matches = [], None
         if i < len(query_tree.childs) and query_tree.childs[i].type == "FILTER":
             filter_node = query_tree.childs[i]
             condition_str = self.condition_tree_to_string(filter_node.childs[1])
             logger.info(f"[UPDATE] WHERE condition: {condition_str}")
-            try:
-                conditions = self.condition_tree_to_conditions(filter_node.childs[1])
-            except ValueError as e:
-                logger.info(f"[UPDATE] Complex condition not supported for UPDATE: {e}")
-                return 0
+            conditions, matches = self._split_write_condition(filter_node)
         
         logger.info(f"[UPDATE] Using READ-MODIFY-WRITE pattern for expression support")
         logger.info(f"[UPDATE]    Table: '{table_name}'")
@@ -630,6 +1474,8 @@ class QueryExecution:
                 logger.info(f"[UPDATE]    After applying buffer: {len(matching_rows)} row(s)")
             else:
                 matching_rows = storage_rows
+            if matches is not None:
+                matching_rows = [row for row in matching_rows if matches(row)]
             
             logger.info(f"[UPDATE]    Found {len(matching_rows)} matching row(s)")
             
@@ -639,11 +1485,13 @@ class QueryExecution:
             
             # STEP 2: MODIFY
             logger.info(f"[UPDATE] STEP 2: Evaluating expressions per row...")
+            assignments = [(col_name, self.compile_value_expression(value_expr))
+                           for col_name, value_expr in assignment_exprs]
             rows_to_update = []
             for row in matching_rows:
                 updated_row = row.copy()
-                for col_name, value_expr in assignment_exprs:
-                    new_value = self.evaluate_value_expression(value_expr, row)
+                for col_name, value_of in assignments:
+                    new_value = value_of(row)
                     updated_row[col_name] = new_value
                     logger.info(f"[UPDATE]    Row {row.get('id', '?')}: {col_name} = {row.get(col_name)} → {new_value}")
                 rows_to_update.append(updated_row)
@@ -775,6 +1623,59 @@ class QueryExecution:
             logger.info(f"[INSERT] Error: {e}")
             return 0
     
+    def execute_copy(self, query_tree: QueryTree, transaction_id: int) -> int:
+        """
+        Execute COPY_QUERY node (bulk load from a CSV/JSONL file)
+        Structure: COPY_QUERY with children: [RELATION, LITERAL_STRING(path)]
+        
+        Rows are written straight to storage instead of the transaction buffer.
+        Each batch is logged as a write record and forced to disk as it is appended,
+        so no more than one batch is held in memory and the whole load is logged
+        before the rows become visible. The records carry the table's row count
+        before the load, and a checkpoint follows, so an abort truncates the table
+        back to that count.
+        """
+        print(f"\n[COPY] Executing COPY statement...")
+        
+        if len(query_tree.childs) != 2:
+            raise ValueError("COPY requires RELATION and file path")
+        
+        table_name = query_tree.childs[0].val
+        file_path = query_tree.childs[1].val
+        
+        logger.info(f"[COPY] -> STORAGE MANAGER: BULK LOAD '{table_name}' FROM '{file_path}'")
+        logger.info(f"[COPY]    Transaction ID: {transaction_id}")
+        
+        # Validate WRITE access with CCM
+        if self.ccm_adapter and transaction_id:
+            self._validate_with_retry(transaction_id, table_name, 'write')
+        
+        logged = bool(self.frm_adapter and transaction_id)
+        # Loaded rows are appended at the end: abort truncates back to these counts
+        row_counts = self.storage_adapter.count_rows_per_file(table_name) if logged else None
+        
+        def log_batch(rows):
+            self.frm_adapter.log_bulk_write(
+                transaction_id=transaction_id,
+                query=f"COPY {table_name} FROM '{file_path}'",
+                table_name=table_name,
+                rows=rows,
+                row_counts=row_counts
+            )
+        
+        rows_loaded = self.storage_adapter.bulk_load(
+            table_name,
+            file_path,
+            on_batch=log_batch if logged else None
+        )
+        
+        # Rows are already in storage: checkpoint so recovery treats the record as flushed
+        if logged:
+            self.frm_adapter.checkpoint()
+        
+        logger.info(f"[COPY] Loaded {rows_loaded} row(s) into '{table_name}'")
+        return rows_loaded
+    
     def execute_delete(self, query_tree: QueryTree, transaction_id: int) -> int:
         """
         Execute DELETE_QUERY node
@@ -788,16 +1689,12 @@ class QueryExecution:
         relation = query_tree.childs[0]
         table_name = relation.val
         
-        conditions = []
+        conditions, matches = [], None
         if len(query_tree.childs) > 1 and query_tree.childs[1].type == "FILTER":
             filter_node = query_tree.childs[1]
             condition_str = self.condition_tree_to_string(filter_node.childs[1])
             logger.info(f"[DELETE] WHERE condition: {condition_str}")
-            try:
-                conditions = self.condition_tree_to_conditions(filter_node.childs[1])
-            except ValueError as e:
-                logger.info(f"[DELETE] Complex condition not supported for DELETE: {e}")
-                return 0
+            conditions, matches = self._split_write_condition(filter_node)
         
         logger.info(f"[DELETE] -> STORAGE MANAGER: DELETE FROM '{table_name}'")
         if conditions:
@@ -818,6 +1715,8 @@ class QueryExecution:
                 conditions=conditions
             )
             old_rows = self.storage_manager.read_block(data_retrieval)
+            if matches is not None:
+                old_rows = [row for row in old_rows if matches(row)]
             
             # Log to FRM
             if self.frm_adapter and transaction_id:
@@ -830,23 +1729,33 @@ class QueryExecution:
                 )
             
             if transaction_id:
-                # Buffer deletions
+                # Buffer deletions (rows picked by an in-memory predicate are deleted by their values)
                 for row in old_rows:
                     self.transaction_buffer.buffer_delete(
                         transaction_id=transaction_id,
                         table_name=table_name,
                         row_data=row,
-                        conditions=conditions
+                        conditions=conditions if matches is None else self._row_conditions(row)
                     )
                 logger.info(f"[DELETE] Buffered {len(old_rows)} row(s) for deletion (will delete on COMMIT)")
                 return len(old_rows)
             else:
                 # No transaction - delete directly
-                rows_affected = self.storage_adapter.delete_data(
-                    table_name=table_name,
-                    conditions=conditions,
-                    transaction_id=transaction_id
-                )
+                if matches is None:
+                    rows_affected = self.storage_adapter.delete_data(
+                        table_name=table_name,
+                        conditions=conditions,
+                        transaction_id=transaction_id
+                    )
+                else:
+                    rows_affected = sum(
+                        self.storage_adapter.delete_data(
+                            table_name=table_name,
+                            conditions=self._row_conditions(row),
+                            transaction_id=transaction_id
+                        )
+                        for row in old_rows
+                    )
                 logger.info(f"[DELETE] Deleted {rows_affected} row(s) (no transaction)")
                 return rows_affected
         except Exception as e:
@@ -881,6 +1790,11 @@ class QueryExecution:
         if col_def_list.type != "COLUMN_DEF_LIST":
             raise ValueError(f"Expected COLUMN_DEF_LIST, got {col_def_list.type}")
         
+        engine = "disk"
+        for option in query_tree.childs[2:]:
+            if option.type == "TABLE_ENGINE":
+                engine = option.val.lower()
+        
         logger.info(f"[CREATE TABLE] Table name: '{table_name}'")
         logger.info(f"[CREATE TABLE] Columns: {len(col_def_list.childs)}")
         
@@ -966,12 +1880,16 @@ class QueryExecution:
             logger.info(f"[CREATE TABLE]    Foreign keys: {len(foreign_keys)}")
         logger.info(f"[CREATE TABLE]    Transaction ID: {transaction_id}")
         
+        if engine != "disk":
+            logger.info(f"[CREATE TABLE]    Engine: {engine.upper()}")
+        
         try:
             self.storage_adapter.create_table(
                 table_name=table_name,
                 columns=columns,
                 primary_keys=primary_keys if primary_keys else None,
-                foreign_keys=foreign_keys if foreign_keys else None
+                foreign_keys=foreign_keys if foreign_keys else None,
+                engine=engine
             )
             logger.info(f"[CREATE TABLE] ✓ Table '{table_name}' created successfully")
             return None
@@ -1010,6 +1928,30 @@ class QueryExecution:
             logger.info(f"[DROP TABLE] Error: {e}")
             raise
         
+    def execute_cluster_table(self, query_tree: QueryTree, transaction_id: int) -> None:
+        """
+        Execute CLUSTER_TABLE node
+        Structure: CLUSTER_TABLE with children: [IDENTIFIER(table), IDENTIFIER(column)?]
+        """
+        print(f"\n[CLUSTER] Executing CLUSTER statement...")
+        
+        if len(query_tree.childs) < 1:
+            raise ValueError("CLUSTER requires table name")
+        
+        table_name = query_tree.childs[0].val
+        column_name = query_tree.childs[1].val if len(query_tree.childs) > 1 else None
+        
+        logger.info(f"[CLUSTER] -> STORAGE MANAGER: Cluster '{table_name}' using '{column_name}'")
+        logger.info(f"[CLUSTER]    Transaction ID: {transaction_id}")
+        
+        # The table file is rewritten, so hold the table like a write
+        if self.ccm_adapter and transaction_id:
+            self._validate_with_retry(transaction_id, table_name, 'write')
+        
+        result = self.storage_adapter.cluster_table(table_name, column_name)
+        logger.info(f"[CLUSTER] ✓ Table '{table_name}' clustered on '{result['column']}'")
+        return None
+        
     def extract_column_name(self, col_ref: QueryTree) -> str:
         if col_ref.type != "COLUMN_REF":
             raise ValueError(f"Expected COLUMN_REF, got {col_ref.type}")
@@ -1021,6 +1963,12 @@ class QueryExecution:
         identifier = column_name_node.childs[0]  # IDENTIFIER
         return identifier.val
     
+    def output_column_name(self, expr: QueryTree) -> str:
+        # Aggregate results are columns named after the call, e.g. "SUM(salary)"
+        if expr.type == "FUNCTION_CALL":
+            return self.value_expr_to_string(expr)
+        return self.extract_column_name(expr)
+    
     def extract_identifier(self, node: QueryTree) -> str:
         if node.type == "IDENTIFIER":
             return node.val
@@ -1042,154 +1990,186 @@ class QueryExecution:
             return None
         return node.val
 
-    # Evaluate value expression tree against a single row    
+    def compile_condition(self, condition: QueryTree):
+        """Compile a condition tree once into predicate(row) -> bool."""
+        return self.expression_compiler.compile_condition(condition)
+    
+    def compile_value_expression(self, expr: QueryTree):
+        """Compile a value expression tree once into value(row)."""
+        return self.expression_compiler.compile_value(expr)
+    
+    # Evaluate value expression tree against a single row
+    # Operators evaluating many rows compile the expression once with compile_value_expression
     def evaluate_value_expression(self, expr: QueryTree, row: dict):
-        if expr.type.startswith("LITERAL_"):
-            return self.extract_literal_value(expr)
-        elif expr.type == "COLUMN_REF":
-            col_name = self.extract_column_name(expr)
-            return row.get(col_name)
-        elif expr.type == "ARITH_EXPR":
-            operator = expr.val
-            left = self.evaluate_value_expression(expr.childs[0], row)
-            right = self.evaluate_value_expression(expr.childs[1], row)
-            
-            if operator == "+":
-                return left + right
-            elif operator == "-":
-                return left - right
-            elif operator == "*":
-                return left * right
-            elif operator == "/":
-                return left / right if right != 0 else None
-            elif operator == "%":
-                return left % right if right != 0 else None
-        
-        return None
+        return self.compile_value_expression(expr)(row)
     
-    def evaluate_condition(self, condition: QueryTree, row: dict) -> bool:
-        if condition.type == "COMPARISON":
-            operator = condition.val
-            left_val = self.evaluate_value_expression(condition.childs[0], row)
-            right_val = self.evaluate_value_expression(condition.childs[1], row)
-            
-            if operator == "=":
-                return left_val == right_val
-            elif operator in ["<>", "!="]:
-                return left_val != right_val
-            elif operator == ">":
-                return left_val > right_val
-            elif operator == ">=":
-                return left_val >= right_val
-            elif operator == "<":
-                return left_val < right_val
-            elif operator == "<=":
-                return left_val <= right_val
-        
-        elif condition.type == "OPERATOR":
-            operator = condition.val
-            
-            if operator == "AND":
-                return all(self.evaluate_condition(child, row) for child in condition.childs)
-            elif operator == "OR":
-                return any(self.evaluate_condition(child, row) for child in condition.childs)
-            elif operator == "NOT":
-                return not self.evaluate_condition(condition.childs[0], row)
-        
-        elif condition.type == "IS_NULL_EXPR":
-            col_ref = condition.childs[0]
-            col_name = self.extract_column_name(col_ref)
-            return row.get(col_name) is None
-        
-        elif condition.type == "IS_NOT_NULL_EXPR":
-            col_ref = condition.childs[0]
-            col_name = self.extract_column_name(col_ref)
-            return row.get(col_name) is not None
-        
-        elif condition.type == "IN_EXPR":
-            # IN_EXPR has 2 children: [COLUMN_REF, LIST or subquery]
-            col_ref = condition.childs[0]
-            col_name = self.extract_column_name(col_ref)
-            col_value = row.get(col_name)
-            
-            list_or_subquery = condition.childs[1]
-            
-            if list_or_subquery.type == "LIST":
-                # IN with literal list: id IN (1, 2, 3)
-                values = [self.extract_literal_value(child) for child in list_or_subquery.childs]
-                return col_value in values
-            else:
-                # IN with subquery: id IN (SELECT ...)
-                # Execute subquery and check if col_value is in results
-                subquery_results = self.execute_node(list_or_subquery, None)
-                if not subquery_results:
-                    return False
-                
-                # Extract values from first column of subquery results
-                first_col = list(subquery_results[0].keys())[0] if subquery_results[0] else None
-                if first_col:
-                    subquery_values = [r[first_col] for r in subquery_results]
-                    return col_value in subquery_values
-                return False
+    def _subquery_probe(self, subquery: QueryTree, kind: str) -> tuple[Callable, SemiJoinTable]:
+        """
+        Hash table of an IN / EXISTS subquery, built once per statement and cached.
+        Uncorrelated subqueries are executed as they are. Correlated ones are decorrelated:
+        the subquery runs once without its inner_expr = outer_column conjuncts and its rows
+        are hashed on inner_expr, so each outer row becomes one semi-/anti-join probe.
         
-        elif condition.type == "NOT_IN_EXPR":
-            # NOT IN - inverse of IN_EXPR
-            col_ref = condition.childs[0]
-            col_name = self.extract_column_name(col_ref)
-            col_value = row.get(col_name)
-            
-            list_or_subquery = condition.childs[1]
-            
-            if list_or_subquery.type == "LIST":
-                values = [self.extract_literal_value(child) for child in list_or_subquery.childs]
-                return col_value not in values
+        Returns:
+            (compiled outer key: outer row -> key tuple, SemiJoinTable)
+        """
+        cached = self.subquery_cache.get(id(subquery))
+        if cached is not None:
+            return cached[1], cached[2]
+        
+        plan = self._plan_subquery(subquery)
+        table = SemiJoinTable()
+        if plan is None:
+            # Uncorrelated: EXISTS only needs one row, IN takes the first column
+            if kind == "EXISTS":
+                rows = self.iterate_node(subquery.childs[-1] if subquery.type == "PROJECT" else subquery, None)
+                try:
+                    if next(rows, None) is not None:
+                        table.add(())
+                finally:
+                    self._close_stream(rows)
             else:
-                # NOT IN with subquery
-                subquery_results = self.execute_node(list_or_subquery, None)
-                if not subquery_results:
-                    return True  # NOT IN empty set is true
-                
-                first_col = list(subquery_results[0].keys())[0] if subquery_results[0] else None
-                if first_col:
-                    subquery_values = [r[first_col] for r in subquery_results]
-                    return col_value not in subquery_values
-                return True
-        
-        elif condition.type == "EXISTS_EXPR":
-            # EXISTS checks if subquery returns any rows
-            # EXISTS_EXPR has 1 child: subquery
-            subquery = condition.childs[0]
-            subquery_results = self.execute_node(subquery, None)
-            return len(subquery_results) > 0
-        
-        elif condition.type == "NOT_EXISTS_EXPR":
-            # NOT EXISTS checks if subquery returns no rows
-            subquery = condition.childs[0]
-            subquery_results = self.execute_node(subquery, None)
-            return len(subquery_results) == 0
-        
-        elif condition.type == "BETWEEN_EXPR":
-            # BETWEEN_EXPR has 3 children: [COLUMN_REF, lower_bound, upper_bound]
-            col_ref = condition.childs[0]
-            col_name = self.extract_column_name(col_ref)
-            col_value = row.get(col_name)
-            
-            lower_bound = self.evaluate_value_expression(condition.childs[1], row)
-            upper_bound = self.evaluate_value_expression(condition.childs[2], row)
-            
-            return lower_bound <= col_value <= upper_bound
+                for row in self.iterate_node(subquery, None):
+                    table.add((), next(iter(row.values()), None))
+            outer_key = self.expression_compiler.compile_key([])
+        else:
+            inner_key = self.expression_compiler.compile_key(plan["inner_keys"])
+            outer_key = self.expression_compiler.compile_key(plan["outer_keys"])
+            value_of = None
+            if plan["value"] is not None:
+                value_of = self.compile_value_expression(plan["value"])
+            for row in self._iter_subquery_source(plan["source"], plan["conjuncts"]):
+                if kind == "EXISTS":
+                    table.add(inner_key(row))
+                elif value_of is None:
+                    table.add(inner_key(row), next(iter(row.values()), None))
+                else:
+                    table.add(inner_key(row), value_of(row))
         
-        elif condition.type == "NOT_BETWEEN_EXPR":
-            col_ref = condition.childs[0]
-            col_name = self.extract_column_name(col_ref)
-            col_value = row.get(col_name)
-            
-            lower_bound = self.evaluate_value_expression(condition.childs[1], row)
-            upper_bound = self.evaluate_value_expression(condition.childs[2], row)
-            
-            return not (lower_bound <= col_value <= upper_bound)
+        logger.info(f"[SUBQUERY] {kind} subquery executed once: {table.rows} rows, "
+                    f"{len(table.groups)} keys{' (decorrelated)' if plan is not None else ''}")
+        self.subquery_cache[id(subquery)] = (subquery, outer_key, table)
+        return outer_key, table
+    
+    def _plan_subquery(self, subquery: QueryTree) -> dict | None:
+        """
+        Split a correlated subquery PROJECT -> FILTER* -> source into its source, the conjuncts
+        that only read the subquery's own tables and the correlation keys.
+        Returns None for an uncorrelated subquery.
+        Raises ValueError when an outer column is used other than in inner_expr = outer_column.
+        """
+        if subquery.type != "PROJECT":
+            return None
+        node = subquery.childs[-1]
+        conjuncts = []
+        while node.type == "FILTER" and len(node.childs) == 2:
+            conjuncts.extend(self._conjuncts(node.childs[1]))
+            node = node.childs[0]
+        source = node
+        names, columns = self._subquery_scope(source)
+        
+        def outer_refs(expr):
+            return self._outer_column_refs(expr, names, columns)
+        
+        if outer_refs(source) or any(outer_refs(col) for col in subquery.childs[:-1]):
+            raise ValueError("Correlated subquery can only reference outer columns in its WHERE clause")
+        correlated = [c for c in conjuncts if outer_refs(c)]
+        if not correlated:
+            return None
         
-        return True
+        inner_keys, outer_keys = [], []
+        for conjunct in correlated:
+            if conjunct.type != "COMPARISON" or conjunct.val != "=":
+                raise ValueError(f"Correlated subquery condition '{self.condition_tree_to_string(conjunct)}' must be an equality")
+            first, second = conjunct.childs
+            if first.type == "COLUMN_REF" and outer_refs(first) and not outer_refs(second):
+                first, second = second, first
+            if not (second.type == "COLUMN_REF" and outer_refs(second) and not outer_refs(first)):
+                raise ValueError(f"Correlated subquery condition '{self.condition_tree_to_string(conjunct)}' must compare a subquery expression with an outer column")
+            inner_keys.append(first)
+            outer_keys.append(second)
+        
+        value = None
+        if subquery.val != "*" and len(subquery.childs) > 1:
+            value = subquery.childs[0]
+        return {
+            "source": source,
+            "conjuncts": [c for c in conjuncts if c not in correlated],
+            "inner_keys": inner_keys,
+            "outer_keys": outer_keys,
+            "value": value,
+        }
+    
+    def _conjuncts(self, condition: QueryTree) -> list:
+        if condition.type == "OPERATOR" and condition.val == "AND":
+            return [part for child in condition.childs for part in self._conjuncts(child)]
+        return [condition]
+    
+    def _subquery_scope(self, source: QueryTree) -> tuple[set, set]:
+        # Table names / aliases and columns visible inside a subquery's FROM
+        names, columns = set(), set()
+        
+        def visit(node):
+            if node.type == "ALIAS" and node.childs:
+                # An aliased table is only visible through its alias
+                names.add(node.val)
+                if node.childs[0].type == "RELATION":
+                    add_columns(node.childs[0].val)
+                else:
+                    visit(node.childs[0])
+            elif node.type == "RELATION":
+                names.add(node.val)
+                add_columns(node.val)
+            elif node.type in ("FILTER", "JOIN"):
+                # Skip conditions
+                for child in node.childs[:1 if node.type == "FILTER" else 2]:
+                    visit(child)
+            elif node.childs:
+                visit(node.childs[-1])
+        
+        def add_columns(table_name):
+            if table_name in self.storage_manager.tables:
+                columns.update(col["name"] for col in self.storage_manager.tables[table_name]["columns"])
+        
+        visit(source)
+        return names, columns
+    
+    def _outer_column_refs(self, node: QueryTree, names: set, columns: set) -> list:
+        # Column references that the subquery's own tables cannot resolve
+        if node.type == "COLUMN_REF":
+            qualifier = self._column_qualifier(node)
+            if qualifier is not None:
+                return [] if qualifier in names else [node]
+            return [] if self.extract_column_name(node) in columns else [node]
+        if node.type == "PROJECT":
+            # Nested subquery: resolved when it is evaluated
+            return []
+        return [ref for child in node.childs for ref in self._outer_column_refs(child, names, columns)]
+    
+    def _iter_subquery_source(self, source: QueryTree, conjuncts: list):
+        # Rows of a decorrelated subquery: its uncorrelated conjuncts are pushed down when possible
+        table_name = self._base_relation(source)
+        rows = None
+        if table_name is not None:
+            try:
+                conditions = [c for conjunct in conjuncts for c in self.condition_tree_to_conditions(conjunct)]
+                rows = self._iter_table(table_name, conditions, [], None, "SUBQUERY")
+            except ValueError:
+                rows = None
+        if rows is None:
+            rows = self.iterate_node(source, None)
+        checks = [self.compile_condition(conjunct) for conjunct in conjuncts]
+        try:
+            for row in rows:
+                if all(check(row) for check in checks):
+                    yield row
+        finally:
+            self._close_stream(rows)
+    
+    # Evaluate condition tree against a single row
+    # Operators evaluating many rows compile the condition once with compile_condition
+    def evaluate_condition(self, condition: QueryTree, row: dict) -> bool:
+        return self.compile_condition(condition)(row)
     
     # FOR DEBUGGING
     def condition_tree_to_string(self, condition: QueryTree) -> str:
@@ -1261,8 +2241,43 @@ class QueryExecution:
             left = self.value_expr_to_string(expr.childs[0])
             right = self.value_expr_to_string(expr.childs[1])
             return f"({left} {expr.val} {right})"
+        elif expr.type == "FUNCTION_CALL":
+            args = ", ".join(self.value_expr_to_string(arg) for arg in expr.childs)
+            return f"{expr.val}({args or '*'})"
         return "<expr>"
         
+    def _split_write_condition(self, filter_node: QueryTree) -> tuple[list[Condition], Callable | None]:
+        """
+        Split an UPDATE / DELETE WHERE clause into the conjuncts pushed down to storage
+        and a compiled predicate for the rest (OR, NOT, BETWEEN, IN / EXISTS subqueries,
+        probed through the statement's subquery cache).
+        
+        The optimizer may cascade the WHERE clause into nested FILTER nodes, so the
+        conjuncts of every FILTER down to the relation are collected.
+        
+        Returns:
+            (storage conditions, predicate over the rows they return or None)
+        """
+        conjuncts = []
+        while filter_node.type == "FILTER":
+            conjuncts.extend(self._conjuncts(filter_node.childs[1]))
+            filter_node = filter_node.childs[0]
+        
+        conditions, residual = [], []
+        for conjunct in conjuncts:
+            try:
+                conditions.extend(self.condition_tree_to_conditions(conjunct))
+            except ValueError:
+                residual.append(conjunct)
+        if not residual:
+            return conditions, None
+        checks = [self.compile_condition(conjunct) for conjunct in residual]
+        return conditions, lambda row: all(check(row) for check in checks)
+    
+    def _row_conditions(self, row: dict) -> list[Condition]:
+        # Conditions matching exactly this row's values
+        return [Condition(column=col, operation="=", operand=value) for col, value in row.items()]
+    
     def condition_tree_to_conditions(self, condition: QueryTree) -> list[Condition]:
         conditions = []
         
@@ -1337,34 +2352,49 @@ class QueryExecution:
         if not transaction_id:
             return storage_data
         
-        # Start with storage data (committed baseline)
-        result = list(storage_data)  # Copy to avoid modifying original
-        
-        # Get all buffered operations for this transaction
-        ops = self.transaction_buffer.get_buffered_operations(transaction_id)
+        return list(self._iter_buffered_operations(storage_data, transaction_id, table_name))
+    
+    def _iter_buffered_operations(self, storage_rows, transaction_id: int, table_name: str):
+        """
+        Lazily overlay this transaction's buffered operations on a row stream.
+        Each operation only looks at one row, so applying them in order per row
+        gives the same result as applying them to the whole list.
+        """
+        ops = []
+        if transaction_id:
+            ops = [
+                op for op in self.transaction_buffer.get_buffered_operations(transaction_id)
+                if op.table_name == table_name
+            ]
         
-        for op in ops:
-            if op.table_name != table_name:
-                continue
-            
+        try:
+            # Storage data (committed baseline) with UPDATEs/DELETEs applied
+            for row in storage_rows:
+                current = self._apply_row_operations(row, ops)
+                if current is not None:
+                    yield current
+        finally:
+            if hasattr(storage_rows, 'close'):
+                storage_rows.close()
+        
+        # Rows from buffered INSERTs, with the operations buffered after them
+        for i, op in enumerate(ops):
             if op.operation_type == "INSERT":
-                # Add new rows from buffered INSERTs
-                result.append(op.data.copy())
-            
-            elif op.operation_type == "UPDATE":
-                # Replace matching rows with updated data
-                for i, row in enumerate(result):
-                    if self._row_matches_data(row, op.old_data):
-                        result[i] = op.data.copy()
-            
+                current = self._apply_row_operations(op.data.copy(), ops[i + 1:])
+                if current is not None:
+                    yield current
+    
+    def _apply_row_operations(self, row: dict, ops: list) -> dict | None:
+        # Returns the row after buffered UPDATEs, or None if a buffered DELETE removed it
+        current = row
+        for op in ops:
+            if op.operation_type == "UPDATE":
+                if self._row_matches_data(current, op.old_data):
+                    current = op.data.copy()
             elif op.operation_type == "DELETE":
-                # Remove matching rows from buffered DELETEs
-                result = [
-                    row for row in result 
-                    if not self._row_matches_data(row, op.data)
-                ]
-        
-        return result
+                if self._row_matches_data(current, op.data):
+                    return None
+        return current
     
     def _row_matches_data(self, row: dict, target_data: dict) -> bool:
         if not target_data:
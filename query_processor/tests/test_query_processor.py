@@ -11,6 +11,7 @@ This test suite covers all major SQL operations through the query processor:
 7. LIMIT - result limiting
 8. ALIAS - table and column aliases
 9. ORDER BY - ascending and descending
+10. GROUP BY / HAVING - COUNT, SUM, AVG, MIN, MAX
 
 Test Database Schema:
 - departments (dept_id PK, dept_name, budget)
@@ -28,6 +29,7 @@ import sys
 import os
 import shutil
 import logging
+from unittest.mock import patch
 
 # Configure logging to reduce noise during tests
 logging.basicConfig(level=logging.CRITICAL)
@@ -37,6 +39,12 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../.
 
 from query_processor.query_processor import QueryProcessor
 from storage_manager.storage_manager import StorageManager
+from query_processor.hash_aggregate import HashAggregate
+from query_processor.hash_join import HashJoin
+from query_processor.merge_join import MergeJoin
+from query_processor.vectorized import ColumnBatch
+from query_optimizer.query_tree import QueryTree
+from storage_manager.btree_index import BPlusTreeIndex
 
 
 class TestQueryProcessor(unittest.TestCase):
@@ -190,6 +198,32 @@ class TestCreateTable(TestQueryProcessor):
         self.assertIn('employees', self.storage_manager.tables)
         self.assertIn('projects', self.storage_manager.tables)
         self.assertIn('tasks', self.storage_manager.tables)
+    
+    def test_04_create_memory_table(self):
+        """Test an ENGINE=MEMORY table through the regular query path."""
+        result = self.execute_query("""
+        CREATE TABLE currencies (
+            code VARCHAR(3) PRIMARY KEY,
+            rate FLOAT
+        ) ENGINE=MEMORY
+        """)
+        self.assertQuerySuccess(result)
+        self.assertIn('currencies', self.storage_manager.memory_tables)
+        
+        for code, rate in [('IDR', 0.5), ('USD', 1.0)]:
+            result = self.execute_query(f"INSERT INTO currencies (code, rate) VALUES ('{code}', {rate})")
+            self.assertQuerySuccess(result)
+        result = self.execute_query("SELECT rate FROM currencies WHERE code = 'USD'")
+        self.assertQuerySuccess(result)
+        self.assertEqual([r['rate'] for r in result.data.rows], [1.0])
+        self.assertEqual(self.storage_manager.last_access_plan["method"], "memory_scan")
+        
+        # the commit checkpoint snapshots the table, so a fresh storage manager sees the rows
+        self.assertEqual(self.storage_manager.memory_tables['currencies'].dirty_rows, 0)
+        StorageManager._instance = None
+        StorageManager._initialized = False
+        restarted = StorageManager(data_dir=self.test_data_dir)
+        self.assertEqual(len(restarted.memory_tables['currencies']), 2)
 
 
 class TestInsertInto(TestQueryProcessor):
@@ -323,6 +357,26 @@ class TestInsertInto(TestQueryProcessor):
         
         result = self.execute_query("SELECT * FROM employees")
         self.assertEqual(len(result.data.rows), 5)
+    
+    def test_05_autocommit_inserts_batch_index_saves(self):
+        """Test auto-commit INSERTs into an indexed table without re-saving the index per statement."""
+        self.execute_query("CREATE TABLE items (item_id INTEGER PRIMARY KEY, name VARCHAR(20))")
+        self.storage_manager.set_index("items", "item_id", "btree")
+        
+        saves = []
+        save = BPlusTreeIndex.save
+        with patch.object(BPlusTreeIndex, "save", lambda index, path: saves.append(path) or save(index, path)):
+            for item_id in range(10):
+                result = self.execute_query(f"INSERT INTO items (item_id, name) VALUES ({item_id}, 'item{item_id}')")
+                self.assertQuerySuccess(result)
+        self.assertLess(len(saves), 10)
+        
+        # the commits only synced the change log, so a fresh storage manager replays the buffered entries
+        StorageManager._instance = None
+        StorageManager._initialized = False
+        restarted = StorageManager(data_dir=self.test_data_dir)
+        self.assertEqual(len(restarted.indexes[("items", "item_id")].pending), 10)
+        self.assertEqual(restarted.indexes[("items", "item_id")].search(7), [7])
 
 
 class TestSelect(TestQueryProcessor):
@@ -529,6 +583,23 @@ class TestSelect(TestQueryProcessor):
         self.assertQuerySuccess(result)
         for row in result.data.rows:
             self.assertNotEqual(row['dept_id'], 1)
+    
+    def test_13_storage_error_mid_scan_fails_query(self):
+        """Test a storage error part-way through a scan aborts the query instead of truncating its result."""
+        self._setup_test_data()
+        open_cursor = self.storage_manager.open_cursor
+        
+        def failing_cursor(data_retrieval, limit=None):
+            rows = open_cursor(data_retrieval, limit)
+            yield next(rows)
+            raise OSError("simulated read failure")
+        
+        self.storage_manager.open_cursor = failing_cursor
+        try:
+            result = self.execute_query("SELECT emp_name FROM employees WHERE salary > 0")
+        finally:
+            del self.storage_manager.open_cursor
+        self.assertQueryFails(result)
 
 
 class TestJoin(TestQueryProcessor):
@@ -685,6 +756,174 @@ class TestJoin(TestQueryProcessor):
             self.assertEqual(row['emp_name'], 'Bob')
             # But paired with different departments
             self.assertIn(row['dept_name'], ['Engineering', 'Sales', 'HR'])
+    
+    def _execute_join_with_method(self, query_tree, method: str):
+        """Execute query tree with every JOIN node forced to the given method."""
+        def set_method(node):
+            if node.type == "JOIN":
+                node.method = method
+            for child in node.childs:
+                set_method(child)
+        
+        set_method(query_tree)
+        return self.query_processor.query_execution_engine.execute_node(query_tree, None)
+    
+    def _sorted_rows(self, rows):
+        return sorted(rows, key=lambda row: sorted(row.items()))
+    
+    def test_08_hash_join_matches_nested_loop(self):
+        """Test hash join returns the same rows as nested loop for INNER and NATURAL joins."""
+        self._setup_join_data()
+        queries = [
+            "SELECT * FROM employees JOIN departments ON employees.dept_id = departments.dept_id",
+            "SELECT * FROM employees NATURAL JOIN departments",
+            "SELECT * FROM employees JOIN departments ON employees.dept_id = departments.dept_id AND employees.salary > 55000",
+            "SELECT * FROM employees JOIN departments ON employees.salary > departments.budget",
+        ]
+        for query in queries:
+            # Same tree for both runs, the optimizer may order join inputs differently per parse
+            query_tree = self.query_processor._get_query_tree(query).query_tree
+            nested = self._execute_join_with_method(query_tree, "nested_loop")
+            hashed = self._execute_join_with_method(query_tree, "hash")
+            self.assertEqual(self._sorted_rows(hashed), self._sorted_rows(nested), query)
+        
+        query_tree = self.query_processor._get_query_tree(queries[2]).query_tree
+        rows = self._execute_join_with_method(query_tree, "hash")
+        self.assertEqual({row['emp_name'] for row in rows}, {'Alice', 'Bob'})
+    
+    def test_09_hash_join_multi_column_key_and_spill(self):
+        """Test hash join on a two-column key, spilling partitions when the build side exceeds the budget."""
+        self.execute_query("CREATE TABLE shipments (region INTEGER, item INTEGER, qty INTEGER)")
+        self.execute_query("CREATE TABLE prices (region INTEGER, item INTEGER, price INTEGER)")
+        for i in range(24):
+            self.execute_query(f"INSERT INTO shipments (region, item, qty) VALUES ({i % 3}, {i % 4}, {i})")
+        for i in range(12):
+            self.execute_query(f"INSERT INTO prices (region, item, price) VALUES ({i % 3}, {i % 4}, {i * 10})")
+        
+        query_tree = self.query_processor._get_query_tree("SELECT * FROM shipments NATURAL JOIN prices").query_tree
+        expected = self._execute_join_with_method(query_tree, "nested_loop")
+        self.assertEqual(len(expected), 24)
+        
+        engine = self.query_processor.query_execution_engine
+        engine.HASH_JOIN_MEMORY_ROWS = 4
+        try:
+            rows = self._execute_join_with_method(query_tree, "hash")
+        finally:
+            del engine.HASH_JOIN_MEMORY_ROWS
+        self.assertEqual(self._sorted_rows(rows), self._sorted_rows(expected))
+        for row in rows:
+            self.assertEqual(row['price'], (row['qty'] % 12) * 10)
+    
+    def test_10_merge_join_matches_nested_loop(self):
+        """Test merge join for equi and range joins returns the same rows as nested loop."""
+        self._setup_join_data()
+        queries = [
+            "SELECT * FROM employees JOIN departments ON employees.dept_id = departments.dept_id",
+            "SELECT * FROM employees NATURAL JOIN departments",
+            "SELECT * FROM employees JOIN departments ON employees.salary > departments.budget",
+            "SELECT * FROM employees JOIN departments ON departments.budget >= employees.salary",
+            "SELECT * FROM employees JOIN departments ON employees.salary < departments.budget AND employees.emp_id <= 2",
+        ]
+        for query in queries:
+            query_tree = self.query_processor._get_query_tree(query).query_tree
+            nested = self._execute_join_with_method(query_tree, "nested_loop")
+            merged = self._execute_join_with_method(query_tree, "merge")
+            self.assertEqual(self._sorted_rows(merged), self._sorted_rows(nested), query)
+    
+    def test_11_merge_join_duplicate_keys_with_external_sort(self):
+        """Test merge join on duplicate key groups from both sides, spilling sort runs to disk."""
+        self.execute_query("CREATE TABLE orders (order_id INTEGER, cust INTEGER)")
+        self.execute_query("CREATE TABLE visits (visit_id INTEGER, cust INTEGER)")
+        for i in range(20):
+            self.execute_query(f"INSERT INTO orders (order_id, cust) VALUES ({i}, {(i * 7) % 5})")
+        for i in range(10):
+            self.execute_query(f"INSERT INTO visits (visit_id, cust) VALUES ({i}, {(i * 3) % 4})")
+        
+        query_tree = self.query_processor._get_query_tree("SELECT * FROM orders NATURAL JOIN visits").query_tree
+        expected = self._execute_join_with_method(query_tree, "nested_loop")
+        # cust 0..3 appear 4 times in orders; in visits 0,1 appear 3 times and 2,3 twice
+        self.assertEqual(len(expected), 4 * 3 + 4 * 3 + 4 * 2 + 4 * 2)
+        
+        engine = self.query_processor.query_execution_engine
+        engine.SORT_MEMORY_ROWS = 3
+        try:
+            rows = self._execute_join_with_method(query_tree, "merge")
+        finally:
+            del engine.SORT_MEMORY_ROWS
+        self.assertEqual(self._sorted_rows(rows), self._sorted_rows(expected))
+        # Output streams out in join key order
+        self.assertEqual([row['cust'] for row in rows], sorted(row['cust'] for row in rows))
+    
+    def test_12_index_nested_loop_join(self):
+        """Test nested loop join probes the inner table's index instead of scanning it."""
+        self._setup_join_data()
+        query = "SELECT * FROM employees JOIN departments ON employees.dept_id = departments.dept_id"
+        query_tree = self.query_processor._get_query_tree(query).query_tree
+        expected = self._execute_join_with_method(query_tree, "hash")
+        # Qualified join columns with the same name on both sides pair each employee with one department
+        self.assertEqual(len(expected), 3)
+        
+        self.storage_manager.set_index("departments", "dept_id", "hash")
+        self.storage_manager.set_index("employees", "dept_id", "btree")
+        engine = self.query_processor.query_execution_engine
+        engine.INDEX_JOIN_BATCH_KEYS = 2
+        try:
+            for method in ["nested_loop", "index_nested_loop"]:
+                rows = self._execute_join_with_method(query_tree, method)
+                self.assertEqual(self._sorted_rows(rows), self._sorted_rows(expected), method)
+                self.assertEqual(self.storage_manager.last_access_plan["method"], "index_batch_lookup")
+            
+            result = self.execute_query("SELECT emp_name, dept_name FROM employees NATURAL JOIN departments")
+            self.assertQuerySuccess(result)
+            self.assertEqual(
+                sorted((row['emp_name'], row['dept_name']) for row in result.data.rows),
+                [('Alice', 'Engineering'), ('Bob', 'Engineering'), ('Carol', 'Sales')]
+            )
+        finally:
+            del engine.INDEX_JOIN_BATCH_KEYS
+    
+    def test_13_hash_join_spills_streamed_build_input(self):
+        """Test the hash join build input is streamed and spills before it is fully read."""
+        produced = []
+        
+        def build_rows():
+            for i in range(20):
+                produced.append(i)
+                yield {'k': i % 5, 'b': i}
+        
+        hash_join = HashJoin(lambda row: (row['k'],), lambda row: (row['k'],),
+                             lambda build, probe: {**build, **probe}, memory_rows=4)
+        spill_started_at = []
+        partition = hash_join._partition
+        
+        def recording_partition(rows, key_fn, temp_dir, depth, side):
+            if side == "build" and depth == 0:
+                spill_started_at.append(len(produced))
+            return partition(rows, key_fn, temp_dir, depth, side)
+        
+        hash_join._partition = recording_partition
+        probe_rows = ({'k': k, 'p': k * 10} for k in range(5))
+        rows = list(hash_join.run(build_rows(), probe_rows))
+        
+        # Spilling starts after memory_rows + 1 build rows, not after the whole input
+        self.assertEqual(spill_started_at, [5])
+        self.assertGreater(hash_join.spilled_partitions, 0)
+        self.assertEqual(sorted((row['b'], row['p']) for row in rows), [(i, (i % 5) * 10) for i in range(20)])
+    
+    def test_14_merge_join_streams_inputs_through_external_sort(self):
+        """Test merge join sorts generator inputs in spilled runs and concatenates a presorted input."""
+        left_rows = ({'k': i // 2, 'l': i} for i in range(12))
+        right_rows = ({'k': (i * 5) % 6, 'r': i} for i in range(6))
+        merge_join = MergeJoin(lambda row: row['k'], lambda row: row['k'],
+                               lambda left, right: {**left, **right}, memory_rows=3)
+        rows = list(merge_join.equi_join(left_rows, right_rows))
+        
+        self.assertEqual(len(rows), 12)
+        self.assertEqual([row['k'] for row in rows], sorted(row['k'] for row in rows))
+        self.assertTrue(all(row['r'] == (row['k'] * 5) % 6 for row in rows))
+        # Only the left input arrived in key order, both were spilled in runs of 3
+        self.assertEqual(merge_join.presorted_inputs, 1)
+        self.assertEqual(merge_join.spilled_runs, 6)
 
 
 class TestUpdate(TestQueryProcessor):
@@ -1236,6 +1475,41 @@ class TestDelete(TestQueryProcessor):
         # Verify CASCADE worked
         task_result = self.execute_query("SELECT * FROM tasks WHERE proj_id = 1")
         self.assertEqual(len(task_result.data.rows), 0, "Tasks should cascade delete")
+    
+    def test_13_delete_and_update_with_cascaded_where(self):
+        """Test DELETE / UPDATE when the optimizer cascades WHERE a AND b into nested FILTERs."""
+        super().setUp()
+        self.execute_query("""
+        CREATE TABLE tasks (
+            task_id INTEGER PRIMARY KEY,
+            proj_id INTEGER,
+            priority INTEGER
+        )
+        """)
+        for task_id, proj_id, priority in [(1, 1, 1), (2, 1, 3), (3, 2, 2), (4, 1, 5)]:
+            self.execute_query(f"INSERT INTO tasks (task_id, proj_id, priority) VALUES ({task_id}, {proj_id}, {priority})")
+        
+        adapter = self.query_processor.adapter_optimizer
+        
+        def parse_cascaded(query):
+            # FILTER(rel, a AND b) -> FILTER(FILTER(rel, b), a)
+            parsed = adapter.optimization_engine.parse_query(query)
+            for node in parsed.query_tree.childs:
+                if node.type == "FILTER" and node.childs[1].type == "OPERATOR" and node.childs[1].val == "AND":
+                    inner = QueryTree("FILTER")
+                    inner.childs = [node.childs[0], node.childs[1].childs[1]]
+                    node.childs = [inner, node.childs[1].childs[0]]
+            return parsed
+        
+        with patch.object(adapter, "parse_optimized_query", side_effect=parse_cascaded):
+            result = self.execute_query("UPDATE tasks SET priority = 0 WHERE proj_id = 1 AND priority > 4")
+            self.assertQuerySuccess(result)
+            result = self.execute_query("DELETE FROM tasks WHERE proj_id = 1 AND priority > 1")
+            self.assertQuerySuccess(result)
+        
+        result = self.execute_query("SELECT * FROM tasks")
+        rows = sorted((row['task_id'], row['priority']) for row in result.data.rows)
+        self.assertEqual(rows, [(1, 1), (3, 2), (4, 0)])
 
 
 class TestLimit(TestQueryProcessor):
@@ -1292,6 +1566,46 @@ class TestLimit(TestQueryProcessor):
         # Should return all available rows (10 in this case)
         self.assertEqual(len(result.data.rows), 10)
 
+    def test_04_limit_stops_pipeline_early(self):
+        """Test LIMIT pulls only the rows it returns through FILTER/PROJECT from the storage cursor."""
+        self._setup_limit_data()
+        pulled = []
+        open_cursor = self.storage_manager.open_cursor
+        
+        def counting_cursor(data_retrieval, limit=None):
+            for row in open_cursor(data_retrieval, limit):
+                pulled.append(row)
+                yield row
+        
+        self.storage_manager.open_cursor = counting_cursor
+        try:
+            query_tree = self.query_processor._get_query_tree(
+                "SELECT emp_name FROM employees WHERE salary > 52000 LIMIT 3"
+            ).query_tree
+            rows = self.query_processor.query_execution_engine.iterate_node(query_tree, None)
+            first = next(rows)
+            self.assertEqual(len(pulled), 1)
+            self.assertEqual(list(first.keys()), ['emp_name'])
+            rest = list(rows)
+        finally:
+            del self.storage_manager.open_cursor
+        
+        self.assertEqual(len(rest), 2)
+        self.assertEqual(len(pulled), 3)
+    
+    def test_05_limit_over_join(self):
+        """Test LIMIT above a JOIN limits the joined rows, not one join input."""
+        self._setup_limit_data()
+        self.execute_query("CREATE TABLE departments (dept_id INTEGER PRIMARY KEY, dept_name VARCHAR(50))")
+        self.execute_query("INSERT INTO departments (dept_id, dept_name) VALUES (1, 'Engineering')")
+        
+        query = "SELECT emp_name, dept_name FROM employees JOIN departments ON employees.dept_id = departments.dept_id LIMIT 4"
+        result = self.execute_query(query)
+        self.assertQuerySuccess(result)
+        self.assertEqual(len(result.data.rows), 4)
+        for row in result.data.rows:
+            self.assertEqual(row['dept_name'], 'Engineering')
+
 
 class TestOrderBy(TestQueryProcessor):
     """Test ORDER BY functionality."""
@@ -1366,6 +1680,108 @@ class TestOrderBy(TestQueryProcessor):
         # Verify alphabetical order
         names = [row['emp_name'] for row in result.data.rows]
         self.assertEqual(names, sorted(names))
+    
+    def test_05_order_by_multiple_keys(self):
+        """Test ORDER BY on several keys with their own direction."""
+        self._setup_orderby_data()
+        query = "SELECT emp_name, dept_id, salary FROM employees ORDER BY dept_id DESC, salary ASC"
+        result = self.execute_query(query)
+        self.assertQuerySuccess(result)
+        
+        names = [row['emp_name'] for row in result.data.rows]
+        self.assertEqual(names, ['Eve', 'Carol', 'Dave', 'Alice', 'Bob'])
+    
+    def test_06_order_by_with_nulls(self):
+        """Test ORDER BY on a column holding NULLs, with default and explicit NULLS FIRST/LAST."""
+        self._setup_orderby_data()
+        self.execute_query("INSERT INTO employees (emp_id, emp_name, dept_id, salary, hire_date) VALUES (6, 'Frank', 3, NULL, '2024-05-01')")
+        
+        expectations = [
+            ("salary ASC", ['Eve', 'Carol', 'Alice', 'Bob', 'Dave', 'Frank']),
+            ("salary DESC", ['Frank', 'Dave', 'Bob', 'Alice', 'Carol', 'Eve']),
+            ("salary ASC NULLS FIRST", ['Frank', 'Eve', 'Carol', 'Alice', 'Bob', 'Dave']),
+            ("salary DESC NULLS LAST", ['Dave', 'Bob', 'Alice', 'Carol', 'Eve', 'Frank']),
+        ]
+        for order_by, expected in expectations:
+            result = self.execute_query(f"SELECT emp_name FROM employees ORDER BY {order_by}")
+            self.assertQuerySuccess(result)
+            self.assertEqual([row['emp_name'] for row in result.data.rows], expected, order_by)
+    
+    def test_07_order_by_spills_sorted_runs(self):
+        """Test ORDER BY larger than the sort memory budget is merged from spilled runs."""
+        self._setup_orderby_data()
+        for i in range(6, 26):
+            self.execute_query(f"INSERT INTO employees (emp_id, emp_name, dept_id, salary, hire_date) VALUES ({i}, 'Employee{i}', {i % 3 + 1}, {40000 + (i * 7919) % 50000}, '2024-01-01')")
+        
+        expected = self.execute_query("SELECT emp_id, dept_id, salary FROM employees ORDER BY dept_id, salary DESC").data.rows
+        engine = self.query_processor.query_execution_engine
+        engine.SORT_MEMORY_ROWS = 4
+        try:
+            result = self.execute_query("SELECT emp_id, dept_id, salary FROM employees ORDER BY dept_id, salary DESC")
+        finally:
+            del engine.SORT_MEMORY_ROWS
+        self.assertQuerySuccess(result)
+        
+        rows = [(row['dept_id'], -row['salary'], row['emp_id']) for row in result.data.rows]
+        self.assertEqual(len(rows), 25)
+        self.assertEqual([row[:2] for row in rows], sorted(row[:2] for row in rows))
+        self.assertEqual(result.data.rows, expected)
+    
+    def test_08_order_by_limit_top_n(self):
+        """Test ORDER BY ... LIMIT runs as a Top-N heap and returns the head of the full sort."""
+        self._setup_orderby_data()
+        self.execute_query("INSERT INTO employees (emp_id, emp_name, dept_id, salary, hire_date) VALUES (6, 'Frank', 3, NULL, '2024-05-01')")
+        
+        engine = self.query_processor.query_execution_engine
+        for order_by in ["salary DESC", "salary ASC", "dept_id DESC, salary ASC", "salary ASC NULLS FIRST", "hire_date"]:
+            expected = self.execute_query(f"SELECT emp_name FROM employees ORDER BY {order_by}").data.rows[:3]
+            
+            def full_sort(*args):
+                raise AssertionError("SORT below LIMIT should be fused into Top-N")
+            
+            engine._iter_sort = full_sort
+            try:
+                result = self.execute_query(f"SELECT emp_name FROM employees ORDER BY {order_by} LIMIT 3")
+            finally:
+                del engine._iter_sort
+            self.assertQuerySuccess(result)
+            self.assertEqual(result.data.rows, expected, order_by)
+        
+        result = self.execute_query("SELECT emp_name FROM employees ORDER BY salary LIMIT 0")
+        self.assertQuerySuccess(result)
+        self.assertEqual(result.data.rows, [])
+    
+    def test_09_order_by_limit_uses_btree_index(self):
+        """Test ORDER BY ... LIMIT on a B+ tree indexed column reads only limit rows in index order."""
+        self._setup_orderby_data()
+        self.storage_manager.set_index("employees", "salary", "btree")
+        pulled = []
+        open_ordered_cursor = self.storage_manager.open_ordered_cursor
+        
+        def counting_cursor(data_retrieval, order_column, descending=False, limit=None):
+            for row in open_ordered_cursor(data_retrieval, order_column, descending, limit):
+                pulled.append(row)
+                yield row
+        
+        def full_scan(*args, **kwargs):
+            raise AssertionError("Index-ordered Top-N should not scan the table")
+        
+        self.storage_manager.open_ordered_cursor = counting_cursor
+        self.storage_manager.open_cursor = full_scan
+        try:
+            result = self.execute_query("SELECT emp_name FROM employees WHERE dept_id < 3 ORDER BY salary DESC LIMIT 2")
+        finally:
+            del self.storage_manager.open_ordered_cursor
+            del self.storage_manager.open_cursor
+        self.assertQuerySuccess(result)
+        self.assertEqual([row['emp_name'] for row in result.data.rows], ['Dave', 'Bob'])
+        self.assertEqual(len(pulled), 2)
+        
+        # NULLS FIRST on an ascending key is not the index order: falls back to the heap
+        self.execute_query("INSERT INTO employees (emp_id, emp_name, dept_id, salary, hire_date) VALUES (6, 'Frank', 3, NULL, '2024-05-01')")
+        result = self.execute_query("SELECT emp_name FROM employees ORDER BY salary ASC NULLS FIRST LIMIT 2")
+        self.assertQuerySuccess(result)
+        self.assertEqual([row['emp_name'] for row in result.data.rows], ['Frank', 'Eve'])
 
 
 class TestAlias(TestQueryProcessor):
@@ -1408,6 +1824,344 @@ class TestAlias(TestQueryProcessor):
         self.assertGreater(len(result.data.rows), 0)
 
 
+class TestVectorized(TestQueryProcessor):
+    """Test batch-at-a-time (vectorized) execution mode."""
+    
+    def _setup_vectorized_data(self):
+        """Set up tables and data for vectorized execution tests."""
+        self.execute_query("CREATE TABLE departments (dept_id INTEGER PRIMARY KEY, dept_name VARCHAR(50), budget INTEGER)")
+        self.execute_query("CREATE TABLE employees (emp_id INTEGER PRIMARY KEY, emp_name VARCHAR(50), dept_id INTEGER, salary INTEGER)")
+        for dept_id, name, budget in [(1, 'Engineering', 100000), (2, 'Sales', 80000), (3, 'HR', 60000)]:
+            self.execute_query(f"INSERT INTO departments (dept_id, dept_name, budget) VALUES ({dept_id}, '{name}', {budget})")
+        emp_data = [(1, 'Alice', 1, 60000), (2, 'Bob', 1, 75000), (3, 'Carol', 2, 55000), (4, 'Dave', 2, 82000), (5, 'Eve', 3, 50000)]
+        for emp_id, name, dept_id, salary in emp_data:
+            self.execute_query(f"INSERT INTO employees (emp_id, emp_name, dept_id, salary) VALUES ({emp_id}, '{name}', {dept_id}, {salary})")
+    
+    def _hash_join_tree(self, query: str):
+        """Parse query with every JOIN node set to hash join (the vectorized join kernel)."""
+        query_tree = self.query_processor._get_query_tree(query).query_tree
+        def set_method(node):
+            if node.type == "JOIN":
+                node.method = "hash"
+            for child in node.childs:
+                set_method(child)
+        
+        set_method(query_tree)
+        return query_tree
+    
+    def _execute_in_mode(self, query_tree, vectorized: bool):
+        engine = self.query_processor.query_execution_engine
+        engine.VECTORIZED = vectorized
+        try:
+            return engine.execute_node(query_tree, None)
+        finally:
+            del engine.VECTORIZED
+    
+    def test_01_vectorized_matches_row_mode(self):
+        """Test batch kernels for filters, arithmetic, projection and hash join probes return the row-mode result."""
+        self._setup_vectorized_data()
+        queries = [
+            "SELECT emp_name, salary FROM employees WHERE salary > 70000 OR dept_id = 3",
+            "SELECT * FROM employees WHERE NOT (salary < 60000)",
+            "SELECT emp_name FROM employees WHERE dept_id IN (1, 3) OR salary BETWEEN 55000 AND 56000",
+            "SELECT emp_name FROM employees WHERE salary * 2 > 140000 OR emp_name = 'Carol'",
+            "SELECT * FROM employees JOIN departments ON employees.dept_id = departments.dept_id AND employees.salary > 55000",
+            "SELECT emp_name, dept_name FROM employees NATURAL JOIN departments WHERE budget > 70000 OR salary < 52000",
+        ]
+        engine = self.query_processor.query_execution_engine
+        # Small batches so every query spans several batches
+        engine.BATCH_SIZE = 2
+        try:
+            for query in queries:
+                query_tree = self._hash_join_tree(query)
+                expected = self._execute_in_mode(query_tree, False)
+                rows = self._execute_in_mode(query_tree, True)
+                self.assertGreater(len(expected), 0, query)
+                self.assertEqual(
+                    sorted(sorted(row.items()) for row in rows),
+                    sorted(sorted(row.items()) for row in expected),
+                    query
+                )
+        finally:
+            del engine.BATCH_SIZE
+    
+    def test_02_vectorized_hash_join_probe(self):
+        """Test the vectorized hash join probes batches and applies the residual as a batch filter."""
+        self._setup_vectorized_data()
+        query = "SELECT emp_name, dept_name FROM employees JOIN departments ON employees.dept_id = departments.dept_id AND employees.salary > departments.budget - 20000 LIMIT 10"
+        query_tree = self._hash_join_tree(query)
+        
+        engine = self.query_processor.query_execution_engine
+        engine.VECTORIZED = True
+        try:
+            batches = list(engine.iterate_batches(query_tree, None))
+        finally:
+            del engine.VECTORIZED
+        rows = [row for batch in batches for row in batch.to_rows()]
+        self.assertEqual(
+            sorted((row['emp_name'], row['dept_name']) for row in rows),
+            [('Dave', 'Sales'), ('Eve', 'HR')]
+        )
+        for batch in batches:
+            self.assertEqual(list(batch.columns), ['emp_name', 'dept_name'])
+    
+    def test_03_vectorized_scan_reads_column_batches(self):
+        """Test table scans read column batches from storage without opening a row cursor."""
+        self._setup_vectorized_data()
+        queries = [
+            "SELECT emp_name, salary FROM employees WHERE salary > 55000 AND dept_id = 1",
+            "SELECT emp_name FROM employees WHERE salary > 70000 OR dept_id = 3",
+            "SELECT * FROM employees",
+        ]
+        engine = self.query_processor.query_execution_engine
+        engine.BATCH_SIZE = 2
+        row_cursors = []
+        open_cursor = self.storage_manager.open_cursor
+        def spy_open_cursor(data_retrieval, *args, **kwargs):
+            row_cursors.append(data_retrieval.table)
+            return open_cursor(data_retrieval, *args, **kwargs)
+        
+        try:
+            for query in queries:
+                query_tree = self._hash_join_tree(query)
+                expected = self._execute_in_mode(query_tree, False)
+                self.storage_manager.open_cursor = spy_open_cursor
+                try:
+                    rows = self._execute_in_mode(query_tree, True)
+                finally:
+                    del self.storage_manager.open_cursor
+                self.assertEqual(row_cursors, [], query)
+                self.assertTrue(self.storage_manager.last_access_plan.get("columnar"), query)
+                self.assertEqual(rows, expected, query)
+        finally:
+            del engine.BATCH_SIZE
+    
+    def test_04_vectorized_hash_join_streams_large_build_side(self):
+        """Test a build side over HASH_JOIN_MEMORY_ROWS is streamed into the spilling join, not concatenated."""
+        self._setup_vectorized_data()
+        query = "SELECT emp_name, dept_name FROM employees JOIN departments ON employees.dept_id = departments.dept_id"
+        query_tree = self._hash_join_tree(query)
+        engine = self.query_processor.query_execution_engine
+        expected = self._execute_in_mode(query_tree, False)
+        engine.BATCH_SIZE = 1
+        engine.HASH_JOIN_MEMORY_ROWS = 2
+        try:
+            with patch.object(ColumnBatch, "concat", side_effect=AssertionError("build side concatenated")):
+                rows = self._execute_in_mode(query_tree, True)
+        finally:
+            del engine.BATCH_SIZE
+            del engine.HASH_JOIN_MEMORY_ROWS
+        self.assertEqual(len(expected), 5)
+        self.assertEqual(sorted(sorted(row.items()) for row in rows), sorted(sorted(row.items()) for row in expected))
+    
+    def test_05_vectorized_storage_error_mid_scan_raises(self):
+        """Test a storage error part-way through a batch scan propagates instead of ending the stream."""
+        self._setup_vectorized_data()
+        query_tree = self._hash_join_tree("SELECT emp_name FROM employees WHERE salary > 0")
+        open_batch_cursor = self.storage_manager.open_batch_cursor
+        
+        def failing_batch_cursor(data_retrieval, batch_size):
+            batches = open_batch_cursor(data_retrieval, 1)
+            yield next(batches)
+            raise OSError("simulated read failure")
+        
+        self.storage_manager.open_batch_cursor = failing_batch_cursor
+        try:
+            with self.assertRaises(OSError):
+                self._execute_in_mode(query_tree, True)
+        finally:
+            del self.storage_manager.open_batch_cursor
+
+
+class TestCompiledExpressions(TestQueryProcessor):
+    """Test conditions and value expressions are compiled once per operator."""
+    
+    def _setup_compiled_data(self):
+        """Set up tables and data for compiled expression tests."""
+        self.execute_query("CREATE TABLE employees (emp_id INTEGER PRIMARY KEY, emp_name VARCHAR(50), dept_id INTEGER, salary INTEGER)")
+        emp_data = [(1, 'Alice', 1, 60000), (2, 'Bob', 1, 75000), (3, 'Carol', 2, 55000), (4, 'Dave', 2, 82000), (5, 'Eve', 3, 50000)]
+        for emp_id, name, dept_id, salary in emp_data:
+            self.execute_query(f"INSERT INTO employees (emp_id, emp_name, dept_id, salary) VALUES ({emp_id}, '{name}', {dept_id}, {salary})")
+    
+    def _count_compilations(self):
+        engine = self.query_processor.query_execution_engine
+        compiled = []
+        compile_condition = engine.compile_condition
+        compile_value_expression = engine.compile_value_expression
+        
+        def counting_condition(condition):
+            compiled.append(condition.type)
+            return compile_condition(condition)
+        
+        def counting_value(expr):
+            compiled.append(expr.type)
+            return compile_value_expression(expr)
+        
+        engine.compile_condition = counting_condition
+        engine.compile_value_expression = counting_value
+        return compiled
+    
+    def _restore_compilations(self):
+        engine = self.query_processor.query_execution_engine
+        del engine.compile_condition
+        del engine.compile_value_expression
+    
+    def test_01_filter_compiled_once(self):
+        """Test an in-memory WHERE is compiled once, not once per row."""
+        self._setup_compiled_data()
+        compiled = self._count_compilations()
+        try:
+            result = self.execute_query("SELECT emp_name FROM employees WHERE salary * 2 > 140000 OR emp_name = 'Carol'")
+        finally:
+            self._restore_compilations()
+        self.assertQuerySuccess(result)
+        self.assertEqual(sorted(row['emp_name'] for row in result.data.rows), ['Bob', 'Carol', 'Dave'])
+        self.assertEqual(compiled, ['OPERATOR'])
+    
+    def test_02_update_set_compiled_once(self):
+        """Test UPDATE SET expressions are compiled once and folded literals keep their value."""
+        self._setup_compiled_data()
+        compiled = self._count_compilations()
+        try:
+            result = self.execute_query("UPDATE employees SET salary = salary + 1000 * 2 WHERE dept_id = 1")
+        finally:
+            self._restore_compilations()
+        self.assertQuerySuccess(result)
+        # Once for the SET expression, however many rows are updated
+        self.assertEqual(compiled.count('ARITH_EXPR'), 1)
+        
+        result = self.execute_query("SELECT emp_name, salary FROM employees WHERE dept_id <> 2")
+        self.assertQuerySuccess(result)
+        self.assertEqual(
+            sorted((row['emp_name'], row['salary']) for row in result.data.rows),
+            [('Alice', 62000), ('Bob', 77000), ('Eve', 50000)]
+        )
+    
+    def test_03_compiled_matches_interpreted_semantics(self):
+        """Test compiled predicates keep NULL, IN list, BETWEEN and division by zero semantics."""
+        self._setup_compiled_data()
+        self.execute_query("INSERT INTO employees (emp_id, emp_name, dept_id, salary) VALUES (6, 'Frank', NULL, 0)")
+        cases = [
+            ("SELECT emp_name FROM employees WHERE dept_id IS NULL", ['Frank']),
+            ("SELECT emp_name FROM employees WHERE dept_id NOT IN (1, 2) AND dept_id IS NOT NULL", ['Eve']),
+            ("SELECT emp_name FROM employees WHERE salary NOT BETWEEN 50001 AND 80000", ['Dave', 'Eve', 'Frank']),
+            ("SELECT emp_name FROM employees WHERE salary / 0 = emp_id / 0", ['Alice', 'Bob', 'Carol', 'Dave', 'Eve', 'Frank']),
+        ]
+        for query, expected in cases:
+            result = self.execute_query(query)
+            self.assertQuerySuccess(result)
+            self.assertEqual(sorted(row['emp_name'] for row in result.data.rows), expected, query)
+
+
+class TestAggregation(TestQueryProcessor):
+    """Test GROUP BY, HAVING and aggregate functions."""
+    
+    def _setup_aggregation_data(self):
+        """Set up employees for aggregation tests."""
+        self.execute_query("CREATE TABLE employees (emp_id INTEGER PRIMARY KEY, emp_name VARCHAR(50), dept_id INTEGER, salary INTEGER)")
+        emp_data = [(1, 'Alice', 1, 60000), (2, 'Bob', 1, 75000), (3, 'Carol', 2, 55000), (4, 'Dave', 2, 82000), (5, 'Eve', 3, 50000), (6, 'Frank', 3, 'NULL')]
+        for emp_id, name, dept_id, salary in emp_data:
+            self.execute_query(f"INSERT INTO employees (emp_id, emp_name, dept_id, salary) VALUES ({emp_id}, '{name}', {dept_id}, {salary})")
+    
+    def test_01_group_by_aggregates(self):
+        """Test GROUP BY with COUNT, SUM, AVG, MIN and MAX, NULLs are ignored except by COUNT(*)."""
+        self._setup_aggregation_data()
+        result = self.execute_query("SELECT dept_id, COUNT(*), COUNT(salary), SUM(salary), AVG(salary), MIN(emp_name), MAX(salary) FROM employees GROUP BY dept_id")
+        self.assertQuerySuccess(result)
+        
+        rows = sorted(
+            (row['dept_id'], row['COUNT(*)'], row['COUNT(salary)'], row['SUM(salary)'], row['AVG(salary)'], row['MIN(emp_name)'], row['MAX(salary)'])
+            for row in result.data.rows
+        )
+        self.assertEqual(rows, [
+            (1, 2, 2, 135000, 67500, 'Alice', 75000),
+            (2, 2, 2, 137000, 68500, 'Carol', 82000),
+            (3, 2, 1, 50000, 50000, 'Eve', 50000),
+        ])
+    
+    def test_02_having_and_order_by_aggregate(self):
+        """Test HAVING filters groups and ORDER BY can sort on an aggregate."""
+        self._setup_aggregation_data()
+        result = self.execute_query("SELECT dept_id, SUM(salary) FROM employees WHERE emp_id > 1 GROUP BY dept_id HAVING SUM(salary) > 70000 ORDER BY SUM(salary) DESC")
+        self.assertQuerySuccess(result)
+        self.assertEqual(
+            [(row['dept_id'], row['SUM(salary)']) for row in result.data.rows],
+            [(2, 137000), (1, 75000)]
+        )
+        
+        result = self.execute_query("SELECT dept_id FROM employees GROUP BY dept_id HAVING COUNT(*) = 2 AND MAX(salary) < 80000")
+        self.assertQuerySuccess(result)
+        self.assertEqual(sorted(row['dept_id'] for row in result.data.rows), [1, 3])
+    
+    def test_03_aggregates_without_group_by(self):
+        """Test aggregates without GROUP BY return one row, also for an empty input."""
+        self._setup_aggregation_data()
+        result = self.execute_query("SELECT COUNT(salary), MIN(salary), MAX(salary), AVG(salary) FROM employees")
+        self.assertQuerySuccess(result)
+        self.assertEqual(result.data.rows, [{'COUNT(salary)': 5, 'MIN(salary)': 50000, 'MAX(salary)': 82000, 'AVG(salary)': 64400}])
+        
+        result = self.execute_query("SELECT COUNT(*), SUM(salary) FROM employees WHERE emp_id > 100")
+        self.assertQuerySuccess(result)
+        self.assertEqual(result.data.rows, [{'COUNT(*)': 0, 'SUM(salary)': None}])
+    
+    def test_04_count_star_from_table_statistics(self):
+        """Test COUNT(*) without a predicate is answered from the table row count, without a scan."""
+        self._setup_aggregation_data()
+        self.execute_query("DELETE FROM employees WHERE emp_id = 2")
+        
+        scans = []
+        open_cursor = self.storage_manager.open_cursor
+        
+        def counting_cursor(data_retrieval):
+            scans.append(data_retrieval.table)
+            return open_cursor(data_retrieval)
+        
+        self.storage_manager.open_cursor = counting_cursor
+        try:
+            result = self.execute_query("SELECT COUNT(*) FROM employees")
+        finally:
+            del self.storage_manager.open_cursor
+        self.assertQuerySuccess(result)
+        self.assertEqual(result.data.rows, [{'COUNT(*)': 5}])
+        self.assertEqual(scans, [])
+        
+        # A predicate still needs the rows
+        result = self.execute_query("SELECT COUNT(*) FROM employees WHERE dept_id = 1")
+        self.assertQuerySuccess(result)
+        self.assertEqual(result.data.rows, [{'COUNT(*)': 1}])
+    
+    def test_05_group_by_spills_partitions(self):
+        """Test more groups than the aggregation memory budget are spilled to partitions with the same result."""
+        self._setup_aggregation_data()
+        for i in range(7, 31):
+            self.execute_query(f"INSERT INTO employees (emp_id, emp_name, dept_id, salary) VALUES ({i}, 'Employee{i}', {i % 12}, {1000 * i})")
+        
+        query = "SELECT dept_id, COUNT(*), SUM(salary) FROM employees GROUP BY dept_id ORDER BY dept_id"
+        expected = self.execute_query(query).data.rows
+        
+        engine = self.query_processor.query_execution_engine
+        partitions = []
+        open_partitions = HashAggregate._open_partitions
+        
+        def counting_partitions(aggregator, temp_dir, depth):
+            partitions.append(depth)
+            return open_partitions(aggregator, temp_dir, depth)
+        
+        engine.AGGREGATE_MEMORY_GROUPS = 3
+        HashAggregate._open_partitions = counting_partitions
+        try:
+            result = self.execute_query(query)
+        finally:
+            HashAggregate._open_partitions = open_partitions
+            del engine.AGGREGATE_MEMORY_GROUPS
+        self.assertQuerySuccess(result)
+        
+        self.assertTrue(partitions)
+        self.assertEqual(len(result.data.rows), 12)
+        self.assertEqual(result.data.rows, expected)
+        self.assertEqual(sum(row['COUNT(*)'] for row in result.data.rows), 30)
+
+
 class TestDropTable(TestQueryProcessor):
     """Test DROP TABLE functionality with foreign key handling."""
     
@@ -1563,6 +2317,106 @@ class TestDropTable(TestQueryProcessor):
         self.assertNotIn('level1', self.storage_manager.tables)
 
 
+class TestCopy(TestQueryProcessor):
+    """Test COPY (bulk load) functionality."""
+    
+    def setUp(self):
+        super().setUp()
+        self.execute_query("""
+        CREATE TABLE imported (
+            id INTEGER PRIMARY KEY,
+            name VARCHAR(20),
+            score FLOAT
+        )
+        """)
+    
+    def test_01_copy_from_csv(self):
+        """Test bulk loading a CSV file."""
+        csv_path = os.path.join(self.test_data_dir, "imported.csv")
+        with open(csv_path, "w") as f:
+            f.write("id,name,score\n1,Alice,90.5\n2,Bob,\n3,Charlie,70\n")
+        
+        result = self.execute_query(f"COPY imported FROM '{csv_path}'")
+        self.assertQuerySuccess(result)
+        
+        result = self.execute_query("SELECT id, score FROM imported WHERE id >= 2")
+        self.assertQuerySuccess(result)
+        self.assertEqual(sorted((r['id'], r['score']) for r in result.data.rows), [(2, None), (3, 70.0)])
+    
+    def test_02_copy_invalid_row_loads_nothing(self):
+        """Test that an invalid row rejects the whole load."""
+        jsonl_path = os.path.join(self.test_data_dir, "imported.jsonl")
+        with open(jsonl_path, "w") as f:
+            f.write('{"id": 1, "name": "Alice"}\n{"id": "two", "name": "Bob"}\n')
+        
+        result = self.execute_query(f"COPY imported FROM '{jsonl_path}'")
+        self.assertQueryFails(result)
+        
+        result = self.execute_query("SELECT * FROM imported")
+        self.assertEqual(len(result.data.rows), 0)
+    
+    def test_03_copy_rolled_back_on_abort(self):
+        """Test that ABORT undoes rows loaded inside a transaction."""
+        csv_path = os.path.join(self.test_data_dir, "imported.csv")
+        with open(csv_path, "w") as f:
+            f.write("id,name,score\n1,Alice,90.5\n2,Bob,80\n")
+        
+        self.execute_query("BEGIN TRANSACTION")
+        result = self.execute_query(f"COPY imported FROM '{csv_path}'")
+        self.assertQuerySuccess(result)
+        self.execute_query("ABORT")
+        
+        result = self.execute_query("SELECT * FROM imported")
+        self.assertEqual(len(result.data.rows), 0)
+    
+    def test_04_copy_logs_each_batch(self):
+        """Test COPY writes one WAL record per loaded batch instead of collecting every row, and ABORT undoes them all."""
+        csv_path = os.path.join(self.test_data_dir, "imported.csv")
+        with open(csv_path, "w") as f:
+            f.write("id,name,score\n")
+            for i in range(1, 6):
+                f.write(f"{i},Name{i},{i * 10}\n")
+        
+        frm_adapter = self.query_processor.query_execution_engine.frm_adapter
+        logged = []
+        log_bulk_write = frm_adapter.log_bulk_write
+        
+        def recording_log_bulk_write(**kwargs):
+            logged.append([row['id'] for row in kwargs['rows']])
+            log_bulk_write(**kwargs)
+        
+        self.storage_manager.BULK_LOAD_BATCH_ROWS = 2
+        frm_adapter.log_bulk_write = recording_log_bulk_write
+        try:
+            self.execute_query("BEGIN TRANSACTION")
+            result = self.execute_query(f"COPY imported FROM '{csv_path}'")
+            self.assertQuerySuccess(result)
+            self.execute_query("ABORT")
+        finally:
+            del frm_adapter.log_bulk_write
+            del self.storage_manager.BULK_LOAD_BATCH_ROWS
+        
+        self.assertEqual(logged, [[1, 2], [3, 4], [5]])
+        result = self.execute_query("SELECT * FROM imported")
+        self.assertEqual(len(result.data.rows), 0)
+    
+    def test_05_copy_abort_keeps_identical_existing_row(self):
+        """Test ABORT removes only the loaded rows, not an identical row committed before the load."""
+        self.execute_query("INSERT INTO imported (id, name, score) VALUES (1, 'Alice', 90.5)")
+        csv_path = os.path.join(self.test_data_dir, "imported.csv")
+        with open(csv_path, "w") as f:
+            f.write("id,name,score\n1,Alice,90.5\n2,Bob,80\n")
+        
+        self.execute_query("BEGIN TRANSACTION")
+        result = self.execute_query(f"COPY imported FROM '{csv_path}'")
+        self.assertQuerySuccess(result)
+        self.execute_query("ABORT")
+        
+        result = self.execute_query("SELECT * FROM imported")
+        self.assertQuerySuccess(result)
+        self.assertEqual(result.data.rows, [{'id': 1, 'name': 'Alice', 'score': 90.5}])
+
+
 class TestSubqueries(TestQueryProcessor):
     """Test subquery operations (IN, NOT IN, EXISTS, NOT EXISTS)."""
     
@@ -1727,6 +2581,148 @@ class TestSubqueries(TestQueryProcessor):
         self.assertEqual(len(result.data.rows), 2)
         self.assertEqual(result.data.rows[0]['emp_name'], 'Alice')  # 75000
         self.assertEqual(result.data.rows[1]['emp_name'], 'Bob')    # 65000
+    
+    def test_08_subquery_executed_once_per_statement(self):
+        """Test an uncorrelated subquery runs once per statement, not once per outer row."""
+        self._setup_subquery_data()
+        engine = self.query_processor.query_execution_engine
+        planned = []
+        plan_subquery = engine._plan_subquery
+        
+        def counting_plan(subquery):
+            planned.append(subquery)
+            return plan_subquery(subquery)
+        
+        engine._plan_subquery = counting_plan
+        try:
+            result = self.execute_query("""
+            SELECT emp_name FROM employees
+            WHERE dept_id IN (SELECT dept_id FROM departments WHERE budget > 70000)
+            AND NOT EXISTS (SELECT * FROM departments WHERE budget > 150000)
+            """)
+        finally:
+            del engine._plan_subquery
+        self.assertQuerySuccess(result)
+        self.assertEqual(sorted(row['emp_name'] for row in result.data.rows), ['Alice', 'Bob', 'Charlie', 'Diana'])
+        self.assertEqual(len(planned), 2)
+        
+        # The next statement sees its own data
+        self.execute_query("UPDATE departments SET budget = 200000 WHERE dept_id = 3")
+        result = self.execute_query("SELECT dept_name FROM departments WHERE NOT EXISTS (SELECT * FROM departments WHERE budget > 150000)")
+        self.assertQuerySuccess(result)
+        self.assertEqual(result.data.rows, [])
+    
+    def test_09_correlated_exists_decorrelated(self):
+        """Test correlated EXISTS / NOT EXISTS / IN are answered by probing the decorrelated subquery."""
+        self._setup_subquery_data()
+        
+        result = self.execute_query("""
+        SELECT dept_name FROM departments d
+        WHERE EXISTS (SELECT * FROM employees e WHERE e.dept_id = d.dept_id AND e.salary > 60000)
+        """)
+        self.assertQuerySuccess(result)
+        self.assertEqual([row['dept_name'] for row in result.data.rows], ['Engineering'])
+        
+        result = self.execute_query("""
+        SELECT dept_name FROM departments d
+        WHERE NOT EXISTS (SELECT * FROM employees e WHERE d.dept_id = e.dept_id)
+        """)
+        self.assertQuerySuccess(result)
+        self.assertEqual([row['dept_name'] for row in result.data.rows], ['HR'])
+        
+        result = self.execute_query("""
+        SELECT emp_name FROM employees e
+        WHERE salary IN (SELECT budget - 25000 FROM departments d WHERE d.dept_id = e.dept_id)
+        """)
+        self.assertQuerySuccess(result)
+        self.assertEqual([row['emp_name'] for row in result.data.rows], ['Alice', 'Diana'])
+        
+        # Outer columns outside an equality cannot be decorrelated
+        result = self.execute_query("""
+        SELECT dept_name FROM departments d
+        WHERE EXISTS (SELECT * FROM employees e WHERE e.salary > d.budget)
+        """)
+        self.assertFalse(result.success)
+    
+    def test_10_in_subquery_null_semantics(self):
+        """Test IN / NOT IN with NULLs on either side follow SQL three-valued logic."""
+        self._setup_subquery_data()
+        self.execute_query("INSERT INTO employees (emp_id, emp_name, dept_id, salary) VALUES (6, 'Frank', NULL, 45000)")
+        
+        # NULL dept_id is neither IN nor NOT IN a set without NULLs
+        result = self.execute_query("SELECT emp_name FROM employees WHERE dept_id IN (SELECT dept_id FROM departments)")
+        self.assertEqual(sorted(row['emp_name'] for row in result.data.rows), ['Alice', 'Bob', 'Charlie', 'Diana'])
+        result = self.execute_query("SELECT emp_name FROM employees WHERE dept_id NOT IN (SELECT dept_id FROM departments)")
+        self.assertEqual([row['emp_name'] for row in result.data.rows], ['Eve'])
+        
+        # A NULL in the subquery makes NOT IN unknown for every value it does not contain
+        result = self.execute_query("SELECT dept_name FROM departments WHERE dept_id NOT IN (SELECT dept_id FROM employees)")
+        self.assertQuerySuccess(result)
+        self.assertEqual(result.data.rows, [])
+        result = self.execute_query("SELECT dept_name FROM departments WHERE dept_id NOT IN (SELECT dept_id FROM employees WHERE dept_id IS NOT NULL)")
+        self.assertEqual([row['dept_name'] for row in result.data.rows], ['HR'])
+        result = self.execute_query("SELECT dept_name FROM departments WHERE dept_id IN (SELECT dept_id FROM employees)")
+        self.assertEqual([row['dept_name'] for row in result.data.rows], ['Engineering', 'Sales'])
+    
+    def test_11_not_of_in_subquery_keeps_unknown(self):
+        """Test NOT (x IN subquery) agrees with x NOT IN subquery when the subquery has a NULL."""
+        self._setup_subquery_data()
+        self.execute_query("INSERT INTO employees (emp_id, emp_name, dept_id, salary) VALUES (6, 'Frank', NULL, 45000)")
+        
+        for query in [
+            "SELECT dept_name FROM departments WHERE dept_id NOT IN (SELECT dept_id FROM employees)",
+            "SELECT dept_name FROM departments WHERE NOT (dept_id IN (SELECT dept_id FROM employees))",
+            "SELECT dept_name FROM departments WHERE NOT (dept_id IN (SELECT dept_id FROM employees) AND budget > 0)",
+        ]:
+            result = self.execute_query(query)
+            self.assertQuerySuccess(result)
+            self.assertEqual(result.data.rows, [], query)
+        
+        # UNKNOWN OR TRUE is TRUE, UNKNOWN AND FALSE is FALSE
+        result = self.execute_query(
+            "SELECT dept_name FROM departments WHERE NOT (dept_id IN (SELECT dept_id FROM employees)) OR budget < 70000"
+        )
+        self.assertEqual([row['dept_name'] for row in result.data.rows], ['HR'])
+        result = self.execute_query(
+            "SELECT dept_name FROM departments WHERE NOT (dept_id IN (SELECT dept_id FROM employees) AND budget > 90000)"
+        )
+        self.assertEqual(sorted(row['dept_name'] for row in result.data.rows), ['HR', 'Sales'])
+        
+        # The vectorized NOT kernel gives the same result
+        query_tree = self.query_processor._get_query_tree(
+            "SELECT dept_name FROM departments WHERE NOT (dept_id IN (SELECT dept_id FROM employees))"
+        ).query_tree
+        engine = self.query_processor.query_execution_engine
+        engine.VECTORIZED = True
+        try:
+            self.assertEqual(engine.execute_node(query_tree, None), [])
+        finally:
+            del engine.VECTORIZED
+    
+    def test_12_delete_where_in_subquery(self):
+        """Test DELETE with an IN subquery in its WHERE clause."""
+        self._setup_subquery_data()
+        result = self.execute_query(
+            "DELETE FROM employees WHERE dept_id IN (SELECT dept_id FROM departments WHERE budget > 90000) AND salary > 70000"
+        )
+        self.assertQuerySuccess(result)
+        
+        result = self.execute_query("SELECT emp_name FROM employees")
+        self.assertEqual(sorted(row['emp_name'] for row in result.data.rows), ['Bob', 'Charlie', 'Diana', 'Eve'])
+    
+    def test_13_update_where_not_exists_subquery(self):
+        """Test UPDATE with a correlated NOT EXISTS subquery in its WHERE clause."""
+        self._setup_subquery_data()
+        result = self.execute_query(
+            "UPDATE employees SET salary = 0 "
+            "WHERE NOT EXISTS (SELECT dept_id FROM departments WHERE departments.dept_id = employees.dept_id)"
+        )
+        self.assertQuerySuccess(result)
+        
+        result = self.execute_query("SELECT emp_name FROM employees WHERE salary = 0")
+        self.assertEqual([row['emp_name'] for row in result.data.rows], ['Eve'])
+        result = self.execute_query("SELECT emp_name FROM employees WHERE salary > 0")
+        self.assertEqual(len(result.data.rows), 4)
 
 
 class TestComplexQueries(TestQueryProcessor):
@@ -1821,7 +2817,10 @@ def suite():
     test_suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestLimit))
     test_suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestOrderBy))
     test_suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestAlias))
+    test_suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestCompiledExpressions))
+    test_suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestAggregation))
     test_suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestDropTable))
+    test_suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestCopy))
     test_suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestSubqueries))
     test_suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestComplexQueries))
     
@@ -0,0 +1,332 @@
+"""
+Batch-at-a-time (vectorized) execution kernels
+Operators exchange ColumnBatch objects: one Python list per column holding up
+to BATCH_SIZE rows, plus a selection vector of the positions still alive.
+Filters only shrink the selection vector, projections share column lists and
+arithmetic, comparisons and hash join probes run as one loop per batch instead
+of one expression tree walk and one dict per row.
+Base table scans come from the storage batch cursor, which decodes blocks
+straight into column lists, so row dicts are only built for the final result.
+batches_from_rows is the compatibility path for operators that still produce
+rows (sorts, aggregates, non-hash joins, transactions with buffered writes).
+"""
+
+import operator
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+import logging
+logger = logging.getLogger(__name__)
+
+Row = Dict[str, Any]
+
+COMPARISON_OPERATORS = {
+    "=": operator.eq,
+    "<>": operator.ne,
+    "!=": operator.ne,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+}
+
+ARITHMETIC_OPERATORS = {
+    "+": operator.add,
+    "-": operator.sub,
+    "*": operator.mul,
+}
+
+
+class ColumnBatch:
+    """
+    A batch of rows stored column-wise.
+
+    Args:
+        columns: Column name -> list of values (all lists have the same length)
+        size: Number of physical rows in the column lists
+        selection: Positions of the rows in the batch, None = all positions
+    """
+
+    __slots__ = ("columns", "size", "selection")
+
+    def __init__(self, columns: Dict[str, List[Any]], size: int, selection: Optional[List[int]] = None):
+        self.columns = columns
+        self.size = size
+        self.selection = selection
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Row]) -> "ColumnBatch":
+        names = {}
+        for row in rows:
+            for name in row:
+                names.setdefault(name, None)
+        columns = {name: [row.get(name) for row in rows] for name in names}
+        return cls(columns, len(rows))
+
+    @classmethod
+    def concat(cls, batches: Iterable["ColumnBatch"]) -> "ColumnBatch":
+        """Dense batch (no selection vector) holding the selected rows of all batches."""
+        columns: Dict[str, List[Any]] = {}
+        size = 0
+        for batch in batches:
+            if not len(batch):
+                continue
+            for name in batch.columns:
+                if name not in columns:
+                    columns[name] = [None] * size
+            for name, column in columns.items():
+                column.extend(batch.values(name))
+            size += len(batch)
+        return cls(columns, size)
+
+    def __len__(self) -> int:
+        return self.size if self.selection is None else len(self.selection)
+
+    def positions(self) -> Sequence[int]:
+        return range(self.size) if self.selection is None else self.selection
+
+    def values(self, name: str) -> List[Any]:
+        """Values of one column for the selected rows, in selection order."""
+        column = self.columns.get(name)
+        if column is None:
+            return [None] * len(self)
+        if self.selection is None:
+            return column
+        return [column[i] for i in self.selection]
+
+    def with_selection(self, selection: List[int]) -> "ColumnBatch":
+        return ColumnBatch(self.columns, self.size, selection)
+
+    def head(self, n: int) -> "ColumnBatch":
+        return self.with_selection(list(self.positions())[:n])
+
+    def project(self, names: List[str]) -> "ColumnBatch":
+        return ColumnBatch({name: self.columns[name] for name in names if name in self.columns},
+                           self.size, self.selection)
+
+    def to_rows(self) -> Iterator[Row]:
+        names = list(self.columns)
+        if self.selection is None:
+            for values in zip(*self.columns.values()):
+                yield dict(zip(names, values))
+            return
+        columns = list(self.columns.values())
+        for i in self.selection:
+            yield {name: column[i] for name, column in zip(names, columns)}
+
+
+def batches_from_rows(rows: Iterable[Row], batch_size: int) -> Iterator[ColumnBatch]:
+    """
+    Cut a row stream into column batches of up to batch_size rows.
+    Compatibility path for row-producing operators: every row is still a dict.
+    """
+    rows = iter(rows)
+    try:
+        while True:
+            chunk = list(islice(rows, batch_size))
+            if not chunk:
+                return
+            yield ColumnBatch.from_rows(chunk)
+    finally:
+        if hasattr(rows, "close"):
+            rows.close()
+
+
+def rows_from_batches(batches: Iterable[ColumnBatch]) -> Iterator[Row]:
+    batches = iter(batches)
+    try:
+        for batch in batches:
+            yield from batch.to_rows()
+    finally:
+        if hasattr(batches, "close"):
+            batches.close()
+
+
+class _Scalar:
+    # Expression value that is the same for every row of the batch (literals)
+    __slots__ = ("value",)
+
+    def __init__(self, value: Any):
+        self.value = value
+
+
+class BatchEvaluator:
+    """
+    Evaluates condition and value expression trees over a ColumnBatch.
+    Same semantics as QueryExecution.evaluate_condition / evaluate_value_expression;
+    node types without a batch kernel (subqueries) fall back to the compiled row predicate.
+
+    Args:
+        engine: QueryExecution used for tree helpers and the row-at-a-time fallback
+    """
+
+    def __init__(self, engine):
+        self.engine = engine
+
+    def filter(self, condition, batch: ColumnBatch) -> ColumnBatch:
+        """Return the batch with its selection vector narrowed to rows matching condition."""
+        return batch.with_selection(self.select(condition, batch, list(batch.positions())))
+
+    def select(self, condition, batch: ColumnBatch, positions: List[int]) -> List[int]:
+        """Positions (subset of positions, same order) of the rows for which condition holds."""
+        if not positions:
+            return positions
+        node_type = condition.type
+
+        if node_type == "COMPARISON" and condition.val in COMPARISON_OPERATORS:
+            compare = COMPARISON_OPERATORS[condition.val]
+            left = self.values(condition.childs[0], batch, positions)
+            right = self.values(condition.childs[1], batch, positions)
+            if isinstance(right, _Scalar):
+                operand = right.value
+                if isinstance(left, _Scalar):
+                    return positions if compare(left.value, operand) else []
+                return [p for p, value in zip(positions, left) if compare(value, operand)]
+            if isinstance(left, _Scalar):
+                operand = left.value
+                return [p for p, value in zip(positions, right) if compare(operand, value)]
+            return [p for p, a, b in zip(positions, left, right) if compare(a, b)]
+
+        if node_type == "OPERATOR" and condition.val == "AND":
+            # Each conjunct only sees the rows that passed the previous ones
+            for child in condition.childs:
+                positions = self.select(child, batch, positions)
+                if not positions:
+                    break
+            return positions
+
+        if node_type == "OPERATOR" and condition.val == "OR":
+            matched = set()
+            remaining = positions
+            for child in condition.childs:
+                hits = self.select(child, batch, remaining)
+                if hits:
+                    matched.update(hits)
+                    remaining = [p for p in remaining if p not in matched]
+                if not remaining:
+                    break
+            return [p for p in positions if p in matched]
+
+        # NOT over an IN subquery must keep UNKNOWN apart from False: row-at-a-time fallback below
+        if (node_type == "OPERATOR" and condition.val == "NOT"
+                and not self.engine.expression_compiler.can_be_unknown(condition)):
+            excluded = set(self.select(condition.childs[0], batch, positions))
+            return [p for p in positions if p not in excluded]
+
+        if node_type in ("IS_NULL_EXPR", "IS_NOT_NULL_EXPR"):
+            column = self._column(batch, condition.childs[0])
+            if node_type == "IS_NULL_EXPR":
+                return [p for p in positions if column[p] is None]
+            return [p for p in positions if column[p] is not None]
+
+        if node_type in ("IN_EXPR", "NOT_IN_EXPR") and condition.childs[1].type == "LIST":
+            values = [self.engine.extract_literal_value(child) for child in condition.childs[1].childs]
+            try:
+                values = frozenset(values)
+            except TypeError:
+                pass
+            column = self._column(batch, condition.childs[0])
+            if node_type == "IN_EXPR":
+                return [p for p in positions if column[p] in values]
+            return [p for p in positions if column[p] not in values]
+
+        if node_type in ("BETWEEN_EXPR", "NOT_BETWEEN_EXPR"):
+            column = self._column(batch, condition.childs[0])
+            lower = self._broadcast(self.values(condition.childs[1], batch, positions), len(positions))
+            upper = self._broadcast(self.values(condition.childs[2], batch, positions), len(positions))
+            if node_type == "BETWEEN_EXPR":
+                return [p for p, lo, hi in zip(positions, lower, upper) if lo <= column[p] <= hi]
+            return [p for p, lo, hi in zip(positions, lower, upper) if not (lo <= column[p] <= hi)]
+
+        # Subqueries and unknown nodes: row-at-a-time fallback
+        names = list(batch.columns)
+        columns = list(batch.columns.values())
+        matches = self.engine.compile_condition(condition)
+        return [
+            p for p in positions
+            if matches({name: column[p] for name, column in zip(names, columns)})
+        ]
+
+    def values(self, expr, batch: ColumnBatch, positions: List[int]):
+        """Values of a value expression for positions, a list or a _Scalar for row-independent values."""
+        if expr.type.startswith("LITERAL_"):
+            return _Scalar(self.engine.extract_literal_value(expr))
+
+        if expr.type in ("COLUMN_REF", "FUNCTION_CALL"):
+            column = self._column(batch, expr)
+            if batch.selection is None and len(positions) == batch.size:
+                return column
+            return [column[p] for p in positions]
+
+        if expr.type == "ARITH_EXPR":
+            left = self.values(expr.childs[0], batch, positions)
+            right = self.values(expr.childs[1], batch, positions)
+            if isinstance(left, _Scalar) and isinstance(right, _Scalar):
+                return _Scalar(self._arithmetic(expr.val, [left.value], [right.value])[0])
+            size = len(positions)
+            return self._arithmetic(expr.val, self._broadcast(left, size), self._broadcast(right, size))
+
+        return _Scalar(None)
+
+    def _arithmetic(self, op: str, left: List[Any], right: List[Any]) -> List[Any]:
+        if op in ARITHMETIC_OPERATORS:
+            return list(map(ARITHMETIC_OPERATORS[op], left, right))
+        if op == "/":
+            return [a / b if b != 0 else None for a, b in zip(left, right)]
+        if op == "%":
+            return [a % b if b != 0 else None for a, b in zip(left, right)]
+        return [None] * len(left)
+
+    def _broadcast(self, values, size: int) -> List[Any]:
+        return [values.value] * size if isinstance(values, _Scalar) else values
+
+    def _column(self, batch: ColumnBatch, col_ref) -> List[Any]:
+        # Physical column list (index by position), missing columns read as NULL
+        column = batch.columns.get(self.engine.output_column_name(col_ref))
+        return column if column is not None else [None] * batch.size
+
+
+class BatchHashTable:
+    """
+    In-memory hash table over a dense build batch, probed one batch at a time.
+
+    Args:
+        build: Build rows as a ColumnBatch without selection vector
+        key_names: Build key columns
+    """
+
+    def __init__(self, build: ColumnBatch, key_names: List[str]):
+        self.build = build
+        self.table: Dict[Any, List[int]] = {}
+        keys = self._keys(build, key_names, range(build.size))
+        for position, key in enumerate(keys):
+            self.table.setdefault(key, []).append(position)
+
+    def _keys(self, batch: ColumnBatch, key_names: List[str], positions: Sequence[int]) -> Iterable[Any]:
+        columns = [batch.columns.get(name) or [None] * batch.size for name in key_names]
+        if len(columns) == 1:
+            column = columns[0]
+            return (column[p] for p in positions)
+        return (tuple(column[p] for column in columns) for p in positions)
+
+    def probe(self, batch: ColumnBatch, key_names: List[str], build_on_right: bool) -> ColumnBatch:
+        """
+        Join one probe batch against the table. Output columns are ordered as
+        {**left, **right}, right columns shadow left columns with the same name.
+        """
+        probe_positions: List[int] = []
+        build_positions: List[int] = []
+        table = self.table
+        positions = batch.positions()
+        for p, key in zip(positions, self._keys(batch, key_names, positions)):
+            matches = table.get(key)
+            if matches:
+                probe_positions.extend([p] * len(matches))
+                build_positions.extend(matches)
+
+        probe_columns = {name: [column[p] for p in probe_positions] for name, column in batch.columns.items()}
+        build_columns = {name: [column[b] for b in build_positions] for name, column in self.build.columns.items()}
+        if build_on_right:
+            columns = {**probe_columns, **build_columns}
+        else:
+            columns = {**build_columns, **probe_columns}
+        return ColumnBatch(columns, len(probe_positions))
@@ -4,6 +4,7 @@ from .models import (
     DataWrite,
     DataDeletion,
     DataUpdate,
+    DataTruncation,
     Statistic,
     ColumnDefinition,
     ForeignKey,
@@ -27,6 +28,7 @@ __all__ = [
     "DataWrite",
     "DataDeletion",
     "DataUpdate",
+    "DataTruncation",
     "Statistic",
     "ColumnDefinition",
     "ForeignKey",
@@ -0,0 +1,105 @@
+"""Adaptive hash index di atas B+ tree buat key yang sering di-lookup.
+
+Point lookup ke B+ tree selalu jalan dari root sampe leaf, walaupun yang
+dicari itu-itu aja. AdaptiveHash ngitung berapa kali tiap key di-lookup;
+key yang udah lewat threshold hasilnya disimpen di dict, jadi lookup
+berikutnya langsung O(1) tanpa turun tree (mirip adaptive hash index di
+InnoDB).
+
+Entry di-invalidate tiap key-nya berubah (insert / delete), dan semuanya
+dibuang kalo index dibangun ulang atau record id di-remap. Jumlah entry
+dibatasi capacity (LRU), counter lookup juga di-aging biar ga numpuk.
+"""
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+
+@dataclass
+class AdaptiveHashStats:
+    """Statistik adaptive hash index.
+
+    Attributes:
+        lookups: Jumlah point lookup yang lewat adaptive hash
+        hits: Lookup yang dijawab langsung dari hash
+        builds: Entry hash yang dibikin (key jadi hot)
+        invalidations: Entry yang dibuang karena key-nya berubah
+        evictions: Entry yang dibuang karena capacity penuh
+    """
+    lookups: int = 0
+    hits: int = 0
+    builds: int = 0
+    invalidations: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.lookups if self.lookups else 0.0
+
+
+class AdaptiveHash:
+    """Cache hasil point lookup buat key yang hot.
+
+    Args:
+        threshold: Key jadi hot setelah di-lookup segini kali
+        capacity: Maksimal entry hash (LRU)
+    """
+
+    def __init__(self, threshold: int = 3, capacity: int = 1024):
+        self.threshold = max(threshold, 1)
+        self.capacity = max(capacity, 1)
+        self.stats = AdaptiveHashStats()
+        self._entries: "OrderedDict[Any, List[int]]" = OrderedDict()
+        self._counts: Dict[Any, int] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Any) -> Optional[List[int]]:
+        """Record ids dari hash kalo key-nya hot, None kalo harus turun tree."""
+        with self._lock:
+            self.stats.lookups += 1
+            record_ids = self._entries.get(key)
+            if record_ids is None:
+                return None
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+            return list(record_ids)
+
+    def observe(self, key: Any, record_ids: List[int]) -> None:
+        """Catat hasil lookup dari tree; simpen ke hash kalo key-nya udah hot."""
+        with self._lock:
+            count = self._counts.get(key, 0) + 1
+            if count < self.threshold:
+                self._counts[key] = count
+                if len(self._counts) > 4 * self.capacity:
+                    self._age_counts()
+                return
+            self._counts.pop(key, None)
+            self._entries[key] = list(record_ids)
+            self._entries.move_to_end(key)
+            self.stats.builds += 1
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+
+    def invalidate(self, key: Any) -> None:
+        """Buang entry satu key (isi key-nya berubah)."""
+        with self._lock:
+            if self._entries.pop(key, None) is not None:
+                self.stats.invalidations += 1
+
+    def clear(self) -> None:
+        """Buang semua entry dan counter (index dibangun ulang / di-remap)."""
+        with self._lock:
+            self.stats.invalidations += len(self._entries)
+            self._entries.clear()
+            self._counts.clear()
+
+    def _age_counts(self) -> None:
+        # counter dibagi dua, key yang jarang di-lookup lama-lama hilang
+        self._counts = {key: count // 2 for key, count in self._counts.items() if count > 1}
@@ -1,16 +1,49 @@
 import os
 import pickle
 
-class BPlusTreeIndex:
+from .adaptive_hash import AdaptiveHash
+from .change_buffer import ChangeBufferedIndex
+
+
+class BPlusTreeIndex(ChangeBufferedIndex):
     """
     B+ Tree Index wrapper untuk table indexing.
     Mendukung operations: insert, delete, search, range queries.
+    Perubahan yang di-buffer (buffer_changes) di-merge otomatis sebelum baca.
+    Point lookup ke key yang hot dijawab dari adaptive hash (ga disimpen ke file).
     """
+    # key jadi hot setelah di-lookup segini kali (None = adaptive hash off)
+    ADAPTIVE_HASH_THRESHOLD = 3
+    # maksimal key yang disimpen di adaptive hash
+    ADAPTIVE_HASH_CAPACITY = 1024
+
     def __init__(self, table_name: str, column_name: str, order=5):
         self.order = order
         self.index = BPlusTree(order)
         self.table_name = table_name
         self.column_name = column_name
+        self._pending = []
+        self.adaptive_hash = (
+            AdaptiveHash(self.ADAPTIVE_HASH_THRESHOLD, self.ADAPTIVE_HASH_CAPACITY)
+            if self.ADAPTIVE_HASH_THRESHOLD else None
+        )
+
+    def _lookup(self, key):
+        return self.index.search(key) or []
+
+    def _apply_insert(self, key, record_id: int):
+        if self.adaptive_hash is not None:
+            self.adaptive_hash.invalidate(key)
+        self.index.insert(key, record_id)
+
+    def _apply_delete(self, key, record_id: int):
+        if self.adaptive_hash is not None:
+            self.adaptive_hash.invalidate(key)
+        return self.index.delete(key, record_id)
+
+    def _clear_adaptive_hash(self):
+        if self.adaptive_hash is not None:
+            self.adaptive_hash.clear()
 
     def insert(self, key, record_id: int):
         """
@@ -20,7 +53,8 @@ class BPlusTreeIndex:
             key: Key untuk indexing (any comparable type)
             record_id: ID record dalam storage
         """
-        self.index.insert(key, record_id)
+        self.merge_pending()
+        self._apply_insert(key, record_id)
 
     def delete(self, key, record_id: int):
         """
@@ -33,7 +67,92 @@ class BPlusTreeIndex:
         Returns:
             bool: True jika berhasil, False jika tidak ditemukan
         """
-        return self.index.delete(key, record_id)
+        self.merge_pending()
+        return self._apply_delete(key, record_id)
+
+    def remap_record_ids(self, mapping: dict):
+        """
+        Ganti record_id lama ke record_id baru dalam satu pass di leaf level.
+        Key ga berubah, jadi struktur tree ga perlu di-rebalance.
+
+        Args:
+            mapping: Dict old_record_id -> new_record_id (id yang ga ada tetap)
+        """
+        node = self._get_leftmost_leaf()
+        self._clear_adaptive_hash()
+        while node:
+            for i, value in enumerate(node.children):
+                if isinstance(value, list):
+                    node.children[i] = [mapping.get(record_id, record_id) for record_id in value]
+                else:
+                    node.children[i] = mapping.get(value, value)
+            node = node.next
+
+    def iter_record_ids(self):
+        """
+        Yield semua record_id urut key (jalan di linked list leaf).
+
+        Yields:
+            int: Record ID
+        """
+        node = self._get_leftmost_leaf()
+        while node:
+            for value in node.children:
+                if isinstance(value, list):
+                    yield from value
+                else:
+                    yield value
+            node = node.next
+
+    def iter_items(self, descending: bool = False):
+        """
+        Yield (key, record_id) urut key, dari key terbesar kalo descending.
+        Leaf cuma punya pointer next, jadi urutan turun jalan dari anak paling kanan.
+
+        Args:
+            descending: True = urut key besar ke kecil
+
+        Yields:
+            tuple: (key, record_id)
+        """
+        if not descending:
+            leaves = self._iter_leaves()
+        else:
+            self.merge_pending()
+            leaves = self._iter_leaves_reversed(self.index.root)
+        for node in leaves:
+            entries = zip(node.keys, node.children)
+            for key, value in (reversed(list(entries)) if descending else entries):
+                if isinstance(value, list):
+                    for record_id in value:
+                        yield key, record_id
+                else:
+                    yield key, value
+
+    def _iter_leaves(self):
+        node = self._get_leftmost_leaf()
+        while node:
+            yield node
+            node = node.next
+
+    def _iter_leaves_reversed(self, node):
+        if node.leaf:
+            yield node
+            return
+        for child in reversed(node.children):
+            yield from self._iter_leaves_reversed(child)
+
+    def bulk_build(self, entries):
+        """
+        Bangun ulang index dari nol secara bottom-up (buat bulk load).
+        Jauh lebih murah dari insert satu-satu karena ga ada split.
+
+        Args:
+            entries: Iterable (key, record_id)
+        """
+        self.discard_pending()
+        self._clear_adaptive_hash()
+        self.index.bulk_build(entries)
 
     def search(self, key):
         """
@@ -45,8 +164,16 @@ class BPlusTreeIndex:
         Returns:
             list: List of record_ids (untuk konsistensi dengan HashIndex)
         """
-        results = self.index.search(key)
-        return results if results else []
+        self.merge_pending()
+        if self.adaptive_hash is None:
+            results = self.index.search(key)
+            return list(results) if results else []
+
+        results = self.adaptive_hash.get(key)
+        if results is None:
+            results = list(self.index.search(key) or [])
+            self.adaptive_hash.observe(key, results)
+        return results
 
     def search_range(self, start_key, end_key):
         """
@@ -59,6 +186,7 @@ class BPlusTreeIndex:
         Returns:
             list: List of record_ids dalam range
         """
+        self.merge_pending()
         return self.index.search_range(start_key, end_key)
 
     def search_by_operation(self, operation: str, operand):
@@ -156,11 +284,42 @@ class BPlusTreeIndex:
 
     def _get_leftmost_leaf(self):
         """Get leftmost leaf node untuk scanning."""
+        self.merge_pending()
         node = self.index.root
         while not node.leaf:
             node = node.children[0]
         return node
 
+    def _get_rightmost_leaf(self):
+        """Get rightmost leaf node untuk ambil key terbesar."""
+        self.merge_pending()
+        node = self.index.root
+        while not node.leaf:
+            node = node.children[-1]
+        return node
+
+    def count_keys(self) -> int:
+        """
+        Jumlah key distinct di index (jalan di linked list leaf, tabel ga dibaca).
+
+        Returns:
+            int: Jumlah key
+        """
+        return sum(len(node.keys) for node in self._iter_leaves())
+
+    def get_key_range(self):
+        """
+        Get key terkecil dan terbesar di index.
+
+        Returns:
+            tuple: (min_key, max_key), atau None kalo index kosong
+        """
+        leftmost = self._get_leftmost_leaf()
+        rightmost = self._get_rightmost_leaf()
+        if not leftmost.keys or not rightmost.keys:
+            return None
+        return leftmost.keys[0], rightmost.keys[-1]
+
     def get_height(self) -> int:
         """
         Get height dari B+ tree.
@@ -168,6 +327,7 @@ class BPlusTreeIndex:
         Returns:
             int: Height dari tree (root = 1, empty tree = 0)
         """
+        self.merge_pending()
         if not self.index.root:
             return 0
 
@@ -199,6 +359,7 @@ class BPlusTreeIndex:
         Args:
             filepath: Path file yang akan di-load
         """
+        self._clear_adaptive_hash()
         if not os.path.exists(filepath):
             self.index = BPlusTree(self.order)
             return
@@ -316,6 +477,79 @@ class BPlusTree:
             if len(node.keys) > self.order - 1:
                 self._split_leaf(node)
 
+    def bulk_build(self, entries):
+        """
+        Bangun tree bottom-up dari pasangan (key, value).
+        Key diurutin dan digabung (duplikat jadi list), terus leaf diisi
+        rata (maks order - 1 key), baru level internal dibangun di atasnya.
+
+        Args:
+            entries: Iterable (key, record_id)
+        """
+        grouped = {}
+        for key, value in entries:
+            grouped.setdefault(key, []).append(value)
+
+        try:
+            keys = sorted(grouped)
+        except TypeError:
+            # key campur tipe (misal "NULL" sama angka): pake jalur insert biasa
+            self.root = BPlusTreeNode(self.order, leaf=True)
+            for key, values in grouped.items():
+                for value in values:
+                    self.insert(key, value)
+            return
+
+        leaves = []
+        for chunk in self._even_chunks(keys, self.order - 1):
+            leaf = BPlusTreeNode(self.order, leaf=True)
+            leaf.keys = chunk
+            leaf.children = [grouped[k] if len(grouped[k]) > 1 else grouped[k][0] for k in chunk]
+            if leaves:
+                leaves[-1].next = leaf
+            leaves.append(leaf)
+
+        if not leaves:
+            self.root = BPlusTreeNode(self.order, leaf=True)
+            return
+
+        # min key tiap subtree, dipake jadi separator di parent
+        level = leaves
+        level_min_keys = [leaf.keys[0] for leaf in leaves]
+        while len(level) > 1:
+            parents = []
+            parent_min_keys = []
+            start = 0
+            for chunk in self._even_chunks(level, self.order):
+                parent = BPlusTreeNode(self.order)
+                parent.children = chunk
+                parent.keys = level_min_keys[start + 1:start + len(chunk)]
+                for child in chunk:
+                    child.parent = parent
+                parents.append(parent)
+                parent_min_keys.append(level_min_keys[start])
+                start += len(chunk)
+            level = parents
+            level_min_keys = parent_min_keys
+
+        self.root = level[0]
+        self.root.parent = None
+
+    @staticmethod
+    def _even_chunks(items, max_size):
+        # bagi items ke jumlah chunk minimal, ukurannya serata mungkin
+        if not items:
+            return []
+        num_chunks = -(-len(items) // max_size)
+        base, extra = divmod(len(items), num_chunks)
+        chunks = []
+        start = 0
+        for i in range(num_chunks):
+            size = base + (1 if i < extra else 0)
+            chunks.append(items[start:start + size])
+            start += size
+        return chunks
+
     def delete(self, key, value: int):
         """
         Delete entry dengan key dan value tertentu dari B+ tree.
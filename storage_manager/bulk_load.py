@@ -0,0 +1,337 @@
+"""Bulk load CSV / JSONL langsung ke file tabel.
+
+Beda sama INSERT per row: input dibaca streaming, tiap row divalidasi pake
+validator yang udah di-compile sekali per schema, terus row yang udah
+diserialisasi langsung dikumpulin jadi block penuh dan ditulis ke ujung
+file. num_blocks di header baru di-update pas commit, jadi reader yang
+jalan selama load ga pernah liat block setengah jadi, dan load yang gagal
+tinggal di-truncate balik.
+"""
+from __future__ import annotations
+
+import csv
+import json
+import os
+import struct
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from .models import ColumnDefinition
+from .toast import open_toast_writer
+from .utils import (
+    dictionary_codes,
+    encode_block,
+    read_table_header,
+    serialize_row,
+    write_table_header,
+)
+
+BULK_FORMATS = ("csv", "jsonl")
+
+_FORMAT_BY_EXTENSION = {
+    ".csv": "csv",
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl",
+}
+
+
+def detect_format(file_path: str) -> str:
+    """Tebak format input dari ekstensi file.
+
+    Raises:
+        ValueError: Jika ekstensi tidak dikenal
+    """
+    extension = os.path.splitext(file_path)[1].lower()
+    if extension not in _FORMAT_BY_EXTENSION:
+        raise ValueError(
+            f"Format file '{file_path}' tidak dikenal, pake ekstensi .csv / .jsonl atau kasih file_format"
+        )
+    return _FORMAT_BY_EXTENSION[extension]
+
+
+def _csv_converter(column_def: ColumnDefinition) -> Callable[[str], Any]:
+    # CSV cuma punya string, jadi konversi tipe ikut schema
+    if column_def.data_type == "INTEGER":
+        return int
+    if column_def.data_type == "FLOAT":
+        return float
+    return str
+
+
+def iter_csv_rows(
+    file_path: str,
+    column_defs: List[ColumnDefinition],
+    delimiter: str = ",",
+    header: bool = True
+) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """Generator row dari file CSV (streaming, satu baris per iterasi).
+
+    Field kosong dianggap NULL. Tanpa header, urutan kolom = urutan schema.
+
+    Args:
+        file_path: Path ke file CSV
+        column_defs: Column definitions tabel tujuan
+        delimiter: Pemisah field
+        header: True kalo baris pertama berisi nama kolom
+
+    Yields:
+        Tuple (nomor baris, row dict)
+
+    Raises:
+        ValueError: Jika header / jumlah field / tipe value tidak valid
+    """
+    defs_by_name = {col.name: col for col in column_defs}
+
+    with open(file_path, 'r', newline='', encoding='utf-8') as f:
+        reader = csv.reader(f, delimiter=delimiter)
+
+        if header:
+            columns = next(reader, None)
+            if columns is None:
+                return
+            columns = [name.strip() for name in columns]
+            unknown = [name for name in columns if name not in defs_by_name]
+            if unknown:
+                raise ValueError(f"Kolom CSV {unknown} tidak ada di tabel")
+        else:
+            columns = [col.name for col in column_defs]
+
+        converters = [_csv_converter(defs_by_name[name]) for name in columns]
+
+        for fields in reader:
+            line_no = reader.line_num
+            if not fields:
+                continue
+            if len(fields) != len(columns):
+                raise ValueError(f"Baris {line_no}: expected {len(columns)} field, got {len(fields)}")
+
+            row = {}
+            for name, convert, field in zip(columns, converters, fields):
+                if field == "":
+                    row[name] = None
+                    continue
+                try:
+                    row[name] = convert(field)
+                except ValueError:
+                    raise ValueError(
+                        f"Baris {line_no}: Column '{name}' expects {defs_by_name[name].data_type}, got '{field}'"
+                    )
+            yield line_no, row
+
+
+def iter_jsonl_rows(file_path: str) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """Generator row dari file JSON Lines (satu object per baris).
+
+    Yields:
+        Tuple (nomor baris, row dict)
+
+    Raises:
+        ValueError: Jika baris bukan JSON object
+    """
+    with open(file_path, 'r', encoding='utf-8') as f:
+        for line_no, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Baris {line_no}: JSON tidak valid ({e.msg})")
+            if not isinstance(row, dict):
+                raise ValueError(f"Baris {line_no}: expected JSON object, got {type(row).__name__}")
+            yield line_no, row
+
+
+def _compile_column_check(column_def: ColumnDefinition) -> Callable[[Any], None]:
+    # cek tipe / ukuran satu kolom, pesan error sama kayak validate_value_for_column
+    name = column_def.name
+    data_type = column_def.data_type
+
+    if data_type == "INTEGER":
+        def check(value):
+            if not isinstance(value, int) or isinstance(value, bool):
+                raise ValueError(f"Column '{name}' expects INTEGER, got {type(value).__name__}")
+        return check
+
+    if data_type == "FLOAT":
+        def check(value):
+            if not isinstance(value, (int, float)) or isinstance(value, bool):
+                raise ValueError(f"Column '{name}' expects FLOAT, got {type(value).__name__}")
+        return check
+
+    if data_type in ("VARCHAR", "CHAR"):
+        size = column_def.size
+
+        def check(value):
+            length = len(str(value))
+            if length > size:
+                raise ValueError(f"Column '{name}' {data_type}({size}): value too long ({length} > {size})")
+        return check
+
+    return lambda value: None
+
+
+def compile_row_validator(column_defs: List[ColumnDefinition]) -> Callable[[Dict[str, Any]], Dict[str, Any]]:
+    """Compile validator row sekali per schema.
+
+    Hasilnya function(row) yang ngisi default, cek NULL / tipe / ukuran, dan
+    balikin row lengkap (semua kolom, urut schema). Aturannya sama kayak
+    insert biasa, tapi lookup definisi kolom ga diulang tiap row.
+
+    Args:
+        column_defs: Column definitions tabel
+
+    Returns:
+        Function row -> row yang udah lengkap
+
+    Raises:
+        ValueError: (dari function hasil) Jika row tidak valid
+    """
+    known_columns = {col.name for col in column_defs}
+    plan = [
+        (col.name, col.default_value, col.is_nullable, _compile_column_check(col))
+        for col in column_defs
+    ]
+
+    def validate(row: Dict[str, Any]) -> Dict[str, Any]:
+        if len(row) > len(known_columns) or not known_columns.issuperset(row):
+            unknown = sorted(set(row) - known_columns)
+            raise ValueError(f"Kolom {unknown} tidak ada di tabel")
+
+        result = {}
+        for name, default, nullable, check in plan:
+            value = row.get(name, default)
+            if value is None:
+                if not nullable:
+                    if name in row:
+                        raise ValueError(f"Column '{name}' cannot be NULL")
+                    raise ValueError(f"Column '{name}' is required but not provided")
+            else:
+                check(value)
+            result[name] = value
+        return result
+
+    return validate
+
+
+class BlockAppender:
+    """Nulis block penuh ke ujung file tabel, baru keliatan setelah commit().
+
+    Block terakhir yang udah ada ga disentuh (row baru selalu mulai di block
+    baru), jadi ga ada block lama yang ditulis ulang. Compaction bisa nge-pack
+    sisa block yang setengah kosong nanti. Value TOAST di-append ke side file
+    dan ikut di-truncate pas rollback.
+
+    Args:
+        file_path: Path ke file tabel
+        block_size: Block size target
+    """
+
+    def __init__(self, file_path: str, block_size: int):
+        self.file_path = file_path
+        self.block_size = block_size
+        self.rows_added = 0
+        self.blocks_added = 0
+        self._pending: List[bytes] = []
+        self._pending_size = 4  # row_count
+
+        self._file = open(file_path, 'r+b')
+        try:
+            self.schema, _, self._num_blocks, options = read_table_header(self._file)
+            self._num_blocks_pos = self._file.tell() - 4
+            self.compression = options.get("compression")
+            # value baru yang belum ada di dictionary disimpen plain (decoder tetap bisa baca)
+            self._codes = dictionary_codes(options.get("dictionaries") or {})
+
+            self._skip_blocks(self._num_blocks)
+            self.start_offset = self._file.tell()
+            # sisa load yang gagal (di luar num_blocks) dibuang
+            self._file.truncate()
+            self._toast = open_toast_writer(file_path, options)
+        except Exception:
+            self._file.close()
+            raise
+
+    def _skip_blocks(self, num_blocks: int) -> None:
+        f = self._file
+        for _ in range(num_blocks):
+            if self.compression == "zlib":
+                _, compressed_length = struct.unpack('<II', f.read(8))
+                f.seek(compressed_length, 1)
+            else:
+                row_count = struct.unpack('<I', f.read(4))[0]
+                for _ in range(row_count):
+                    row_length = struct.unpack('<I', f.read(4))[0]
+                    f.seek(row_length, 1)
+
+    def add(self, row: Dict[str, Any]) -> None:
+        """Serialisasi satu row, tulis block kalo udah penuh."""
+        row_bytes = serialize_row(row, self.schema, self._codes, self._toast)
+        if self._pending and self._pending_size + len(row_bytes) > self.block_size:
+            self._flush_block()
+        self._pending.append(row_bytes)
+        self._pending_size += len(row_bytes)
+        self.rows_added += 1
+
+    def _flush_block(self) -> None:
+        self._file.write(encode_block(self._pending, self.compression))
+        self.blocks_added += 1
+        self._pending = []
+        self._pending_size = 4
+
+    def commit(self) -> None:
+        """Tulis block terakhir, fsync, terus update num_blocks di header."""
+        try:
+            if self._pending:
+                self._flush_block()
+            if self._toast is not None:
+                self._toast.flush()
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+            # titik visibility: sebelum ini reader cuma liat block lama
+            self._file.seek(self._num_blocks_pos)
+            self._file.write(struct.pack('<I', self._num_blocks + self.blocks_added))
+            self._file.flush()
+            os.fsync(self._file.fileno())
+        finally:
+            self._file.close()
+            if self._toast is not None:
+                self._toast.close()
+
+    def rollback(self) -> None:
+        """Buang semua block yang udah ditulis, header ga berubah."""
+        if self._toast is not None:
+            self._toast.rollback()
+        if self._file.closed:
+            return
+        try:
+            self._file.truncate(self.start_offset)
+        finally:
+            self._file.close()
+
+
+def ensure_table_file(file_path: str, schema: List[str], block_size: int) -> None:
+    """Bikin file tabel kosong kalo belum ada (header doang)."""
+    if os.path.exists(file_path):
+        return
+    with open(file_path, 'wb') as f:
+        write_table_header(f, schema, block_size, 0, None)
+
+
+def open_source(
+    file_path: str,
+    file_format: str,
+    column_defs: List[ColumnDefinition],
+    delimiter: str = ",",
+    header: bool = True
+) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """Pilih reader sesuai format.
+
+    Raises:
+        ValueError: Jika format tidak didukung
+    """
+    if file_format == "csv":
+        return iter_csv_rows(file_path, column_defs, delimiter, header)
+    if file_format == "jsonl":
+        return iter_jsonl_rows(file_path)
+    raise ValueError(f"Format '{file_format}' tidak didukung. Pilihan: {list(BULK_FORMATS)}")
@@ -0,0 +1,177 @@
+"""Change buffer buat index (insert / update / delete ke kolom yang di-index).
+
+Tanpa buffer, tiap insert/update langsung ngubah semua index tabel dan
+nge-save (pickle ulang) file index-nya, jadi latency insert didominasi
+maintenance index. Dengan buffer, perubahan index cuma dicatat di memory
+(plus di-append ke change log biar ga ilang kalo crash), terus di-merge ke
+index sekaligus, urut key, pas:
+- buffer index itu udah penuh (INDEX_CHANGE_BUFFER_SIZE di StorageManager)
+- ada lookup / operasi lain yang butuh isi index lengkap
+- diminta eksplisit (merge_index_changes)
+
+Commit ga nge-merge: perubahan bisa numpuk lintas statement, dan file index
+baru di-pickle ulang sekali per merge, bukan sekali per insert.
+
+Change log = redo log buat index: isinya perubahan yang belum masuk file
+index, satu file per index. Yang bikin perubahan index durable itu log ini
+(di-fsync pas commit, lihat IndexChangeLog.sync), bukan file index. Pas
+startup, log di-replay ke buffer; merge dibikin idempotent jadi perubahan
+yang ternyata udah ke-save sebelum crash ga dobel.
+"""
+from __future__ import annotations
+
+import glob
+import json
+import os
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+# satu perubahan: (op, key, record_id), op = "insert" | "delete"
+Change = Tuple[str, Any, int]
+
+
+def sort_changes(changes: List[Change]) -> List[Change]:
+    """Urutin perubahan berdasarkan key (stabil, urutan per key tetap).
+
+    Perubahan ke key yang beda independen satu sama lain, jadi boleh diurut
+    ulang; perubahan ke key yang sama tetap sesuai urutan datang.
+    """
+    try:
+        return sorted(changes, key=lambda change: (isinstance(change[1], str), change[1]))
+    except TypeError:
+        return list(changes)
+
+
+class ChangeBufferedIndex(ABC):
+    """Base class buat index yang perubahannya bisa di-buffer.
+
+    Method baca di index (search, range scan, dll) harus manggil
+    merge_pending() duluan biar hasilnya selalu lengkap.
+    """
+
+    # dipanggil setelah merge (StorageManager: save index + rapihin change log)
+    on_merge: Optional[Callable[["ChangeBufferedIndex"], None]] = None
+
+    @property
+    def pending(self) -> List[Change]:
+        # dibikin lazy biar index lama (tanpa atribut ini) tetap jalan
+        if "_pending" not in self.__dict__:
+            self._pending: List[Change] = []
+        return self._pending
+
+    def buffer_changes(self, changes: List[Change]) -> None:
+        """Catat perubahan tanpa nyentuh struktur index."""
+        self.pending.extend(changes)
+
+    def discard_pending(self) -> None:
+        """Buang perubahan yang belum di-merge (index-nya dibangun ulang dari tabel)."""
+        self.pending.clear()
+
+    def merge_pending(self) -> int:
+        """Terapin semua perubahan yang di-buffer, urut key.
+
+        Returns:
+            Jumlah perubahan yang di-merge
+        """
+        if not self.pending:
+            return 0
+        changes = sort_changes(self.pending)
+        self._pending = []
+        for op, key, record_id in changes:
+            if op == "insert":
+                # idempotent: perubahan hasil replay log bisa aja udah ada di file index
+                if record_id not in self._lookup(key):
+                    self._apply_insert(key, record_id)
+            else:
+                self._apply_delete(key, record_id)
+        if self.on_merge is not None:
+            self.on_merge(self)
+        return len(changes)
+
+    @abstractmethod
+    def _lookup(self, key) -> List[int]:
+        """Record id yang udah ada di struktur index buat key ini."""
+
+    @abstractmethod
+    def _apply_insert(self, key, record_id: int) -> None:
+        """Masukin satu entry langsung ke struktur index."""
+
+    @abstractmethod
+    def _apply_delete(self, key, record_id: int) -> None:
+        """Hapus satu entry langsung dari struktur index."""
+
+
+class IndexChangeLog:
+    """Change log append-only di data_dir, satu file per index, satu baris JSON per perubahan.
+
+    Merge satu index cukup hapus file log index itu, log index lain ga
+    disentuh. Append ga di-fsync per perubahan: semua log yang ditulis sejak
+    sync terakhir di-fsync sekaligus pas commit (group commit), jadi satu
+    transaksi yang nyentuh banyak index / banyak row tetap cuma bayar
+    satu fsync per file log.
+
+    Args:
+        directory: Folder tempat file log
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        # file log yang udah di-append tapi belum di-fsync
+        self._unsynced: Set[str] = set()
+
+    def file_path(self, table: str, column: str) -> str:
+        """Path file log buat index table.column."""
+        return os.path.join(self.directory, f"__index_changes__{table}_{column}.log")
+
+    def append(self, table: str, column: str, changes: List[Change]) -> None:
+        """Append perubahan ke log index table.column."""
+        if not changes:
+            return
+        lines = "".join(
+            json.dumps([table, column, op, key, record_id]) + "\n"
+            for op, key, record_id in changes
+        )
+        file_path = self.file_path(table, column)
+        with open(file_path, 'a', encoding='utf-8') as f:
+            f.write(lines)
+        self._unsynced.add(file_path)
+
+    def sync(self) -> int:
+        """Fsync semua log yang di-append sejak sync terakhir.
+
+        Returns:
+            Jumlah file log yang di-fsync
+        """
+        synced = 0
+        for file_path in sorted(self._unsynced):
+            # log yang udah di-truncate (index-nya ke-merge) ga perlu di-fsync
+            if not os.path.exists(file_path):
+                continue
+            with open(file_path, 'a', encoding='utf-8') as f:
+                os.fsync(f.fileno())
+            synced += 1
+        self._unsynced.clear()
+        return synced
+
+    def truncate(self, table: str, column: str) -> None:
+        """Buang log index table.column (semua perubahannya udah di file index)."""
+        file_path = self.file_path(table, column)
+        self._unsynced.discard(file_path)
+        if os.path.exists(file_path):
+            os.remove(file_path)
+
+    def load(self) -> Dict[Tuple[str, str], List[Change]]:
+        """Baca perubahan yang belum di-merge dari semua log, dikelompokin per index.
+
+        Baris terakhir yang kepotong (crash pas append) diabaikan.
+        """
+        pending: Dict[Tuple[str, str], List[Change]] = {}
+        for file_path in sorted(glob.glob(os.path.join(glob.escape(self.directory), "__index_changes__*.log"))):
+            with open(file_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        table, column, op, key, record_id = json.loads(line)
+                    except (ValueError, TypeError):
+                        continue
+                    pending.setdefault((table, column), []).append((op, key, record_id))
+        return pending
@@ -0,0 +1,175 @@
+"""Clustering tabel berdasarkan key index (CLUSTER table USING column).
+
+Tabel biasanya urut insert, jadi range scan lewat B+ tree nge-fetch row
+yang kesebar di banyak block. CLUSTER nulis ulang file tabel urut key,
+jadi row dengan key berdekatan ada di block yang berurutan dan range scan
+tinggal baca block yang nyambung.
+
+Clustering factor = jumlah perpindahan block kalo row di-fetch urut index.
+Nilainya mendekati b_r kalo tabel urut sesuai index, mendekati n_r kalo
+row-nya acak. Dipake cost model buat estimasi block yang kena fetch.
+"""
+from __future__ import annotations
+
+import math
+import os
+import struct
+from bisect import bisect_right
+from typing import Any, Dict, Iterable, List, Tuple
+
+from .parallel_scan import compute_block_offsets
+from .toast import open_toast_reader
+from .utils import (
+    encode_block,
+    group_rows_into_blocks,
+    iter_row_buffers,
+    make_row_decoder,
+    read_table_header,
+    write_table_header,
+)
+
+
+def compute_block_directory(file_path: str) -> Tuple[List[int], List[int]]:
+    """Offset dan record id pertama tiap block.
+
+    Args:
+        file_path: Path ke file tabel
+
+    Returns:
+        Tuple (offsets, first_record_ids), dua-duanya satu entry per block
+    """
+    _, _, offsets = compute_block_offsets(file_path)
+    first_record_ids = []
+    record_id = 0
+    with open(file_path, 'rb') as f:
+        for offset in offsets:
+            # row_count selalu 4 byte pertama block, compressed atau ga
+            f.seek(offset)
+            first_record_ids.append(record_id)
+            record_id += struct.unpack('<I', f.read(4))[0]
+    return offsets, first_record_ids
+
+
+def locate_block(first_record_ids: List[int], record_id: int) -> int:
+    """Nomor block yang berisi record_id."""
+    return max(bisect_right(first_record_ids, record_id) - 1, 0)
+
+
+def cluster_sort_key(value: Any) -> Tuple[int, Any]:
+    """Key sort buat CLUSTER: NULL di depan, sisanya urut nilai."""
+    return (0, 0) if value is None else (1, value)
+
+
+def cluster_table_file(file_path: str, column: str, block_size: int) -> Dict[str, int]:
+    """Tulis ulang file tabel urut berdasarkan satu kolom, lalu swap atomik.
+
+    Cuma kolom key yang di-decode; row di-copy sebagai raw buffer, jadi
+    dictionary code dan pointer TOAST tetap valid. Record id berubah, index
+    harus dibangun ulang.
+
+    Args:
+        file_path: Path ke file tabel
+        column: Kolom key clustering
+        block_size: Block size target
+
+    Returns:
+        Dict num_rows, blocks_before, blocks_after
+
+    Raises:
+        ValueError: Jika nilai kolom ga bisa diurutin (tipe campur)
+    """
+    with open(file_path, 'rb') as f:
+        schema, _, num_blocks, options = read_table_header(f)
+        toast = open_toast_reader(file_path, options)
+        try:
+            decode_key = make_row_decoder(schema, [column], None, None, options.get("dictionaries"), toast=toast)
+            keyed_rows = [
+                (decode_key(row_buffer)[column], row_buffer)
+                for row_buffer in iter_row_buffers(f, num_blocks, options.get("compression"))
+            ]
+        finally:
+            if toast is not None:
+                toast.close()
+
+    try:
+        # sort stabil: row dengan key sama tetap urut insert
+        keyed_rows.sort(key=lambda item: cluster_sort_key(item[0]))
+    except TypeError:
+        raise ValueError(f"Nilai kolom '{column}' tidak bisa diurutkan (tipe campur)")
+
+    blocks = group_rows_into_blocks([row_buffer for _, row_buffer in keyed_rows], block_size)
+    temp_path = file_path + ".cluster"
+    try:
+        with open(temp_path, 'wb') as dst:
+            write_table_header(dst, schema, block_size, len(blocks), options)
+            for block in blocks:
+                dst.write(encode_block(block, options.get("compression")))
+            dst.flush()
+            os.fsync(dst.fileno())
+        os.replace(temp_path, file_path)
+    except Exception:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+    return {"num_rows": len(keyed_rows), "blocks_before": num_blocks, "blocks_after": len(blocks)}
+
+
+def clustering_factor(record_id_runs: Iterable[Iterable[int]], first_record_ids: List[int]) -> int:
+    """Hitung clustering factor dari urutan fetch index.
+
+    Args:
+        record_id_runs: Urutan record id per lookup index (B+ tree: satu run
+            urut key; hash: satu run per key)
+        first_record_ids: Record id pertama tiap block (compute_block_directory)
+
+    Returns:
+        Jumlah perpindahan block selama fetch
+    """
+    factor = 0
+    for run in record_id_runs:
+        previous_block = None
+        for record_id in run:
+            block = locate_block(first_record_ids, record_id)
+            if block != previous_block:
+                factor += 1
+                previous_block = block
+    return factor
+
+
+def clustered_fetch_cost(
+    n_r: int,
+    b_r: int,
+    estimated_rows: float,
+    clustering: int,
+    sequential_cost: float,
+    random_cost: float
+) -> float:
+    """Estimasi cost fetch row hasil index dari clustering factor.
+
+    Dipake bareng cost model Storage Manager dan Query Optimizer biar dua-duanya
+    nilai index yang sama dengan cara yang sama.
+
+    Args:
+        n_r: Jumlah row tabel
+        b_r: Jumlah block tabel
+        estimated_rows: Estimasi jumlah row yang di-fetch
+        clustering: Clustering factor index (b_r = urut sesuai index, n_r = acak total)
+        sequential_cost: Cost baca satu block berurutan
+        random_cost: Cost baca satu block acak
+
+    Returns:
+        Cost fetch (0 kalo tabel kosong atau ga ada row yang di-fetch)
+    """
+    if b_r <= 0 or n_r <= 0 or estimated_rows <= 0:
+        return 0.0
+
+    randomness = (clustering - b_r) / (n_r - b_r) if n_r > b_r else 0.0
+    randomness = min(max(randomness, 0.0), 1.0)
+
+    # block yang kena ~ clustering_factor * fraksi row, maksimal estimasi Cardenas
+    # (ekspektasi jumlah block berbeda kalo row-nya acak, tiap block dibaca sekali)
+    random_blocks = b_r * (1 - (1 - 1 / b_r) ** estimated_rows)
+    fetched_blocks = min(max(math.ceil(clustering * estimated_rows / n_r), 1), max(random_blocks, 1))
+    block_cost = sequential_cost + randomness * (random_cost - sequential_cost)
+    return fetched_blocks * block_cost
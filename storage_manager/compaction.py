@@ -0,0 +1,183 @@
+"""Vacuum / compaction file tabel buat Storage Manager.
+
+Block yang setengah kosong bikin b_r (dan I/O scan) lebih gede dari yang
+perlu. Compaction nge-pack ulang row ke block sepenuh mungkin, dikerjain
+per range block ke file sementara, terus di-swap atomik pake os.replace.
+Cek "file berubah ga selama copy" dan swap-nya dikerjain di bawah lock tabel
+yang sama dengan yang dipegang writer, jadi ga ada write yang nyelip di antaranya.
+Reader yang lagi buka file lama tetap baca file lama sampe selesai; reader
+baru langsung dapet file hasil compaction.
+"""
+from __future__ import annotations
+
+import os
+import threading
+import time
+from contextlib import nullcontext
+from typing import TYPE_CHECKING, Any, ContextManager, Dict, Optional
+
+from .parallel_scan import compute_block_offsets, partition_blocks
+from .utils import (
+    encode_block,
+    group_rows_into_blocks,
+    iter_row_buffers,
+    read_table_header,
+    write_table_header,
+)
+
+if TYPE_CHECKING:
+    from .storage_manager import StorageManager
+
+
+def _file_signature(file_path: str) -> tuple:
+    # dipake buat deteksi ada writer yang ngubah file selama compaction
+    st = os.stat(file_path)
+    return st.st_size, st.st_mtime_ns
+
+
+def measure_fragmentation(file_path: str, block_size: int) -> Dict[str, Any]:
+    """Hitung seberapa banyak block yang kebuang dibanding packing ideal.
+
+    Args:
+        file_path: Path ke file tabel
+        block_size: Block size target
+
+    Returns:
+        Dict dengan num_blocks, ideal_blocks, num_rows, dan dead_ratio
+        (porsi block yang bisa dihemat, 0.0 = udah padat)
+    """
+    with open(file_path, 'rb') as f:
+        _, _, num_blocks, options = read_table_header(f)
+        row_lengths = [len(buffer) for buffer in iter_row_buffers(f, num_blocks, options.get("compression"))]
+
+    # simulasi greedy packing yang sama kayak write_binary_table
+    ideal_blocks = 0
+    current_block_size = None
+    for row_length in row_lengths:
+        if current_block_size is None or current_block_size + row_length > block_size:
+            ideal_blocks += 1
+            current_block_size = 4
+        current_block_size += row_length
+
+    dead_ratio = (num_blocks - ideal_blocks) / num_blocks if num_blocks else 0.0
+    return {
+        "num_blocks": num_blocks,
+        "ideal_blocks": ideal_blocks,
+        "num_rows": len(row_lengths),
+        "dead_ratio": max(dead_ratio, 0.0),
+    }
+
+
+def compact_table_file(
+    file_path: str,
+    block_size: int,
+    blocks_per_step: int = 64,
+    pause: float = 0.0,
+    lock: Optional[ContextManager] = None
+) -> Optional[Dict[str, int]]:
+    """Pack ulang file tabel range per range, lalu swap atomik.
+
+    Row di-copy sebagai raw buffer (tanpa decode), jadi dictionary code dan
+    urutan row tetap sama. Record id ga berubah, index ga perlu di-remap.
+
+    Args:
+        file_path: Path ke file tabel
+        block_size: Block size target
+        blocks_per_step: Jumlah block sumber yang diproses per langkah
+        pause: Jeda (detik) antar langkah biar ga monopoli I/O
+        lock: Lock tabel yang juga dipegang writer. Copy jalan tanpa lock,
+            cek signature + os.replace dikerjain sambil megang lock ini
+
+    Returns:
+        Dict blocks_before/blocks_after, atau None kalo file berubah selama
+        compaction (hasil dibuang, coba lagi nanti)
+    """
+    signature = _file_signature(file_path)
+    schema, options, offsets = compute_block_offsets(file_path)
+    compression = options.get("compression")
+    temp_path = file_path + ".compact"
+
+    blocks_written = 0
+    try:
+        with open(file_path, 'rb') as src, open(temp_path, 'wb') as dst:
+            # num_blocks diisi belakangan setelah semua block ditulis
+            write_table_header(dst, schema, block_size, 0, options)
+            num_blocks_pos = dst.tell() - 4
+
+            pending = []
+            num_steps = max(1, -(-len(offsets) // blocks_per_step))
+            for start_offset, count in partition_blocks(offsets, num_steps):
+                src.seek(start_offset)
+                pending.extend(iter_row_buffers(src, count, compression))
+
+                # tulis block yang udah penuh, block terakhir (belum penuh) dibawa ke range berikutnya
+                blocks = group_rows_into_blocks(pending, block_size)
+                for block in blocks[:-1]:
+                    dst.write(encode_block(block, compression))
+                blocks_written += max(len(blocks) - 1, 0)
+                pending = blocks[-1] if blocks else []
+
+                if pause:
+                    time.sleep(pause)
+
+            if pending:
+                dst.write(encode_block(pending, compression))
+                blocks_written += 1
+
+            dst.seek(num_blocks_pos)
+            dst.write(blocks_written.to_bytes(4, 'little'))
+            dst.flush()
+            os.fsync(dst.fileno())
+
+        with lock if lock is not None else nullcontext():
+            if _file_signature(file_path) != signature:
+                # ada write selama compaction: buang hasil, file asli ga disentuh
+                os.remove(temp_path)
+                return None
+
+            os.replace(temp_path, file_path)
+    except Exception:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+    return {"blocks_before": len(offsets), "blocks_after": blocks_written}
+
+
+class CompactionWorker(threading.Thread):
+    """Thread background yang compact tabel dengan dead space di atas threshold.
+
+    Args:
+        storage_manager: Instance StorageManager
+        interval: Jeda (detik) antar putaran cek semua tabel
+        threshold: dead_ratio minimal supaya tabel di-compact
+    """
+
+    def __init__(self, storage_manager: "StorageManager", interval: float = 60.0, threshold: float = 0.2):
+        super().__init__(daemon=True, name="storage-compaction")
+        self.storage_manager = storage_manager
+        self.interval = interval
+        self.threshold = threshold
+        self.compacted: Dict[str, int] = {}
+        self._stopped = threading.Event()
+
+    def run(self) -> None:
+        while not self._stopped.is_set():
+            self.run_once()
+            self._stopped.wait(self.interval)
+
+    def run_once(self) -> None:
+        # satu putaran: cek semua tabel, compact yang lewat threshold
+        for table_name in list(self.storage_manager.tables):
+            if self._stopped.is_set():
+                return
+            try:
+                if self.storage_manager.compact_table(table_name, self.threshold) is not None:
+                    self.compacted[table_name] = self.compacted.get(table_name, 0) + 1
+            except Exception as e:
+                print(f"compaction tabel '{table_name}' gagal: {e}")
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self.is_alive():
+            self.join()
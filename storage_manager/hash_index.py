@@ -2,23 +2,33 @@ from collections import defaultdict
 import pickle
 import os
 
-class HashIndex:
+from .change_buffer import ChangeBufferedIndex
+
+class HashIndex(ChangeBufferedIndex):
     # hash index buat optimasi query equality (WHERE col = value)
     # nyimpen mapping dari value ke list record_id
+    # perubahan yang di-buffer (buffer_changes) di-merge otomatis sebelum baca
 
     def __init__(self, table_name : str, column_name : str):
         # inisialisasi hash index
         self.index = defaultdict(list)
         self.table_name = table_name
         self.column_name = column_name
+        self._pending = []
 
     def insert(self, key: str, record_id: int):
         # masukin key-value pair ke index
         # key bisa duplikat (multiple records dengan value yang sama)
+        self.merge_pending()
+        self._apply_insert(key, record_id)
+
+    def _lookup(self, key):
+        return self.index.get(key, [])
+
+    def _apply_insert(self, key: str, record_id: int):
         self.index[key].append(record_id)
 
-    def delete(self, key: str, record_id: int):
-        # hapus record_id dari key tertentu
+    def _apply_delete(self, key: str, record_id: int):
         if key in self.index:
             if record_id in self.index[key]:
                 self.index[key].remove(record_id)
@@ -26,11 +36,36 @@ class HashIndex:
                 if not self.index[key]:
                     del self.index[key]
 
+    def delete(self, key: str, record_id: int):
+        # hapus record_id dari key tertentu
+        self.merge_pending()
+        self._apply_delete(key, record_id)
+
+    def bulk_build(self, entries):
+        # bangun ulang index dari iterable (key, record_id) sekaligus
+        self.discard_pending()
+        index = defaultdict(list)
+        for key, record_id in entries:
+            index[key].append(record_id)
+        self.index = index
+
+    def remap_record_ids(self, mapping: dict):
+        # ganti record_id lama ke baru dalam satu pass (id yang ga ada di mapping tetap)
+        self.merge_pending()
+        for key, record_ids in self.index.items():
+            self.index[key] = [mapping.get(record_id, record_id) for record_id in record_ids]
+
     def search(self, key):
         # cari record_ids yang match dengan key
         # return empty list kalo ga ada
+        self.merge_pending()
         return self.index.get(key, [])
 
+    def count_keys(self) -> int:
+        # jumlah key distinct di index (tabel ga dibaca)
+        self.merge_pending()
+        return len(self.index)
+
     def save(self, filepath: str):
         # save index ke binary file pake pickle
         dir_path = os.path.dirname(filepath)
@@ -0,0 +1,192 @@
+"""Engine tabel in-memory (ENGINE=MEMORY) buat tabel lookup kecil yang hot.
+
+Tabel disk selalu baca file (plus decode) tiap read_block, walaupun isinya
+cuma puluhan row yang dibaca terus-terusan. Tabel ENGINE=MEMORY nyimpen
+row di RAM secara kolumnar: kolom INTEGER / FLOAT pake array('q') /
+array('d') selama isinya homogen, kolom lain list biasa. read_block
+dijawab langsung dari situ tanpa I/O; lookup equality pake hash
+value -> posisi yang dibangun lazy per kolom dan dibuang tiap ada write.
+
+File tabel (.dat) cuma jadi snapshot: ditulis ulang pas checkpoint FRM
+(dan tiap MEMORY_SNAPSHOT_ROWS perubahan row), di-load balik pas startup.
+Perubahan setelah snapshot terakhir di-redo dari WAL sama recovery FRM.
+"""
+from __future__ import annotations
+
+import os
+from array import array
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from .utils import read_binary_table_streaming, read_table_options, write_binary_table
+
+# tipe kolom yang bisa disimpen di array: data_type -> (typecode, tipe python persis)
+_ARRAY_TYPES = {"INTEGER": ("q", int), "FLOAT": ("d", float)}
+
+
+class MemoryColumn:
+    """Satu kolom tabel memory.
+
+    Mulai sebagai array kalo tipenya INTEGER / FLOAT. Begitu ada value yang
+    ga muat (NULL, int di luar 64 bit, int di kolom FLOAT) kolomnya turun
+    jadi list biar value-nya balik persis sama kayak yang disimpen.
+
+    Args:
+        data_type: Tipe kolom dari schema
+    """
+
+    def __init__(self, data_type: Optional[str] = None):
+        spec = _ARRAY_TYPES.get(data_type)
+        self.values = array(spec[0]) if spec else []
+        self._exact_type = spec[1] if spec else None
+
+    def append(self, value: Any) -> None:
+        if isinstance(self.values, array):
+            if type(value) is self._exact_type:
+                try:
+                    self.values.append(value)
+                    return
+                except OverflowError:
+                    pass
+            self.values = list(self.values)
+        self.values.append(value)
+
+
+class MemoryTable:
+    """Isi satu tabel ENGINE=MEMORY.
+
+    Args:
+        columns: Definisi kolom dari metadata tabel (list dict name, data_type, ...)
+    """
+
+    def __init__(self, columns: List[Dict[str, Any]]):
+        self.schema = [c["name"] for c in columns]
+        self._types = {c["name"]: c.get("data_type") for c in columns}
+        self.columns = self._empty_columns()
+        self.num_rows = 0
+        # jumlah row yang berubah sejak snapshot terakhir
+        self.dirty_rows = 0
+        self._lookups: Dict[str, Dict[Any, List[int]]] = {}
+
+    def __len__(self) -> int:
+        return self.num_rows
+
+    def _empty_columns(self) -> Dict[str, MemoryColumn]:
+        return {name: MemoryColumn(self._types.get(name)) for name in self.schema}
+
+    def append_rows(self, rows: List[Dict[str, Any]]) -> None:
+        """Tambah row di ujung tabel (record id lanjut dari num_rows)."""
+        for row in rows:
+            for name, column in self.columns.items():
+                column.append(row.get(name))
+        self.num_rows += len(rows)
+        self.dirty_rows += len(rows)
+        self._lookups = {}
+
+    def replace_rows(self, rows: List[Dict[str, Any]], changed_rows: Optional[int] = None) -> None:
+        """Ganti semua isi tabel (hasil update / delete).
+
+        Args:
+            rows: Isi tabel yang baru, urut record id
+            changed_rows: Jumlah row yang di-update / dihapus, dihitung ke
+                dirty_rows (None = anggap semua row berubah)
+        """
+        columns = self._empty_columns()
+        for row in rows:
+            for name, column in columns.items():
+                column.append(row.get(name))
+        # scan yang lagi jalan tetap pake kolom lama, jadi di-swap sekaligus
+        self.columns = columns
+        self.num_rows = len(rows)
+        self.dirty_rows += len(rows) if changed_rows is None else changed_rows
+        self._lookups = {}
+
+    def rows(self) -> List[Dict[str, Any]]:
+        """Semua row sebagai dict, urut record id."""
+        return list(self.scan())
+
+    def _positions(self, column: str, operand: Any) -> Optional[List[int]]:
+        # posisi row dengan column == operand, None kalo operand ga bisa di-hash
+        lookup = self._lookups.get(column)
+        if lookup is None:
+            lookup = {}
+            for position, value in enumerate(self.columns[column].values[:self.num_rows]):
+                try:
+                    lookup.setdefault(value, []).append(position)
+                except TypeError:
+                    return None
+            self._lookups[column] = lookup
+        try:
+            return lookup.get(operand, [])
+        except TypeError:
+            return None
+
+    def scan(
+        self,
+        filter_fn: Optional[Callable[[Dict[str, Any]], bool]] = None,
+        columns: Optional[List[str]] = None,
+        equality_filters: Optional[List[Tuple[str, Any]]] = None,
+        plan: Optional[Dict[str, Any]] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield row yang lolos filter, urut record id.
+
+        Kondisi '=' pertama ke kolom tabel dijawab lewat hash lookup, sisa
+        kondisi tetap dicek filter_fn.
+
+        Args:
+            filter_fn: Optional function(row) -> bool
+            columns: Optional kolom output (None = semua kolom)
+            equality_filters: Optional list (column, operand) dari kondisi '='
+            plan: Optional access plan, diisi memory_lookup (kolom hash lookup)
+        """
+        num_rows = self.num_rows
+        values = [(name, column.values) for name, column in self.columns.items()]
+        positions = range(num_rows)
+        for column, operand in equality_filters or []:
+            if column not in self.columns:
+                continue
+            matched = self._positions(column, operand)
+            if matched is not None:
+                positions = matched
+                if plan is not None:
+                    plan["memory_lookup"] = column
+                break
+
+        output = [name for name in columns if name in self.columns] if columns else None
+        for position in positions:
+            row = {name: column_values[position] for name, column_values in values}
+            if filter_fn is not None and not filter_fn(row):
+                continue
+            yield {name: row[name] for name in output} if output is not None else row
+
+    def memory_bytes(self) -> int:
+        """Perkiraan ukuran buffer kolom (array dihitung per item, list per pointer)."""
+        total = 0
+        for column in self.columns.values():
+            values = column.values
+            total += len(values) * (values.itemsize if isinstance(values, array) else 8)
+        return total
+
+
+def load_memory_table(table_file: str, columns: List[Dict[str, Any]]) -> MemoryTable:
+    """Load isi tabel memory dari file snapshot (kosong kalo belum ada)."""
+    table = MemoryTable(columns)
+    if os.path.exists(table_file):
+        table.append_rows(list(read_binary_table_streaming(table_file)))
+    table.dirty_rows = 0
+    return table
+
+
+def write_snapshot(table_file: str, table: MemoryTable, block_size: int) -> None:
+    """Tulis isi tabel memory ke file snapshot, swap atomik biar snapshot lama aman kalo crash."""
+    options = read_table_options(table_file) if os.path.exists(table_file) else {}
+    temp_path = table_file + ".snapshot"
+    try:
+        write_binary_table(temp_path, table.rows(), table.schema, block_size, options)
+        with open(temp_path, 'rb+') as f:
+            os.fsync(f.fileno())
+        os.replace(temp_path, table_file)
+    except Exception:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    table.dirty_rows = 0
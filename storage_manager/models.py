@@ -209,6 +209,18 @@ class DataDeletion:
     conditions: List[Condition] = field(default_factory=list)
 
 
+@dataclass
+class DataTruncation:
+    """Parameter untuk operasi truncate_block (undo bulk load).
+    
+    Attributes:
+        table: Nama tabel (atau partisi) yang dipotong
+        num_rows: Jumlah row awal yang dipertahankan, row setelahnya dibuang
+    """
+    table: str
+    num_rows: int = 0
+
+
 @dataclass
 class DataUpdate:
     """Parameter untuk operasi update_by_old_new_data untuk FRM.
@@ -243,7 +255,16 @@ class Statistic:
         f_r: Blocking factor dari r (jumlah tuple yang muat dalam satu blok)
         V_a_r: Dictionary mapping kolom -> jumlah nilai distinct di kolom tersebut
         indexes: Dictionary mapping kolom -> info index (type dan height untuk btree)
-                 Format: {"column_name": {"type": "hash"|"btree", "height": int (for btree only)}}
+                 Format: {"column_name": {"type": "hash"|"btree", "height": int (for btree only),
+                          "clustering_factor": int, "clustered": bool (kalo tabel di-CLUSTER pake kolom ini)}}
+                 clustering_factor = jumlah perpindahan block kalo row di-fetch urut index
+                 (mendekati b_r = urut sesuai index, mendekati n_r = acak)
+                 btree juga punya "adaptive_hash": {"entries", "lookups", "hits", "hit_rate"}
+                 (point lookup yang dijawab dari hash key hot, bukan turun tree)
+        partitioning: Spec partisi kalo tabel dipartisi (None kalo ga)
+                 Format: {"type": "range", "column": c, "bounds": [...]}
+                      atau {"type": "hash", "column": c, "partitions": n}
+        partitions: Statistik tiap partisi (urut sesuai nomor partisi)
     
     Rumus:
         b_r = ceil(n_r / f_r)  jika tuple disimpan bersama secara fisik dalam satu file
@@ -254,3 +275,5 @@ class Statistic:
     f_r: int
     V_a_r: Dict[str, int] = field(default_factory=dict)
     indexes: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    partitioning: Optional[Dict[str, Any]] = None
+    partitions: List["Statistic"] = field(default_factory=list)
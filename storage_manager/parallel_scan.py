@@ -0,0 +1,268 @@
+"""Parallel full-table scan buat Storage Manager.
+
+Block tabel dibagi jadi beberapa range, terus tiap range di-decode dan
+di-filter di worker ProcessPoolExecutor. Worker nge-mmap file tabel sendiri
+dan cuma nerima offset awal + jumlah block, jadi yang dikirim antar proses
+cuma parameter scan dan row hasil filter.
+
+Range yang di-submit ke pool dibatasi sebanyak jumlah worker; range berikutnya
+baru di-submit setelah satu hasil diambil, jadi hasil yang belum di-consume
+ga numpuk di memory. Worker dibikin pake start method forkserver (atau spawn),
+bukan fork, karena process scan biasanya punya thread lain yang lagi jalan
+(readahead, compaction, sync scan).
+"""
+from __future__ import annotations
+
+import mmap
+import multiprocessing
+import os
+import struct
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from itertools import islice
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .models import Condition
+from .toast import open_toast_reader
+from .utils import evaluate_condition, iter_row_buffers, make_row_decoder, read_table_header
+
+# pool dipake ulang antar scan, bikin proses baru tiap query terlalu mahal
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_workers = 0
+
+# range scan maksimal segini block, biar hasil satu range yang ditahan di memory tetap kecil
+RANGE_MAX_BLOCKS = 64
+
+
+def default_worker_count() -> int:
+    """Jumlah worker default (jumlah CPU)."""
+    return os.cpu_count() or 1
+
+
+def compute_block_offsets(file_path: str) -> Tuple[List[str], Dict[str, Any], List[int]]:
+    """Hitung offset awal tiap block tanpa decode row.
+
+    Args:
+        file_path: Path ke file tabel
+
+    Returns:
+        Tuple (schema, options, offsets) dengan offsets[i] = posisi block ke-i
+    """
+    with open(file_path, 'rb') as f:
+        schema, _, num_blocks, options = read_table_header(f)
+        if num_blocks == 0:
+            return schema, options, []
+
+        compression = options.get("compression")
+        offsets = []
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            position = f.tell()
+            for _ in range(num_blocks):
+                offsets.append(position)
+                if compression == "zlib":
+                    # block compressed nyimpen panjang payload, langsung loncat
+                    _, compressed_length = struct.unpack_from('<II', mm, position)
+                    position += 8 + compressed_length
+                else:
+                    row_count = struct.unpack_from('<I', mm, position)[0]
+                    position += 4
+                    for _ in range(row_count):
+                        row_length = struct.unpack_from('<I', mm, position)[0]
+                        position += 4 + row_length
+
+    return schema, options, offsets
+
+
+def partition_blocks(offsets: List[int], num_partitions: int) -> List[Tuple[int, int]]:
+    """Bagi block jadi range yang kurang lebih sama besar.
+
+    Args:
+        offsets: Offset tiap block dari compute_block_offsets
+        num_partitions: Jumlah range yang diinginkan
+
+    Returns:
+        List (start_offset, num_blocks) sesuai urutan file
+    """
+    num_partitions = max(1, min(num_partitions, len(offsets)))
+    base, extra = divmod(len(offsets), num_partitions)
+
+    ranges = []
+    start = 0
+    for i in range(num_partitions):
+        count = base + (1 if i < extra else 0)
+        if count:
+            ranges.append((offsets[start], count))
+        start += count
+    return ranges
+
+
+def _make_scan_decoder(file_path, schema, options, columns, conditions):
+    # decoder row + filter kondisi (AND), dipake worker dan sisa scan yang di-handoff
+    row_filter = None
+    if conditions:
+        def row_filter(row):
+            return all(evaluate_condition(row, condition) for condition in conditions)
+
+    toast = open_toast_reader(file_path, options)
+    decode = make_row_decoder(
+        schema,
+        columns,
+        row_filter,
+        [condition.column for condition in conditions],
+        options.get("dictionaries"),
+        [(c.column, c.operand) for c in conditions if c.operation == "="],
+        toast
+    )
+    return decode, toast
+
+
+def _scan_block_range(task: Tuple[Any, ...]) -> List[Dict[str, Any]]:
+    # jalan di worker process: mmap file, decode + filter block di range-nya
+    file_path, schema, options, start_offset, num_blocks, columns, conditions = task
+    decode, toast = _make_scan_decoder(file_path, schema, options, columns, conditions)
+
+    rows = []
+    try:
+        with open(file_path, 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                mm.seek(start_offset)
+                for row_buffer in iter_row_buffers(mm, num_blocks, options.get("compression")):
+                    row = decode(row_buffer)
+                    if row is not None:
+                        rows.append(row)
+    finally:
+        if toast is not None:
+            toast.close()
+    return rows
+
+
+def _get_pool(max_workers: int) -> ProcessPoolExecutor:
+    global _pool, _pool_workers
+    if _pool is None or _pool_workers != max_workers:
+        if _pool is not None:
+            _pool.shutdown(wait=True)
+        _pool = ProcessPoolExecutor(max_workers=max_workers, mp_context=_worker_context())
+        _pool_workers = max_workers
+    return _pool
+
+
+def _worker_context() -> multiprocessing.context.BaseContext:
+    # fork dari process yang punya thread lain bisa nyalin lock yang lagi dipegang
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+def shutdown_scan_pool() -> None:
+    """Matikan worker pool (dibikin ulang otomatis di scan berikutnya)."""
+    global _pool, _pool_workers
+    if _pool is not None:
+        _pool.shutdown(wait=True)
+    _pool = None
+    _pool_workers = 0
+
+
+def parallel_scan(
+    file_path: str,
+    conditions: Optional[List[Condition]] = None,
+    columns: Optional[List[str]] = None,
+    max_workers: Optional[int] = None,
+    ordered: bool = True,
+    shared=None,
+    readahead: int = 0
+) -> Iterator[Dict[str, Any]]:
+    """Full scan paralel: tiap worker decode + filter satu range block.
+
+    Args:
+        file_path: Path ke file tabel
+        conditions: Kondisi filter (AND), dievaluasi di worker
+        columns: Kolom output (None = semua kolom)
+        max_workers: Jumlah worker process (None = jumlah CPU)
+        ordered: True = hasil di-merge sesuai urutan file (record id),
+            False = yield range yang duluan selesai. Dua-duanya cuma
+            nahan maksimal max_workers range di pool sekaligus
+        shared: Optional SharedScan tempat scan ini kedaftar (lihat
+            SyncScanRegistry.parallel_scan). Block pertama yang belum
+            di-submit dipublish sebagai posisi scan; begitu ada scan lain
+            yang nempel, range berikutnya ga di-submit lagi dan sisa block
+            dibaca serial lewat shared biar ke-share sama scan itu
+        readahead: Jumlah block yang di-prefetch pas baca serial lewat shared
+
+    Yields:
+        Dict[str, Any]: Row yang lolos filter
+    """
+    conditions = list(conditions or [])
+    max_workers = max_workers or default_worker_count()
+
+    if shared is not None:
+        schema, options, offsets = shared.schema, shared.options, shared.offsets
+    else:
+        schema, options, offsets = compute_block_offsets(file_path)
+    if not offsets:
+        return
+
+    # range lebih banyak dari worker biar load-nya rata, dan ga lebih dari RANGE_MAX_BLOCKS block
+    num_ranges = max(max_workers * 4, -(-len(offsets) // RANGE_MAX_BLOCKS))
+    tasks = (
+        (file_path, schema, options, start_offset, num_blocks, columns, conditions)
+        for start_offset, num_blocks in partition_blocks(offsets, num_ranges)
+    )
+
+    pool = _get_pool(max_workers)
+    # range yang lagi jalan + hasil yang belum di-consume, maksimal max_workers (urutan submit)
+    pending: List[Future] = []
+    # jumlah block tiap range yang belum di-consume
+    range_blocks: Dict[Future, int] = {}
+    # block pertama yang belum di-submit ke pool
+    next_block = 0
+
+    def submit(count: int) -> None:
+        nonlocal next_block
+        first_block = next_block
+        for task in islice(tasks, count):
+            future = pool.submit(_scan_block_range, task)
+            pending.append(future)
+            range_blocks[future] = task[4]
+            next_block += task[4]
+        if shared is not None:
+            # scan yang nempel baca mulai next_block; window ditahan selebar block
+            # yang masih harus di-consume scan ini sebelum nyusul ke sana
+            shared.advance(next_block, next_block - first_block, sum(range_blocks.values()))
+
+    submit(max_workers)
+    try:
+        while pending:
+            if ordered:
+                future = pending[0]
+            else:
+                # yield range yang duluan selesai
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                future = next(f for f in pending if f in done)
+            rows = future.result()
+            pending.remove(future)
+            # slot kosong langsung diisi range berikutnya sebelum hasil ini di-consume,
+            # kecuali ada scan lain yang nempel: sisa block dibaca bareng scan itu
+            if shared is None or shared.consumers <= 1:
+                submit(1)
+            yield from rows
+            del range_blocks[future]
+
+        if next_block < len(offsets):
+            decode, toast = _make_scan_decoder(file_path, schema, options, columns, conditions)
+            try:
+                with open(file_path, 'rb') as f:
+                    blocks = shared.iter_blocks(f, next_block, len(offsets) - next_block, readahead)
+                    try:
+                        for row_buffers in blocks:
+                            for row_buffer in row_buffers:
+                                row = decode(row_buffer)
+                                if row is not None:
+                                    yield row
+                    finally:
+                        # stop prefetcher sebelum file-nya ditutup
+                        blocks.close()
+            finally:
+                if toast is not None:
+                    toast.close()
+    finally:
+        # consumer berhenti di tengah: batalin range yang belum jalan
+        for future in pending:
+            future.cancel()
@@ -0,0 +1,176 @@
+"""Partitioning tabel (range / hash) buat Storage Manager.
+
+Tabel yang dipartisi ga punya file sendiri. Tiap partisi disimpen sebagai
+tabel internal "{tabel}.p{i}" dengan file, index, dan statistik sendiri.
+Titik ga valid di nama tabel user, jadi nama partisi ga bakal bentrok.
+
+Spec partisi:
+    {"type": "range", "column": c, "bounds": [b1, b2, ...]}
+        p0: key < b1, p1: b1 <= key < b2, ..., p_n: key >= b_n (NULL masuk p0)
+    {"type": "hash", "column": c, "partitions": n}
+        p_i: stable_hash(key) % n == i
+"""
+from __future__ import annotations
+
+import zlib
+from bisect import bisect_right
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .models import Condition
+
+PARTITION_TYPES = ("range", "hash")
+
+
+def normalize_partitioning(spec: Dict[str, Any], column_names: Iterable[str]) -> Dict[str, Any]:
+    """Validasi spec partisi dan balikin versi yang udah dinormalisasi.
+
+    Args:
+        spec: Spec partisi dari create_table
+        column_names: Nama kolom tabel
+
+    Returns:
+        Dict spec dengan type lowercase dan bounds terurut
+
+    Raises:
+        ValueError: Jika spec tidak valid
+    """
+    if not isinstance(spec, dict):
+        raise ValueError("partition_by harus dict")
+
+    partition_type = str(spec.get("type", "")).lower()
+    if partition_type not in PARTITION_TYPES:
+        raise ValueError(f"Partition type '{spec.get('type')}' tidak didukung. Pilihan: {list(PARTITION_TYPES)}")
+
+    column = spec.get("column")
+    if column not in set(column_names):
+        raise ValueError(f"Partition column '{column}' tidak ada di columns")
+
+    if partition_type == "range":
+        bounds = list(spec.get("bounds") or [])
+        if not bounds:
+            raise ValueError("Range partitioning butuh minimal satu bound")
+        if any(bound is None for bound in bounds):
+            raise ValueError("Bound range partition tidak boleh NULL")
+        try:
+            increasing = all(a < b for a, b in zip(bounds, bounds[1:]))
+        except TypeError:
+            raise ValueError("Bound range partition harus satu tipe yang bisa dibandingkan")
+        if not increasing:
+            raise ValueError("Bound range partition harus naik dan unik")
+        return {"type": "range", "column": column, "bounds": bounds}
+
+    num_partitions = spec.get("partitions")
+    if not isinstance(num_partitions, int) or isinstance(num_partitions, bool) or num_partitions < 1:
+        raise ValueError("Hash partitioning butuh 'partitions' integer >= 1")
+    return {"type": "hash", "column": column, "partitions": num_partitions}
+
+
+def partition_count(spec: Dict[str, Any]) -> int:
+    """Jumlah partisi fisik dari spec."""
+    if spec["type"] == "range":
+        return len(spec["bounds"]) + 1
+    return spec["partitions"]
+
+
+def partition_table_name(table_name: str, partition: int) -> str:
+    """Nama tabel internal buat partisi ke-i."""
+    return f"{table_name}.p{partition}"
+
+
+def _stable_hash(value: Any) -> int:
+    # hash() bawaan python buat str diacak per process, padahal routing
+    # harus sama terus antar restart. int dan float bulat di-hash sama
+    # biar 5 dan 5.0 masuk partisi yang sama (5 == 5.0)
+    if value is None:
+        return 0
+    if isinstance(value, (bool, int)):
+        return int(value)
+    if isinstance(value, float):
+        if value.is_integer():
+            return int(value)
+        return zlib.crc32(repr(value).encode('utf-8'))
+    return zlib.crc32(str(value).encode('utf-8'))
+
+
+def route_value(spec: Dict[str, Any], value: Any) -> int:
+    """Tentuin partisi buat satu nilai partition key.
+
+    Args:
+        spec: Spec partisi
+        value: Nilai kolom partisi
+
+    Returns:
+        Nomor partisi
+
+    Raises:
+        ValueError: Jika nilai ga bisa dibandingin sama bound range
+    """
+    if spec["type"] == "hash":
+        return _stable_hash(value) % spec["partitions"]
+
+    if value is None:
+        return 0
+    try:
+        return bisect_right(spec["bounds"], value)
+    except TypeError:
+        raise ValueError(f"Nilai '{value}' tidak bisa dibandingkan dengan bound partisi kolom '{spec['column']}'")
+
+
+def route_row(spec: Dict[str, Any], row: Dict[str, Any]) -> int:
+    """Tentuin partisi buat satu row."""
+    return route_value(spec, row.get(spec["column"]))
+
+
+def partition_bounds(spec: Dict[str, Any], partition: int) -> Tuple[Any, Any]:
+    """Range [lower, upper) partisi range (None = ga dibatasi)."""
+    bounds = spec["bounds"]
+    lower = bounds[partition - 1] if partition > 0 else None
+    upper = bounds[partition] if partition < len(bounds) else None
+    return lower, upper
+
+
+def _range_partition_may_match(spec: Dict[str, Any], partition: int, condition: Condition) -> bool:
+    lower, upper = partition_bounds(spec, partition)
+    operand = condition.operand
+    op = condition.operation
+
+    try:
+        if op == "=":
+            return route_value(spec, operand) == partition
+        if op in ("<", "<="):
+            # ada key di [lower, upper) yang < / <= operand
+            return lower is None or (lower < operand if op == "<" else lower <= operand)
+        if op in (">", ">="):
+            # ada key di [lower, upper) yang > / >= operand
+            return upper is None or operand < upper
+    except (TypeError, ValueError):
+        # tipe operand beda sama bound: ga bisa dipastiin, partisi tetap discan
+        return True
+    return True
+
+
+def prune_partitions(spec: Dict[str, Any], conditions: Optional[List[Condition]]) -> List[int]:
+    """Buang partisi yang bound-nya pasti ga match sama kondisi (AND).
+
+    Kondisi ke kolom lain atau operator yang ga bisa dipake ('<>') ga
+    ngebuang partisi apa-apa.
+
+    Args:
+        spec: Spec partisi
+        conditions: Kondisi filter (AND)
+
+    Returns:
+        List nomor partisi yang masih perlu discan, urut naik
+    """
+    candidates = list(range(partition_count(spec)))
+    for condition in conditions or []:
+        if condition.column != spec["column"] or condition.operand is None:
+            continue
+
+        if spec["type"] == "hash":
+            if condition.operation == "=":
+                target = route_value(spec, condition.operand)
+                candidates = [p for p in candidates if p == target]
+        else:
+            candidates = [p for p in candidates if _range_partition_may_match(spec, p, condition)]
+    return candidates
@@ -0,0 +1,120 @@
+"""Readahead (prefetch) block buat sequential scan.
+
+Thread background baca (dan decompress) N block berikutnya ke queue
+selagi thread scan decode block yang sekarang. File read dan zlib
+decompress ngelepas GIL, jadi I/O jalan barengan sama decoding.
+"""
+from __future__ import annotations
+
+import queue
+import threading
+from dataclasses import dataclass
+from typing import Callable, Iterator, List, Optional
+
+_END = object()
+
+
+@dataclass
+class PrefetchStats:
+    """Statistik readahead.
+
+    Attributes:
+        blocks: Jumlah block yang di-consume scan
+        hits: Block yang udah siap di queue pas diminta
+        misses: Block yang harus ditunggu (reader belum selesai baca)
+    """
+    blocks: int = 0
+    hits: int = 0
+    misses: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.blocks if self.blocks else 0.0
+
+    def add(self, other: "PrefetchStats") -> None:
+        self.blocks += other.blocks
+        self.hits += other.hits
+        self.misses += other.misses
+
+
+class _BlockPrefetcher(threading.Thread):
+    # producer: baca block ke queue sampe habis atau di-stop
+    def __init__(self, read_block: Callable[[], Optional[List[bytes]]], num_blocks: int, depth: int):
+        super().__init__(daemon=True)
+        self.read_block = read_block
+        self.num_blocks = num_blocks
+        self.blocks: "queue.Queue" = queue.Queue(maxsize=depth)
+        self.stopped = threading.Event()
+
+    def run(self) -> None:
+        try:
+            for _ in range(self.num_blocks):
+                if self.stopped.is_set():
+                    return
+                rows = self.read_block()
+                if rows is None or not self._put(rows):
+                    break
+        except Exception as e:
+            # error dioper ke thread scan biar di-raise di sana
+            self._put(e)
+            return
+        self._put(_END)
+
+    def _put(self, item) -> bool:
+        # put yang bisa dibatalin kalo consumer udah berhenti
+        while not self.stopped.is_set():
+            try:
+                self.blocks.put(item, timeout=0.05)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def stop(self) -> None:
+        self.stopped.set()
+        self.join()
+
+
+def iter_prefetched_blocks(
+    read_block: Callable[[], Optional[List[bytes]]],
+    num_blocks: int,
+    depth: int = 4,
+    stats: Optional[PrefetchStats] = None
+) -> Iterator[List[bytes]]:
+    """Yield block hasil read_block, dengan N block berikutnya dibaca di background.
+
+    Args:
+        read_block: Function yang baca block berikutnya (None = file habis)
+        num_blocks: Jumlah block yang mau dibaca
+        depth: Maksimal block yang di-prefetch
+        stats: Optional PrefetchStats yang di-update selama scan
+
+    Yields:
+        List[bytes]: Row buffer dari satu block
+    """
+    prefetcher = _BlockPrefetcher(read_block, num_blocks, max(depth, 1))
+    prefetcher.start()
+    try:
+        while True:
+            try:
+                item = prefetcher.blocks.get_nowait()
+                ready = True
+            except queue.Empty:
+                item = prefetcher.blocks.get()
+                ready = False
+
+            if item is _END:
+                return
+            if isinstance(item, Exception):
+                raise item
+
+            if stats is not None:
+                stats.blocks += 1
+                if ready:
+                    stats.hits += 1
+                else:
+                    stats.misses += 1
+            yield item
+    finally:
+        # stop reader sebelum file ditutup sama caller
+        prefetcher.stop()
@@ -1,11 +1,42 @@
 from __future__ import annotations
 
 import os
+import json
+import math
 import struct
 import pickle
-from typing import Any, Dict, List, Optional, Union, Tuple
+import heapq
+import threading
+from contextlib import nullcontext
+from functools import wraps
+from dataclasses import replace
+from itertools import islice
+from typing import Any, Callable, Dict, Iterator, List, Optional, Union, Tuple
 from .hash_index import HashIndex
 from .btree_index import BPlusTreeIndex
+from .change_buffer import IndexChangeLog
+from .memory_engine import MemoryTable, load_memory_table, write_snapshot
+from .parallel_scan import parallel_scan, default_worker_count
+from .readahead import PrefetchStats
+from .sync_scan import SyncScanRegistry
+from .toast import open_toast_reader, toast_file_path
+from .compaction import CompactionWorker, compact_table_file, measure_fragmentation
+from .clustering import (
+    cluster_table_file,
+    clustered_fetch_cost,
+    clustering_factor,
+    compute_block_directory,
+    locate_block,
+)
+from .bulk_load import BlockAppender, compile_row_validator, detect_format, ensure_table_file, open_source
+from .partitioning import (
+    normalize_partitioning,
+    partition_count,
+    partition_table_name,
+    prune_partitions,
+    route_row,
+    route_value,
+)
 
 from .models import (
     Condition,
@@ -13,17 +44,22 @@ from .models import (
     DataWrite,
     DataDeletion,
     DataUpdate,
+    DataTruncation,
     Statistic,
     ColumnDefinition,
     ForeignKey
 )
 from .utils import (
     evaluate_condition,
-    project_columns,
     validate_table_name,
     validate_row_for_schema,
     validate_value_for_column,
     read_binary_table_streaming,
+    read_binary_table_batches,
+    read_table_header,
+    iter_row_buffers,
+    make_row_decoder,
+    normalize_storage_options,
     write_binary_table,
     append_row_to_table,
     append_block_to_table,
@@ -32,6 +68,17 @@ from .utils import (
 )
 
 
+def _table_writer(method: Callable) -> Callable:
+    # writer file tabel pegang lock tabel selama nulis, jadi compaction ga bisa
+    # nge-swap file di antara cek signature dan os.replace
+    @wraps(method)
+    def locked(self, target, *args, **kwargs):
+        table_name = getattr(target, "table", target)
+        with self._table_lock(table_name):
+            return method(self, target, *args, **kwargs)
+    return locked
+
+
 class StorageManager:
     # kelas utama buat ngatur penyimpanan data
     # tugasnya: simpan data ke binary file, baca/tulis/hapus blok, kelola index, kasih statistik
@@ -40,6 +87,32 @@ class StorageManager:
     _instance: Optional['StorageManager'] = None
     _initialized: bool = False
 
+    # bobot cost buat milih access path (sama kayak default di query_optimizer/cost.py)
+    SEQUENTIAL_IO_COST = 1.0
+    RANDOM_IO_COST = 1.5
+    DEFAULT_RANGE_SELECTIVITY = 0.33
+
+    # full scan tabel yang minimal segini block-nya dijalanin paralel (None = off)
+    PARALLEL_SCAN_MIN_BLOCKS: Optional[int] = 256
+    # jumlah worker process buat parallel scan (None = jumlah CPU)
+    PARALLEL_SCAN_WORKERS: Optional[int] = None
+    # jumlah block yang dibaca duluan di background pas sequential scan (0 = off)
+    READAHEAD_DEPTH = 4
+    # full scan tabel yang minimal segini block-nya jalan sebagai synchronized scan (None = off)
+    SYNC_SCAN_MIN_BLOCKS: Optional[int] = 64
+    # jumlah block terakhir yang disimpen buat scan lain yang nempel
+    SYNC_SCAN_WINDOW = 32
+    # tabel di-compact kalo porsi block yang bisa dihemat >= threshold ini
+    COMPACTION_DEAD_SPACE_THRESHOLD = 0.2
+    # bulk load manggil on_batch tiap segini row
+    BULK_LOAD_BATCH_ROWS = 1000
+    # perubahan index dari insert/update di-buffer, di-merge kalo udah segini (0 = langsung)
+    INDEX_CHANGE_BUFFER_SIZE = 256
+    # scan urut index: record id diambil dari index segini per pass file (dobel tiap pass)
+    INDEX_ORDER_CHUNK_ROWS = 64
+    # tabel ENGINE=MEMORY di-snapshot ke file tiap segini row berubah (None = cuma pas checkpoint)
+    MEMORY_SNAPSHOT_ROWS: Optional[int] = 1000
+
     def __new__(cls, data_dir: str = "data", block_size: int = 4096):
         # singleton pattern: cuma bikin instance sekali
         if cls._instance is None:
@@ -62,11 +135,32 @@ class StorageManager:
         self.tables: Dict[str, Dict[str, Any]] = {}
         self.stats: Dict[str, Statistic] = {}
         self.indexes: Dict[tuple, Any] = {}
+        # isi tabel ENGINE=MEMORY (file tabelnya cuma snapshot)
+        self.memory_tables: Dict[str, MemoryTable] = {}
+        # redo log perubahan index yang masih di buffer (belum masuk file index)
+        self.index_change_log = IndexChangeLog(self.data_dir)
+
+        # keputusan access path terakhir dari read_block (buat instrumentation)
+        self.last_access_plan: Dict[str, Any] = {}
+        # statistik readahead kumulatif dari semua sequential scan
+        self.prefetch_stats = PrefetchStats()
+        # full scan yang lagi jalan per file tabel (buat synchronized scan)
+        self.sync_scans = SyncScanRegistry(self.SYNC_SCAN_WINDOW)
+        # worker vacuum background (None = belum jalan)
+        self._compaction_worker: Optional[CompactionWorker] = None
+        # cache directory block (offset + record id pertama) per file, dicek pake size/mtime
+        self._block_directories: Dict[str, Tuple[tuple, Tuple[List[int], List[int]]]] = {}
+        # statistik murah buat pilih access path per tabel, dicek pake signature file + index
+        self._access_path_stats: Dict[str, Tuple[tuple, Statistic]] = {}
+        # lock per tabel yang dipegang writer dan swap file compaction
+        self._table_locks: Dict[str, threading.RLock] = {}
+        self._table_locks_guard = threading.Lock()
 
         if not os.path.exists(self.data_dir):
             os.makedirs(self.data_dir)
 
         self._load_table_schemas()
+        self._load_memory_tables()
         self._load_indexes()
         print(f"storage manager diinisialisasi di: {os.path.abspath(self.data_dir)}")
 
@@ -98,7 +192,13 @@ class StorageManager:
             try:
                 # parse filename: __index__table_column.idx
                 name_part = index_file[9:-4]  # remove "__index__" and ".idx"
-                parts = name_part.split("_", 1)  # split jadi table dan column
+                # nama tabel bisa ada "_"-nya, jadi cocokin ke tabel yang dikenal dulu
+                known_tables = [t for t in self.tables if name_part.startswith(t + "_")]
+                if known_tables:
+                    table = max(known_tables, key=len)
+                    parts = [table, name_part[len(table) + 1:]]
+                else:
+                    parts = name_part.split("_", 1)  # split jadi table dan column
                 if len(parts) == 2:
                     table, column = parts
                     index_path = os.path.join(self.data_dir, index_file)
@@ -119,13 +219,22 @@ class StorageManager:
                         index.index = loaded_index
 
                     # simpan ke memory
-                    self.indexes[(table, column)] = index
+                    self._register_index(table, column, index)
             except Exception as e:
                 print(f"error loading index {index_file}: {e}")
 
         if self.indexes:
             print(f"loaded {len(self.indexes)} index dari disk")
 
+        # replay perubahan index yang belum sempet di-merge sebelum shutdown / crash
+        replayed = 0
+        for key, changes in self.index_change_log.load().items():
+            if key in self.indexes:
+                self.indexes[key].buffer_changes(changes)
+                replayed += len(changes)
+        if replayed:
+            print(f"replay {replayed} perubahan index dari change log")
+
     def _save_table_schemas(self) -> None:
         # simpen schema semua tabel ke metadata file
         metadata_file = self._get_metadata_file_path()
@@ -145,12 +254,15 @@ class StorageManager:
     def _write_binary_metadata(self, file_path: str, tables: Dict[str, Dict[str, Any]]) -> None:
         # tulis metadata ke binary file
         # formatnya: magic bytes, version, jumlah tabel, terus info tiap tabel
+        # version 2 nambahin JSON extra (info partisi / clustering) di akhir tiap tabel,
+        # cuma dipake kalo ada tabel yang butuh biar file lama tetap v1
+        version = 2 if any(self._table_meta_extra(meta) for meta in tables.values()) else 1
         with open(file_path, 'wb') as f:
             # tulis magic bytes
             f.write(b'META')
 
             # tulis version
-            f.write(struct.pack('<I', 1))
+            f.write(struct.pack('<I', version))
 
             # tulis jumlah tabel
             f.write(struct.pack('<I', len(tables)))
@@ -242,6 +354,21 @@ class StorageManager:
                     f.write(struct.pack('<I', len(on_upd)))
                     f.write(on_upd)
 
+                # tulis extra (partitioning / partition_of / clustered_on) sebagai JSON
+                if version >= 2:
+                    extra = self._table_meta_extra(table_meta)
+                    extra_bytes = json.dumps(extra).encode('utf-8') if extra else b''
+                    f.write(struct.pack('<I', len(extra_bytes)))
+                    f.write(extra_bytes)
+
+    def _table_meta_extra(self, table_meta: Dict[str, Any]) -> Dict[str, Any]:
+        # field metadata di luar format v1 (info partisi, kolom clustering)
+        return {
+            key: table_meta[key]
+            for key in ("partitioning", "partition_of", "clustered_on", "engine")
+            if key in table_meta
+        }
+
     def _read_binary_metadata(self, file_path: str) -> Dict[str, Dict[str, Any]]:
         # baca metadata dari binary file
         with open(file_path, 'rb') as f:
@@ -252,7 +379,7 @@ class StorageManager:
 
             # baca version
             version = struct.unpack('<I', f.read(4))[0]
-            if version != 1:
+            if version not in (1, 2):
                 raise ValueError(f"unsupported metadata version: {version}")
 
             # baca jumlah tabel
@@ -351,6 +478,12 @@ class StorageManager:
                     'foreign_keys': foreign_keys
                 }
 
+                # baca extra (v2)
+                if version >= 2:
+                    extra_len = struct.unpack('<I', f.read(4))[0]
+                    if extra_len:
+                        tables[table_name].update(json.loads(f.read(extra_len).decode('utf-8')))
+
             return tables
 
 
@@ -361,16 +494,30 @@ class StorageManager:
         table_name: str,
         columns: Union[List[str], List[ColumnDefinition]],
         primary_keys: Optional[List[str]] = None,
-        foreign_keys: Optional[List[ForeignKey]] = None
+        foreign_keys: Optional[List[ForeignKey]] = None,
+        storage_options: Optional[Dict[str, Any]] = None,
+        partition_by: Optional[Dict[str, Any]] = None,
+        engine: str = "disk"
     ) -> None:
         # bikin tabel baru dengan schema dan constraints
         # bisa pake list nama kolom aja atau list columndefinition yang lebih lengkap
+        # storage_options opsional: {"compression": "zlib", "dictionary_columns": [...]}
+        # disimpen di header file tabel, bukan di metadata
+        # partition_by opsional: {"type": "range", "column": c, "bounds": [...]}
+        # atau {"type": "hash", "column": c, "partitions": n}, tiap partisi jadi file sendiri
+        # engine "memory": row disimpen di RAM, file tabel cuma snapshot (ENGINE=MEMORY)
         if not validate_table_name(table_name):
             raise ValueError(f"Nama tabel tidak valid: {table_name}")
 
         if table_name in self.tables:
             raise ValueError(f"Tabel '{table_name}' sudah ada")
 
+        engine = (engine or "disk").lower()
+        if engine not in ("disk", "memory"):
+            raise ValueError(f"Engine '{engine}' tidak dikenal (disk / memory)")
+        if engine == "memory" and partition_by is not None:
+            raise ValueError("Tabel ENGINE=MEMORY tidak bisa dipartisi")
+
         # kalo columns cuma list string, convert ke columndefinition dengan default varchar 255
         if columns and isinstance(columns[0], str):
             column_defs = [
@@ -399,42 +546,162 @@ class StorageManager:
                 if fk.references_table not in self.tables:
                     raise ValueError(f"Referenced table '{fk.references_table}' tidak ditemukan")
 
+                # cek FK jalan per file tabel, belum bisa lintas partisi
+                if partition_by or self._is_partitioned(fk.references_table):
+                    raise ValueError("Foreign key belum didukung untuk tabel yang dipartisi")
+
+        # validasi storage options
+        storage_options = normalize_storage_options(storage_options)
+        column_names = {c.name for c in column_defs}
+        for col in storage_options.get("dictionary_columns", []):
+            if col not in column_names:
+                raise ValueError(f"Dictionary column '{col}' tidak ada di columns")
+        if engine == "memory" and storage_options.get("toast_threshold"):
+            raise ValueError("toast_threshold tidak didukung untuk tabel ENGINE=MEMORY")
+
+        if partition_by is not None:
+            partition_by = normalize_partitioning(partition_by, column_names)
+
         # simpen metadata tabel
         self.tables[table_name] = {
             "columns": [self._column_def_to_dict(c) for c in column_defs],
             "primary_keys": primary_keys or [],
             "foreign_keys": [self._foreign_key_to_dict(fk) for fk in foreign_keys] if foreign_keys else []
         }
-        self._save_table_schemas()
 
-        # bikin file binary kosong
         schema_names = [c.name for c in column_defs]
-        table_file = self._get_table_file_path(table_name)
-        write_binary_table(table_file, [], schema_names, self.block_size)
+        if partition_by is None:
+            if engine == "memory":
+                self.tables[table_name]["engine"] = "memory"
+                self.memory_tables[table_name] = MemoryTable(self.tables[table_name]["columns"])
+            self._save_table_schemas()
+
+            # bikin file binary kosong (tabel memory: snapshot kosong)
+            table_file = self._get_table_file_path(table_name)
+            write_binary_table(table_file, [], schema_names, self.block_size, storage_options)
+
+            print(f"[OK] tabel '{table_name}' berhasil dibuat dengan {len(column_defs)} kolom")
+            return
+
+        # tabel partisi: parent cuma metadata, data ada di tabel internal per partisi
+        self.tables[table_name]["partitioning"] = partition_by
+        for partition in range(partition_count(partition_by)):
+            partition_name = partition_table_name(table_name, partition)
+            self.tables[partition_name] = {
+                "columns": self.tables[table_name]["columns"],
+                "primary_keys": primary_keys or [],
+                "foreign_keys": [],
+                "partition_of": table_name
+            }
+            write_binary_table(
+                self._get_table_file_path(partition_name), [], schema_names, self.block_size, storage_options
+            )
+        self._save_table_schemas()
 
-        print(f"[OK] tabel '{table_name}' berhasil dibuat dengan {len(column_defs)} kolom")
+        print(
+            f"[OK] tabel '{table_name}' berhasil dibuat dengan {len(column_defs)} kolom "
+            f"({partition_by['type']} partition on {partition_by['column']}, "
+            f"{partition_count(partition_by)} partisi)"
+        )
 
+    @_table_writer
     def drop_table(self, table_name: str) -> None:
         if table_name not in self.tables:
             raise ValueError(f"Tabel '{table_name}' tidak ditemukan")
 
+        parent = self.tables[table_name].get("partition_of")
+        if parent is not None:
+            raise ValueError(f"Tabel '{table_name}' adalah partisi dari '{parent}', drop tabel '{parent}'")
+
         # implementasi restrict drop: ga boleh hapus kalo ada tabel lain yang referensi ke tabel ini
         for tbl, meta in self.tables.items():
             for fk in meta.get("foreign_keys", []):
                 if fk["references_table"] == table_name:
                     raise ValueError(f"Tabel '{table_name}' tidak bisa dihapus karena direferensi oleh tabel '{tbl}'")
 
-        # hapus metadata tabel
-        del self.tables[table_name]
+        # hapus metadata tabel (plus semua partisinya)
+        dropped = [table_name] + self._partition_names(table_name)
+        for name in dropped:
+            del self.tables[name]
+            self.memory_tables.pop(name, None)
         self._save_table_schemas()
 
-        # hapus file binary tabel
-        table_file = self._get_table_file_path(table_name)
-        if os.path.exists(table_file):
-            os.remove(table_file)
+        # hapus file binary tabel (plus side file TOAST kalo ada)
+        for name in dropped:
+            table_file = self._get_table_file_path(name)
+            for path in (table_file, toast_file_path(table_file)):
+                if os.path.exists(path):
+                    os.remove(path)
+
+        # index partisi ikut dihapus, partisinya udah ga ada
+        for name in dropped[1:]:
+            for _, column in self.get_indexes(name):
+                self.delete_index(name, column)
 
         print(f"tabel '{table_name}' berhasil dihapus")
 
+    def _is_memory_table(self, table_name: str) -> bool:
+        # tabel ENGINE=MEMORY: baca / tulis ke memory_tables, bukan file
+        return table_name in self.memory_tables
+
+    def _load_memory_tables(self) -> None:
+        # isi tabel ENGINE=MEMORY dari snapshot terakhir; perubahan setelahnya di-redo dari WAL
+        for name, meta in self.tables.items():
+            if meta.get("engine") == "memory":
+                try:
+                    self.memory_tables[name] = load_memory_table(self._get_table_file_path(name), meta["columns"])
+                except Exception as e:
+                    print(f"error loading snapshot tabel memory '{name}': {e}")
+                    self.memory_tables[name] = MemoryTable(meta["columns"])
+
+    def _after_memory_write(self, table_name: str) -> None:
+        # snapshot otomatis kalo perubahan sejak snapshot terakhir udah banyak
+        table = self.memory_tables[table_name]
+        if self.MEMORY_SNAPSHOT_ROWS is not None and table.dirty_rows >= self.MEMORY_SNAPSHOT_ROWS:
+            write_snapshot(self._get_table_file_path(table_name), table, self.block_size)
+
+    def snapshot_memory_tables(self) -> int:
+        # tulis snapshot semua tabel memory yang berubah (dipanggil pas checkpoint)
+        # return jumlah tabel yang di-snapshot
+        snapshotted = 0
+        for name, table in list(self.memory_tables.items()):
+            if table.dirty_rows:
+                write_snapshot(self._get_table_file_path(name), table, self.block_size)
+                snapshotted += 1
+        return snapshotted
+
+    def _is_partitioned(self, table_name: str) -> bool:
+        # tabel logis yang datanya dipecah ke beberapa partisi
+        return "partitioning" in self.tables.get(table_name, {})
+
+    def _partition_names(self, table_name: str, partitions: Optional[List[int]] = None) -> List[str]:
+        # nama tabel internal partisi (semua, atau cuma nomor yang diminta)
+        spec = self.tables.get(table_name, {}).get("partitioning")
+        if spec is None:
+            return []
+        if partitions is None:
+            partitions = list(range(partition_count(spec)))
+        return [partition_table_name(table_name, p) for p in partitions]
+
+    def _pruned_partition_names(self, table_name: str, conditions: Optional[List[Condition]]) -> List[str]:
+        # partisi yang masih mungkin berisi row yang match kondisi
+        spec = self.tables[table_name]["partitioning"]
+        return self._partition_names(table_name, prune_partitions(spec, conditions))
+
+    def _route_rows_to_partitions(self, table_name: str, rows: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+        # kelompokin row per partisi tujuan (urutan partisi naik)
+        spec = self.tables[table_name]["partitioning"]
+        column = spec["column"]
+        # kolom partisi yang ga diisi bakal dapet default value-nya
+        default = next(
+            (c.get("default_value") for c in self.tables[table_name]["columns"] if c["name"] == column), None
+        )
+        routed: Dict[int, List[Dict[str, Any]]] = {}
+        for row in rows:
+            key_row = row if column in row else {column: default}
+            routed.setdefault(route_row(spec, key_row), []).append(row)
+        return {partition_table_name(table_name, p): routed[p] for p in sorted(routed)}
+
     def _column_def_to_dict(self, col: ColumnDefinition) -> Dict[str, Any]:
         # convert columndefinition ke dictionary buat disimpen
         return {
@@ -475,11 +742,18 @@ class StorageManager:
         table_meta = self.tables[table_name]
         return [self._dict_to_column_def(c) for c in table_meta["columns"]]
 
+    @_table_writer
     def insert_rows(self, table_name: str, rows: List[Dict[str, Any]], validate: bool = True) -> None:
         # insert banyak rows sekaligus ke tabel (optimized batch insert)
         if table_name not in self.tables:
             raise ValueError(f"Tabel '{table_name}' tidak ditemukan")
 
+        if self._is_partitioned(table_name):
+            # tiap row masuk ke file partisinya sendiri
+            for partition_name, partition_rows in self._route_rows_to_partitions(table_name, rows).items():
+                self.insert_rows(partition_name, partition_rows, validate)
+            return
+
         # ambil column definitions
         column_defs = self._get_column_definitions(table_name)
 
@@ -510,19 +784,264 @@ class StorageManager:
         table_file = self._get_table_file_path(table_name)
 
         # pake append_block_to_table buat batch insert tanpa load semua data
-        if not os.path.exists(table_file):
+        if self._is_memory_table(table_name):
+            self._append_memory_rows(table_name, processed_rows)
+        elif not os.path.exists(table_file):
             write_binary_table(table_file, processed_rows, schema_names, self.block_size)
         else:
             append_block_to_table(table_file, processed_rows, schema_names, self.block_size)
 
         print(f"[OK] inserted {len(rows)} rows ke tabel '{table_name}' (optimized batch insert)")
 
+    @_table_writer
+    def bulk_load(
+        self,
+        table_name: str,
+        file_path: str,
+        file_format: Optional[str] = None,
+        delimiter: str = ",",
+        header: bool = True,
+        on_batch: Optional[Callable[[List[Dict[str, Any]]], None]] = None,
+        before_commit: Optional[Callable[[int], None]] = None
+    ) -> int:
+        # load CSV / JSONL langsung ke file tabel tanpa lewat insert per row
+        # input distream, divalidasi pake validator hasil compile, ditulis per block penuh
+        # semua row gagal kalo ada satu row yang invalid (file tabel di-truncate balik)
+        # on_batch(rows) dipanggil tiap BULK_LOAD_BATCH_ROWS row (misal buat logging)
+        # before_commit(jumlah row) dipanggil sebelum row keliatan (misal buat nulis WAL duluan)
+        if table_name not in self.tables or "partition_of" in self.tables[table_name]:
+            raise ValueError(f"Tabel '{table_name}' tidak ditemukan")
+        if self._is_memory_table(table_name):
+            raise ValueError(f"Bulk load ke tabel ENGINE=MEMORY '{table_name}' belum didukung, pake INSERT")
+        if not os.path.exists(file_path):
+            raise ValueError(f"File '{file_path}' tidak ditemukan")
+
+        file_format = (file_format or detect_format(file_path)).lower()
+        column_defs = self._get_column_definitions(table_name)
+        schema_names = [c.name for c in column_defs]
+        validate = compile_row_validator(column_defs)
+        source = open_source(file_path, file_format, column_defs, delimiter, header)
+
+        spec = self.tables[table_name].get("partitioning")
+        targets = self._partition_names(table_name) if spec else [table_name]
+
+        appenders: Dict[str, BlockAppender] = {}
+        # record id row pertama yang di-append per target (= jumlah row sebelum load)
+        first_record_ids: Dict[str, int] = {}
+        try:
+            for target in targets:
+                target_file = self._get_table_file_path(target)
+                ensure_table_file(target_file, schema_names, self.block_size)
+                first_record_ids[target] = self.count_rows(target)
+                appenders[target] = BlockAppender(target_file, self.block_size)
+
+            loaded = 0
+            batch: List[Dict[str, Any]] = []
+            for line_no, raw_row in source:
+                try:
+                    row = validate(raw_row)
+                    target = partition_table_name(table_name, route_row(spec, row)) if spec else table_name
+                except ValueError as e:
+                    raise ValueError(f"Baris {line_no}: {e}")
+
+                appenders[target].add(row)
+                loaded += 1
+                batch.append(row)
+                if len(batch) >= self.BULK_LOAD_BATCH_ROWS:
+                    if on_batch:
+                        on_batch(batch)
+                    batch = []
+
+            if batch and on_batch:
+                on_batch(batch)
+            if before_commit:
+                before_commit(loaded)
+        except BaseException:
+            for appender in appenders.values():
+                appender.rollback()
+            raise
+
+        for appender in appenders.values():
+            appender.commit()
+
+        # index cuma ditambahin entry buat block yang baru di-append, isi tabel lama ga dibaca ulang
+        for target, appender in appenders.items():
+            self._index_appended_blocks(target, appender.start_offset, appender.blocks_added, first_record_ids[target])
+
+        print(f"[OK] bulk load {loaded} rows ke tabel '{table_name}' dari '{file_path}'")
+        return loaded
+
     # ========== operasi utama ==========
 
     def read_block(self, data_retrieval: DataRetrieval) -> List[Dict[str, Any]]:
         # baca data dari disk pake streaming (ga load semua ke memory)
         # filter row berdasarkan kondisi terus proyeksi kolom kalo diminta
         table_name = data_retrieval.table
+        if self._is_partitioned(table_name):
+            return self._read_partitioned(data_retrieval)
+
+        table_file, access_plan = self._prepare_scan(data_retrieval)
+        if table_file is None:
+            return []
+
+        try:
+            # filter + proyeksi jalan dalam satu pass lewat cursor
+            rows = list(self._iter_cursor(table_file, access_plan, data_retrieval))
+        except Exception as e:
+            raise ValueError(f"error membaca binary file '{table_name}.dat': {e}")
+
+        access_plan["actual_rows"] = len(rows)
+        print(f"found {len(rows)} matching rows dari tabel '{table_name}' ({self._describe_access_plan(access_plan)})")
+        return rows
+
+    def open_cursor(self, data_retrieval: DataRetrieval, limit: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """Buka cursor streaming buat baca tabel secara lazy.
+
+        Beda sama read_block yang materialize semua hasil, cursor nge-yield
+        row (udah difilter dan diproyeksi) satu-satu. File cuma dibaca
+        sejauh row yang di-consume, jadi LIMIT kecil cuma nyentuh blok awal.
+
+        Args:
+            data_retrieval: Tabel, kolom proyeksi, dan kondisi filter
+            limit: Maksimal jumlah row yang di-yield (None = semua)
+
+        Returns:
+            Iterator of row dicts. Panggil close() kalo berhenti di tengah
+            supaya file langsung ditutup.
+
+        Raises:
+            ValueError: Jika tabel tidak ditemukan
+        """
+        if self._is_partitioned(data_retrieval.table):
+            partitions = self._pruned_partition_names(data_retrieval.table, data_retrieval.conditions)
+            self.last_access_plan = {"method": "partitioned", "partitions": partitions, "partition_plans": {}}
+            return self._iter_partitions(data_retrieval, partitions, limit)
+
+        table_file, access_plan = self._prepare_scan(data_retrieval)
+        if table_file is None:
+            return iter([])
+        return self._iter_cursor(table_file, access_plan, data_retrieval, limit)
+
+    def open_batch_cursor(self, data_retrieval: DataRetrieval, batch_rows: int = 1024) -> Iterator[Dict[str, List[Any]]]:
+        """Buka cursor columnar: yield batch {kolom: list value} ganti row dict.
+
+        Full scan tabel disk di-decode langsung dari row buffer ke list per
+        kolom (read_binary_table_batches), kondisi dicek per kolom, dan ga ada
+        dict per row sama sekali. Access path lain (index scan, parallel scan,
+        scan yang nempel ke sync scan lain, tabel memory, tabel partisi) tetap
+        lewat open_cursor dan row-nya dikelompokkan jadi batch.
+
+        Args:
+            data_retrieval: Tabel, kolom proyeksi, dan kondisi filter
+            batch_rows: Maksimal jumlah row per batch
+
+        Returns:
+            Iterator of dict kolom -> list value (semua list sama panjang).
+            Panggil close() kalo berhenti di tengah.
+
+        Raises:
+            ValueError: Jika tabel tidak ditemukan
+        """
+        if self._is_partitioned(data_retrieval.table):
+            return self._iter_row_batches(self.open_cursor(data_retrieval), batch_rows)
+
+        table_file, access_plan = self._prepare_scan(data_retrieval)
+        if table_file is None:
+            return iter([])
+        if access_plan["method"] == "full_scan":
+            # parallel scan decode di worker process, sync scan yang lagi jalan di-share: dua-duanya row-based
+            workers = self._parallel_scan_workers(table_file)
+            if workers <= 1 and not self.sync_scans.active_scans(table_file):
+                return self._iter_batch_scan(table_file, access_plan, data_retrieval, batch_rows)
+        rows = self._iter_cursor(table_file, access_plan, data_retrieval)
+        return self._iter_row_batches(rows, batch_rows)
+
+    def _iter_batch_scan(
+        self,
+        table_file: str,
+        access_plan: Dict[str, Any],
+        data_retrieval: DataRetrieval,
+        batch_rows: int
+    ) -> Iterator[Dict[str, List[Any]]]:
+        # full scan columnar, prefetch stats dicatet kayak _iter_cursor
+        scan_stats = PrefetchStats()
+        access_plan["prefetch"] = scan_stats
+        access_plan["columnar"] = True
+        batches = read_binary_table_batches(
+            table_file,
+            columns=data_retrieval.column or None,
+            conditions=data_retrieval.conditions,
+            batch_rows=batch_rows,
+            readahead=self.READAHEAD_DEPTH,
+            prefetch_stats=scan_stats
+        )
+        try:
+            yield from batches
+        finally:
+            batches.close()
+            self.prefetch_stats.add(scan_stats)
+
+    def _iter_row_batches(self, rows: Iterator[Dict[str, Any]], batch_rows: int) -> Iterator[Dict[str, List[Any]]]:
+        # fallback: kelompokin row dict dari cursor biasa jadi batch columnar
+        try:
+            while True:
+                chunk = list(islice(rows, batch_rows))
+                if not chunk:
+                    return
+                yield {name: [row.get(name) for row in chunk] for name in chunk[0]}
+        finally:
+            close = getattr(rows, "close", None)
+            if close is not None:
+                close()
+
+    def _read_partitioned(self, data_retrieval: DataRetrieval) -> List[Dict[str, Any]]:
+        # read_block ke tabel partisi: partisi yang bound-nya ga match di-skip
+        table_name = data_retrieval.table
+        partitions = self._pruned_partition_names(table_name, data_retrieval.conditions)
+
+        rows: List[Dict[str, Any]] = []
+        partition_plans: Dict[str, Dict[str, Any]] = {}
+        for partition_name in partitions:
+            rows.extend(self.read_block(replace(data_retrieval, table=partition_name)))
+            partition_plans[partition_name] = self.last_access_plan
+
+        self.last_access_plan = {
+            "method": "partitioned",
+            "partitions": partitions,
+            "partition_plans": partition_plans,
+            "actual_rows": len(rows)
+        }
+        total = partition_count(self.tables[table_name]["partitioning"])
+        print(f"found {len(rows)} matching rows dari tabel '{table_name}' (scan {len(partitions)}/{total} partisi)")
+        return rows
+
+    def _iter_partitions(
+        self,
+        data_retrieval: DataRetrieval,
+        partitions: List[str],
+        limit: Optional[int] = None
+    ) -> Iterator[Dict[str, Any]]:
+        # cursor berantai: buka partisi berikutnya setelah partisi sebelumnya habis
+        remaining = limit
+        for partition_name in partitions:
+            if remaining is not None and remaining <= 0:
+                return
+            cursor = self.open_cursor(replace(data_retrieval, table=partition_name), remaining)
+            try:
+                for row in cursor:
+                    yield row
+                    if remaining is not None:
+                        remaining -= 1
+                        if remaining <= 0:
+                            return
+            finally:
+                close = getattr(cursor, "close", None)
+                if close is not None:
+                    close()
+
+    def _prepare_scan(self, data_retrieval: DataRetrieval) -> Tuple[Optional[str], Dict[str, Any]]:
+        # validasi tabel dan pilih access path sebelum mulai baca
+        table_name = data_retrieval.table
 
         # cek tabel ada ga
         if table_name not in self.tables:
@@ -531,126 +1050,429 @@ class StorageManager:
 
         table_file = self._get_table_file_path(table_name)
 
+        if self._is_memory_table(table_name):
+            # tabel memory ga baca file sama sekali
+            access_plan = {"method": "memory_scan", "index": None, "condition": None}
+            self.last_access_plan = access_plan
+            return table_file, access_plan
+
         # cek file exists
         if not os.path.exists(table_file):
             print(f"file tabel '{table_name}' tidak ditemukan")
-            return []
+            return None, {}
+
+        # pilih access path (index scan vs full scan) berdasarkan estimasi cost
+        access_plan = self._choose_access_path(table_name, data_retrieval.conditions)
+        self.last_access_plan = access_plan
+        return table_file, access_plan
+
+    def _iter_cursor(
+        self,
+        table_file: str,
+        access_plan: Dict[str, Any],
+        data_retrieval: DataRetrieval,
+        limit: Optional[int] = None
+    ) -> Iterator[Dict[str, Any]]:
+        # generator: baca row sesuai access path, proyeksi, stop kalo limit tercapai
+        if limit is not None and limit <= 0:
+            return
 
-        # cek apakah bisa pake hash index buat optimasi
-        usable_index = self._find_usable_index(table_name, data_retrieval.conditions)
+        columns = data_retrieval.column or None
+        conditions = data_retrieval.conditions
+        # kolom yang dibaca filter di-decode duluan, sisa proyeksi belakangan
+        filter_columns = [condition.column for condition in conditions]
+        # equality ke kolom dictionary-encoded dicek langsung pake integer code
+        equality_filters = [(c.column, c.operand) for c in conditions if c.operation == "="]
+        row_filter = None
+        if conditions:
+            def row_filter(row):
+                return self._row_matches_all_conditions(row, conditions)
+
+        if access_plan["method"] == "memory_scan":
+            # tabel ENGINE=MEMORY: scan / hash lookup langsung di RAM
+            rows = self.memory_tables[data_retrieval.table].scan(row_filter, columns, equality_filters, access_plan)
+        elif access_plan["method"] == "index_scan":
+            # pake index buat optimasi
+            rows = self._iter_with_index(
+                table_file,
+                access_plan["index"],
+                access_plan["condition"],
+                row_filter,
+                columns,
+                filter_columns,
+                equality_filters
+            )
+        else:
+            # cursor dengan limit tetap serial biar cuma baca blok awal
+            workers = self._parallel_scan_workers(table_file) if limit is None else 1
+            if limit is None and self._use_sync_scan(table_file, workers):
+                # full scan tabel gede: nempel ke scan lain yang lagi jalan di file yang sama
+                access_plan["sync_scan"] = True
+                scan_stats = PrefetchStats()
+                access_plan["prefetch"] = scan_stats
+                rows = self.sync_scans.scan(
+                    table_file, row_filter, columns, filter_columns, equality_filters, access_plan,
+                    readahead=self.READAHEAD_DEPTH,
+                    prefetch_stats=scan_stats
+                )
+            elif workers > 1:
+                # tabel gede: decode + filter range block di beberapa process,
+                # kedaftar di sync_scans biar full scan berikutnya bisa nempel
+                access_plan["parallel_workers"] = workers
+                if self.SYNC_SCAN_MIN_BLOCKS is not None:
+                    rows = self.sync_scans.parallel_scan(
+                        table_file, conditions, columns, workers, readahead=self.READAHEAD_DEPTH
+                    )
+                else:
+                    rows = parallel_scan(table_file, conditions, columns, workers, ordered=True)
+            else:
+                # full table scan biasa, proyeksi langsung di decoder
+                scan_stats = PrefetchStats()
+                access_plan["prefetch"] = scan_stats
+                rows = read_binary_table_streaming(
+                    table_file,
+                    filter_fn=row_filter,
+                    columns=columns,
+                    filter_columns=filter_columns,
+                    equality_filters=equality_filters,
+                    readahead=self.READAHEAD_DEPTH,
+                    prefetch_stats=scan_stats
+                )
+
+        produced = 0
+        try:
+            for row in rows:
+                yield row
+                produced += 1
+                if limit is not None and produced >= limit:
+                    return
+        finally:
+            rows.close()
+            if "prefetch" in access_plan:
+                self.prefetch_stats.add(access_plan["prefetch"])
+
+    def _parallel_scan_workers(self, table_file: str) -> int:
+        # jumlah worker buat full scan; 1 artinya scan biasa di process ini
+        if self.PARALLEL_SCAN_MIN_BLOCKS is None:
+            return 1
+        workers = self.PARALLEL_SCAN_WORKERS or default_worker_count()
+        if workers <= 1:
+            return 1
+
+        with open(table_file, 'rb') as f:
+            _, _, num_blocks, _ = read_table_header(f)
+        if num_blocks < self.PARALLEL_SCAN_MIN_BLOCKS:
+            return 1
+        return min(workers, num_blocks)
+
+    def _use_sync_scan(self, table_file: str, workers: int) -> bool:
+        # full scan lewat SharedScan kalo ada scan lain (serial atau parallel) yang lagi
+        # jalan di file ini, atau tabelnya cukup gede buat kemungkinan di-scan barengan
+        if self.SYNC_SCAN_MIN_BLOCKS is None:
+            return False
+        if self.sync_scans.active_scans(table_file):
+            return True
+        if workers > 1:
+            return False
+
+        with open(table_file, 'rb') as f:
+            _, _, num_blocks, _ = read_table_header(f)
+        return num_blocks >= self.SYNC_SCAN_MIN_BLOCKS
+
+    def _describe_access_plan(self, access_plan: Dict[str, Any]) -> str:
+        # format keputusan access path buat log read_block
+        if access_plan["method"] == "memory_scan":
+            lookup = access_plan.get("memory_lookup")
+            label = f"memory hash lookup on {lookup}" if lookup else "memory scan"
+        elif access_plan["method"] == "index_scan":
+            label = f"index scan on {access_plan['index_column']} ({access_plan['index_type']})"
+        elif access_plan.get("parallel_workers"):
+            label = f"parallel full scan ({access_plan['parallel_workers']} workers)"
+        elif access_plan.get("sync_scan"):
+            label = f"synchronized full scan (start block {access_plan.get('sync_scan_start', 0)})"
+        else:
+            label = "full scan"
+
+        if access_plan.get("index_cost") is None:
+            return label
+
+        return (
+            f"{label}, est. rows={access_plan['estimated_rows']:.0f}, "
+            f"cost index={access_plan['index_cost']:.1f} vs seq={access_plan['seq_cost']:.1f}"
+        )
+
+    def _choose_access_path(self, table: str, conditions: List[Condition]) -> Dict[str, Any]:
+        """Pilih antara index scan dan sequential scan berdasarkan estimasi cost.
+
+        Index yang compatible belum tentu lebih murah: predicate yang match
+        sebagian besar tabel lebih cepat dibaca pake satu sequential pass
+        daripada traversal index + fetch row yang tersebar.
+
+        Cost model (satuan block access, sama kayak query_optimizer/cost.py):
+            seq scan   = b_r * SEQUENTIAL_IO_COST
+            hash index = RANDOM_IO_COST + fetched_blocks * RANDOM_IO_COST
+            b+ tree    = height * RANDOM_IO_COST + leaf_blocks * SEQUENTIAL_IO_COST
+                         + fetched_blocks * RANDOM_IO_COST
+        fetched_blocks diestimasi pake rumus Cardenas dari jumlah row yang match.
+        Kalo statistik punya clustering factor index, fetched_blocks =
+        clustering_factor * fraksi row, dan cost per block geser dari
+        sequential (tabel urut index) ke random (acak), lihat _estimate_fetch_cost.
+
+        Returns:
+            Dict dengan key method ('index_scan' | 'full_scan'), index, condition,
+            index_column, index_type, estimated_rows, index_cost, seq_cost
+        """
+        plan: Dict[str, Any] = {
+            "table": table,
+            "method": "full_scan",
+            "index": None,
+            "condition": None,
+            "index_column": None,
+            "index_type": None,
+            "estimated_rows": None,
+            "index_cost": None,
+            "seq_cost": None,
+        }
+
+        candidates = self._find_usable_indexes(table, conditions)
+        if not candidates:
+            return plan
 
         try:
-            if usable_index:
-                # pake index buat optimasi
-                index, condition = usable_index
-                filtered_rows = self._read_with_index(table_file, index, condition, data_retrieval.conditions)
-                print(f"found {len(filtered_rows)} matching rows dari tabel '{table_name}' (index scan)")
+            table_stats = self._get_access_path_stats(table)
+        except Exception:
+            table_stats = None
+
+        if table_stats is None:
+            # ga ada statistik: tetap pake index terbaik kayak sebelumnya
+            best = candidates[0]
+            plan.update(
+                method="index_scan",
+                index=best["index"],
+                condition=best["condition"],
+                index_column=best["condition"].column,
+                index_type=best["index_type"],
+            )
+            return plan
+
+        seq_cost = max(table_stats.b_r, 1) * self.SEQUENTIAL_IO_COST
+
+        best_estimate = None
+        for candidate in candidates:
+            estimate = self._estimate_index_scan(candidate, table_stats)
+            if best_estimate is None or estimate["index_cost"] < best_estimate["index_cost"]:
+                best_estimate = estimate
+
+        plan.update(
+            index=best_estimate["index"],
+            condition=best_estimate["condition"],
+            index_column=best_estimate["condition"].column,
+            index_type=best_estimate["index_type"],
+            estimated_rows=best_estimate["estimated_rows"],
+            index_cost=best_estimate["index_cost"],
+            seq_cost=seq_cost,
+        )
+
+        if best_estimate["index_cost"] < seq_cost:
+            plan["method"] = "index_scan"
+        else:
+            plan["index"] = None
+            plan["condition"] = None
+
+        return plan
+
+    def _get_access_path_stats(self, table: str) -> Optional[Statistic]:
+        """Statistik buat _choose_access_path tanpa decode row tabel.
+
+        n_r dari header block (count_rows), b_r dari directory block, V(a,r)
+        cuma buat kolom ber-index dari jumlah key index-nya. Clustering factor
+        diambil dari statistik terakhir get_stats (self.stats) kalo ada.
+        Hasilnya di-cache, dihitung ulang cuma kalo file tabel atau index-nya berubah.
+        Tabel memory isinya udah di memory, jadi tetap pake _compute_table_stats.
+        """
+        if self._is_partitioned(table):
+            return self._aggregate_partition_stats(
+                table,
+                [self._get_access_path_stats(name) or Statistic(0, 0, 0, 0) for name in self._partition_names(table)]
+            )
+
+        index_columns = tuple(sorted(col for tbl, col in self.indexes if tbl == table))
+        if self._is_memory_table(table):
+            memory_table = self.memory_tables[table]
+            signature = ("memory", len(memory_table), memory_table.dirty_rows, index_columns)
+        else:
+            table_file = self._get_table_file_path(table)
+            if os.path.exists(table_file):
+                stat = os.stat(table_file)
+                signature = (stat.st_size, stat.st_mtime_ns, index_columns)
             else:
-                # fallback ke full table scan
-                def row_filter(row):
-                    return self._row_matches_all_conditions(row, data_retrieval.conditions)
+                signature = (None, index_columns)
 
-                filtered_rows = list(read_binary_table_streaming(table_file, filter_fn=row_filter))
-                print(f"found {len(filtered_rows)} matching rows dari tabel '{table_name}' (full scan)")
-        except Exception as e:
-            raise ValueError(f"error membaca binary file '{table_name}.dat': {e}")
+        cached = self._access_path_stats.get(table)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        if self._is_memory_table(table):
+            table_stats = self._compute_table_stats(table)
+        else:
+            table_stats = self._metadata_table_stats(table, index_columns)
+        if table_stats is not None:
+            self._access_path_stats[table] = (signature, table_stats)
+        return table_stats
+
+    def _metadata_table_stats(self, table: str, index_columns: Tuple[str, ...]) -> Statistic:
+        # statistik dari metadata aja: header block + index, ga ada row yang dibaca
+        table_file = self._get_table_file_path(table)
+        n_r = self.count_rows(table)
+        b_r = len(self._get_block_directory(table_file)[0]) if os.path.exists(table_file) else 0
+        f_r = math.ceil(n_r / b_r) if b_r else 0
+        l_r = int((self.block_size - 4) / f_r) if f_r else 0
+
+        previous = self.stats.get(table)
+        V_a_r: Dict[str, int] = {}
+        indexes: Dict[str, Dict[str, Any]] = {}
+        for col in index_columns:
+            index = self.indexes[(table, col)]
+            V_a_r[col] = index.count_keys()
+            if isinstance(index, BPlusTreeIndex):
+                indexes[col] = {"type": "btree", "height": index.get_height()}
+            else:
+                indexes[col] = {"type": "hash"}
+            if self.tables[table].get("clustered_on") == col:
+                indexes[col]["clustered"] = True
+            clustering = previous.indexes.get(col, {}).get("clustering_factor") if previous else None
+            if clustering is not None:
+                indexes[col]["clustering_factor"] = clustering
+
+        return Statistic(n_r=n_r, b_r=b_r, l_r=l_r, f_r=f_r, V_a_r=V_a_r, indexes=indexes)
+
+    def _estimate_index_scan(self, candidate: Dict[str, Any], table_stats: Statistic) -> Dict[str, Any]:
+        # estimasi jumlah row yang match dan cost index scan buat satu kandidat
+        index = candidate["index"]
+        condition = candidate["condition"]
+        n_r = table_stats.n_r
+        b_r = table_stats.b_r
+
+        if condition.operation == "=":
+            distinct = table_stats.V_a_r.get(condition.column, 0)
+            estimated_rows = n_r / distinct if distinct > 0 else 0.0
+        else:
+            estimated_rows = n_r * self._estimate_range_fraction(index, condition)
 
-        # proyeksi kolom kalo ada
-        if data_retrieval.column and len(data_retrieval.column) > 0:
-            return [project_columns(row, data_retrieval.column) for row in filtered_rows]
+        clustering = table_stats.indexes.get(condition.column, {}).get("clustering_factor")
+        fetch_cost = self._estimate_fetch_cost(n_r, b_r, estimated_rows, clustering)
+
+        if isinstance(index, BPlusTreeIndex):
+            height = max(index.get_height(), 1)
+            leaf_capacity = max(index.order - 1, 1)
+            leaf_blocks = math.ceil(estimated_rows / leaf_capacity) if estimated_rows > 0 else 1
+            index_cost = (
+                height * self.RANDOM_IO_COST
+                + leaf_blocks * self.SEQUENTIAL_IO_COST
+                + fetch_cost
+            )
         else:
-            return filtered_rows
+            index_cost = self.RANDOM_IO_COST + fetch_cost
+
+        return {
+            "index": index,
+            "condition": condition,
+            "index_type": candidate["index_type"],
+            "estimated_rows": estimated_rows,
+            "index_cost": index_cost,
+        }
+
+    def _estimate_fetch_cost(
+        self, n_r: int, b_r: int, estimated_rows: float, clustering: Optional[int] = None
+    ) -> float:
+        # cost fetch row hasil index dari file tabel
+        if b_r <= 0 or estimated_rows <= 0:
+            return 0.0
+
+        if clustering is None or n_r <= 0:
+            # rumus Cardenas: ekspektasi jumlah blok berbeda yang kena fetch (row acak)
+            random_blocks = b_r * (1 - (1 - 1 / b_r) ** estimated_rows)
+            return random_blocks * self.RANDOM_IO_COST
+
+        return clustered_fetch_cost(
+            n_r, b_r, estimated_rows, clustering, self.SEQUENTIAL_IO_COST, self.RANDOM_IO_COST
+        )
+
+    def _estimate_range_fraction(self, index: BPlusTreeIndex, condition: Condition) -> float:
+        # estimasi fraksi row yang match range predicate
+        # asumsi distribusi uniform antara key terkecil dan terbesar di b+ tree
+        key_range = index.get_key_range()
+        if key_range is None:
+            return 0.0
+
+        low, high = key_range
+        operand = condition.operand
+        numeric = (int, float)
+        if not (isinstance(low, numeric) and isinstance(high, numeric) and isinstance(operand, numeric)):
+            return self.DEFAULT_RANGE_SELECTIVITY
+
+        if high <= low:
+            # semua key sama: cek langsung apakah key itu lolos kondisi
+            return 1.0 if evaluate_condition({condition.column: low}, condition) else 0.0
+
+        if condition.operation in ('>', '>='):
+            fraction = (high - operand) / (high - low)
+        else:
+            fraction = (operand - low) / (high - low)
+
+        return min(max(fraction, 0.0), 1.0)
 
     def _find_usable_index(self, table: str, conditions: List[Condition]) -> Optional[Tuple[Any, Condition]]:
-        """Cari index yang bisa dipake dengan smart optimized prioritize.
-        
-        Priority (untuk multiple conditions):
-        1. Operation compatibility: Range queries MUST use B+ tree
-        2. For equality (=) only: Pick hash if available (O(1) vs O(log n))
-        3. Selectivity: Lower V(column) = more selective (less distinct values)
-        
-        Returns: 
+        """Cari index yang bisa dipake dan lebih murah dari full scan.
+
+        Returns:
             Tuple (index_object, matching_condition) atau None
         """
-        # Collect semua usable indexes
+        access_plan = self._choose_access_path(table, conditions)
+        if access_plan["method"] != "index_scan":
+            return None
+        return (access_plan["index"], access_plan["condition"])
+
+    def _find_usable_indexes(self, table: str, conditions: List[Condition]) -> List[Dict[str, Any]]:
+        """Kumpulin semua index yang compatible sama kondisi.
+
+        Compatibility:
+        1. Range queries (<, <=, >, >=) cuma bisa pake B+ tree
+        2. Equality (=) bisa pake hash atau B+ tree
+
+        Returns:
+            List of dict {index, condition, index_type}, hash equality duluan
+        """
         usable_indexes = []
-        
-        try:
-            all_stats = self.get_stats()
-            table_stats = all_stats.get(table)  # Get stats for specific table
-        except:
-            table_stats = None
-        
+
         for condition in conditions:
             index_key = (table, condition.column)
-            
-            if index_key in self.indexes:
-                index = self.indexes[index_key]
-                
-                # Check compatibility
-                is_compatible = False
-                if isinstance(index, HashIndex) and condition.operation == '=':
-                    is_compatible = True
-                elif isinstance(index, BPlusTreeIndex) and condition.operation in ['=', '<', '<=', '>', '>=']:
-                    is_compatible = True
-                
-                if is_compatible:
-                    # Get selectivity (jumlah distinct values)
-                    selectivity = 999999  # default tinggi
-                    if table_stats and condition.column in table_stats.V_a_r:
-                        selectivity = table_stats.V_a_r[condition.column]
-                    
-                    # OPTIMIZED PRIORITY:
-                    # 1. For range queries: MUST use B+ tree (hash can't do range)
-                    #    priority_type = 0 (B+ tree for range)
-                    # 2. For equality: prefer hash (O(1)) > B+ tree (O(log n))
-                    #    priority_type = 1 (hash for equality)
-                    # 3. Fallback: if no hash, use B+ tree for safety
-                    #    priority_type = 2 (B+ tree fallback)
-                    
-                    if condition.operation in ['<', '<=', '>', '>=']:
-                        # Range query - MUST use B+ tree
-                        if isinstance(index, BPlusTreeIndex):
-                            priority_type = 0  # Best: B+ tree for range
-                        else:
-                            continue  # Skip hash index for range queries
-                    else:  # operation == '='
-                        # Equality - prefer hash (faster O(1))
-                        if isinstance(index, HashIndex):
-                            priority_type = 1  # Best: hash for equality (O(1))
-                        else:  # B+ tree
-                            priority_type = 2  # Fallback: B+ tree for equality (O(log n))
-                    
-                    usable_indexes.append({
-                        'index': index,
-                        'condition': condition,
-                        'priority_type': priority_type,      # 0=range, 1=hash equal, 2=btree equal
-                        'selectivity': selectivity,          # Lower = better
-                    })
-        
-        if not usable_indexes:
-            return None
-        
-        # Sort by priority:
-        # 1. Priority type (0=range btree < 1=hash equal < 2=btree equal)
-        # 2. Selectivity (lower distinct values = more selective)
-        usable_indexes.sort(
-            key=lambda x: (x['priority_type'], x['selectivity'])
-        )
-        
-        best = usable_indexes[0]
-        return (best['index'], best['condition'])
+            if index_key not in self.indexes:
+                continue
 
-    def _read_with_index(
+            index = self.indexes[index_key]
+            if isinstance(index, HashIndex) and condition.operation == '=':
+                usable_indexes.append({'index': index, 'condition': condition, 'index_type': 'hash'})
+            elif isinstance(index, BPlusTreeIndex) and condition.operation in ['=', '<', '<=', '>', '>=']:
+                usable_indexes.append({'index': index, 'condition': condition, 'index_type': 'btree'})
+
+        # hash (O(1)) duluan buat tie-break kalo ga ada statistik
+        usable_indexes.sort(key=lambda x: 0 if x['index_type'] == 'hash' else 1)
+        return usable_indexes
+
+    def _iter_with_index(
         self,
         table_file: str,
         index: Any,
         indexed_condition: Condition,
-        all_conditions: List[Condition]
-    ) -> List[Dict[str, Any]]:
-        # baca data pake index (hash atau b+ tree)
+        row_filter: Optional[Callable[[Dict[str, Any]], bool]] = None,
+        columns: Optional[List[str]] = None,
+        filter_columns: Optional[List[str]] = None,
+        equality_filters: Optional[List[Tuple[str, Any]]] = None
+    ) -> Iterator[Dict[str, Any]]:
+        # baca data pake index (hash atau b+ tree) secara lazy
         # 1. pake index buat dapetin record_ids yang match
-        # 2. load cuma rows yang match
+        # 2. decode cuma rows yang match, row lain dilompati tanpa decode
         # 3. apply kondisi lain yang ga di-index
 
         # cari record_ids dari index
@@ -665,23 +1487,280 @@ class StorageManager:
             search_key = str(indexed_condition.operand) if indexed_condition.operand is not None else "NULL"
             record_ids = index.search(search_key)
 
+        return self._iter_record_ids(
+            table_file, index, record_ids, row_filter, columns, filter_columns, equality_filters
+        )
+
+    def _iter_record_ids(
+        self,
+        table_file: str,
+        index: Any,
+        record_ids: List[int],
+        row_filter: Optional[Callable[[Dict[str, Any]], bool]] = None,
+        columns: Optional[List[str]] = None,
+        filter_columns: Optional[List[str]] = None,
+        equality_filters: Optional[List[Tuple[str, Any]]] = None,
+        with_record_ids: bool = False
+    ) -> Iterator[Dict[str, Any]]:
+        # decode cuma row dengan record id hasil index, urut record id
+        # with_record_ids: yield (record_id, row) biar caller bisa ngurutin ulang
         if not record_ids:
-            return []
+            return
 
         # convert ke set buat fast lookup
         target_record_ids = set(record_ids)
+        last_record_id = max(target_record_ids)
+
+        # tabel yang di-cluster pake kolom index ini: row yang match ada di block
+        # yang nyambung, jadi langsung loncat ke block record pertama
+        start_block = 0
+        start_record_id = 0
+        table_meta = self.tables.get(index.table_name, {})
+        if table_meta.get("clustered_on") == index.column_name:
+            offsets, first_record_ids = self._get_block_directory(table_file)
+            if offsets:
+                start_block = locate_block(first_record_ids, min(target_record_ids))
+                start_record_id = first_record_ids[start_block]
 
         # load rows yang match dari disk
-        matching_rows = []
-        record_id = 0
-        for row in read_binary_table_streaming(table_file):
-            if record_id in target_record_ids:
-                # apply kondisi lain yang ga di-index
-                if self._row_matches_all_conditions(row, all_conditions):
-                    matching_rows.append(row)
-            record_id += 1
+        with open(table_file, 'rb') as f:
+            schema, _, num_blocks, options = read_table_header(f)
+            with open_toast_reader(table_file, options) or nullcontext() as toast:
+                decode = make_row_decoder(
+                    schema, columns, row_filter, filter_columns,
+                    options.get("dictionaries"), equality_filters, toast
+                )
+                if start_block:
+                    f.seek(offsets[start_block])
+                row_buffers = iter_row_buffers(f, num_blocks - start_block, options.get("compression"))
+                for record_id, row_buffer in enumerate(row_buffers, start=start_record_id):
+                    if record_id in target_record_ids:
+                        # apply kondisi lain yang ga di-index
+                        row = decode(row_buffer)
+                        if row is not None:
+                            yield (record_id, row) if with_record_ids else row
+                    if record_id >= last_record_id:
+                        # udah lewat record terakhir yang dicari, ga perlu baca sisa file
+                        return
+
+    def read_by_index_keys(
+        self,
+        table_name: str,
+        column: str,
+        keys: List[Any],
+        columns: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """Batch lookup lewat index: semua row yang nilai `column`-nya ada di keys.
+
+        Dipake index nested-loop join. Key probe satu batch di-dedup, record id
+        semua key dikumpulin dari index, terus file tabel cuma dibaca sekali
+        (urut record id) buat semua key sekaligus, bukan satu lookup per key.
+
+        Args:
+            table_name: Nama tabel
+            column: Kolom yang punya index (hash atau btree)
+            keys: Nilai yang dicari (boleh dobel, NULL ikut dicari)
+            columns: Optional kolom output (None = semua kolom)
+
+        Returns:
+            List row yang match, urut record id (per partisi kalo tabel partisi)
+
+        Raises:
+            ValueError: Jika tabel atau index tidak ditemukan
+        """
+        if table_name not in self.tables:
+            available = list(self.tables.keys()) if self.tables else "tidak ada"
+            raise ValueError(f"Tabel '{table_name}' tidak ditemukan. Tersedia: {available}")
+        if not self.has_index(table_name, column):
+            raise ValueError(f"Kolom '{column}' di tabel '{table_name}' tidak punya index")
+
+        if self._is_partitioned(table_name):
+            rows: List[Dict[str, Any]] = []
+            for partition_name in self._partition_names(table_name):
+                rows.extend(self.read_by_index_keys(partition_name, column, keys, columns))
+            return rows
+
+        unique_keys = []
+        key_set = set()
+        for key in keys:
+            if key not in key_set:
+                key_set.add(key)
+                unique_keys.append(key)
+
+        index = self.indexes[(table_name, column)]
+        record_ids: List[int] = []
+        for key in unique_keys:
+            if isinstance(index, BPlusTreeIndex):
+                try:
+                    record_ids.extend(index.search_by_operation("=", "NULL" if key is None else key))
+                except TypeError:
+                    # tipe key beda sama isi tree, ga mungkin ada yang sama
+                    continue
+            else:
+                record_ids.extend(index.search(str(key) if key is not None else "NULL"))
+
+        table_file = self._get_table_file_path(table_name)
+        self.last_access_plan = {"method": "index_batch_lookup", "index": index, "keys": len(unique_keys)}
+        if not record_ids or not os.path.exists(table_file):
+            return []
+
+        # hash index nyimpen str(key): "1" sama 1 satu bucket, jadi nilai asli dicek lagi
+        def row_filter(row):
+            return row.get(column) in key_set
+
+        try:
+            rows = list(self._iter_record_ids(table_file, index, record_ids, row_filter, columns, [column]))
+        except Exception as e:
+            raise ValueError(f"error membaca binary file '{table_name}.dat': {e}")
 
-        return matching_rows
+        self.last_access_plan["actual_rows"] = len(rows)
+        print(f"found {len(rows)} matching rows dari tabel '{table_name}' (index lookup {len(unique_keys)} key on {column})")
+        return rows
+
+    def open_ordered_cursor(
+        self,
+        data_retrieval: DataRetrieval,
+        order_column: str,
+        descending: bool = False,
+        limit: Optional[int] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """Buka cursor yang nge-yield row urut nilai kolom yang punya index btree.
+
+        Record id diambil dari leaf index urut key, satu chunk per pass file
+        (chunk pertama segede limit), terus row chunk itu dikeluarin lagi sesuai
+        urutan index. Jadi ORDER BY ... LIMIT n cuma decode sekitar n row, ga
+        perlu sort seluruh tabel. NULL dianggap nilai terbesar (ASC paling
+        akhir, DESC paling awal). Tabel partisi: cursor tiap partisi di-merge.
+
+        Args:
+            data_retrieval: Tabel, kolom proyeksi, dan kondisi filter
+            order_column: Kolom urutan (harus punya index btree)
+            descending: True = urut dari nilai terbesar
+            limit: Maksimal jumlah row yang di-yield (None = semua)
+
+        Returns:
+            Iterator of row dicts urut order_column
+
+        Raises:
+            ValueError: Jika tabel tidak ditemukan atau kolom tidak punya index btree
+        """
+        table_name = data_retrieval.table
+        if table_name not in self.tables:
+            available = list(self.tables.keys()) if self.tables else "tidak ada"
+            raise ValueError(f"Tabel '{table_name}' tidak ditemukan. Tersedia: {available}")
+        if not self.has_index(table_name, order_column, "btree"):
+            raise ValueError(f"Kolom '{order_column}' di tabel '{table_name}' tidak punya index btree")
+
+        if self._is_partitioned(table_name):
+            partitions = self._pruned_partition_names(table_name, data_retrieval.conditions)
+            self.last_access_plan = {"method": "partitioned", "partitions": partitions, "partition_plans": {}}
+            return self._iter_ordered_partitions(data_retrieval, partitions, order_column, descending, limit)
+
+        index = self.indexes[(table_name, order_column)]
+        table_file = self._get_table_file_path(table_name)
+        self.last_access_plan = {"method": "index_order_scan", "index": index, "descending": descending}
+        if not os.path.exists(table_file):
+            return iter([])
+        return self._iter_index_order(table_file, index, data_retrieval, descending, limit)
+
+    def _iter_index_order(
+        self,
+        table_file: str,
+        index: BPlusTreeIndex,
+        data_retrieval: DataRetrieval,
+        descending: bool,
+        limit: Optional[int]
+    ) -> Iterator[Dict[str, Any]]:
+        # generator: record id urut index per chunk, tiap chunk satu pass file urut record id
+        if limit is not None and limit <= 0:
+            return
+
+        conditions = data_retrieval.conditions
+        row_filter = None
+        if conditions:
+            def row_filter(row):
+                return self._row_matches_all_conditions(row, conditions)
+        columns = data_retrieval.column or None
+        filter_columns = [condition.column for condition in conditions]
+
+        record_ids = self._index_order_record_ids(index, descending)
+        chunk_size = max(limit or 0, self.INDEX_ORDER_CHUNK_ROWS)
+        produced = 0
+        while True:
+            chunk = list(islice(record_ids, chunk_size))
+            if not chunk:
+                return
+            rows = dict(self._iter_record_ids(
+                table_file, index, chunk, row_filter, columns, filter_columns, with_record_ids=True
+            ))
+            for record_id in chunk:
+                row = rows.get(record_id)
+                if row is None:
+                    # kena filter
+                    continue
+                yield row
+                produced += 1
+                if limit is not None and produced >= limit:
+                    return
+            # sisa row banyak yang kena filter: pass berikutnya ambil lebih banyak
+            chunk_size *= 2
+
+    def _index_order_record_ids(self, index: BPlusTreeIndex, descending: bool) -> Iterator[int]:
+        # NULL disimpen di b+ tree sebagai key "NULL": dikeluarin paling akhir (ASC) / paling awal (DESC)
+        null_record_ids: List[int] = []
+        if descending:
+            try:
+                null_record_ids = index.search("NULL")
+            except TypeError:
+                # tree isinya angka, ga mungkin ada key "NULL"
+                pass
+            yield from null_record_ids
+        for key, record_id in index.iter_items(descending):
+            if key == "NULL":
+                if not descending:
+                    null_record_ids.append(record_id)
+                continue
+            yield record_id
+        if not descending:
+            yield from null_record_ids
+
+    def _iter_ordered_partitions(
+        self,
+        data_retrieval: DataRetrieval,
+        partitions: List[str],
+        order_column: str,
+        descending: bool,
+        limit: Optional[int]
+    ) -> Iterator[Dict[str, Any]]:
+        # k-way merge cursor urut index tiap partisi (index partisi lokal)
+        columns = data_retrieval.column
+        hidden = bool(columns) and order_column not in columns
+        if hidden:
+            # kolom urutan dibutuhin buat merge, dibuang lagi sebelum yield
+            data_retrieval = replace(data_retrieval, column=list(columns) + [order_column])
+        cursors = [
+            self.open_ordered_cursor(replace(data_retrieval, table=partition_name), order_column, descending, limit)
+            for partition_name in partitions
+        ]
+
+        def merge_key(row):
+            value = row.get(order_column)
+            return (value is None, 0 if value is None else value)
+
+        produced = 0
+        try:
+            for row in heapq.merge(*cursors, key=merge_key, reverse=descending):
+                if hidden:
+                    row = {col: row[col] for col in columns if col in row}
+                yield row
+                produced += 1
+                if limit is not None and produced >= limit:
+                    return
+        finally:
+            for cursor in cursors:
+                close = getattr(cursor, "close", None)
+                if close is not None:
+                    close()
 
     def _row_matches_all_conditions(self, row: Dict[str, Any], conditions: List[Condition]) -> bool:
         # cek apakah row memenuhi semua kondisi (and logic)
@@ -695,6 +1774,8 @@ class StorageManager:
 
     def _load_table_rows(self, table_name: str) -> List[Dict[str, Any]]:
         # load semua baris dari file tabel pake streaming
+        if self._is_memory_table(table_name):
+            return self.memory_tables[table_name].rows()
         table_file = self._get_table_file_path(table_name)
         if not os.path.exists(table_file):
             return []
@@ -702,12 +1783,27 @@ class StorageManager:
         rows = list(read_binary_table_streaming(table_file))
         return rows
 
-    def _save_table_rows(self, table_name: str, rows: List[Dict[str, Any]]) -> None:
+    def _save_table_rows(
+        self,
+        table_name: str,
+        rows: List[Dict[str, Any]],
+        changed_rows: Optional[int] = None
+    ) -> None:
         # tulis balik semua baris ke file tabel
+        # changed_rows = jumlah row yang di-update / dihapus (buat snapshot tabel memory)
+        if self._is_memory_table(table_name):
+            self.memory_tables[table_name].replace_rows(rows, changed_rows)
+            self._after_memory_write(table_name)
+            return
         schema_names = [c["name"] for c in self.tables[table_name]["columns"]]
         table_file = self._get_table_file_path(table_name)
         write_binary_table(table_file, rows, schema_names, self.block_size)
 
+    def _append_memory_rows(self, table_name: str, rows: List[Dict[str, Any]]) -> None:
+        # insert ke tabel memory (row udah divalidasi)
+        self.memory_tables[table_name].append_rows(rows)
+        self._after_memory_write(table_name)
+
     # ========== helper buat write_block ==========
 
     def _load_all_rows_with_schema(self, table_name: str) -> Tuple[List[Dict[str, Any]], List[str]]:
@@ -716,6 +1812,9 @@ class StorageManager:
 
         schema_names = [col.name for col in self._get_column_definitions(table_name)]
 
+        if self._is_memory_table(table_name):
+            return self.memory_tables[table_name].rows(), schema_names
+
         if not os.path.exists(table_file):
             return [], schema_names
 
@@ -745,6 +1844,7 @@ class StorageManager:
 
 
     # ========== write / delete / index / stats ==========
+    @_table_writer
     def write_block(self, data_write: DataWrite) -> int:
         # tulis atau update data di disk
         # kalo ga ada kondisi: insert row baru
@@ -755,6 +1855,9 @@ class StorageManager:
         if table_name not in self.tables:
             raise ValueError(f"Tabel '{table_name}' tidak ditemukan")
 
+        if self._is_partitioned(table_name):
+            return self._write_partitioned(data_write)
+
         table_file = self._get_table_file_path(table_name)
         column_defs = self._get_column_definitions(table_name)
         schema_names = [c.name for c in column_defs]
@@ -782,7 +1885,9 @@ class StorageManager:
                 self._apply_defaults_and_validate(rows_to_insert, column_defs)
 
                 # batch insert pake append_block_to_table
-                if not os.path.exists(table_file):
+                if self._is_memory_table(table_name):
+                    self._append_memory_rows(table_name, rows_to_insert)
+                elif not os.path.exists(table_file):
                     write_binary_table(table_file, rows_to_insert, schema_names, self.block_size)
                 else:
                     append_block_to_table(table_file, rows_to_insert, schema_names, self.block_size)
@@ -804,7 +1909,9 @@ class StorageManager:
                 self._apply_defaults_and_validate([new_row_data], column_defs)
 
                 # file baru atau udah ada?
-                if not os.path.exists(table_file):
+                if self._is_memory_table(table_name):
+                    self._append_memory_rows(table_name, [new_row_data])
+                elif not os.path.exists(table_file):
                     write_binary_table(table_file, [new_row_data], schema_names, self.block_size)
                 else:
                     append_row_to_table(table_file, new_row_data, schema_names, self.block_size)
@@ -859,7 +1966,7 @@ class StorageManager:
 
             # tulis balik semua rows
             if rows_affected > 0:
-                write_binary_table(table_file, new_rows, schema_names, self.block_size)
+                self._save_table_rows(table_name, new_rows, rows_affected)
 
                 # efficient index update (no rebuild!)
                 self._update_indexes_after_update(table_name, updated_rows_info)
@@ -867,6 +1974,122 @@ class StorageManager:
             print(f"updated {rows_affected} rows di tabel '{table_name}' (efficient index update!)")
             return rows_affected
 
+    def _write_partitioned(self, data_write: DataWrite) -> int:
+        # write_block ke tabel partisi: insert di-route per row, update cuma ke partisi hasil pruning
+        table_name = data_write.table
+        if not data_write.column or not data_write.new_value:
+            raise ValueError("column dan new_value harus diisi")
+
+        # ========== insert: route tiap row ke partisinya ==========
+        if not data_write.conditions:
+            is_batch = isinstance(data_write.new_value[0], (list, tuple))
+            value_rows = data_write.new_value if is_batch else [data_write.new_value]
+            rows = []
+            for row_values in value_rows:
+                if len(data_write.column) != len(row_values):
+                    raise ValueError(f"Jumlah kolom ({len(data_write.column)}) dan nilai ({len(row_values)}) harus sama")
+                rows.append(dict(zip(data_write.column, row_values)))
+
+            inserted = 0
+            for partition_name, partition_rows in self._route_rows_to_partitions(table_name, rows).items():
+                inserted += self.write_block(DataWrite(
+                    table=partition_name,
+                    column=list(data_write.column),
+                    new_value=[[row[c] for c in data_write.column] for row in partition_rows]
+                ))
+            return inserted
+
+        # ========== update ==========
+        if len(data_write.column) != len(data_write.new_value):
+            raise ValueError("jumlah kolom dan nilai baru harus sama")
+
+        spec = self.tables[table_name]["partitioning"]
+        partitions = self._pruned_partition_names(table_name, data_write.conditions)
+        update_data = dict(zip(data_write.column, data_write.new_value))
+
+        if spec["column"] not in update_data:
+            # partition key ga berubah, row tetap di partisinya
+            return sum(self.write_block(replace(data_write, table=name)) for name in partitions)
+
+        # partition key di-update ke satu nilai baru: semua row yang match
+        # pindah ke satu partisi tujuan
+        column_defs = self._get_column_definitions(table_name)
+        for col_name, new_val in update_data.items():
+            col_def = next((c for c in column_defs if c.name == col_name), None)
+            if col_def is None:
+                raise ValueError(f"kolom '{col_name}' tidak ada di tabel '{table_name}'")
+            try:
+                validate_value_for_column(new_val, col_def)
+            except ValueError as e:
+                raise ValueError(f"update value validation failed for column '{col_name}': {e}")
+
+        target = partition_table_name(table_name, route_value(spec, update_data[spec["column"]]))
+        rows_affected = 0
+        if target in partitions:
+            rows_affected += self.write_block(replace(data_write, table=target))
+
+        moved_rows = []
+        for partition_name in partitions:
+            if partition_name == target:
+                continue
+            matched = self.read_block(DataRetrieval(table=partition_name, conditions=list(data_write.conditions)))
+            if not matched:
+                continue
+            self.delete_block(DataDeletion(table=partition_name, conditions=list(data_write.conditions)))
+            moved_rows.extend({**row, **update_data} for row in matched)
+
+        if moved_rows:
+            schema_names = [c.name for c in column_defs]
+            rows_affected += self.write_block(DataWrite(
+                table=target,
+                column=schema_names,
+                new_value=[[row.get(c) for c in schema_names] for row in moved_rows]
+            ))
+            print(f"moved {len(moved_rows)} rows ke partisi '{target}'")
+        return rows_affected
+
+    def _update_partitioned_by_old_new_data(self, data_update: DataUpdate) -> int:
+        # update_by_old_new_data ke tabel partisi: dikelompokin per partisi row lama,
+        # row yang partition key-nya pindah partisi di-delete lalu di-insert ulang
+        table_name = data_update.table
+        spec = self.tables[table_name]["partitioning"]
+        primary_keys = self._get_primary_key_columns(table_name)
+
+        in_place: Dict[int, Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]] = {}
+        moves = []
+        for old_row, new_row in zip(data_update.old_data, data_update.new_data):
+            source = route_row(spec, old_row)
+            target = route_row(spec, new_row)
+            if source == target:
+                olds, news = in_place.setdefault(source, ([], []))
+                olds.append(old_row)
+                news.append(new_row)
+            else:
+                moves.append((source, target, old_row, new_row))
+
+        rows_updated = 0
+        for partition in sorted(in_place):
+            olds, news = in_place[partition]
+            rows_updated += self.update_by_old_new_data(
+                DataUpdate(table=partition_table_name(table_name, partition), old_data=olds, new_data=news)
+            )
+
+        for source, target, old_row, new_row in moves:
+            match_columns = [pk for pk in primary_keys if pk in old_row] or list(old_row)
+            deleted = self.delete_block(DataDeletion(
+                table=partition_table_name(table_name, source),
+                conditions=[Condition(col, "=", old_row[col]) for col in match_columns]
+            ))
+            if deleted:
+                self.write_block(DataWrite(
+                    table=partition_table_name(table_name, target),
+                    column=list(new_row),
+                    new_value=list(new_row.values())
+                ))
+                rows_updated += 1
+        return rows_updated
+
+    @_table_writer
     def update_by_old_new_data(self, data_update: DataUpdate) -> int:
         """Update rows dengan matching old_data ke new_data.
         
@@ -906,6 +2129,9 @@ class StorageManager:
             
         if not old_data:
             return 0
+
+        if self._is_partitioned(table_name):
+            return self._update_partitioned_by_old_new_data(data_update)
             
         table_file = self._get_table_file_path(table_name)
         column_defs = self._get_column_definitions(table_name)
@@ -967,7 +2193,7 @@ class StorageManager:
         
         # Tulis balik kalo ada yang diupdate
         if rows_updated > 0:
-            write_binary_table(table_file, new_rows, schema_names, self.block_size)
+            self._save_table_rows(table_name, new_rows, rows_updated)
             
             # Update indexes efficiently
             self._update_indexes_after_update(table_name, updated_rows_info)
@@ -978,6 +2204,7 @@ class StorageManager:
 
 
 
+    @_table_writer
     def delete_block(self, data_deletion: DataDeletion) -> int:
         table_name = data_deletion.table
 
@@ -985,6 +2212,14 @@ class StorageManager:
             available = list(self.tables.keys()) if self.tables else "tidak ada"
             raise ValueError(f"Tabel '{table_name}' tidak ditemukan. Tersedia: {available}")
 
+        if self._is_partitioned(table_name):
+            # partisi yang bound-nya ga match kondisi ga perlu dibaca
+            conditions = getattr(data_deletion, "conditions", []) or []
+            return sum(
+                self.delete_block(DataDeletion(table=name, conditions=conditions))
+                for name in self._pruned_partition_names(table_name, conditions)
+            )
+
         all_rows = self._load_table_rows(table_name)
         if not all_rows:
             print(f"tidak ada baris ditemukan di tabel '{table_name}'")
@@ -1013,12 +2248,47 @@ class StorageManager:
         )
 
         self._update_indexes_after_delete_efficient(table_name, all_rows, deleted_record_ids)
-        self._save_table_rows(table_name, rows_to_keep)
+        self._save_table_rows(table_name, rows_to_keep, len(deleted_record_ids))
 
         deleted_count = len(deleted_record_ids)
         # Deleted {deleted_count} rows from '{table_name}'
         return deleted_count
 
+    @_table_writer
+    def truncate_block(self, data_truncation: DataTruncation) -> int:
+        """Buang row dengan record id >= num_rows.
+
+        Dipake buat undo bulk load: row hasil load selalu di-append di ujung
+        tabel, jadi tabel cukup dipotong balik ke jumlah row sebelum load.
+        Beda sama delete_block per isi row, row lama yang isinya kebetulan
+        sama dengan row hasil load ga ikut kehapus.
+
+        Args:
+            data_truncation: Tabel (atau partisi) dan jumlah row yang dipertahankan
+
+        Returns:
+            Jumlah row yang dibuang
+
+        Raises:
+            ValueError: Jika tabel tidak ditemukan atau tabelnya dipartisi
+                (truncate per partisi, lihat count_rows_per_file)
+        """
+        table_name = data_truncation.table
+        if table_name not in self.tables:
+            raise ValueError(f"Tabel '{table_name}' tidak ditemukan")
+        if self._is_partitioned(table_name):
+            raise ValueError(f"Tabel '{table_name}' dipartisi, truncate per partisi")
+
+        all_rows = self._load_table_rows(table_name)
+        num_rows = max(data_truncation.num_rows, 0)
+        removed_record_ids = set(range(num_rows, len(all_rows)))
+        if not removed_record_ids:
+            return 0
+
+        self._update_indexes_after_delete_efficient(table_name, all_rows, removed_record_ids)
+        self._save_table_rows(table_name, all_rows[:num_rows], len(removed_record_ids))
+        return len(removed_record_ids)
+
 
     def _check_and_handle_foreign_key_constraints(
         self,
@@ -1133,7 +2403,7 @@ class StorageManager:
             deleted_record_ids
         )
         
-        self._save_table_rows(child_table, rows_to_keep)
+        self._save_table_rows(child_table, rows_to_keep, len(deleted_record_ids))
 
 
     def _set_null_child_rows(
@@ -1165,7 +2435,7 @@ class StorageManager:
         
         # Update indexes and save
         self._update_indexes_after_update(child_table, updated_rows_info)
-        self._save_table_rows(child_table, new_rows)
+        self._save_table_rows(child_table, new_rows, len(updated_rows_info))
 
 
     def _get_primary_key_columns(self, table_name: str) -> List[str]:
@@ -1183,15 +2453,15 @@ class StorageManager:
         if not indexes_to_update:
             return
 
-        # dapetin current total rows buat tau record_id awal
-        table_file = self._get_table_file_path(table_name)
-        all_rows = list(read_binary_table_streaming(table_file))
-        starting_record_id = len(all_rows) - len(new_rows)
+        # record_id awal = jumlah row sekarang (dari header block) - row baru
+        # ga perlu decode seluruh tabel tiap insert
+        starting_record_id = self.count_rows(table_name) - len(new_rows)
 
         for table, column in indexes_to_update:
             index = self.indexes[(table, column)]
 
-            # insert entry baru ke index
+            # entry baru masuk buffer dulu, di-merge sekaligus nanti
+            changes = []
             for i, row in enumerate(new_rows):
                 if column in row:
                     key = row[column]
@@ -1201,11 +2471,9 @@ class StorageManager:
                     else:
                         key_value = str(key) if key is not None else "NULL"
                     record_id = starting_record_id + i
-                    index.insert(key_value, record_id)
+                    changes.append(("insert", key_value, record_id))
 
-            # save updated index
-            index_file = self._get_index_file_path(table, column)
-            index.save(index_file)
+            self._buffer_index_changes(table, column, changes)
 
     def _update_indexes_after_update(
         self,
@@ -1223,7 +2491,7 @@ class StorageManager:
 
         for table, column in indexes_to_update:
             index = self.indexes[(table, column)]
-            index_updated = False
+            changes = []
 
             # cuma update index kalo kolom yang di-index berubah
             for record_id, old_row, new_row in updated_rows_info:
@@ -1243,18 +2511,46 @@ class StorageManager:
                         old_key = str(old_value) if old_value is not None else "NULL"
                         new_key = str(new_value) if new_value is not None else "NULL"
 
-                    # delete old entry
-                    index.delete(old_key, record_id)
-                    # insert new entry (SAME record_id!)
-                    index.insert(new_key, record_id)
-                    index_updated = True
+                    # delete old entry, insert new entry (SAME record_id!)
+                    changes.append(("delete", old_key, record_id))
+                    changes.append(("insert", new_key, record_id))
 
-            # save updated index (cuma kalo ada perubahan)
-            if index_updated:
-                index_file = self._get_index_file_path(table, column)
-                index.save(index_file)
+            # buffer cuma kalo ada perubahan
+            if changes:
+                self._buffer_index_changes(table, column, changes)
                 print(f"  efficiently updated index {table}.{column} (no rebuild!)")
 
+    def _buffer_index_changes(self, table: str, column: str, changes: List[Tuple[str, Any, int]]) -> None:
+        # catat perubahan ke change log (durable) terus ke buffer index
+        # merge kalo buffer udah lewat INDEX_CHANGE_BUFFER_SIZE
+        if not changes:
+            return
+        index = self.indexes[(table, column)]
+        self.index_change_log.append(table, column, changes)
+        index.buffer_changes(changes)
+        if len(index.pending) >= self.INDEX_CHANGE_BUFFER_SIZE:
+            index.merge_pending()
+
+    def _register_index(self, table: str, column: str, index: Any) -> None:
+        # simpen index di memory, habis merge buffer index-nya langsung di-save
+        index.on_merge = self._on_index_merged
+        self.indexes[(table, column)] = index
+
+    def _on_index_merged(self, index: Any) -> None:
+        # file index udah ke-update, perubahan yang baru di-merge ga perlu di log lagi
+        index.save(self._get_index_file_path(index.table_name, index.column_name))
+        self.index_change_log.truncate(index.table_name, index.column_name)
+
+    def merge_index_changes(self) -> int:
+        # merge semua perubahan index yang masih di buffer (misal sebelum shutdown)
+        # tiap merge hapus log index-nya sendiri; return jumlah perubahan yang di-merge
+        return sum(index.merge_pending() for index in list(self.indexes.values()))
+
+    def sync_index_changes(self) -> int:
+        # bikin perubahan index yang masih di buffer durable (dipanggil pas commit)
+        # cuma fsync change log, buffer-nya ga di-merge; return jumlah file log yang di-fsync
+        return self.index_change_log.sync()
+
     def _update_indexes_after_delete_efficient(
         self,
         table_name: str,
@@ -1282,8 +2578,9 @@ class StorageManager:
         for table, column in indexes_to_update:
             index = self.indexes[(table, column)]
 
-            # proses tiap row: delete atau update record_id
-            for old_record_id, row in enumerate(all_rows):
+            # 1. hapus entry row yang dihapus
+            for old_record_id in deleted_record_ids:
+                row = all_rows[old_record_id]
                 if column not in row:
                     continue
 
@@ -1293,17 +2590,10 @@ class StorageManager:
                     key_value = "NULL" if key is None else key
                 else:
                     key_value = str(key) if key is not None else "NULL"
+                index.delete(key_value, old_record_id)
 
-                if old_record_id in deleted_record_ids:
-                    # row dihapus: delete dari index
-                    index.delete(key_value, old_record_id)
-                else:
-                    # row tetap: update record_id yang shift
-                    new_record_id = record_id_mapping[old_record_id]
-                    if old_record_id != new_record_id:
-                        # record_id berubah: delete old, insert new
-                        index.delete(key_value, old_record_id)
-                        index.insert(key_value, new_record_id)
+            # 2. remap record_id yang shift dalam satu batch (ga delete + insert per row)
+            index.remap_record_ids(record_id_mapping)
 
             # save updated index
             index_file = self._get_index_file_path(table, column)
@@ -1348,6 +2638,16 @@ class StorageManager:
         if index_type not in ["btree", "hash"]:
             raise ValueError(f"Type {index_type} tidak ada")
 
+        if self._is_memory_table(table):
+            # lookup equality tabel memory udah pake hash di RAM
+            raise ValueError(f"Tabel ENGINE=MEMORY '{table}' tidak pakai index")
+
+        if self._is_partitioned(table):
+            # index lokal: tiap partisi punya index sendiri
+            for partition_name in self._partition_names(table):
+                self.set_index(partition_name, column, index_type)
+            return
+
         if index_type == "btree":
             # use default order from BPlusTree implementation
             # best practice: let the data structure use its tested default
@@ -1373,7 +2673,8 @@ class StorageManager:
                 index.save(index_file)
             else:
                 print("tabel kosong, index tidak dibuat")
-            self.indexes[(table, column)] = index
+            self._register_index(table, column, index)
+            self.index_change_log.truncate(table, column)
 
         elif index_type == "hash":
             # bikin hash index baru
@@ -1402,10 +2703,74 @@ class StorageManager:
                 print("tabel kosong, index tidak dibuat")
 
             # simpan index ke memory buat dipake nanti
-            self.indexes[(table, column)] = index
+            self._register_index(table, column, index)
+            self.index_change_log.truncate(table, column)
+
+    def _index_appended_blocks(self, table: str, start_offset: int, num_blocks: int, first_record_id: int) -> None:
+        # tambahin entry index buat num_blocks block mulai dari start_offset (hasil bulk load)
+        # record id row-nya lanjut dari first_record_id, cuma kolom index yang di-decode
+        table_indexes = [(column, index) for (index_table, column), index in self.indexes.items() if index_table == table]
+        if not table_indexes or num_blocks == 0:
+            return
+
+        table_file = self._get_table_file_path(table)
+        with open(table_file, 'rb') as f:
+            schema, _, _, options = read_table_header(f)
+            toast = open_toast_reader(table_file, options)
+            try:
+                decode = make_row_decoder(
+                    schema, [column for column, _ in table_indexes],
+                    dictionaries=options.get("dictionaries"), toast=toast
+                )
+                f.seek(start_offset)
+                row_buffers = iter_row_buffers(f, num_blocks, options.get("compression"))
+                for record_id, row_buffer in enumerate(row_buffers, first_record_id):
+                    row = decode(row_buffer)
+                    for column, index in table_indexes:
+                        key = row.get(column)
+                        # preserve key type buat b+ tree, convert to str buat hash
+                        if isinstance(index, BPlusTreeIndex):
+                            index.insert("NULL" if key is None else key, record_id)
+                        else:
+                            index.insert(str(key) if key is not None else "NULL", record_id)
+            finally:
+                if toast is not None:
+                    toast.close()
+
+        for column, index in table_indexes:
+            index.save(self._get_index_file_path(table, column))
+
+    def _rebuild_index(self, table: str, column: str) -> None:
+        # bangun ulang index yang udah ada dari isi tabel (bottom-up, bukan insert satu-satu)
+        # cuma kolom index yang di-decode
+        index = self.indexes[(table, column)]
+        table_file = self._get_table_file_path(table)
+
+        def entries():
+            if not os.path.exists(table_file):
+                return
+            for record_id, row in enumerate(read_binary_table_streaming(table_file, columns=[column])):
+                key = row.get(column)
+                if isinstance(index, BPlusTreeIndex):
+                    yield ("NULL" if key is None else key), record_id
+                else:
+                    yield (str(key) if key is not None else "NULL"), record_id
+
+        index.bulk_build(entries())
+        index.save(self._get_index_file_path(table, column))
+        # perubahan yang masih di buffer udah kebuang (index dibangun dari tabel)
+        self.index_change_log.truncate(table, column)
 
     def delete_index(self, table: str, column: str) -> None:
         # hapus index dari tabel dan kolom tertentu
+        if self._is_partitioned(table):
+            partition_indexes = [(p, column) for p in self._partition_names(table) if (p, column) in self.indexes]
+            if not partition_indexes:
+                raise ValueError(f"Index untuk {table}.{column} tidak ditemukan")
+            for partition_name, _ in partition_indexes:
+                self.delete_index(partition_name, column)
+            return
+
         if (table, column) not in self.indexes:
             raise ValueError(f"Index untuk {table}.{column} tidak ditemukan")
 
@@ -1416,6 +2781,16 @@ class StorageManager:
 
         # hapus index dari memory
         del self.indexes[(table, column)]
+        self.index_change_log.truncate(table, column)
+
+        # tabel ga lagi di-cluster berdasarkan index yang udah dihapus
+        table_meta = self.tables.get(table, {})
+        parent_meta = self.tables.get(table_meta.get("partition_of"), {})
+        clustered_metas = [meta for meta in (table_meta, parent_meta) if meta.get("clustered_on") == column]
+        for meta in clustered_metas:
+            del meta["clustered_on"]
+        if clustered_metas:
+            self._save_table_schemas()
 
         print(f"index untuk {table}.{column} berhasil dihapus")
 
@@ -1423,9 +2798,48 @@ class StorageManager:
         # dapetin path file index
         return os.path.join(self.data_dir, f"__index__{table}_{column}.idx")
 
-    def has_index(self, table: str, column: str) -> bool:
-        # cek apakah kolom di tabel punya index
-        return (table, column) in self.indexes
+    def has_index(self, table: str, column: str, index_type: Optional[str] = None) -> bool:
+        # cek apakah kolom di tabel punya index (index_type "btree"/"hash" = harus tipe itu)
+        if self._is_partitioned(table):
+            partitions = self._partition_names(table)
+            return all(self.has_index(p, column, index_type) for p in partitions)
+        index = self.indexes.get((table, column))
+        if index is None:
+            return False
+        if index_type == "btree":
+            return isinstance(index, BPlusTreeIndex)
+        if index_type == "hash":
+            return isinstance(index, HashIndex)
+        return True
+
+    def count_rows(self, table_name: str) -> int:
+        # jumlah row (n_r) tabel dari header block, ga ada row yang di-decode
+        # dipake executor buat jawab COUNT(*) tanpa WHERE
+        if table_name not in self.tables:
+            raise ValueError(f"Tabel '{table_name}' tidak ditemukan")
+        if self._is_partitioned(table_name):
+            return sum(self.count_rows(name) for name in self._partition_names(table_name))
+        if self._is_memory_table(table_name):
+            return len(self.memory_tables[table_name])
+
+        table_file = self._get_table_file_path(table_name)
+        if not os.path.exists(table_file):
+            return 0
+        offsets, first_record_ids = self._get_block_directory(table_file)
+        if not offsets:
+            return 0
+        # record id pertama block terakhir + row_count block terakhir
+        with open(table_file, 'rb') as f:
+            f.seek(offsets[-1])
+            return first_record_ids[-1] + struct.unpack('<I', f.read(4))[0]
+
+    def count_rows_per_file(self, table_name: str) -> Dict[str, int]:
+        # jumlah row tiap file tabel (tiap partisi kalo tabel dipartisi)
+        # dipake buat nyatet ujung tabel sebelum bulk load, biar abort bisa truncate_block balik
+        if table_name not in self.tables:
+            raise ValueError(f"Tabel '{table_name}' tidak ditemukan")
+        names = self._partition_names(table_name) if self._is_partitioned(table_name) else [table_name]
+        return {name: self.count_rows(name) for name in names}
 
     def get_indexes(self, table: Optional[str] = None) -> List[Tuple[str, str]]:
         # dapetin list semua index yang ada
@@ -1435,6 +2849,109 @@ class StorageManager:
         else:
             return list(self.indexes.keys())
 
+    @_table_writer
+    def cluster_table(self, table_name: str, column: Optional[str] = None) -> Dict[str, Any]:
+        # tulis ulang tabel urut key index (CLUSTER table USING column)
+        # column None = pake kolom clustering sebelumnya
+        # ini one-shot kayak CLUSTER di postgres: row yang di-insert setelahnya tetap di ujung,
+        # clustering factor di statistik yang nunjukin seberapa urut tabelnya sekarang
+        if table_name not in self.tables or "partition_of" in self.tables[table_name]:
+            raise ValueError(f"Tabel '{table_name}' tidak ditemukan")
+        if self._is_memory_table(table_name):
+            raise ValueError(f"Tabel ENGINE=MEMORY '{table_name}' tidak bisa di-cluster")
+
+        table_meta = self.tables[table_name]
+        column = column or table_meta.get("clustered_on")
+        if column is None:
+            raise ValueError(f"Tabel '{table_name}' belum pernah di-cluster, kolom harus disebut")
+        if not self.has_index(table_name, column):
+            raise ValueError(f"Kolom '{column}' di tabel '{table_name}' belum punya index")
+
+        targets = self._partition_names(table_name) if self._is_partitioned(table_name) else [table_name]
+        result = {"num_rows": 0, "blocks_before": 0, "blocks_after": 0}
+        for target in targets:
+            target_file = self._get_table_file_path(target)
+            if os.path.exists(target_file):
+                for key, value in cluster_table_file(target_file, column, self.block_size).items():
+                    result[key] += value
+
+            # record id berubah semua: index tabel ini dibangun ulang
+            for index_table, index_column in [key for key in self.indexes if key[0] == target]:
+                self._rebuild_index(index_table, index_column)
+            self.tables[target]["clustered_on"] = column
+
+        table_meta["clustered_on"] = column
+        self._save_table_schemas()
+
+        result["column"] = column
+        print(f"[OK] tabel '{table_name}' di-cluster berdasarkan '{column}' ({result['num_rows']} rows)")
+        return result
+
+    def _get_block_directory(self, table_file: str) -> Tuple[List[int], List[int]]:
+        # (offsets, first_record_ids) per block, dihitung ulang kalo file berubah
+        stat = os.stat(table_file)
+        signature = (stat.st_size, stat.st_mtime_ns)
+        cached = self._block_directories.get(table_file)
+        if cached is None or cached[0] != signature:
+            cached = (signature, compute_block_directory(table_file))
+            self._block_directories[table_file] = cached
+        return cached[1]
+
+    def _table_lock(self, table_name: str) -> threading.RLock:
+        # reentrant: writer boleh manggil writer lain di tabel yang sama (misal update = delete + insert)
+        with self._table_locks_guard:
+            lock = self._table_locks.get(table_name)
+            if lock is None:
+                lock = self._table_locks[table_name] = threading.RLock()
+            return lock
+
+    def compact_table(self, table_name: str, threshold: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        # pack ulang file tabel kalo dead space-nya lewat threshold
+        # return info compaction, atau None kalo ga perlu / file berubah di tengah jalan
+        if table_name not in self.tables:
+            raise ValueError(f"Tabel '{table_name}' tidak ditemukan")
+
+        table_file = self._get_table_file_path(table_name)
+        if self._is_memory_table(table_name) or not os.path.exists(table_file):
+            # snapshot tabel memory selalu ditulis padat
+            return None
+
+        if threshold is None:
+            threshold = self.COMPACTION_DEAD_SPACE_THRESHOLD
+        fragmentation = measure_fragmentation(table_file, self.block_size)
+        if fragmentation["num_blocks"] == 0 or fragmentation["dead_ratio"] < threshold:
+            return None
+
+        # copy jalan tanpa lock, cek signature + swap di bawah lock tabel
+        result = compact_table_file(table_file, self.block_size, lock=self._table_lock(table_name))
+        if result is None:
+            print(f"compaction tabel '{table_name}' dibatalin: file berubah selama compaction")
+            return None
+
+        result["dead_ratio"] = fragmentation["dead_ratio"]
+        print(
+            f"[OK] tabel '{table_name}' di-compact: "
+            f"{result['blocks_before']} -> {result['blocks_after']} blok"
+        )
+        return result
+
+    def start_compaction_worker(self, interval: float = 60.0, threshold: Optional[float] = None) -> CompactionWorker:
+        # jalanin vacuum di background thread, cek semua tabel tiap interval detik
+        if self._compaction_worker is not None and self._compaction_worker.is_alive():
+            return self._compaction_worker
+
+        if threshold is None:
+            threshold = self.COMPACTION_DEAD_SPACE_THRESHOLD
+        self._compaction_worker = CompactionWorker(self, interval, threshold)
+        self._compaction_worker.start()
+        return self._compaction_worker
+
+    def stop_compaction_worker(self) -> None:
+        # stop worker vacuum (nunggu putaran yang lagi jalan selesai)
+        if self._compaction_worker is not None:
+            self._compaction_worker.stop()
+            self._compaction_worker = None
+
     def get_stats(self) -> Dict[str, Statistic]:
         # ambil statistik buat semua tabel
         # n_r: jumlah tuple, b_r: jumlah blok, l_r: ukuran rata-rata tuple
@@ -1443,117 +2960,208 @@ class StorageManager:
         stats = {}
 
         for table_name in self.tables:
-            table_file = self._get_table_file_path(table_name)
-            schema_names = [c["name"] for c in self.tables[table_name]["columns"]]
-
-            # default values kalo tabel kosong
-            n_r = 0
-            b_r = 0
-            l_r = 0
-            f_r = 0
-            V_a_r: Dict[str, int] = {}
-            indexes: Dict[str, Dict[str, Any]] = {}
-
-            # collect index info untuk tabel ini
-            table_indexes = self.get_indexes(table_name)
-            for tbl, col in table_indexes:
-                index = self.indexes[(tbl, col)]
-                if isinstance(index, BPlusTreeIndex):
-                    # btree index: include type dan height
-                    indexes[col] = {
-                        "type": "btree",
-                        "height": index.get_height()
-                    }
-                elif isinstance(index, HashIndex):
-                    # hash index: cuma include type
-                    indexes[col] = {
-                        "type": "hash"
-                    }
+            if self._is_partitioned(table_name):
+                continue
+            table_stats = self._compute_table_stats(table_name)
+            if table_stats is not None:
+                stats[table_name] = table_stats
 
-            if not os.path.exists(table_file):
-                stats[table_name] = Statistic(
-                    n_r=n_r,
-                    b_r=b_r,
-                    l_r=l_r,
-                    f_r=f_r,
-                    V_a_r=V_a_r,
-                    indexes=indexes
+        # tabel partisi: gabungan statistik partisinya (dihitung di atas)
+        for table_name in self.tables:
+            if self._is_partitioned(table_name):
+                stats[table_name] = self._aggregate_partition_stats(
+                    table_name,
+                    [stats.get(name) or Statistic(0, 0, 0, 0) for name in self._partition_names(table_name)]
                 )
-                continue
 
-            try:
-                # baca header file buat dapetin num_blocks
-                with open(table_file, 'rb') as f:
-                    magic = f.read(4)
-                    if magic != b'SMDB':
-                        continue
+        self.stats = stats
+        return stats
 
-                    f.read(4)
+    def _aggregate_partition_stats(self, table_name: str, partition_stats: List[Statistic]) -> Statistic:
+        # statistik tabel logis dari statistik tiap partisi
+        # partition_stats disimpen juga biar cost model bisa pruning
+        spec = self.tables[table_name]["partitioning"]
+        n_r = sum(s.n_r for s in partition_stats)
+        b_r = sum(s.b_r for s in partition_stats)
+        l_r = int(sum(s.l_r * s.n_r for s in partition_stats) / n_r) if n_r else 0
+        f_r = max(int((self.block_size - 4) / l_r), 1) if l_r else 0
+
+        V_a_r: Dict[str, int] = {}
+        for col in self.tables[table_name]["columns"]:
+            counts = [s.V_a_r.get(col["name"], 0) for s in partition_stats]
+            # nilai partition key ga overlap antar partisi, kolom lain bisa overlap
+            V_a_r[col["name"]] = sum(counts) if col["name"] == spec["column"] else max(counts, default=0)
+
+        # index dibikin per partisi, pake height paling tinggi buat estimasi
+        indexes: Dict[str, Dict[str, Any]] = {}
+        for s in partition_stats:
+            for col, info in s.indexes.items():
+                if col not in indexes or info.get("height", 0) > indexes[col].get("height", 0):
+                    indexes[col] = dict(info)
+
+        # clustering factor dijumlah, tiap partisi di-fetch sendiri-sendiri
+        for col, info in indexes.items():
+            factors = [s.indexes[col].get("clustering_factor") for s in partition_stats if col in s.indexes]
+            if any(factor is not None for factor in factors):
+                info["clustering_factor"] = sum(factor or 0 for factor in factors)
+
+        return Statistic(
+            n_r=n_r,
+            b_r=b_r,
+            l_r=l_r,
+            f_r=f_r,
+            V_a_r=V_a_r,
+            indexes=indexes,
+            partitioning=spec,
+            partitions=partition_stats
+        )
 
-                    schema_length = struct.unpack('<I', f.read(4))[0]
-                    f.seek(schema_length, 1)
+    def _compute_table_stats(self, table_name: str) -> Optional[Statistic]:
+        # hitung statistik buat satu tabel aja
+        # return None kalo file tabel formatnya ga valid
+        if self._is_partitioned(table_name):
+            return self._aggregate_partition_stats(
+                table_name,
+                [self._compute_table_stats(name) or Statistic(0, 0, 0, 0) for name in self._partition_names(table_name)]
+            )
+
+        table_file = self._get_table_file_path(table_name)
+        schema_names = [c["name"] for c in self.tables[table_name]["columns"]]
 
-                    f.read(4)
+        # default values kalo tabel kosong
+        n_r = 0
+        b_r = 0
+        l_r = 0
+        f_r = 0
+        V_a_r: Dict[str, int] = {}
+        indexes: Dict[str, Dict[str, Any]] = {}
+
+        # collect index info untuk tabel ini
+        table_indexes = self.get_indexes(table_name)
+        for tbl, col in table_indexes:
+            index = self.indexes[(tbl, col)]
+            if isinstance(index, BPlusTreeIndex):
+                # btree index: include type dan height
+                indexes[col] = {
+                    "type": "btree",
+                    "height": index.get_height()
+                }
+                if index.adaptive_hash is not None:
+                    ahi_stats = index.adaptive_hash.stats
+                    indexes[col]["adaptive_hash"] = {
+                        "entries": len(index.adaptive_hash),
+                        "lookups": ahi_stats.lookups,
+                        "hits": ahi_stats.hits,
+                        "hit_rate": ahi_stats.hit_rate,
+                    }
+            elif isinstance(index, HashIndex):
+                # hash index: cuma include type
+                indexes[col] = {
+                    "type": "hash"
+                }
+            if col in indexes and self.tables[table_name].get("clustered_on") == col:
+                indexes[col]["clustered"] = True
 
-                    # ini b_r (jumlah blok)
-                    b_r = struct.unpack('<I', f.read(4))[0]
+        if not os.path.exists(table_file):
+            return Statistic(
+                n_r=n_r,
+                b_r=b_r,
+                l_r=l_r,
+                f_r=f_r,
+                V_a_r=V_a_r,
+                indexes=indexes
+            )
 
-                # load semua rows buat hitung statistik lainnya
+        try:
+            # baca header file buat dapetin num_blocks
+            with open(table_file, 'rb') as f:
+                magic = f.read(4)
+                if magic != b'SMDB':
+                    return None
+                f.seek(0)
+
+                # ini b_r (jumlah blok)
+                _, _, b_r, options = read_table_header(f)
+
+            # load semua rows buat hitung statistik lainnya
+            if self._is_memory_table(table_name):
+                all_rows = self.memory_tables[table_name].rows()
+            else:
                 all_rows = list(read_binary_table_streaming(table_file))
-                n_r = len(all_rows)
-
-                if n_r > 0:
-                    # hitung l_r (rata-rata ukuran row dalam bytes)
-                    total_size = sum(calculate_row_size(row, schema_names) for row in all_rows)
-                    l_r = int(total_size / n_r)
-
-                    # hitung f_r (blocking factor)
-                    if l_r > 0:
-                        usable_space = self.block_size - 4
-                        f_r = int(usable_space / l_r)
-                        if f_r == 0:
-                            f_r = 1
-
-                    # hitung V(a,r) - jumlah nilai distinct per atribut
-                    for col_name in schema_names:
-                        distinct_values = set()
-                        for row in all_rows:
-                            if col_name in row:
-                                val = row[col_name]
-                                if isinstance(val, dict) or isinstance(val, list):
-                                    val = str(val)
-                                distinct_values.add(val)
-                        V_a_r[col_name] = len(distinct_values)
-
-                stats[table_name] = Statistic(
-                    n_r=n_r,
-                    b_r=b_r,
-                    l_r=l_r,
-                    f_r=f_r,
-                    V_a_r=V_a_r,
-                    indexes=indexes
-                )
+            n_r = len(all_rows)
+
+            if n_r > 0:
+                # hitung l_r (rata-rata ukuran row dalam bytes), value TOAST dihitung ukuran pointer-nya
+                toast_threshold = options.get("toast_threshold")
+                total_size = sum(calculate_row_size(row, schema_names, toast_threshold) for row in all_rows)
+                l_r = int(total_size / n_r)
+
+                # hitung f_r (blocking factor)
+                if l_r > 0:
+                    usable_space = self.block_size - 4
+                    f_r = int(usable_space / l_r)
+                    if f_r == 0:
+                        f_r = 1
+
+                # tabel memory: snapshot bisa ketinggalan, b_r = jumlah block kalo isinya ditulis sekarang
+                if self._is_memory_table(table_name) and f_r > 0:
+                    b_r = math.ceil(n_r / f_r)
+
+                # hitung V(a,r) - jumlah nilai distinct per atribut
+                for col_name in schema_names:
+                    distinct_values = set()
+                    for row in all_rows:
+                        if col_name in row:
+                            val = row[col_name]
+                            if isinstance(val, dict) or isinstance(val, list):
+                                val = str(val)
+                            distinct_values.add(val)
+                    V_a_r[col_name] = len(distinct_values)
+
+                # clustering factor tiap index (n_r = acak, b_r = urut sesuai index)
+                if indexes:
+                    _, first_record_ids = self._get_block_directory(table_file)
+                    for col in indexes:
+                        indexes[col]["clustering_factor"] = self._index_clustering_factor(
+                            self.indexes[(table_name, col)], first_record_ids
+                        )
 
-            except Exception as e:
-                print(f"error calculating stats for '{table_name}': {e}")
-                stats[table_name] = Statistic(
-                    n_r=0,
-                    b_r=0,
-                    l_r=0,
-                    f_r=0,
-                    V_a_r={},
-                    indexes={}
-                )
+            return Statistic(
+                n_r=n_r,
+                b_r=b_r,
+                l_r=l_r,
+                f_r=f_r,
+                V_a_r=V_a_r,
+                indexes=indexes
+            )
 
-        self.stats = stats
-        return stats
+        except Exception as e:
+            print(f"error calculating stats for '{table_name}': {e}")
+            return Statistic(
+                n_r=0,
+                b_r=0,
+                l_r=0,
+                f_r=0,
+                V_a_r={},
+                indexes={}
+            )
+
+    def _index_clustering_factor(self, index: Any, first_record_ids: List[int]) -> int:
+        # b+ tree di-fetch urut key (satu run), hash per key
+        if isinstance(index, BPlusTreeIndex):
+            runs = [index.iter_record_ids()]
+        else:
+            index.merge_pending()
+            runs = [sorted(record_ids) for record_ids in index.index.values()]
+        return clustering_factor(runs, first_record_ids)
 
     def get_metadata(self) -> Dict[str, Any]:
         # ambil metadata database: list tabel dan kolom tiap tabel
         # format output sama kayak get_statistic() di query_check.py
         # returns: {"tables": [...], "columns": {table_name: [col1, col2, ...]}}
 
-        tables = list(self.tables.keys())
+        # partisi itu tabel internal, ga ditampilin
+        tables = [name for name, meta in self.tables.items() if "partition_of" not in meta]
         columns = {}
 
         for table_name in tables:
@@ -0,0 +1,295 @@
+"""Synchronized scan buat full scan yang jalan barengan di tabel yang sama.
+
+Tanpa ini, N client yang `SELECT *` tabel gede barengan masing-masing baca
+(dan decompress) semua block sendiri-sendiri. Dengan synchronized scan,
+semua full scan ke satu file tabel pake satu SharedScan: scan baru mulai
+dari block yang lagi dibaca scan lain, baca block lewat window bersama
+(block yang baru dibaca disimpen sebentar), terus wrap around ke block 0
+buat block yang kelewat. Scan yang jalan barengan jadi cuma baca tiap
+block sekali, mirip synchronize_seqscans di PostgreSQL.
+
+Yang di-share raw row buffer per block (udah di-decompress). Decode tetap
+per scan, jadi proyeksi / filter / TOAST tetap lazy sesuai query masing-masing.
+
+Parallel scan tabel gede juga kedaftar di sini: scan yang mulai belakangan
+nempel di block pertama yang belum di-submit ke worker, terus parallel scan
+baca sisa block-nya serial lewat window yang sama.
+"""
+from __future__ import annotations
+
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from .models import Condition
+from .parallel_scan import compute_block_offsets, parallel_scan
+from .readahead import PrefetchStats, iter_prefetched_blocks
+from .toast import open_toast_reader
+from .utils import make_row_decoder, read_block_rows
+
+
+@dataclass
+class SyncScanStats:
+    """Statistik synchronized scan.
+
+    Attributes:
+        scans: Jumlah scan yang jalan lewat SharedScan
+        attached: Scan yang nempel ke scan lain yang lagi jalan
+        blocks_read: Block yang beneran dibaca dari file
+        blocks_shared: Block yang diambil dari window (hasil baca scan lain)
+    """
+    scans: int = 0
+    attached: int = 0
+    blocks_read: int = 0
+    blocks_shared: int = 0
+
+
+def _file_signature(file_path: str) -> Tuple[int, int]:
+    st = os.stat(file_path)
+    return st.st_size, st.st_mtime_ns
+
+
+class SharedScan:
+    """State bersama semua scan ke satu versi file tabel.
+
+    Args:
+        file_path: Path ke file tabel
+        window: Maksimal block yang disimpen buat scan lain
+        stats: SyncScanStats kumulatif (punya registry)
+    """
+
+    def __init__(self, file_path: str, window: int, stats: SyncScanStats):
+        self.file_path = file_path
+        self.signature = _file_signature(file_path)
+        self.schema, self.options, self.offsets = compute_block_offsets(file_path)
+        self.window = max(window, 1)
+        self.stats = stats
+        # block terakhir yang dibaca dari file (atau block pertama yang belum
+        # di-submit parallel scan) = posisi scan baru mulai
+        self.position = 0
+        self.consumers = 0
+        self._lock = threading.Lock()
+        self._blocks: "OrderedDict[int, List[bytes]]" = OrderedDict()
+        self._loading: Dict[int, threading.Event] = {}
+
+    @property
+    def num_blocks(self) -> int:
+        return len(self.offsets)
+
+    def advance(self, block: int, blocks_read: int = 0, lag: int = 0) -> None:
+        """Publish posisi parallel scan: block pertama yang belum di-submit ke worker.
+
+        Args:
+            block: Block pertama yang belum di-submit
+            blocks_read: Block yang baru di-submit (dibaca worker)
+            lag: Block yang masih harus di-consume parallel scan sebelum sampe
+                ke posisi ini; window minimal segini biar block yang dibaca
+                scan yang nempel belum dibuang pas parallel scan nyusul
+        """
+        with self._lock:
+            self.position = block % self.num_blocks
+            self.stats.blocks_read += blocks_read
+            self.window = max(self.window, lag)
+
+    def iter_blocks(
+        self,
+        f,
+        start: int,
+        count: int,
+        readahead: int = 0,
+        prefetch_stats: Optional[PrefetchStats] = None
+    ) -> Iterator[List[bytes]]:
+        """Row buffer count block mulai dari start (wrap ke block 0), dibaca pake file f.
+
+        Kalo readahead > 0, block berikutnya diambil (dari window atau file) di
+        background thread selagi block ini di-decode. Panggil close() sebelum
+        f ditutup kalo berhenti di tengah.
+        """
+        positions = iter(range(count))
+
+        def read_next() -> List[bytes]:
+            return self.get_block(f, (start + next(positions)) % self.num_blocks)
+
+        if readahead > 0 and count > 1:
+            yield from iter_prefetched_blocks(read_next, count, readahead, prefetch_stats)
+            return
+        for _ in range(count):
+            yield read_next()
+
+    def get_block(self, f, block: int) -> List[bytes]:
+        """Row buffer satu block, dari window kalo ada, kalo ga dibaca pake file f."""
+        while True:
+            with self._lock:
+                rows = self._blocks.get(block)
+                if rows is not None:
+                    # window FIFO sesuai urutan baca: block yang udah dipake ga di-refresh,
+                    # jadi yang dibuang duluan block yang paling jauh di belakang
+                    self.stats.blocks_shared += 1
+                    return rows
+                pending = self._loading.get(block)
+                if pending is None:
+                    pending = self._loading[block] = threading.Event()
+                    break
+            # scan lain lagi baca block ini, tunggu hasilnya
+            pending.wait()
+
+        try:
+            f.seek(self.offsets[block])
+            rows = read_block_rows(f, self.options.get("compression"))
+            if rows is None:
+                raise ValueError(f"Block {block} tabel '{self.file_path}' kepotong")
+        except Exception:
+            # scan yang nunggu bakal coba baca sendiri
+            with self._lock:
+                del self._loading[block]
+            pending.set()
+            raise
+
+        with self._lock:
+            del self._loading[block]
+            self._blocks[block] = rows
+            while len(self._blocks) > self.window:
+                self._blocks.popitem(last=False)
+            self.position = block
+            self.stats.blocks_read += 1
+        pending.set()
+        return rows
+
+
+class SyncScanRegistry:
+    """Daftar SharedScan yang lagi aktif, satu per file tabel.
+
+    Args:
+        window: Jumlah block yang disimpen tiap SharedScan
+    """
+
+    def __init__(self, window: int = 32):
+        self.window = window
+        self.stats = SyncScanStats()
+        self._scans: Dict[str, SharedScan] = {}
+        self._lock = threading.Lock()
+
+    def attach(self, file_path: str) -> Tuple[SharedScan, int]:
+        """Gabung ke scan yang lagi jalan (atau mulai baru).
+
+        Returns:
+            Tuple (SharedScan, block awal buat scan ini)
+        """
+        with self._lock:
+            scan = self._scans.get(file_path)
+            if scan is not None and scan.signature != _file_signature(file_path):
+                # file udah berubah: scan lama dibiarin selesai, scan baru pake versi baru
+                scan = None
+            if scan is None:
+                scan = SharedScan(file_path, self.window, self.stats)
+                self._scans[file_path] = scan
+                start = 0
+            else:
+                self.stats.attached += 1
+                start = scan.position
+            scan.consumers += 1
+            self.stats.scans += 1
+            return scan, start
+
+    def detach(self, scan: SharedScan) -> None:
+        with self._lock:
+            scan.consumers -= 1
+            if scan.consumers == 0 and self._scans.get(scan.file_path) is scan:
+                del self._scans[scan.file_path]
+
+    def active_scans(self, file_path: str) -> int:
+        """Jumlah scan yang lagi jalan di file tabel ini."""
+        with self._lock:
+            scan = self._scans.get(file_path)
+            return scan.consumers if scan is not None else 0
+
+    def scan(
+        self,
+        file_path: str,
+        filter_fn: Optional[Callable[[Dict[str, Any]], bool]] = None,
+        columns: Optional[List[str]] = None,
+        filter_columns: Optional[List[str]] = None,
+        equality_filters: Optional[List[Tuple[str, Any]]] = None,
+        plan: Optional[Dict[str, Any]] = None,
+        readahead: int = 0,
+        prefetch_stats: Optional[PrefetchStats] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """Full scan lewat SharedScan, mulai dari posisi scan yang lagi jalan.
+
+        Urutan row: block awal sampe block terakhir, terus wrap ke block 0.
+        Scan yang jalan sendirian selalu mulai dari block 0 (urutan file).
+        Argumen filter / proyeksi sama kayak read_binary_table_streaming.
+
+        Args:
+            file_path: Path ke file tabel
+            filter_fn: Optional function(row) -> bool
+            columns: Optional kolom output (None = semua kolom)
+            filter_columns: Optional kolom yang dibaca filter_fn
+            equality_filters: Optional list (column, operand) dari kondisi '='
+            plan: Optional access plan, diisi sync_scan_start (block awal)
+            readahead: Jumlah block yang di-prefetch di background (0 = off)
+            prefetch_stats: Optional PrefetchStats buat nyatet hit/miss readahead
+
+        Yields:
+            Dict[str, Any]: Row yang lolos filter
+        """
+        scan, start = self.attach(file_path)
+        toast = None
+        try:
+            if plan is not None:
+                plan["sync_scan_start"] = start
+            toast = open_toast_reader(file_path, scan.options)
+            decode = make_row_decoder(
+                scan.schema, columns, filter_fn, filter_columns,
+                scan.options.get("dictionaries"), equality_filters, toast
+            )
+            with open(file_path, 'rb') as f:
+                blocks = scan.iter_blocks(f, start, scan.num_blocks, readahead, prefetch_stats)
+                try:
+                    for row_buffers in blocks:
+                        for row_buffer in row_buffers:
+                            row = decode(row_buffer)
+                            if row is not None:
+                                yield row
+                finally:
+                    # stop prefetcher sebelum file-nya ditutup
+                    blocks.close()
+        finally:
+            if toast is not None:
+                toast.close()
+            self.detach(scan)
+
+    def parallel_scan(
+        self,
+        file_path: str,
+        conditions: Optional[List[Condition]] = None,
+        columns: Optional[List[str]] = None,
+        max_workers: Optional[int] = None,
+        readahead: int = 0
+    ) -> Iterator[Dict[str, Any]]:
+        """Parallel full scan yang kedaftar sebagai scan aktif di file tabel.
+
+        Selama sendirian, range block di-decode di worker kayak parallel_scan
+        biasa. Scan lain yang mulai di tengah jalan nempel di block pertama
+        yang belum di-submit; setelah itu range yang udah jalan dihabisin,
+        terus sisa block dibaca serial lewat SharedScan bareng scan itu.
+
+        Args:
+            file_path: Path ke file tabel
+            conditions: Kondisi filter (AND)
+            columns: Optional kolom output (None = semua kolom)
+            max_workers: Jumlah worker process (None = jumlah CPU)
+            readahead: Jumlah block yang di-prefetch pas baca serial lewat SharedScan
+
+        Yields:
+            Dict[str, Any]: Row yang lolos filter, urut sesuai file
+        """
+        scan, _ = self.attach(file_path)
+        try:
+            yield from parallel_scan(
+                file_path, conditions, columns, max_workers, ordered=True, shared=scan, readahead=readahead
+            )
+        finally:
+            self.detach(scan)
@@ -19,10 +19,20 @@ Atau jalankan test spesifik:
 
 import os
 import sys
+import threading
+import time
 from typing import List, Dict, Any
 
 from .storage_manager import StorageManager
-from .models import Condition, DataRetrieval, DataWrite, DataDeletion, ColumnDefinition, ForeignKey
+from .models import Condition, DataRetrieval, DataWrite, DataDeletion, DataUpdate, DataTruncation, ColumnDefinition, ForeignKey
+from . import parallel_scan as scan_module
+from .parallel_scan import compute_block_offsets, partition_blocks, parallel_scan, shutdown_scan_pool
+from . import utils as storage_utils
+from . import storage_manager as storage_module
+from .readahead import _BlockPrefetcher, iter_prefetched_blocks
+from .compaction import measure_fragmentation
+from .partitioning import prune_partitions, route_value
+from .utils import serialize_row, deserialize_row, build_column_mask, make_row_decoder, decode_columns, read_table_options, write_binary_table
 
 
 class TestStorageManager:
@@ -622,6 +632,1401 @@ class TestStorageManager:
             self.assert_true(False, f"Test large dataset gagal: {e}")
 
 
+    # ========== Test: access path (index scan vs full scan) ==========
+
+    def test_access_path(self):
+        """Test cost-based choice antara index scan dan full scan di read_block."""
+        self.print_header("ACCESS PATH SELECTION")
+
+        TABLE_NAME = "access_path_test"
+        if TABLE_NAME not in self.sm.tables:
+            self.sm.create_table(TABLE_NAME, [
+                ColumnDefinition("id", "INTEGER", is_primary_key=True),
+                ColumnDefinition("status", "VARCHAR", size=10),
+                ColumnDefinition("payload", "VARCHAR", size=200),
+            ])
+            # payload bikin row cukup lebar supaya tabel kepecah jadi banyak blok
+            rows = [
+                {"id": i, "status": "active" if i % 10 else "inactive", "payload": "x" * 150}
+                for i in range(500)
+            ]
+            self.sm.insert_rows(TABLE_NAME, rows)
+            self.sm.set_index(TABLE_NAME, "id", "btree")
+            self.sm.set_index(TABLE_NAME, "status", "hash")
+
+        # Test 1: equality yang selektif pake index
+        print("\n[1] WHERE id = 321 harus pake index scan")
+        retrieval = DataRetrieval(table=TABLE_NAME, conditions=[Condition("id", "=", 321)])
+        rows = self.sm.read_block(retrieval)
+        self.assert_equal(len(rows), 1, "Should return 1 row")
+        self.assert_equal(self.sm.last_access_plan["method"], "index_scan", "Selective equality should use index")
+        self.assert_true(
+            self.sm.last_access_plan["index_cost"] < self.sm.last_access_plan["seq_cost"],
+            "Index cost should be lower than seq cost"
+        )
+
+        # Test 2: range yang match hampir semua row pake full scan
+        print("\n[2] WHERE id > 25 (95% tabel) harus pake full scan")
+        retrieval = DataRetrieval(table=TABLE_NAME, conditions=[Condition("id", ">", 25)])
+        rows = self.sm.read_block(retrieval)
+        self.assert_equal(len(rows), 474, "Should return 474 rows")
+        self.assert_equal(self.sm.last_access_plan["method"], "full_scan", "Unselective range should use full scan")
+        self.assert_true(
+            abs(self.sm.last_access_plan["estimated_rows"] - 474) < 10,
+            f"Estimated rows should be close to 474, got {self.sm.last_access_plan['estimated_rows']}"
+        )
+
+        # Test 3: range yang sempit tetap pake index
+        print("\n[3] WHERE id < 5 harus pake index scan")
+        retrieval = DataRetrieval(table=TABLE_NAME, conditions=[Condition("id", "<", 5)])
+        rows = self.sm.read_block(retrieval)
+        self.assert_equal(len(rows), 5, "Should return 5 rows")
+        self.assert_equal(self.sm.last_access_plan["method"], "index_scan", "Narrow range should use index")
+
+        # Test 4: equality di kolom low-cardinality (90% active) pake full scan
+        print("\n[4] WHERE status = 'active' harus pake full scan")
+        retrieval = DataRetrieval(table=TABLE_NAME, conditions=[Condition("status", "=", "active")])
+        rows = self.sm.read_block(retrieval)
+        self.assert_equal(len(rows), 450, "Should return 450 rows")
+        self.assert_equal(self.sm.last_access_plan["method"], "full_scan", "Low-cardinality equality should use full scan")
+
+        # Test 5: pilih access path ga scan tabel, statistik dari metadata di-cache per signature file
+        print("\n[5] Point lookup ga hitung statistik dari scan tabel")
+        full_stats_calls = []
+        compute_table_stats = self.sm._compute_table_stats
+        self.sm._compute_table_stats = lambda table: full_stats_calls.append(table) or compute_table_stats(table)
+        try:
+            rows = self.sm.read_block(DataRetrieval(table=TABLE_NAME, conditions=[Condition("id", "=", 42)]))
+            self.assert_equal(len(rows), 1, "Should return 1 row")
+            self.assert_equal(self.sm.last_access_plan["method"], "index_scan", "Point lookup should use index")
+            self.assert_equal(full_stats_calls, [], "Should not compute full table stats")
+
+            cached = self.sm._access_path_stats[TABLE_NAME]
+            self.sm.read_block(DataRetrieval(table=TABLE_NAME, conditions=[Condition("id", "=", 43)]))
+            self.assert_true(self.sm._access_path_stats[TABLE_NAME] is cached, "Unchanged table should reuse cached stats")
+
+            self.sm.write_block(DataWrite(
+                table=TABLE_NAME, column=["id", "status", "payload"], new_value=[500, "new", "y"], conditions=[]
+            ))
+            rows = self.sm.read_block(DataRetrieval(table=TABLE_NAME, conditions=[Condition("status", "=", "new")]))
+            self.assert_equal(len(rows), 1, "Should find the new row")
+            refreshed = self.sm._access_path_stats[TABLE_NAME][1]
+            self.assert_equal(refreshed.n_r, 501, "Stats should be refreshed after a write")
+            self.assert_equal(refreshed.V_a_r["status"], 3, "Distinct count should come from the index keys")
+            self.sm.delete_block(DataDeletion(table=TABLE_NAME, conditions=[Condition("id", "=", 500)]))
+        finally:
+            del self.sm._compute_table_stats
+
+    # ========== Test: open_cursor ==========
+
+    def test_open_cursor(self):
+        """Test streaming cursor dengan proyeksi dan LIMIT."""
+        self.print_header("OPEN CURSOR")
+
+        TABLE_NAME = "access_path_test"
+        if TABLE_NAME not in self.sm.tables:
+            self.test_access_path()
+
+        # Test 1: limit + proyeksi
+        print("\n[1] Cursor dengan limit 3 dan proyeksi kolom id")
+        retrieval = DataRetrieval(table=TABLE_NAME, column=["id"], conditions=[])
+        rows = list(self.sm.open_cursor(retrieval, limit=3))
+        self.assert_equal(rows, [{"id": 0}, {"id": 1}, {"id": 2}], "Should return first 3 projected rows")
+
+        # Test 2: cursor lazy, bisa di-consume sebagian lalu ditutup
+        print("\n[2] Cursor lazy dengan filter")
+        retrieval = DataRetrieval(table=TABLE_NAME, column=["id", "status"], conditions=[
+            Condition("status", "=", "inactive")
+        ])
+        cursor = self.sm.open_cursor(retrieval)
+        first = next(cursor)
+        second = next(cursor)
+        cursor.close()
+        self.assert_equal((first["id"], second["id"]), (0, 10), "Should yield matching rows in file order")
+        self.assert_true("payload" not in first, "Should not include 'payload'")
+
+        # Test 3: limit 0 ga baca apa-apa
+        print("\n[3] Cursor dengan limit 0")
+        rows = list(self.sm.open_cursor(DataRetrieval(table=TABLE_NAME), limit=0))
+        self.assert_equal(rows, [], "Should return no rows")
+
+        # Test 4: tabel ga ada langsung error
+        print("\n[4] Cursor ke tabel yang tidak ada harus gagal")
+        try:
+            self.sm.open_cursor(DataRetrieval(table="tidak_ada"))
+            self.assert_true(False, "Should raise ValueError for missing table")
+        except ValueError:
+            self.assert_true(True, "Should raise ValueError for missing table")
+
+    def test_batch_cursor(self):
+        """Test cursor columnar yang decode block langsung ke list per kolom."""
+        self.print_header("BATCH CURSOR")
+
+        TABLE_NAME = "access_path_test"
+        if TABLE_NAME not in self.sm.tables:
+            self.test_access_path()
+
+        # Test 1: decode_columns tanpa dict per row, urutan schema
+        print("\n[1] decode_columns dari row buffer")
+        schema = ["id", "name", "score", "note"]
+        buffers = [serialize_row({"id": i, "name": f"n{i}", "score": i / 2, "note": None}, schema) for i in range(3)]
+        decoded = decode_columns(buffers, schema, ["score", "id"])
+        self.assert_equal(decoded, {"id": [0, 1, 2], "score": [0.0, 0.5, 1.0]}, "Should decode requested columns as lists")
+
+        # Test 2: filter per kolom + proyeksi, hasil sama kayak read_block
+        print("\n[2] Batch cursor dengan filter dan proyeksi")
+        retrieval = DataRetrieval(table=TABLE_NAME, column=["payload", "id"], conditions=[
+            Condition("status", "<>", "active"),
+            Condition("id", ">=", 100)
+        ])
+        expected = self.sm.read_block(retrieval)
+        batches = list(self.sm.open_batch_cursor(retrieval, batch_rows=64))
+        self.assert_true(self.sm.last_access_plan.get("columnar"), "Full scan should decode columnar batches")
+        rows = [dict(zip(batch, values)) for batch in batches for values in zip(*batch.values())]
+        self.assert_equal(rows, expected, "Should return the same rows as read_block")
+        self.assert_equal(list(batches[0]), ["payload", "id"], "Should keep requested column order")
+
+        # Test 3: tanpa kondisi, batch dipotong per batch_rows
+        print("\n[3] Batch cursor full scan")
+        sizes = [len(batch["id"]) for batch in self.sm.open_batch_cursor(DataRetrieval(table=TABLE_NAME), batch_rows=64)]
+        self.assert_equal(sum(sizes), self.sm.count_rows(TABLE_NAME), "Should return every row")
+        self.assert_true(max(sizes) <= 64, "Should not exceed batch_rows")
+
+        # Test 4: index scan lewat cursor biasa, dikelompokkan jadi batch
+        print("\n[4] Index scan dikelompokkan jadi batch")
+        retrieval = DataRetrieval(table=TABLE_NAME, column=["id"], conditions=[Condition("id", "=", 321)])
+        batches = list(self.sm.open_batch_cursor(retrieval))
+        self.assert_equal(self.sm.last_access_plan["method"], "index_scan", "Selective equality should use index")
+        self.assert_equal(batches, [{"id": [321]}], "Should return the index scan rows as one batch")
+
+    def test_projection_decoding(self):
+        """Test decoding yang cuma materialize kolom yang dibutuhkan."""
+        self.print_header("PROJECTION-AWARE DECODING")
+
+        schema = ["id", "name", "score", "active", "note"]
+        row = {"id": 7, "name": "budi", "score": 3.5, "active": True, "note": None}
+        row_bytes = serialize_row(row, schema)
+
+        # Test 1: mask cuma decode kolom yang diminta, offset tetap di akhir row
+        print("\n[1] deserialize_row dengan mask kolom")
+        mask = build_column_mask(schema, ["score", "id"])
+        decoded, offset = deserialize_row(row_bytes, 0, schema, mask)
+        self.assert_equal(decoded, {"id": 7, "score": 3.5}, "Should decode only masked columns")
+        self.assert_equal(offset, len(row_bytes), "Should return offset after the whole row")
+
+        # Test 2: late materialization, row yang gagal filter ga decode kolom lain
+        print("\n[2] Decoder decode kolom filter dulu")
+        seen = []
+
+        def only_active(r):
+            seen.append(dict(r))
+            return r["active"]
+
+        decode = make_row_decoder(schema, ["name", "id"], only_active, ["active"])
+        self.assert_equal(decode(row_bytes), {"name": "budi", "id": 7}, "Should keep requested column order")
+        self.assert_equal(seen, [{"active": True}], "Filter should only see its own columns")
+
+        rejected = serialize_row(dict(row, active=False), schema)
+        self.assert_true(decode(rejected) is None, "Should reject rows failing the filter")
+
+        # Test 3: read_block dengan proyeksi + filter ke kolom di luar proyeksi
+        print("\n[3] read_block proyeksi kolom yang beda dari kolom filter")
+        TABLE_NAME = "access_path_test"
+        if TABLE_NAME not in self.sm.tables:
+            self.test_access_path()
+        retrieval = DataRetrieval(table=TABLE_NAME, column=["payload", "id"], conditions=[
+            Condition("status", "=", "inactive"),
+            Condition("id", "<", 25)
+        ])
+        rows = self.sm.read_block(retrieval)
+        self.assert_equal([r["id"] for r in rows], [0, 10, 20], "Should filter on non-projected column")
+        self.assert_equal(list(rows[0].keys()), ["payload", "id"], "Should only contain projected columns")
+
+    def test_compressed_table(self):
+        """Test tabel dengan block compression dan dictionary encoding."""
+        self.print_header("COMPRESSION & DICTIONARY ENCODING")
+
+        TABLE_NAME = "compressed_test"
+        PLAIN_TABLE = "uncompressed_test"
+        columns = [
+            ColumnDefinition("id", "INTEGER", is_primary_key=True),
+            ColumnDefinition("major", "VARCHAR", size=30),
+            ColumnDefinition("note", "VARCHAR", size=100),
+        ]
+        majors = ["Informatics", "Electrical Engineering", "Mathematics"]
+        rows = [
+            {"id": i, "major": majors[i % 3], "note": f"catatan mahasiswa nomor {i}"}
+            for i in range(300)
+        ]
+        for table, options in ((TABLE_NAME, {"compression": "zlib", "dictionary_columns": ["major"]}),
+                               (PLAIN_TABLE, None)):
+            if table in self.sm.tables:
+                self.sm.drop_table(table)
+            self.sm.create_table(table, [ColumnDefinition(**vars(c)) for c in columns],
+                                 storage_options=options)
+            self.sm.insert_rows(table, rows)
+
+        table_file = self.sm._get_table_file_path(TABLE_NAME)
+
+        # Test 1: options + dictionary kesimpen di header, file lebih kecil
+        print("\n[1] Header nyimpen options, file lebih kecil dari tabel plain")
+        options = read_table_options(table_file)
+        self.assert_equal(options["compression"], "zlib", "Header should record zlib compression")
+        self.assert_equal(options["dictionaries"]["major"], sorted(majors), "Header should record sorted dictionary")
+        plain_size = os.path.getsize(self.sm._get_table_file_path(PLAIN_TABLE))
+        self.assert_true(os.path.getsize(table_file) < plain_size / 2, "Compressed file should be much smaller")
+
+        # Test 2: scan hasilnya sama persis kayak tabel plain
+        print("\n[2] Full scan dan equality filter di kolom dictionary")
+        self.assert_equal(
+            self.sm.read_block(DataRetrieval(table=TABLE_NAME)),
+            self.sm.read_block(DataRetrieval(table=PLAIN_TABLE)),
+            "Compressed scan should match plain scan"
+        )
+        retrieval = DataRetrieval(table=TABLE_NAME, column=["id"], conditions=[
+            Condition("major", "=", "Mathematics")
+        ])
+        self.assert_equal(len(self.sm.read_block(retrieval)), 100, "Should match 100 Mathematics rows")
+        retrieval = DataRetrieval(table=TABLE_NAME, conditions=[Condition("major", "=", "Physics")])
+        self.assert_equal(self.sm.read_block(retrieval), [], "Value outside dictionary should match nothing")
+
+        # Test 3: insert value baru bikin dictionary nambah
+        print("\n[3] Insert value baru nambah dictionary")
+        self.sm.write_block(DataWrite(
+            table=TABLE_NAME, column=["id", "major", "note"], new_value=[300, "Physics", "baru"], conditions=[]
+        ))
+        self.sm.write_block(DataWrite(
+            table=TABLE_NAME, column=["id", "major", "note"], new_value=[301, "Mathematics", "lagi"], conditions=[]
+        ))
+        options = read_table_options(table_file)
+        self.assert_true("Physics" in options["dictionaries"]["major"], "Dictionary should contain new value")
+        retrieval = DataRetrieval(table=TABLE_NAME, column=["id"], conditions=[Condition("major", "=", "Physics")])
+        self.assert_equal(self.sm.read_block(retrieval), [{"id": 300}], "Should find inserted row")
+
+        # Test 4: update (rewrite full) tetap pertahanin options
+        print("\n[4] Update tetap pake compression")
+        self.sm.write_block(DataWrite(
+            table=TABLE_NAME, column=["note"], new_value=["diubah"], conditions=[Condition("id", "=", 5)]
+        ))
+        self.assert_equal(read_table_options(table_file).get("compression"), "zlib", "Rewrite should keep options")
+        rows_after = self.sm.read_block(DataRetrieval(table=TABLE_NAME, conditions=[Condition("id", "=", 5)]))
+        self.assert_equal(rows_after[0]["note"], "diubah", "Updated value should be readable")
+        self.assert_equal(self.sm.get_stats()[TABLE_NAME].n_r, 302, "Stats should count all rows")
+
+        # Test 5: option yang ga valid ditolak
+        print("\n[5] Storage option tidak valid harus gagal")
+        try:
+            self.sm.create_table("bad_options", ["a"], storage_options={"compression": "lz4"})
+            self.assert_true(False, "Should raise ValueError for unsupported compression")
+        except ValueError:
+            self.assert_true("bad_options" not in self.sm.tables, "Should raise ValueError for unsupported compression")
+
+        self.sm.drop_table(TABLE_NAME)
+        self.sm.drop_table(PLAIN_TABLE)
+
+    def test_parallel_scan(self):
+        """Test full scan paralel pake process pool."""
+        self.print_header("PARALLEL FULL SCAN")
+
+        TABLE_NAME = "access_path_test"
+        if TABLE_NAME not in self.sm.tables:
+            self.test_access_path()
+        table_file = self.sm._get_table_file_path(TABLE_NAME)
+
+        # Test 1: partisi block rata dan sesuai urutan file
+        print("\n[1] Block dibagi jadi range yang rata")
+        _, _, offsets = compute_block_offsets(table_file)
+        ranges = partition_blocks(offsets, 4)
+        self.assert_equal(sum(count for _, count in ranges), len(offsets), "Ranges should cover every block")
+        self.assert_equal([start for start, _ in ranges], sorted(start for start, _ in ranges), "Ranges should follow file order")
+
+        retrieval = DataRetrieval(table=TABLE_NAME, column=["id", "status"], conditions=[
+            Condition("status", "=", "inactive")
+        ])
+        serial_rows = self.sm.read_block(retrieval)
+
+        # Test 2: di atas threshold read_block otomatis pake parallel scan
+        print("\n[2] read_block pake parallel scan di atas threshold")
+        self.sm.PARALLEL_SCAN_MIN_BLOCKS = 1
+        self.sm.PARALLEL_SCAN_WORKERS = 2
+        try:
+            parallel_rows = self.sm.read_block(retrieval)
+            self.assert_equal(self.sm.last_access_plan.get("parallel_workers"), 2, "Should scan with 2 workers")
+            self.assert_equal(parallel_rows, serial_rows, "Parallel scan should return rows in file order")
+
+            # cursor dengan limit tetap serial
+            list(self.sm.open_cursor(retrieval, limit=1))
+            self.assert_true("parallel_workers" not in self.sm.last_access_plan, "Limited cursor should stay serial")
+        finally:
+            del self.sm.PARALLEL_SCAN_MIN_BLOCKS
+            del self.sm.PARALLEL_SCAN_WORKERS
+
+        # Test 3: mode unordered hasilnya sama (urutan bebas)
+        print("\n[3] Parallel scan tanpa urutan")
+        unordered = list(parallel_scan(table_file, retrieval.conditions, ["id"], max_workers=2, ordered=False))
+        self.assert_equal(sorted(r["id"] for r in unordered), [r["id"] for r in serial_rows], "Unordered scan should return same rows")
+
+        # Test 4: range yang di-submit ke pool dibatasi jumlah worker
+        print("\n[4] Range in-flight dibatasi jumlah worker")
+        pool = scan_module._get_pool(2)
+        self.assert_true(pool._mp_context.get_start_method() in ("forkserver", "spawn"), "Workers should not be forked")
+        submitted = []
+        submit = pool.submit
+
+        def counting_submit(fn, task):
+            submitted.append(task)
+            return submit(fn, task)
+
+        pool.submit = counting_submit
+        range_max_blocks = scan_module.RANGE_MAX_BLOCKS
+        scan_module.RANGE_MAX_BLOCKS = 1
+        try:
+            rows = parallel_scan(table_file, retrieval.conditions, ["id"], max_workers=2)
+            first = next(rows)
+            self.assert_true(len(submitted) <= 3, "Only the worker window plus one refill should be submitted")
+            rows = [first] + list(rows)
+            self.assert_equal(rows, [{"id": r["id"]} for r in serial_rows], "Windowed scan should return rows in file order")
+            self.assert_equal(len(submitted), len(offsets), "Every block range should be scanned once")
+        finally:
+            scan_module.RANGE_MAX_BLOCKS = range_max_blocks
+            del pool.submit
+        shutdown_scan_pool()
+
+    def test_readahead(self):
+        """Test prefetch block di background pas sequential scan."""
+        self.print_header("READAHEAD PREFETCH")
+
+        TABLE_NAME = "access_path_test"
+        if TABLE_NAME not in self.sm.tables:
+            self.test_access_path()
+        retrieval = DataRetrieval(table=TABLE_NAME, column=["id"], conditions=[
+            Condition("status", "=", "active")
+        ])
+        num_blocks = self.sm.get_stats()[TABLE_NAME].b_r
+
+        # Test 1: full scan nyatet hit/miss tiap block
+        print("\n[1] Full scan nyatet statistik prefetch")
+        before = self.sm.prefetch_stats.blocks
+        rows = self.sm.read_block(retrieval)
+        rows_by_serial_scan = rows
+        scan_stats = self.sm.last_access_plan["prefetch"]
+        self.assert_equal(len(rows), 450, "Should return 450 rows")
+        self.assert_equal(scan_stats.blocks, num_blocks, "Should consume every block through readahead")
+        self.assert_equal(scan_stats.hits + scan_stats.misses, scan_stats.blocks, "Hits + misses should equal blocks")
+        self.assert_equal(self.sm.prefetch_stats.blocks - before, num_blocks, "Cumulative stats should be updated")
+
+        # Test 2: depth 0 matiin readahead, hasil tetap sama
+        print("\n[2] READAHEAD_DEPTH = 0")
+        self.sm.READAHEAD_DEPTH = 0
+        try:
+            self.assert_equal(self.sm.read_block(retrieval), rows, "Should return same rows without readahead")
+            self.assert_equal(self.sm.last_access_plan["prefetch"].blocks, 0, "Should not prefetch")
+        finally:
+            del self.sm.READAHEAD_DEPTH
+
+        # Test 3: cursor berhenti di tengah, reader thread ikut berhenti
+        print("\n[3] Cursor ditutup di tengah scan")
+        cursor = self.sm.open_cursor(retrieval)
+        self.assert_equal(next(cursor), {"id": 1}, "Should yield first matching row")
+        cursor.close()
+        self.assert_true(self.sm.last_access_plan["prefetch"].blocks < num_blocks, "Should stop prefetching early")
+
+        # Test 4: error dari reader di-raise di thread scan
+        print("\n[4] Error reader dioper ke consumer")
+        def broken_reader():
+            raise IOError("disk error")
+        try:
+            list(iter_prefetched_blocks(broken_reader, 3, depth=2))
+            self.assert_true(False, "Should raise reader error")
+        except IOError:
+            self.assert_true(True, "Should raise reader error")
+
+        # Test 5: scan ditutup di tengah, prefetcher di-stop sebelum file tabel ditutup
+        print("\n[5] Prefetcher berhenti sebelum file ditutup")
+        opened = []
+        files_closed_at_stop = []
+        stop = _BlockPrefetcher.stop
+
+        def recording_open(*args, **kwargs):
+            f = open(*args, **kwargs)
+            opened.append(f)
+            return f
+
+        def recording_stop(prefetcher):
+            files_closed_at_stop.append([f.closed for f in opened])
+            stop(prefetcher)
+
+        storage_utils.open = recording_open
+        _BlockPrefetcher.stop = recording_stop
+        try:
+            rows = storage_utils.read_binary_table_streaming(self.sm._get_table_file_path(TABLE_NAME), readahead=2)
+            next(rows)
+            rows.close()
+        finally:
+            del storage_utils.open
+            _BlockPrefetcher.stop = stop
+        self.assert_equal(files_closed_at_stop, [[False]], "Prefetcher should stop while the table file is still open")
+
+        # Test 6: synchronized scan (tabel gede) juga baca block lewat prefetcher
+        print("\n[6] Synchronized scan pake readahead")
+        self.sm.SYNC_SCAN_MIN_BLOCKS = 1
+        try:
+            sync_rows = self.sm.read_block(retrieval)
+            self.assert_true(self.sm.last_access_plan.get("sync_scan"), "Scan should be synchronized")
+            scan_stats = self.sm.last_access_plan["prefetch"]
+            self.assert_equal(sync_rows, rows_by_serial_scan, "Synchronized scan should return same rows")
+            self.assert_equal(scan_stats.blocks, num_blocks, "Synchronized scan should consume every block through readahead")
+            self.assert_equal(scan_stats.hits + scan_stats.misses, scan_stats.blocks, "Hits + misses should equal blocks")
+
+            threads_before = threading.active_count()
+            cursor = self.sm.open_cursor(retrieval)
+            next(cursor)
+            cursor.close()
+            self.assert_equal(threading.active_count(), threads_before, "Closing the cursor should stop the prefetcher")
+        finally:
+            del self.sm.SYNC_SCAN_MIN_BLOCKS
+
+    def test_compaction(self):
+        """Test vacuum/compaction file tabel yang fragmented."""
+        self.print_header("COMPACTION")
+
+        TABLE_NAME = "compaction_test"
+        if TABLE_NAME in self.sm.tables:
+            self.sm.drop_table(TABLE_NAME)
+        self.sm.create_table(TABLE_NAME, [
+            ColumnDefinition("id", "INTEGER", is_primary_key=True),
+            ColumnDefinition("name", "VARCHAR", size=30),
+        ])
+        self.sm.insert_rows(TABLE_NAME, [{"id": i, "name": f"nama_{i % 7}"} for i in range(200)])
+        self.sm.set_index(TABLE_NAME, "id", "btree")
+        self.sm.set_index(TABLE_NAME, "name", "hash")
+
+        table_file = self.sm._get_table_file_path(TABLE_NAME)
+        original_rows = self.sm.read_block(DataRetrieval(table=TABLE_NAME))
+
+        def fragment():
+            # simulasi file fragmented: block kecil yang setengah kosong
+            write_binary_table(table_file, original_rows, ["id", "name"], block_size=96)
+
+        # Test 1: file fragmented di-compact, data dan index tetap valid
+        print("\n[1] Compact tabel fragmented")
+        fragment()
+        fragmentation = measure_fragmentation(table_file, self.sm.block_size)
+        self.assert_true(fragmentation["dead_ratio"] > 0.5, "Fragmented file should have high dead ratio")
+        result = self.sm.compact_table(TABLE_NAME)
+        self.assert_true(result is not None, "Should compact fragmented table")
+        self.assert_true(result["blocks_after"] < result["blocks_before"], "Should use fewer blocks")
+        self.assert_equal(self.sm.read_block(DataRetrieval(table=TABLE_NAME)), original_rows, "Rows should be unchanged")
+        self.assert_equal(self.sm.indexes[(TABLE_NAME, "id")].search(150), [150], "Index should still point to same record")
+        self.assert_true(not os.path.exists(table_file + ".compact"), "Temp file should be swapped away")
+
+        # Test 2: tabel yang udah padat ga di-compact lagi
+        print("\n[2] Tabel padat di-skip")
+        self.assert_true(self.sm.compact_table(TABLE_NAME) is None, "Compact table should be skipped")
+
+        # Test 3: worker background compact tabel yang lewat threshold
+        print("\n[3] Background compaction worker")
+        fragment()
+        worker = self.sm.start_compaction_worker(interval=0.05)
+        deadline = time.time() + 5
+        while TABLE_NAME not in worker.compacted and time.time() < deadline:
+            time.sleep(0.05)
+        self.sm.stop_compaction_worker()
+        self.assert_true(TABLE_NAME in worker.compacted, "Worker should compact fragmented table")
+        self.assert_equal(self.sm.read_block(DataRetrieval(table=TABLE_NAME)), original_rows, "Rows should be unchanged")
+
+        # Test 4: delete remap record_id index dalam satu batch
+        print("\n[4] Delete remap record_id index")
+        self.sm.delete_block(DataDeletion(table=TABLE_NAME, conditions=[Condition("id", "<", 10)]))
+        self.assert_equal(self.sm.indexes[(TABLE_NAME, "id")].search(150), [140], "B+ tree should point to shifted record")
+        self.assert_equal(self.sm.indexes[(TABLE_NAME, "id")].search(5), [], "Deleted key should be gone from B+ tree")
+        self.assert_equal(self.sm.indexes[(TABLE_NAME, "name")].search("nama_0")[:2], [4, 11], "Hash index should point to shifted records")
+
+        # Test 5: swap nunggu writer yang megang lock tabel, write-nya bikin compaction batal
+        print("\n[5] Compaction nunggu lock writer sebelum swap")
+        fragment()
+        results = []
+        with self.sm._table_lock(TABLE_NAME):
+            compactor = threading.Thread(target=lambda: results.append(self.sm.compact_table(TABLE_NAME)))
+            compactor.start()
+            deadline = time.time() + 5
+            while not os.path.exists(table_file + ".compact") and time.time() < deadline:
+                time.sleep(0.01)
+            self.sm.insert_rows(TABLE_NAME, [{"id": 1000, "name": "baru"}])
+            compactor.join(0.2)
+            self.assert_true(compactor.is_alive(), "Compaction should wait for the table lock before swapping")
+        compactor.join()
+        self.assert_equal(results, [None], "Compaction should be abandoned after a concurrent write")
+        rows = self.sm.read_block(DataRetrieval(table=TABLE_NAME))
+        self.assert_equal([row["id"] for row in rows if row["id"] == 1000], [1000], "Concurrent write should survive compaction")
+        self.assert_true(not os.path.exists(table_file + ".compact"), "Temp file should be removed")
+
+        self.sm.drop_table(TABLE_NAME)
+
+    # ========== Test: partitioning ==========
+
+    def test_partitioning(self):
+        """Test range dan hash partitioning plus partition pruning."""
+        self.print_header("PARTITIONING")
+
+        RANGE_TABLE = "partition_range_test"
+        HASH_TABLE = "partition_hash_test"
+        for table in (RANGE_TABLE, HASH_TABLE):
+            if table in self.sm.tables:
+                self.sm.drop_table(table)
+        columns = [
+            ColumnDefinition("id", "INTEGER", is_primary_key=True),
+            ColumnDefinition("city", "VARCHAR", size=20),
+        ]
+        self.sm.create_table(RANGE_TABLE, columns, partition_by={"type": "range", "column": "id", "bounds": [100, 200]})
+        self.sm.create_table(HASH_TABLE, [
+            ColumnDefinition("id", "INTEGER", is_primary_key=True),
+            ColumnDefinition("city", "VARCHAR", size=20),
+        ], partition_by={"type": "hash", "column": "city", "partitions": 4})
+        rows = [{"id": i, "city": f"kota_{i % 5}"} for i in range(300)]
+
+        # Test 1: fungsi pruning
+        print("\n[1] Pruning bound partisi")
+        spec = self.sm.tables[RANGE_TABLE]["partitioning"]
+        self.assert_equal(prune_partitions(spec, [Condition("id", "=", 150)]), [1], "Equality should hit one range partition")
+        self.assert_equal(prune_partitions(spec, [Condition("id", ">=", 200)]), [2], "Range should prune lower partitions")
+        self.assert_equal(prune_partitions(spec, [Condition("id", ">", 50), Condition("id", "<", 120)]), [0, 1], "AND should intersect")
+        self.assert_equal(prune_partitions(spec, [Condition("id", "<>", 5)]), [0, 1, 2], "<> should keep all partitions")
+        self.assert_equal(prune_partitions(spec, [Condition("city", "=", "x")]), [0, 1, 2], "Other column should keep all partitions")
+
+        # Test 2: insert di-route ke file partisi masing-masing
+        print("\n[2] Insert routing")
+        self.sm.insert_rows(RANGE_TABLE, rows)
+        self.sm.write_block(DataWrite(table=HASH_TABLE, column=["id", "city"], new_value=[[r["id"], r["city"]] for r in rows]))
+        partition_rows = self.sm.read_block(DataRetrieval(table=f"{RANGE_TABLE}.p1"))
+        self.assert_equal(sorted(r["id"] for r in partition_rows), list(range(100, 200)), "Partition p1 should hold 100..199")
+        self.assert_true(not os.path.exists(self.sm._get_table_file_path(RANGE_TABLE)), "Parent table should have no data file")
+
+        # Test 3: read_block cuma scan partisi yang lolos pruning
+        print("\n[3] Read dengan pruning")
+        result = self.sm.read_block(DataRetrieval(table=RANGE_TABLE, conditions=[Condition("id", ">=", 250)]))
+        self.assert_equal(sorted(r["id"] for r in result), list(range(250, 300)), "Should return matching rows")
+        self.assert_equal(self.sm.last_access_plan["partitions"], [f"{RANGE_TABLE}.p2"], "Should scan only last partition")
+        result = self.sm.read_block(DataRetrieval(table=HASH_TABLE, conditions=[Condition("city", "=", "kota_3")]))
+        self.assert_equal(len(result), 60, "Hash partition read should return matching rows")
+        self.assert_equal(len(self.sm.last_access_plan["partitions"]), 1, "Hash equality should scan one partition")
+        cursor = self.sm.open_cursor(DataRetrieval(table=RANGE_TABLE, column=["id"]), limit=5)
+        self.assert_equal([r["id"] for r in cursor], [0, 1, 2, 3, 4], "Cursor should chain partitions with limit")
+
+        # Test 4: update yang mindahin row ke partisi lain
+        print("\n[4] Update partition key")
+        affected = self.sm.write_block(DataWrite(
+            table=RANGE_TABLE, column=["id"], new_value=[500], conditions=[Condition("id", "=", 5)]
+        ))
+        self.assert_equal(affected, 1, "Should update one row")
+        moved = self.sm.read_block(DataRetrieval(table=f"{RANGE_TABLE}.p2", conditions=[Condition("id", "=", 500)]))
+        self.assert_equal(moved, [{"id": 500, "city": "kota_0"}], "Row should move to last partition")
+        self.assert_equal(
+            self.sm.read_block(DataRetrieval(table=RANGE_TABLE, conditions=[Condition("id", "=", 5)])), [], "Old row should be gone"
+        )
+        updated = self.sm.update_by_old_new_data(DataUpdate(
+            table=RANGE_TABLE, old_data=[{"id": 500, "city": "kota_0"}], new_data=[{"id": 5, "city": "kota_9"}]
+        ))
+        self.assert_equal(updated, 1, "update_by_old_new_data should move row back")
+        self.assert_equal(
+            self.sm.read_block(DataRetrieval(table=f"{RANGE_TABLE}.p0", conditions=[Condition("id", "=", 5)])),
+            [{"id": 5, "city": "kota_9"}], "Row should be back in first partition"
+        )
+
+        # Test 5: index dan statistik per partisi
+        print("\n[5] Index dan statistik")
+        self.sm.set_index(RANGE_TABLE, "id", "btree")
+        self.assert_true(self.sm.has_index(RANGE_TABLE, "id"), "Partitioned table should report index")
+        self.assert_true((f"{RANGE_TABLE}.p1", "id") in self.sm.indexes, "Each partition should get its own index")
+        stats = self.sm.get_stats()[RANGE_TABLE]
+        self.assert_equal(stats.n_r, 300, "Aggregated n_r should sum partitions")
+        self.assert_equal([p.n_r for p in stats.partitions], [100, 100, 100], "Per-partition stats should be kept")
+        self.assert_equal(stats.V_a_r["id"], 300, "Partition key distinct count should sum")
+        self.assert_true("id" in stats.indexes, "Aggregated stats should list partition indexes")
+        self.assert_true(RANGE_TABLE + ".p0" not in self.sm.get_metadata()["tables"], "Partitions should be hidden from metadata")
+
+        # Test 6: delete di-prune, catalog partisi persist
+        print("\n[6] Delete dan catalog")
+        deleted = self.sm.delete_block(DataDeletion(table=RANGE_TABLE, conditions=[Condition("id", "<", 50)]))
+        self.assert_equal(deleted, 50, "Should delete rows from pruned partitions")
+        self.assert_equal(self.sm.indexes[(f"{RANGE_TABLE}.p0", "id")].search(60), [10], "Partition index should be remapped")
+        catalog = self.sm._read_binary_metadata(self.sm._get_metadata_file_path())
+        self.assert_equal(catalog[RANGE_TABLE]["partitioning"], spec, "Partition spec should persist in catalog")
+        self.assert_equal(catalog[f"{HASH_TABLE}.p3"]["partition_of"], HASH_TABLE, "Partition should point to parent")
+        try:
+            self.sm.drop_table(f"{RANGE_TABLE}.p0")
+            self.assert_true(False, "Dropping a single partition should fail")
+        except ValueError:
+            self.assert_true(True, "Dropping a single partition raises ValueError")
+
+        self.sm.drop_table(RANGE_TABLE)
+        self.sm.drop_table(HASH_TABLE)
+        self.assert_true(f"{RANGE_TABLE}.p0" not in self.sm.tables, "Partitions should be dropped with parent")
+        self.assert_true((f"{RANGE_TABLE}.p1", "id") not in self.sm.indexes, "Partition indexes should be dropped")
+        self.assert_equal(route_value(spec, None), 0, "NULL key should route to first range partition")
+
+    def test_bulk_load(self):
+        """Test bulk load CSV / JSONL plus index entry buat row yang di-append."""
+        self.print_header("BULK LOAD")
+
+        TABLE_NAME = "bulk_load_test"
+        if TABLE_NAME in self.sm.tables:
+            self.sm.drop_table(TABLE_NAME)
+        self.sm.create_table(TABLE_NAME, [
+            ColumnDefinition("id", "INTEGER", is_primary_key=True),
+            ColumnDefinition("name", "VARCHAR", size=10),
+            ColumnDefinition("score", "FLOAT", default_value=0.0),
+        ])
+        self.sm.insert_rows(TABLE_NAME, [{"id": 0, "name": "awal", "score": 1.0}])
+        self.sm.set_index(TABLE_NAME, "id", "btree")
+        self.sm.set_index(TABLE_NAME, "name", "hash")
+
+        csv_path = os.path.join(self.test_dir, "bulk_rows.csv")
+        with open(csv_path, "w") as f:
+            f.write("id,name,score\n")
+            for i in range(1, 501):
+                f.write(f"{i},nama_{i % 7},{'' if i % 10 == 0 else i / 2}\n")
+
+        # Test 1: CSV di-load per block, on_batch kepanggil per batch
+        print("\n[1] Load CSV")
+        batches = []
+        rebuilt = []
+        self.sm._rebuild_index = lambda table, column: rebuilt.append(column)
+        try:
+            loaded = self.sm.bulk_load(TABLE_NAME, csv_path, on_batch=lambda rows: batches.append(len(rows)))
+        finally:
+            del self.sm._rebuild_index
+        self.assert_equal(loaded, 500, "Should load all CSV rows")
+        self.assert_equal(sum(batches), 500, "on_batch should see every row")
+        rows = self.sm.read_block(DataRetrieval(table=TABLE_NAME))
+        self.assert_equal(len(rows), 501, "Existing row plus loaded rows")
+        self.assert_equal(rows[10], {"id": 10, "name": "nama_3", "score": None}, "Empty field should become NULL")
+        self.assert_equal(rows[3]["score"], 1.5, "FLOAT field should be converted")
+
+        # Test 2: index cuma ditambahin entry row yang di-append
+        print("\n[2] Index entry buat row yang di-append")
+        self.assert_equal(rebuilt, [], "Bulk load should not rebuild indexes from the whole table")
+        self.assert_equal(self.sm.indexes[(TABLE_NAME, "id")].search(0), [0], "Existing index entries should be kept")
+        self.assert_equal(self.sm.indexes[(TABLE_NAME, "id")].search(250), [250], "B+ tree index should cover loaded rows")
+        self.assert_equal(
+            len(self.sm.indexes[(TABLE_NAME, "id")].search_by_operation(">", 490)), 10, "Range search should cover loaded rows"
+        )
+        self.assert_equal(len(self.sm.indexes[(TABLE_NAME, "name")].search("nama_0")), 71, "Hash index should cover loaded rows")
+
+        # Test 3: row invalid -> semua row batal, file balik kayak semula
+        print("\n[3] Validasi dan rollback")
+        table_file = self.sm._get_table_file_path(TABLE_NAME)
+        size_before = os.path.getsize(table_file)
+        jsonl_path = os.path.join(self.test_dir, "bulk_rows.jsonl")
+        with open(jsonl_path, "w") as f:
+            for i in range(1000, 1300):
+                f.write(f'{{"id": {i}, "name": "n{i}"}}\n')
+            f.write('{"id": 2000, "name": "kepanjangan_banget"}\n')
+        try:
+            self.sm.bulk_load(TABLE_NAME, jsonl_path)
+            self.assert_true(False, "Too long VARCHAR should fail")
+        except ValueError as e:
+            self.assert_true("Baris 301" in str(e), "Error should mention the line number")
+        self.assert_equal(os.path.getsize(table_file), size_before, "Failed load should be truncated")
+        self.assert_equal(len(self.sm.read_block(DataRetrieval(table=TABLE_NAME))), 501, "Failed load should add no rows")
+
+        # Test 4: JSONL, default value dipake buat kolom yang ga ada
+        print("\n[4] Load JSONL")
+        with open(jsonl_path, "w") as f:
+            f.write('{"id": 1000, "name": "json"}\n\n{"id": 1001, "name": null, "score": 3}\n')
+        self.assert_equal(self.sm.bulk_load(TABLE_NAME, jsonl_path), 2, "Should load JSONL rows")
+        result = self.sm.read_block(DataRetrieval(table=TABLE_NAME, conditions=[Condition("id", ">=", 1000)]))
+        self.assert_equal(
+            result, [{"id": 1000, "name": "json", "score": 0.0}, {"id": 1001, "name": None, "score": 3}],
+            "Missing column should get default value"
+        )
+        self.assert_equal(self.sm.indexes[(TABLE_NAME, "id")].search(1001), [502], "Index should include JSONL rows")
+
+        # Test 5: undo bulk load = truncate balik ke jumlah row sebelum load, row lama yang sama tetap ada
+        print("\n[5] Truncate balik ke sebelum load")
+        row_counts = self.sm.count_rows_per_file(TABLE_NAME)
+        self.assert_equal(row_counts, {TABLE_NAME: 503}, "Should report the row count per table file")
+        with open(jsonl_path, "w") as f:
+            f.write('{"id": 0, "name": "awal", "score": 1.0}\n{"id": 2000, "name": "baru"}\n')
+        self.sm.bulk_load(TABLE_NAME, jsonl_path)
+        removed = self.sm.truncate_block(DataTruncation(table=TABLE_NAME, num_rows=row_counts[TABLE_NAME]))
+        self.assert_equal(removed, 2, "Truncate should remove only the loaded rows")
+        self.assert_equal(self.sm.count_rows(TABLE_NAME), 503, "Table should be back to its size before the load")
+        self.assert_equal(self.sm.indexes[(TABLE_NAME, "id")].search(0), [0], "Identical existing row should survive")
+        self.assert_equal(self.sm.indexes[(TABLE_NAME, "id")].search(2000), [], "Index should drop truncated rows")
+
+        self.sm.drop_table(TABLE_NAME)
+
+    def test_cluster_table(self):
+        """Test CLUSTER: tabel ditulis ulang urut key index + clustering factor."""
+        self.print_header("CLUSTER TABLE")
+
+        TABLE_NAME = "cluster_test"
+        if TABLE_NAME in self.sm.tables:
+            self.sm.drop_table(TABLE_NAME)
+        self.sm.create_table(TABLE_NAME, [
+            ColumnDefinition("id", "INTEGER", is_primary_key=True),
+            ColumnDefinition("payload", "VARCHAR", size=100),
+        ])
+        # id diacak deterministik (37 coprime sama 600) biar urutan insert != urutan key
+        ids = [(i * 37) % 600 for i in range(600)]
+        self.sm.insert_rows(TABLE_NAME, [{"id": i, "payload": "x" * 80} for i in ids])
+        self.sm.set_index(TABLE_NAME, "id", "btree")
+
+        # Test 1: CLUSTER butuh index di kolomnya
+        print("\n[1] Validasi")
+        try:
+            self.sm.cluster_table(TABLE_NAME, "payload")
+            self.assert_true(False, "Clustering on a column without index should fail")
+        except ValueError:
+            self.assert_true(True, "Clustering on a column without index raises ValueError")
+
+        stats_before = self.sm.get_stats()[TABLE_NAME]
+        factor_before = stats_before.indexes["id"]["clustering_factor"]
+        self.assert_true(factor_before > 10 * stats_before.b_r, "Scattered table should have a high clustering factor")
+
+        # Test 2: file ditulis ulang urut key, index dibangun ulang
+        print("\n[2] Cluster by id")
+        result = self.sm.cluster_table(TABLE_NAME, "id")
+        self.assert_equal(result["num_rows"], 600, "Should rewrite all rows")
+        rows = self.sm.read_block(DataRetrieval(table=TABLE_NAME, column=["id"]))
+        self.assert_equal([r["id"] for r in rows], list(range(600)), "Rows should be stored in key order")
+        self.assert_equal(self.sm.indexes[(TABLE_NAME, "id")].search(123), [123], "Index should point to new record ids")
+
+        stats_after = self.sm.get_stats()[TABLE_NAME]
+        self.assert_equal(stats_after.indexes["id"]["clustering_factor"], stats_after.b_r, "Clustered index factor should equal b_r")
+        self.assert_true(stats_after.indexes["id"].get("clustered"), "Stats should flag the clustered index")
+        estimated_rows = 60
+        self.assert_true(
+            self.sm._estimate_fetch_cost(stats_after.n_r, stats_after.b_r, estimated_rows, stats_after.indexes["id"]["clustering_factor"])
+            < self.sm._estimate_fetch_cost(stats_before.n_r, stats_before.b_r, estimated_rows, factor_before),
+            "Clustered fetch should be cheaper"
+        )
+
+        # Test 3: range scan langsung loncat ke block pertama yang match
+        print("\n[3] Range scan")
+        result = self.sm.read_block(DataRetrieval(table=TABLE_NAME, column=["id"], conditions=[Condition("id", ">=", 590)]))
+        self.assert_equal(self.sm.last_access_plan["method"], "index_scan", "Clustered range should use the index")
+        self.assert_equal(sorted(r["id"] for r in result), list(range(590, 600)), "Range scan should return matching rows")
+        result = self.sm.read_block(DataRetrieval(
+            table=TABLE_NAME, column=["id"], conditions=[Condition("id", ">", 300), Condition("id", "<", 303)]
+        ))
+        self.assert_equal([r["id"] for r in result], [301, 302], "Seek into middle blocks should keep record ids aligned")
+
+        # Test 4: catalog nyimpen kolom clustering, CLUSTER ulang tanpa kolom
+        print("\n[4] Catalog")
+        catalog = self.sm._read_binary_metadata(self.sm._get_metadata_file_path())
+        self.assert_equal(catalog[TABLE_NAME]["clustered_on"], "id", "Clustering column should persist in catalog")
+        self.sm.insert_rows(TABLE_NAME, [{"id": -1, "payload": "baru"}])
+        self.sm._rebuild_index(TABLE_NAME, "id")
+        self.sm.cluster_table(TABLE_NAME)
+        rows = self.sm.read_block(DataRetrieval(table=TABLE_NAME, column=["id"]))
+        self.assert_equal(rows[0]["id"], -1, "Re-cluster should reuse the stored column")
+        self.sm.delete_index(TABLE_NAME, "id")
+        self.assert_true("clustered_on" not in self.sm.tables[TABLE_NAME], "Dropping the index should clear clustering")
+
+        self.sm.drop_table(TABLE_NAME)
+
+    def test_toast_storage(self):
+        """Test TOAST: string panjang disimpan di side file, row cuma nyimpen pointer."""
+        self.print_header("TOAST (OUT-OF-LINE VARCHAR)")
+
+        TABLE_NAME = "toast_test"
+        PLAIN_TABLE = "untoasted_test"
+        columns = [
+            ColumnDefinition("id", "INTEGER", is_primary_key=True),
+            ColumnDefinition("title", "VARCHAR", size=50),
+            ColumnDefinition("body", "VARCHAR", size=2000),
+        ]
+        rows = [{"id": i, "title": f"judul {i}", "body": f"{i}:" + "deskripsi panjang " * 60} for i in range(200)]
+        for table, options in ((TABLE_NAME, {"toast_threshold": 256}), (PLAIN_TABLE, None)):
+            if table in self.sm.tables:
+                self.sm.drop_table(table)
+            self.sm.create_table(table, [ColumnDefinition(**vars(c)) for c in columns], storage_options=options)
+            self.sm.insert_rows(table, rows)
+
+        table_file = self.sm._get_table_file_path(TABLE_NAME)
+        toast_file = table_file + ".toast"
+
+        # Test 1: body pindah ke side file, block tabel jauh lebih sedikit
+        print("\n[1] Value panjang disimpan out-of-line")
+        self.assert_true(os.path.exists(toast_file), "Side file should exist")
+        stats = self.sm.get_stats()
+        self.assert_true(stats[TABLE_NAME].l_r < 100, f"l_r should only count the pointer, got {stats[TABLE_NAME].l_r}")
+        self.assert_true(stats[TABLE_NAME].b_r * 10 < stats[PLAIN_TABLE].b_r, "Table file should need far fewer blocks")
+
+        # Test 2: hasil baca sama persis kayak tabel plain
+        print("\n[2] Full scan dan filter di kolom TOAST")
+        self.assert_equal(
+            self.sm.read_block(DataRetrieval(table=TABLE_NAME)),
+            self.sm.read_block(DataRetrieval(table=PLAIN_TABLE)),
+            "Toasted scan should match plain scan"
+        )
+        result = self.sm.read_block(DataRetrieval(
+            table=TABLE_NAME, column=["id"], conditions=[Condition("body", "=", rows[7]["body"])]
+        ))
+        self.assert_equal(result, [{"id": 7}], "Filter on toasted column should fetch values")
+
+        # Test 3: scan yang ga butuh body ga nyentuh side file
+        print("\n[3] Proyeksi tanpa kolom TOAST")
+        os.rename(toast_file, toast_file + ".hidden")
+        try:
+            result = self.sm.read_block(DataRetrieval(
+                table=TABLE_NAME, column=["id", "title"], conditions=[Condition("id", "<", 3)]
+            ))
+            self.assert_equal([r["title"] for r in result], ["judul 0", "judul 1", "judul 2"],
+                              "Scan without toasted columns should not open the side file")
+        finally:
+            os.rename(toast_file + ".hidden", toast_file)
+
+        # Test 4: insert nambah ke side file, update rewrite side file tanpa sisa value lama
+        print("\n[4] Insert dan update")
+        size_before = os.path.getsize(toast_file)
+        self.sm.write_block(DataWrite(
+            table=TABLE_NAME, column=["id", "title", "body"], new_value=[200, "baru", "z" * 500], conditions=[]
+        ))
+        self.assert_equal(os.path.getsize(toast_file), size_before + 500, "Insert should append to the side file")
+        self.sm.write_block(DataWrite(
+            table=TABLE_NAME, column=["body"], new_value=["pendek"], conditions=[Condition("id", "=", 200)]
+        ))
+        self.assert_equal(os.path.getsize(toast_file), size_before, "Rewrite should drop unreferenced values")
+        result = self.sm.read_block(DataRetrieval(table=TABLE_NAME, conditions=[Condition("id", ">=", 199)]))
+        self.assert_equal([r["body"] for r in result], [rows[199]["body"], "pendek"], "Values should survive rewrite")
+
+        # Test 5: threshold yang ga valid ditolak, drop ikut hapus side file
+        print("\n[5] Validasi dan drop")
+        try:
+            self.sm.create_table("bad_toast", ["a"], storage_options={"toast_threshold": 4})
+            self.assert_true(False, "Should raise ValueError for tiny toast_threshold")
+        except ValueError:
+            self.assert_true("bad_toast" not in self.sm.tables, "Should raise ValueError for tiny toast_threshold")
+        self.sm.drop_table(TABLE_NAME)
+        self.sm.drop_table(PLAIN_TABLE)
+        self.assert_true(not os.path.exists(toast_file), "Drop should remove the side file")
+
+    def test_sync_scan(self):
+        """Test synchronized scan: full scan barengan di tabel yang sama share block."""
+        self.print_header("SYNCHRONIZED SCAN")
+
+        TABLE_NAME = "sync_scan_test"
+        if TABLE_NAME in self.sm.tables:
+            self.sm.drop_table(TABLE_NAME)
+        self.sm.create_table(TABLE_NAME, [
+            ColumnDefinition("id", "INTEGER", is_primary_key=True),
+            ColumnDefinition("payload", "VARCHAR", size=100),
+        ])
+        self.sm.insert_rows(TABLE_NAME, [{"id": i, "payload": "y" * 90} for i in range(2000)])
+        num_blocks = self.sm.get_stats()[TABLE_NAME].b_r
+        retrieval = DataRetrieval(table=TABLE_NAME, column=["id"])
+        self.sm.SYNC_SCAN_MIN_BLOCKS = 8
+        try:
+            # Test 1: scan sendirian mulai dari block 0, hasil sama kayak scan biasa
+            print("\n[1] Scan sendirian")
+            rows = self.sm.read_block(retrieval)
+            self.assert_true(self.sm.last_access_plan.get("sync_scan"), "Large full scan should be synchronized")
+            self.assert_equal(self.sm.last_access_plan["sync_scan_start"], 0, "Lone scan should start at block 0")
+            self.assert_equal([r["id"] for r in rows], list(range(2000)), "Lone scan should keep file order")
+
+            # Test 2: scan kedua nempel di posisi scan pertama, terus wrap around
+            print("\n[2] Scan kedua nempel ke scan yang lagi jalan")
+            blocks_before = self.sm.sync_scans.stats.blocks_read
+            first = self.sm.open_cursor(retrieval)
+            first_ids = [next(first)["id"] for _ in range(500)]
+            second = self.sm.open_cursor(retrieval)
+            second_plan = self.sm.last_access_plan
+            second_ids = [next(second)["id"]]
+            self.assert_true(second_plan["sync_scan_start"] > 0, "Second scan should attach mid-table")
+            self.assert_true(second_ids[0] > 0, "Second scan should start at the shared position")
+            for first_row, second_row in zip(first, second):
+                first_ids.append(first_row["id"])
+                second_ids.append(second_row["id"])
+            first_ids.extend(row["id"] for row in first)
+            second_ids.extend(row["id"] for row in second)
+            self.assert_equal(first_ids, list(range(2000)), "First scan should return every row in order")
+            self.assert_equal(sorted(second_ids), list(range(2000)), "Second scan should wrap around for missed blocks")
+            blocks_read = self.sm.sync_scans.stats.blocks_read - blocks_before
+            self.assert_true(
+                blocks_read <= num_blocks + second_plan["sync_scan_start"] + 1,
+                f"Concurrent scans should read each block about once ({blocks_read} reads, {num_blocks} blocks)"
+            )
+            self.assert_equal(self.sm.sync_scans.active_scans(self.sm._get_table_file_path(TABLE_NAME)), 0,
+                              "Finished scans should detach")
+
+            # Test 3: beberapa thread scan barengan, semua dapet hasil lengkap
+            print("\n[3] Scan barengan dari beberapa thread")
+            import threading
+            results = []
+
+            def scan():
+                results.append(sorted(r["id"] for r in self.sm.open_cursor(retrieval)))
+            threads = [threading.Thread(target=scan) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            self.assert_true(all(ids == list(range(2000)) for ids in results) and len(results) == 4,
+                             "Every concurrent scan should see every row")
+        finally:
+            del self.sm.SYNC_SCAN_MIN_BLOCKS
+
+        # Test 4: tabel >= PARALLEL_SCAN_MIN_BLOCKS, scan kedua nempel ke parallel scan
+        print("\n[4] Scan kedua nempel ke parallel scan tabel gede")
+        LARGE_TABLE = "sync_scan_large_test"
+        if LARGE_TABLE in self.sm.tables:
+            self.sm.drop_table(LARGE_TABLE)
+        self.sm.create_table(LARGE_TABLE, [
+            ColumnDefinition("id", "INTEGER", is_primary_key=True),
+            ColumnDefinition("payload", "VARCHAR", size=400),
+        ])
+        self.sm.insert_rows(LARGE_TABLE, [{"id": i, "payload": "z" * 390} for i in range(3000)])
+        num_blocks = self.sm.get_stats()[LARGE_TABLE].b_r
+        self.assert_true(num_blocks >= self.sm.PARALLEL_SCAN_MIN_BLOCKS, f"Table should span {num_blocks} >= 256 blocks")
+        retrieval = DataRetrieval(table=LARGE_TABLE, column=["id"])
+        self.sm.PARALLEL_SCAN_WORKERS = 2
+        try:
+            blocks_before = self.sm.sync_scans.stats.blocks_read
+            first = self.sm.open_cursor(retrieval)
+            first_ids = [next(first)["id"] for _ in range(500)]
+            self.assert_equal(self.sm.last_access_plan.get("parallel_workers"), 2, "First scan should run in parallel")
+            table_file = self.sm._get_table_file_path(LARGE_TABLE)
+            self.assert_equal(self.sm.sync_scans.active_scans(table_file), 1, "Parallel scan should register as active")
+
+            second = self.sm.open_cursor(retrieval)
+            second_plan = self.sm.last_access_plan
+            second_ids = [next(second)["id"]]
+            self.assert_true(second_plan.get("sync_scan"), "Second scan should attach through the registry")
+            self.assert_true(second_plan["sync_scan_start"] > 0, "Second scan should start past the parallel scan's ranges")
+            for first_row, second_row in zip(first, second):
+                first_ids.append(first_row["id"])
+                second_ids.append(second_row["id"])
+            first_ids.extend(row["id"] for row in first)
+            second_ids.extend(row["id"] for row in second)
+            self.assert_equal(first_ids, list(range(3000)), "Parallel scan should return every row in order")
+            self.assert_equal(sorted(second_ids), list(range(3000)), "Attached scan should wrap around for missed blocks")
+            blocks_read = self.sm.sync_scans.stats.blocks_read - blocks_before
+            self.assert_true(
+                blocks_read <= num_blocks + second_plan["sync_scan_start"],
+                f"Concurrent scans should share blocks after the handoff ({blocks_read} reads, {num_blocks} blocks)"
+            )
+            self.assert_equal(self.sm.sync_scans.active_scans(table_file), 0, "Finished scans should detach")
+        finally:
+            del self.sm.PARALLEL_SCAN_WORKERS
+            shutdown_scan_pool()
+        self.sm.drop_table(LARGE_TABLE)
+
+        self.sm.drop_table(TABLE_NAME)
+
+    def test_index_change_buffer(self):
+        """Test change buffer index: insert/update di-buffer, di-merge pas lookup / penuh / diminta."""
+        self.print_header("INDEX CHANGE BUFFER")
+
+        TABLE_NAME = "change_buffer_test"
+        if TABLE_NAME in self.sm.tables:
+            self.sm.drop_table(TABLE_NAME)
+        self.sm.create_table(TABLE_NAME, [
+            ColumnDefinition("id", "INTEGER", is_primary_key=True),
+            ColumnDefinition("grp", "VARCHAR", size=10),
+        ])
+        self.sm.insert_rows(TABLE_NAME, [{"id": i, "grp": f"g{i % 3}"} for i in range(20)])
+        self.sm.set_index(TABLE_NAME, "id", "btree")
+        self.sm.set_index(TABLE_NAME, "grp", "hash")
+        id_index_file = self.sm._get_index_file_path(TABLE_NAME, "id")
+        log_file = self.sm.index_change_log.file_path(TABLE_NAME, "id")
+        grp_log_file = self.sm.index_change_log.file_path(TABLE_NAME, "grp")
+
+        def insert(row_id, grp):
+            self.sm.write_block(DataWrite(table=TABLE_NAME, column=["id", "grp"], new_value=[row_id, grp]))
+
+        self.sm.INDEX_CHANGE_BUFFER_SIZE = 5
+        try:
+            # Test 1: insert cuma masuk buffer + change log, file index ga ditulis ulang
+            print("\n[1] Insert di-buffer")
+            mtime_before = os.stat(id_index_file).st_mtime_ns
+            fsyncs = []
+            fsync = os.fsync
+            os.fsync = lambda fd: fsyncs.append(fd)
+            decoded = []
+            read_streaming = storage_module.read_binary_table_streaming
+            storage_module.read_binary_table_streaming = lambda *a, **kw: decoded.append(a) or read_streaming(*a, **kw)
+            try:
+                insert(100, "g9")
+                insert(50, "g9")
+                self.assert_equal(fsyncs, [], "Buffered inserts should not fsync the change log")
+                # commit: satu fsync per log index yang ketulis, buffer tetap ga di-merge
+                self.assert_equal(self.sm.sync_index_changes(), 2, "Commit should fsync each written change log once")
+                self.assert_equal(len(fsyncs), 2, "Commit should fsync each written change log once")
+                self.assert_equal(self.sm.sync_index_changes(), 0, "Nothing to fsync without new changes")
+            finally:
+                os.fsync = fsync
+                storage_module.read_binary_table_streaming = read_streaming
+            id_index = self.sm.indexes[(TABLE_NAME, "id")]
+            self.assert_equal(len(id_index.pending), 2, "Inserts should be buffered, not applied")
+            self.assert_equal(os.stat(id_index_file).st_mtime_ns, mtime_before, "Index file should not be rewritten per insert")
+            self.assert_true(os.path.exists(log_file), "Buffered changes should be in the change log")
+            self.assert_true(os.path.exists(grp_log_file), "Each index should have its own change log")
+            self.assert_equal(decoded, [], "Insert should take record ids from the block headers, not a table scan")
+
+            # Test 2: restart -> change log di-replay ke buffer
+            print("\n[2] Replay change log")
+            self.sm.indexes.clear()
+            self.sm._load_indexes()
+            id_index = self.sm.indexes[(TABLE_NAME, "id")]
+            self.assert_equal(len(id_index.pending), 2, "Change log should be replayed into the buffer")
+
+            # Test 3: lookup nge-merge buffer dulu
+            print("\n[3] Lookup merge buffer")
+            self.assert_equal(id_index.search(50), [21], "Lookup should see buffered insert")
+            self.assert_equal(id_index.pending, [], "Lookup should drain the buffer")
+            self.assert_true(not os.path.exists(log_file), "Merge should drop the merged index's change log")
+            with open(grp_log_file) as f:
+                self.assert_equal(len(f.readlines()), 2, "Other index's change log should be left alone")
+            self.assert_equal(self.sm.indexes[(TABLE_NAME, "grp")].search("g9"), [20, 21], "Hash lookup should see buffered inserts")
+            self.assert_true(not os.path.exists(grp_log_file), "Change log should be empty after everything is merged")
+            rows = self.sm.read_block(DataRetrieval(
+                table=TABLE_NAME, conditions=[Condition(column="id", operation=">=", operand=50)]
+            ))
+            self.assert_equal(sorted(r["id"] for r in rows), [50, 100], "Range read should see merged inserts")
+
+            # Test 4: buffer penuh -> merge sekaligus
+            print("\n[4] Merge pas buffer penuh")
+            for row_id in range(200, 205):
+                insert(row_id, "g8")
+            self.assert_equal(len(id_index.pending), 0, "Full buffer should be merged")
+            self.assert_true(os.stat(id_index_file).st_mtime_ns != mtime_before, "Merge should save the index file")
+
+            # Test 5: update ke kolom index + merge eksplisit
+            print("\n[5] Update di-buffer, merge eksplisit")
+            self.sm.write_block(DataWrite(
+                table=TABLE_NAME, column=["grp"], new_value=["g7"],
+                conditions=[Condition(column="id", operation="=", operand=1)]
+            ))
+            grp_index = self.sm.indexes[(TABLE_NAME, "grp")]
+            self.assert_equal(len(grp_index.pending), 2, "Update should buffer delete + insert")
+            self.assert_equal(self.sm.merge_index_changes(), 2, "Explicit merge should apply buffered changes")
+            self.assert_equal(grp_index.search("g7"), [1], "Updated key should be indexed")
+            self.assert_true(1 not in grp_index.search("g1"), "Old key should be removed")
+            self.assert_true(not os.path.exists(grp_log_file), "Merge should truncate the change log")
+
+            # Test 6: delete tetap konsisten dengan buffer yang belum di-merge
+            print("\n[6] Delete dengan buffer yang belum di-merge")
+            insert(300, "g6")
+            self.sm.delete_block(DataDeletion(table=TABLE_NAME, conditions=[Condition(column="id", operation="=", operand=0)]))
+            self.assert_equal(self.sm.indexes[(TABLE_NAME, "id")].search(300), [26], "Buffered insert should be remapped by delete")
+            self.assert_equal(self.sm.indexes[(TABLE_NAME, "id")].search(0), [], "Deleted key should be gone")
+        finally:
+            del self.sm.INDEX_CHANGE_BUFFER_SIZE
+
+        self.sm.drop_table(TABLE_NAME)
+        self.assert_true(not os.path.exists(log_file) and not os.path.exists(grp_log_file),
+                         "Dropping the table should leave no buffered changes")
+
+    def test_adaptive_hash_index(self):
+        """Test adaptive hash di atas B+ tree: key hot dijawab dari hash, invalidate pas berubah."""
+        self.print_header("ADAPTIVE HASH INDEX")
+
+        TABLE_NAME = "adaptive_hash_test"
+        if TABLE_NAME in self.sm.tables:
+            self.sm.drop_table(TABLE_NAME)
+        self.sm.create_table(TABLE_NAME, [
+            ColumnDefinition("id", "INTEGER", is_primary_key=True),
+            ColumnDefinition("grp", "INTEGER"),
+        ])
+        self.sm.insert_rows(TABLE_NAME, [{"id": i, "grp": i % 10} for i in range(100)])
+        self.sm.set_index(TABLE_NAME, "grp", "btree")
+        index = self.sm.indexes[(TABLE_NAME, "grp")]
+        ahi = index.adaptive_hash
+        expected = list(range(7, 100, 10))
+
+        # Test 1: key jadi hot setelah threshold, lookup berikutnya kena hash
+        print("\n[1] Key hot masuk hash")
+        for _ in range(index.ADAPTIVE_HASH_THRESHOLD):
+            self.assert_equal(sorted(index.search(7)), expected, "Tree lookup should return all matches")
+        self.assert_equal(len(ahi), 1, "Hot key should get a hash entry")
+        hits_before = ahi.stats.hits
+        self.assert_equal(sorted(index.search_by_operation("=", 7)), expected, "Hash hit should return the same rows")
+        self.assert_equal(ahi.stats.hits, hits_before + 1, "Lookup of hot key should hit the hash")
+        self.assert_equal(index.search(3), list(range(3, 100, 10)), "Cold key should still use the tree")
+
+        # Test 2: hasil dari hash ga boleh ke-mutate caller
+        print("\n[2] Hasil hash di-copy")
+        index.search(7).append(999)
+        self.assert_equal(sorted(index.search(7)), expected, "Mutating a result should not corrupt the hash")
+
+        # Test 3: perubahan key nge-invalidate entry-nya
+        print("\n[3] Invalidate pas key berubah")
+        self.sm.write_block(DataWrite(table=TABLE_NAME, column=["id", "grp"], new_value=[100, 7]))
+        self.assert_equal(sorted(index.search(7)), expected + [100], "Insert should invalidate the hot key")
+        self.sm.delete_block(DataDeletion(table=TABLE_NAME, conditions=[Condition(column="id", operation="=", operand=0)]))
+        self.assert_equal(len(ahi), 0, "Record id remap should clear the hash")
+        self.assert_equal(sorted(index.search(7)), [i - 1 for i in expected + [100]], "Lookup after delete should see remapped ids")
+
+        # Test 4: jumlah entry dibatasi capacity
+        print("\n[4] Capacity")
+        from .adaptive_hash import AdaptiveHash
+        small = AdaptiveHash(threshold=1, capacity=2)
+        for key in range(3):
+            small.observe(key, [key])
+        self.assert_equal(len(small), 2, "Entries should be bounded by capacity")
+        self.assert_equal(small.get(0), None, "Least recently used key should be evicted")
+        self.assert_equal(small.stats.evictions, 1, "Eviction should be counted")
+
+        # Test 5: hit rate masuk statistik
+        print("\n[5] Statistik")
+        stats = self.sm.get_stats()[TABLE_NAME].indexes["grp"]["adaptive_hash"]
+        self.assert_true(stats["lookups"] > 0 and 0 < stats["hit_rate"] <= 1, f"Stats should report hit rate: {stats}")
+
+        self.sm.drop_table(TABLE_NAME)
+
+    def test_memory_engine(self):
+        """Test tabel ENGINE=MEMORY: baca/tulis di RAM, file cuma snapshot."""
+        self.print_header("MEMORY ENGINE")
+
+        TABLE_NAME = "memory_engine_test"
+        if TABLE_NAME in self.sm.tables:
+            self.sm.drop_table(TABLE_NAME)
+        self.sm.create_table(TABLE_NAME, [
+            ColumnDefinition("id", "INTEGER", is_primary_key=True),
+            ColumnDefinition("rate", "FLOAT"),
+            ColumnDefinition("code", "VARCHAR", size=10),
+        ], engine="memory")
+        table_file = self.sm._get_table_file_path(TABLE_NAME)
+        snapshot_mtime = os.stat(table_file).st_mtime_ns
+
+        # Test 1: insert + read langsung dari memory, file snapshot ga disentuh
+        print("\n[1] Insert dan read tanpa file I/O")
+        self.sm.insert_rows(TABLE_NAME, [{"id": i, "rate": i / 10, "code": f"C{i}"} for i in range(50)])
+        self.sm.write_block(DataWrite(table=TABLE_NAME, column=["id", "rate", "code"], new_value=[50, 5.0, "C50"]))
+        rows = self.sm.read_block(DataRetrieval(table=TABLE_NAME, column=["id", "code"]))
+        self.assert_equal(self.sm.last_access_plan["method"], "memory_scan", "Memory table should use memory scan")
+        self.assert_equal([r["id"] for r in rows], list(range(51)), "Memory scan should return rows in insert order")
+        self.assert_equal(rows[3], {"id": 3, "code": "C3"}, "Memory scan should project columns")
+        self.assert_equal(os.stat(table_file).st_mtime_ns, snapshot_mtime, "Writes should not touch the snapshot file")
+        memory_table = self.sm.memory_tables[TABLE_NAME]
+        self.assert_equal(memory_table.columns["id"].values.typecode, "q", "INTEGER column should be array-backed")
+        self.assert_equal(memory_table.columns["rate"].values.typecode, "d", "FLOAT column should be array-backed")
+
+        # Test 2: equality lookup lewat hash
+        print("\n[2] Hash lookup")
+        rows = self.sm.read_block(DataRetrieval(
+            table=TABLE_NAME, conditions=[Condition("code", "=", "C7"), Condition("rate", ">", 0.5)]
+        ))
+        self.assert_equal(rows, [{"id": 7, "rate": 0.7, "code": "C7"}], "Equality lookup should find the row")
+        self.assert_equal(self.sm.last_access_plan.get("memory_lookup"), "code", "Equality should use hash lookup")
+
+        # Test 3: update + delete, kolom array turun jadi list kalo ada NULL
+        print("\n[3] Update dan delete")
+        self.sm.write_block(DataWrite(
+            table=TABLE_NAME, column=["rate"], new_value=[None], conditions=[Condition("id", "=", 1)]
+        ))
+        deleted = self.sm.delete_block(DataDeletion(table=TABLE_NAME, conditions=[Condition("id", ">=", 40)]))
+        self.assert_equal(deleted, 11, "Delete should remove matching rows")
+        rows = self.sm.read_block(DataRetrieval(table=TABLE_NAME, conditions=[Condition("id", "=", 1)]))
+        self.assert_equal(rows[0]["rate"], None, "Update should store NULL")
+        self.assert_true(isinstance(memory_table.columns["rate"].values, list), "NULL should demote the column to a list")
+        self.assert_equal(self.sm.get_stats()[TABLE_NAME].n_r, 40, "Stats should count in-memory rows")
+        self.assert_equal(memory_table.dirty_rows, 51 + 1 + 11, "Update/delete should only count changed rows as dirty")
+
+        # Test 4: snapshot + restart
+        print("\n[4] Snapshot dan load ulang")
+        self.assert_equal(self.sm.snapshot_memory_tables(), 1, "Changed memory table should be snapshotted")
+        self.assert_equal(self.sm.snapshot_memory_tables(), 0, "Clean memory table should not be snapshotted again")
+        metadata = self.sm._read_binary_metadata(self.sm._get_metadata_file_path())
+        self.assert_equal(metadata[TABLE_NAME].get("engine"), "memory", "Engine should be persisted in metadata")
+        expected = self.sm.read_block(DataRetrieval(table=TABLE_NAME))
+        self.sm.memory_tables.clear()
+        self.sm._load_memory_tables()
+        self.assert_equal(self.sm.read_block(DataRetrieval(table=TABLE_NAME)), expected, "Snapshot should restore the rows")
+
+        # Test 5: snapshot otomatis tiap MEMORY_SNAPSHOT_ROWS perubahan
+        print("\n[5] Snapshot otomatis")
+        self.sm.MEMORY_SNAPSHOT_ROWS = 3
+        try:
+            self.sm.write_block(DataWrite(
+                table=TABLE_NAME, column=["id", "rate", "code"], new_value=[[100, 1.0, "X"], [101, 2.0, "Y"], [102, 3.0, "Z"]]
+            ))
+            self.assert_equal(self.sm.memory_tables[TABLE_NAME].dirty_rows, 0, "Reaching the threshold should snapshot")
+            self.sm.memory_tables.clear()
+            self.sm._load_memory_tables()
+            self.assert_equal(len(self.sm.read_block(DataRetrieval(table=TABLE_NAME))), 43, "Auto snapshot should persist rows")
+        finally:
+            del self.sm.MEMORY_SNAPSHOT_ROWS
+
+        # Test 6: operasi yang ga didukung
+        print("\n[6] Operasi yang tidak didukung")
+        try:
+            self.sm.set_index(TABLE_NAME, "id", "hash")
+            self.assert_true(False, "set_index on memory table should fail")
+        except ValueError:
+            self.assert_true(True, "set_index on memory table should raise ValueError")
+        try:
+            self.sm.create_table("memory_bad", ["a"], engine="tape")
+            self.assert_true(False, "Unknown engine should fail")
+        except ValueError:
+            self.assert_true(True, "Unknown engine should raise ValueError")
+
+        self.sm.drop_table(TABLE_NAME)
+        self.assert_true(TABLE_NAME not in self.sm.memory_tables, "Drop should discard the memory table")
+
+    def test_read_by_index_keys(self):
+        """Test batch lookup lewat index buat index nested-loop join."""
+        self.print_header("READ BY INDEX KEYS")
+
+        TABLE_NAME = "index_keys_test"
+        if TABLE_NAME in self.sm.tables:
+            self.sm.drop_table(TABLE_NAME)
+        self.sm.create_table(TABLE_NAME, [
+            ColumnDefinition("id", "INTEGER", is_primary_key=True),
+            ColumnDefinition("grp", "INTEGER"),
+            ColumnDefinition("label", "VARCHAR", size=10),
+        ])
+        self.sm.insert_rows(TABLE_NAME, [
+            {"id": i, "grp": i % 5, "label": f"L{i}"} for i in range(40)
+        ])
+
+        for index_type in ["hash", "btree"]:
+            self.sm.set_index(TABLE_NAME, "grp", index_type)
+            print(f"\n[{index_type}] Lookup beberapa key sekaligus")
+            rows = self.sm.read_by_index_keys(TABLE_NAME, "grp", [3, 1, 3, 1, 42], columns=["id", "grp"])
+            self.assert_equal(
+                [r["id"] for r in rows], [i for i in range(40) if i % 5 in (1, 3)],
+                f"{index_type}: lookup should return matching rows in record id order"
+            )
+            self.assert_equal(self.sm.last_access_plan["keys"], 3, f"{index_type}: duplicate keys should be probed once")
+            self.assert_equal(set(rows[0].keys()), {"id", "grp"}, f"{index_type}: lookup should project columns")
+
+            # hash index nyimpen str(key), btree nolak key beda tipe: dua-duanya ga boleh match
+            rows = self.sm.read_by_index_keys(TABLE_NAME, "grp", [None, "2"])
+            self.assert_equal(rows, [], f"{index_type}: NULL and '2' should not match integer keys")
+            self.sm.delete_index(TABLE_NAME, "grp")
+
+        try:
+            self.sm.read_by_index_keys(TABLE_NAME, "label", ["L1"])
+            self.assert_true(False, "Lookup on column without index should fail")
+        except ValueError:
+            self.assert_true(True, "Lookup on column without index should raise ValueError")
+
+        self.sm.drop_table(TABLE_NAME)
+
+    def test_ordered_index_scan(self):
+        """Test cursor urut index btree buat ORDER BY ... LIMIT."""
+        self.print_header("ORDERED INDEX SCAN")
+
+        TABLE_NAME = "index_order_test"
+        PARTITIONED_TABLE = "index_order_partitioned_test"
+        for table in (TABLE_NAME, PARTITIONED_TABLE):
+            if table in self.sm.tables:
+                self.sm.drop_table(table)
+        columns = [
+            ColumnDefinition("id", "INTEGER", is_primary_key=True),
+            ColumnDefinition("score", "INTEGER"),
+            ColumnDefinition("name", "VARCHAR", size=10),
+        ]
+        rows = [
+            {"id": i, "score": (i * 7) % 30, "name": None if i % 4 == 0 else f"n{(i * 7) % 30:02d}"}
+            for i in range(30)
+        ]
+        self.sm.create_table(TABLE_NAME, columns)
+        self.sm.insert_rows(TABLE_NAME, rows)
+        self.sm.set_index(TABLE_NAME, "score", "btree")
+        self.sm.set_index(TABLE_NAME, "name", "btree")
+
+        # Test 1: ASC dengan limit cuma ambil row awal index
+        print("\n[1] Urut ASC dengan limit")
+        result = list(self.sm.open_ordered_cursor(DataRetrieval(table=TABLE_NAME), "score", limit=5))
+        self.assert_equal([r["score"] for r in result], [0, 1, 2, 3, 4], "Should return smallest scores in order")
+        self.assert_equal(self.sm.last_access_plan["method"], "index_order_scan", "Should use index order scan")
+
+        # Test 2: DESC + filter + proyeksi
+        print("\n[2] Urut DESC dengan filter dan proyeksi")
+        retrieval = DataRetrieval(table=TABLE_NAME, column=["id"], conditions=[Condition("id", "<", 10)])
+        result = list(self.sm.open_ordered_cursor(retrieval, "score", descending=True, limit=3))
+        expected = sorted((r for r in rows if r["id"] < 10), key=lambda r: r["score"], reverse=True)[:3]
+        self.assert_equal(result, [{"id": r["id"]} for r in expected], "Should return filtered ids by descending score")
+
+        # Test 3: NULL dianggap nilai terbesar
+        print("\n[3] Posisi NULL")
+        names = [r["name"] for r in self.sm.open_ordered_cursor(DataRetrieval(table=TABLE_NAME), "name")]
+        non_null = sorted(r["name"] for r in rows if r["name"] is not None)
+        self.assert_equal(names, non_null + [None] * 8, "ASC should put NULLs last")
+        names = [r["name"] for r in self.sm.open_ordered_cursor(DataRetrieval(table=TABLE_NAME), "name", descending=True)]
+        self.assert_equal(names, [None] * 8 + non_null[::-1], "DESC should put NULLs first")
+
+        # Test 4: kolom tanpa index btree ditolak
+        print("\n[4] Kolom tanpa index btree")
+        try:
+            self.sm.open_ordered_cursor(DataRetrieval(table=TABLE_NAME), "id")
+            self.assert_true(False, "Ordered scan on column without btree index should fail")
+        except ValueError:
+            self.assert_true(True, "Ordered scan on column without btree index should raise ValueError")
+
+        # Test 5: tabel partisi di-merge urut index lokal tiap partisi
+        print("\n[5] Tabel partisi")
+        self.sm.create_table(PARTITIONED_TABLE, columns[:2], partition_by={"type": "range", "column": "id", "bounds": [10, 20]})
+        self.sm.insert_rows(PARTITIONED_TABLE, [{"id": r["id"], "score": r["score"]} for r in rows])
+        self.sm.set_index(PARTITIONED_TABLE, "score", "btree")
+        result = list(self.sm.open_ordered_cursor(DataRetrieval(table=PARTITIONED_TABLE, column=["id"]), "score", descending=True, limit=4))
+        expected = sorted(rows, key=lambda r: r["score"], reverse=True)[:4]
+        self.assert_equal(result, [{"id": r["id"]} for r in expected], "Partitions should be merged in index order")
+
+        self.sm.drop_table(PARTITIONED_TABLE)
+        self.sm.drop_table(TABLE_NAME)
+
+    # ========== Test: count_rows ==========
+
+    def test_count_rows(self):
+        """Test jumlah row dari header block buat COUNT(*)."""
+        self.print_header("COUNT ROWS")
+
+        TABLE_NAME = "count_rows_test"
+        COMPRESSED_TABLE = "count_rows_zlib_test"
+        MEMORY_TABLE = "count_rows_memory_test"
+        PARTITIONED_TABLE = "count_rows_partitioned_test"
+        for table in (TABLE_NAME, COMPRESSED_TABLE, MEMORY_TABLE, PARTITIONED_TABLE):
+            if table in self.sm.tables:
+                self.sm.drop_table(table)
+        columns = [
+            ColumnDefinition("id", "INTEGER", is_primary_key=True),
+            ColumnDefinition("name", "VARCHAR", size=20),
+        ]
+        rows = [{"id": i, "name": f"row {i:04d}"} for i in range(500)]
+
+        # Test 1: tabel kosong dan tabel banyak block
+        print("\n[1] Tabel disk")
+        self.sm.create_table(TABLE_NAME, columns)
+        self.assert_equal(self.sm.count_rows(TABLE_NAME), 0, "Empty table should count 0 rows")
+        self.sm.insert_rows(TABLE_NAME, rows)
+        self.assert_equal(self.sm.count_rows(TABLE_NAME), 500, "Should count rows of every block")
+
+        # Test 2: delete keliatan di header block
+        print("\n[2] Setelah delete")
+        self.sm.delete_block(DataDeletion(table=TABLE_NAME, conditions=[Condition("id", "<", 120)]))
+        self.assert_equal(self.sm.count_rows(TABLE_NAME), 380, "Deleted rows should not be counted")
+        self.assert_equal(self.sm.count_rows(TABLE_NAME), len(self.sm.read_block(DataRetrieval(table=TABLE_NAME))),
+                          "Count should match a full scan")
+
+        # Test 3: tabel compressed, memory, dan partisi
+        print("\n[3] Tabel compressed, memory, partisi")
+        self.sm.create_table(COMPRESSED_TABLE, columns, storage_options={"compression": "zlib"})
+        self.sm.insert_rows(COMPRESSED_TABLE, rows)
+        self.assert_equal(self.sm.count_rows(COMPRESSED_TABLE), 500, "Compressed blocks keep row_count in their header")
+        self.sm.create_table(MEMORY_TABLE, columns, engine="memory")
+        self.sm.insert_rows(MEMORY_TABLE, rows[:42])
+        self.assert_equal(self.sm.count_rows(MEMORY_TABLE), 42, "Memory table should count its rows")
+        self.sm.create_table(PARTITIONED_TABLE, columns, partition_by={"type": "range", "column": "id", "bounds": [100, 300]})
+        self.sm.insert_rows(PARTITIONED_TABLE, rows)
+        self.assert_equal(self.sm.count_rows(PARTITIONED_TABLE), 500, "Partitioned table should sum its partitions")
+
+        # Test 4: tabel ga ada
+        print("\n[4] Tabel tidak ada")
+        try:
+            self.sm.count_rows("count_rows_missing")
+            self.assert_true(False, "Counting a missing table should fail")
+        except ValueError:
+            self.assert_true(True, "Counting a missing table should raise ValueError")
+
+        for table in (TABLE_NAME, COMPRESSED_TABLE, MEMORY_TABLE, PARTITIONED_TABLE):
+            self.sm.drop_table(table)
+
     # ========== Test: drop_table ==========
 
     def test_drop_table(self):
@@ -678,6 +2083,25 @@ class TestStorageManager:
         self.test_delete_block()
         self.test_set_index()
         self.test_get_stats()
+        self.test_access_path()
+        self.test_open_cursor()
+        self.test_batch_cursor()
+        self.test_projection_decoding()
+        self.test_compressed_table()
+        self.test_parallel_scan()
+        self.test_readahead()
+        self.test_compaction()
+        self.test_partitioning()
+        self.test_bulk_load()
+        self.test_cluster_table()
+        self.test_toast_storage()
+        self.test_sync_scan()
+        self.test_index_change_buffer()
+        self.test_adaptive_hash_index()
+        self.test_memory_engine()
+        self.test_read_by_index_keys()
+        self.test_ordered_index_scan()
+        self.test_count_rows()
         self.test_drop_table()
 
         self.teardown()
@@ -0,0 +1,124 @@
+"""Out-of-line storage (TOAST) buat value string yang panjang.
+
+Tanpa ini, satu kolom deskripsi panjang bikin l_r gede, blocking factor
+kecil, dan semua scan jadi lambat, termasuk scan yang ga pernah baca kolom
+itu. Tabel dengan storage option "toast_threshold" nyimpen string yang
+ukuran UTF-8-nya di atas threshold ke side file "{file tabel}.toast", dan
+row cuma nyimpen pointer (offset + length). Value-nya baru dibaca dari side
+file kalo kolomnya diproyeksi atau dipake filter.
+
+Side file ditulis ulang tiap full rewrite tabel (update/delete), jadi value
+yang udah ga dirujuk ikut kebuang di situ.
+"""
+from __future__ import annotations
+
+import os
+import zlib
+from typing import Any, Dict, Optional
+
+TOAST_SUFFIX = ".toast"
+
+
+def toast_file_path(table_file: str) -> str:
+    """Path side file TOAST buat satu file tabel."""
+    return table_file + TOAST_SUFFIX
+
+
+class ToastWriter:
+    """Append value ke side file TOAST, balikin (offset, length) buat pointer.
+
+    Args:
+        file_path: Path side file
+        threshold: Value string di atas ukuran ini (byte UTF-8) disimpan out-of-line
+        compression: None atau "zlib" (ikut compression tabel)
+        truncate: True = mulai side file baru (full rewrite), False = append
+    """
+
+    def __init__(self, file_path: str, threshold: int, compression: Optional[str] = None, truncate: bool = False):
+        self.file_path = file_path
+        self.threshold = threshold
+        self.compression = compression
+        self._file = open(file_path, 'wb' if truncate else 'ab')
+        self._file.seek(0, os.SEEK_END)
+        self.start_offset = self._file.tell()
+        self._offset = self.start_offset
+
+    def append(self, encoded: bytes) -> tuple:
+        """Tulis satu value (udah di-encode UTF-8) ke ujung side file."""
+        if self.compression == "zlib":
+            encoded = zlib.compress(encoded)
+        offset = self._offset
+        self._file.write(encoded)
+        self._offset += len(encoded)
+        return offset, len(encoded)
+
+    def flush(self) -> None:
+        """Flush + fsync, dipanggil sebelum header tabel yang nunjuk ke sini di-update."""
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def rollback(self) -> None:
+        """Buang semua value yang ditulis writer ini."""
+        if self._file.closed:
+            return
+        try:
+            self._file.truncate(self.start_offset)
+        finally:
+            self._file.close()
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self._file.close()
+
+
+class ToastReader:
+    """Baca value dari side file TOAST. File baru dibuka pas value pertama di-fetch.
+
+    Args:
+        file_path: Path side file
+        compression: None atau "zlib" (ikut compression tabel)
+    """
+
+    def __init__(self, file_path: str, compression: Optional[str] = None):
+        self.file_path = file_path
+        self.compression = compression
+        self.fetches = 0
+        self._file = None
+
+    def read(self, offset: int, length: int) -> str:
+        if self._file is None:
+            self._file = open(self.file_path, 'rb')
+        self._file.seek(offset)
+        data = self._file.read(length)
+        if len(data) < length:
+            raise ValueError(f"TOAST value di offset {offset} kepotong ({len(data)} < {length} byte)")
+        self.fetches += 1
+        if self.compression == "zlib":
+            data = zlib.decompress(data)
+        return data.decode('utf-8')
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> "ToastReader":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def open_toast_reader(table_file: str, options: Dict[str, Any]) -> Optional[ToastReader]:
+    """ToastReader buat tabel yang pake TOAST, None kalo ga pake."""
+    if not options.get("toast_threshold"):
+        return None
+    return ToastReader(toast_file_path(table_file), options.get("compression"))
+
+
+def open_toast_writer(table_file: str, options: Dict[str, Any], truncate: bool = False) -> Optional[ToastWriter]:
+    """ToastWriter buat tabel yang pake TOAST, None kalo ga pake."""
+    threshold = options.get("toast_threshold")
+    if not threshold:
+        return None
+    return ToastWriter(toast_file_path(table_file), threshold, options.get("compression"), truncate)
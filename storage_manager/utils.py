@@ -6,10 +6,29 @@ evaluasi kondisi, I/O file, dan validasi data.
 from __future__ import annotations
 
 import os
+import operator
 import struct
 import json
-from typing import Any, Dict, List, Tuple
+import zlib
+from itertools import islice
+from typing import Any, BinaryIO, Callable, Dict, Iterator, List, Optional, Tuple
 from .models import Condition, ColumnDefinition
+from .readahead import PrefetchStats, iter_prefetched_blocks
+from .toast import ToastReader, ToastWriter, open_toast_reader, open_toast_writer, toast_file_path
+
+
+# operator Condition -> fungsi pembanding (dipake filter per kolom di batch scan)
+CONDITION_OPERATORS = {
+    "=": operator.eq,
+    "<>": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+
+_unpack_int = struct.Struct('<q').unpack_from
+_unpack_length = struct.Struct('<I').unpack_from
 
 
 def evaluate_condition(row: Dict[str, Any], condition: Condition) -> bool:
@@ -150,8 +169,20 @@ def validate_row_for_schema(row: Dict[str, Any], columns: List[ColumnDefinition]
 
 MAGIC_BYTES = b'SMDB'
 VERSION = 1
-
-def serialize_value(value: Any) -> bytes:
+# version 2 = header punya storage options (compression, dictionary encoding)
+VERSION_WITH_OPTIONS = 2
+
+SUPPORTED_COMPRESSION = (None, "zlib")
+# dictionary code disimpan sebagai uint16
+DICTIONARY_MAX_SIZE = 65535
+# pointer TOAST: type indicator + offset (uint64) + length (uint32)
+TOAST_POINTER_SIZE = 13
+
+def serialize_value(
+    value: Any,
+    codes: Optional[Dict[str, int]] = None,
+    toast: Optional[ToastWriter] = None
+) -> bytes:
     """Serialisasi satu value ke binary format.
 
     Format (little-endian, no padding):
@@ -161,14 +192,23 @@ def serialize_value(value: Any) -> bytes:
         2 = float
         3 = str
         4 = bool
+        5 = dictionary code (uint16, index ke dictionary kolom di header)
+        6 = pointer TOAST (uint64 offset + uint32 length di side file)
     - N bytes data (tergantung tipe)
 
     Args:
         value: Value yang akan diserialisasi
+        codes: Optional mapping value -> code buat kolom yang dictionary-encoded
+        toast: Optional ToastWriter, string di atas threshold-nya ditulis ke side file
 
     Returns:
         Binary representation dari value
     """
+    if codes is not None and isinstance(value, str):
+        code = codes.get(value)
+        if code is not None:
+            return struct.pack('<BH', 5, code)  # type indicator: dictionary code
+
     if value is None:
         return struct.pack('<B', 0)  # type indicator: None
 
@@ -184,6 +224,10 @@ def serialize_value(value: Any) -> bytes:
     elif isinstance(value, str):
         encoded = value.encode('utf-8')
         length = len(encoded)
+        if toast is not None and length > toast.threshold:
+            # string panjang disimpan out-of-line, row cuma nyimpen pointer
+            toast_offset, toast_length = toast.append(encoded)
+            return struct.pack('<BQI', 6, toast_offset, toast_length)
         # Pack type indicator and length first, then append the string bytes
         return struct.pack('<BI', 3, length) + encoded
 
@@ -194,12 +238,19 @@ def serialize_value(value: Any) -> bytes:
         return struct.pack('<BI', 3, length) + encoded
 
 
-def deserialize_value(data: bytes, offset: int) -> Tuple[Any, int]:
+def deserialize_value(
+    data: bytes,
+    offset: int,
+    dictionary: Optional[List[str]] = None,
+    toast: Optional[ToastReader] = None
+) -> Tuple[Any, int]:
     """Deserialisasi satu value dari binary format.
 
     Args:
         data: Binary data buffer
         offset: Posisi awal dalam buffer
+        dictionary: Dictionary kolom (wajib kalo value-nya dictionary code)
+        toast: ToastReader tabel (wajib kalo value-nya pointer TOAST)
 
     Returns:
         Tuple (value, new_offset) dimana new_offset adalah posisi setelah membaca
@@ -229,16 +280,35 @@ def deserialize_value(data: bytes, offset: int) -> Tuple[Any, int]:
         value = struct.unpack_from('<?', data, offset)[0]
         return value, offset + 1
 
+    elif type_indicator == 5:  # dictionary code
+        if dictionary is None:
+            raise ValueError("Dictionary code ditemukan tapi kolom tidak punya dictionary")
+        code = struct.unpack_from('<H', data, offset)[0]
+        return dictionary[code], offset + 2
+
+    elif type_indicator == 6:  # pointer TOAST
+        if toast is None:
+            raise ValueError("Pointer TOAST ditemukan tapi side file tidak dibuka")
+        toast_offset, toast_length = struct.unpack_from('<QI', data, offset)
+        return toast.read(toast_offset, toast_length), offset + 12
+
     else:
         raise ValueError(f"Unknown type indicator: {type_indicator}")
 
 
-def serialize_row(row: Dict[str, Any], schema: List[str]) -> bytes:
+def serialize_row(
+    row: Dict[str, Any],
+    schema: List[str],
+    codes: Optional[Dict[str, Dict[str, int]]] = None,
+    toast: Optional[ToastWriter] = None
+) -> bytes:
     """Serialisasi satu row ke binary format.
 
     Args:
         row: Dictionary berisi data row
         schema: List nama kolom (urutan penting!)
+        codes: Optional mapping per kolom (value -> dictionary code)
+        toast: Optional ToastWriter buat string yang panjang
 
     Returns:
         Binary representation dari row
@@ -248,47 +318,307 @@ def serialize_row(row: Dict[str, Any], schema: List[str]) -> bytes:
     # serialisasi tiap kolom sesuai urutan schema
     for column_name in schema:
         value = row.get(column_name, None)
-        row_data += serialize_value(value)
+        row_data += serialize_value(value, codes.get(column_name) if codes else None, toast)
 
     # tambahkan row length di depan untuk memudahkan parsing
     row_length = len(row_data)
     return struct.pack('<I', row_length) + row_data
 
 
-def deserialize_row(data: bytes, offset: int, schema: List[str]) -> Tuple[Dict[str, Any], int]:
+def skip_value(data: bytes, offset: int) -> int:
+    """Lompati satu value tanpa decode (cuma baca type indicator + length).
+
+    Args:
+        data: Binary data buffer
+        offset: Posisi awal value dalam buffer
+
+    Returns:
+        Posisi setelah value tersebut
+    """
+    type_indicator = data[offset]
+    offset += 1
+
+    if type_indicator == 0:  # None
+        return offset
+    elif type_indicator == 1 or type_indicator == 2:  # int / float, 8 bytes
+        return offset + 8
+    elif type_indicator == 3:  # str, skip berdasarkan length prefix
+        length = struct.unpack_from('<I', data, offset)[0]
+        return offset + 4 + length
+    elif type_indicator == 4:  # bool
+        return offset + 1
+    elif type_indicator == 5:  # dictionary code, uint16
+        return offset + 2
+    elif type_indicator == 6:  # pointer TOAST, side file ga dibaca
+        return offset + 12
+    else:
+        raise ValueError(f"Unknown type indicator: {type_indicator}")
+
+
+def build_column_mask(schema: List[str], columns: List[str]) -> List[bool]:
+    """Bikin column mask (urutan schema) dari daftar kolom yang dibutuhkan.
+
+    Args:
+        schema: List nama kolom (urutan penting!)
+        columns: Kolom yang perlu di-decode
+
+    Returns:
+        List bool, True di posisi kolom yang perlu di-decode
+    """
+    wanted = set(columns)
+    return [column_name in wanted for column_name in schema]
+
+
+def deserialize_row(
+    data: bytes,
+    offset: int,
+    schema: List[str],
+    mask: Optional[List[bool]] = None,
+    row: Optional[Dict[str, Any]] = None,
+    dictionaries: Optional[Dict[str, List[str]]] = None,
+    toast: Optional[ToastReader] = None
+) -> Tuple[Dict[str, Any], int]:
     """Deserialisasi satu row dari binary format.
 
+    Kalo mask dikasih, cuma kolom yang True yang di-decode. Kolom lain
+    dilompati pake length-nya tanpa bikin object Python, dan decoding
+    berhenti setelah kolom terakhir yang dibutuhkan.
+
     Args:
         data: Binary data buffer
         offset: Posisi awal row dalam buffer
         schema: List nama kolom (urutan penting!)
+        mask: Optional column mask dari build_column_mask (None = semua kolom)
+        row: Optional dict tujuan (buat decode bertahap ke dict yang sama)
+        dictionaries: Optional dictionary per kolom dari header tabel
+        toast: Optional ToastReader buat kolom yang disimpan out-of-line
 
     Returns:
         Tuple (row_dict, new_offset)
     """
-    # skip row length (4 bytes) - sudah disimpan untuk konsistensi format
+    if row is None:
+        row = {}
+
+    if mask is None:
+        # skip row length (4 bytes) - sudah disimpan untuk konsistensi format
+        offset += 4
+        for column_name in schema:
+            dictionary = dictionaries.get(column_name) if dictionaries else None
+            value, offset = deserialize_value(data, offset, dictionary, toast)
+            row[column_name] = value
+        return row, offset
+
+    row_length = struct.unpack_from('<I', data, offset)[0]
+    end_offset = offset + 4 + row_length
     offset += 4
 
-    row = {}
-    for column_name in schema:
-        value, offset = deserialize_value(data, offset)
-        row[column_name] = value
+    remaining = mask.count(True)
+    for column_name, needed in zip(schema, mask):
+        if not remaining:
+            # sisa kolom ga dibutuhin, langsung loncat ke akhir row
+            break
+        if needed:
+            dictionary = dictionaries.get(column_name) if dictionaries else None
+            value, offset = deserialize_value(data, offset, dictionary, toast)
+            row[column_name] = value
+            remaining -= 1
+        else:
+            offset = skip_value(data, offset)
+
+    return row, end_offset
+
+
+def make_row_decoder(
+    schema: List[str],
+    columns: Optional[List[str]] = None,
+    filter_fn: Optional[Callable[[Dict[str, Any]], bool]] = None,
+    filter_columns: Optional[List[str]] = None,
+    dictionaries: Optional[Dict[str, List[str]]] = None,
+    equality_filters: Optional[List[Tuple[str, Any]]] = None,
+    toast: Optional[ToastReader] = None
+) -> Callable[[bytes], Optional[Dict[str, Any]]]:
+    """Bikin decoder row yang projection-aware (late materialization).
+
+    Kalo ada filter, kolom yang dipake filter di-decode duluan. Sisa kolom
+    proyeksi cuma di-decode buat row yang lolos filter, jadi row yang
+    ditolak ga pernah decode string panjang yang ga dibutuhin.
+
+    Equality filter ke kolom yang dictionary-encoded dicek duluan dengan
+    bandingin integer code langsung dari buffer, sebelum decode apapun.
+
+    Value TOAST cuma dibaca dari side file kalo kolomnya ikut ke-decode,
+    jadi row yang ditolak filter ga pernah nyentuh side file.
+
+    Args:
+        schema: List nama kolom tabel
+        columns: Kolom output (None/kosong = semua kolom)
+        filter_fn: Optional function(row) -> bool
+        filter_columns: Kolom yang dibaca filter_fn (None = semua kolom)
+        dictionaries: Optional dictionary per kolom dari header tabel
+        equality_filters: Optional list (column, operand) dari kondisi '='
+        toast: Optional ToastReader buat kolom yang disimpan out-of-line
+
+    Returns:
+        Function(row_buffer) -> row dict, atau None kalo row ga lolos filter
+    """
+    if columns:
+        output_columns = list(dict.fromkeys(c for c in columns if c in schema))
+    else:
+        output_columns = list(schema)
+    output_mask = build_column_mask(schema, output_columns)
+
+    if filter_fn is None:
+        decoded_order = [c for c, needed in zip(schema, output_mask) if needed]
+        reorder = decoded_order != output_columns
+
+        def decode(buffer: bytes) -> Optional[Dict[str, Any]]:
+            row, _ = deserialize_row(buffer, 0, schema, output_mask, dictionaries=dictionaries, toast=toast)
+            return {c: row[c] for c in output_columns} if reorder else row
+
+        return decode
+
+    filter_mask = build_column_mask(schema, schema if filter_columns is None else filter_columns)
+    rest_mask = [needed and not used_by_filter for needed, used_by_filter in zip(output_mask, filter_mask)]
+    has_rest = any(rest_mask)
+
+    # urutan key setelah dua tahap decode; rebuild dict kalo beda sama output
+    decoded_order = [c for c, needed in zip(schema, filter_mask) if needed]
+    decoded_order += [c for c, needed in zip(schema, rest_mask) if needed]
+    reorder = decoded_order != output_columns
+
+    # probe: (posisi kolom, code target) buat equality filter di kolom dictionary.
+    # code None artinya operand ga ada di dictionary, jadi row yang di-encode pasti ga match
+    probes = []
+    if dictionaries and equality_filters:
+        for column, operand in equality_filters:
+            dictionary = dictionaries.get(column)
+            if dictionary is None or column not in schema:
+                continue
+            code = dictionary.index(operand) if isinstance(operand, str) and operand in dictionary else None
+            probes.append((schema.index(column), code))
+
+    def passes_probes(buffer: bytes) -> bool:
+        for position, code in probes:
+            offset = 4
+            for _ in range(position):
+                offset = skip_value(buffer, offset)
+            if buffer[offset] == 5:
+                if code is None or struct.unpack_from('<H', buffer, offset + 1)[0] != code:
+                    return False
+            # value plain (ga di-encode): biar filter_fn yang evaluasi
+        return True
+
+    def decode(buffer: bytes) -> Optional[Dict[str, Any]]:
+        if probes and not passes_probes(buffer):
+            return None
+        # tahap 1: decode kolom filter aja
+        row, _ = deserialize_row(buffer, 0, schema, filter_mask, dictionaries=dictionaries, toast=toast)
+        if not filter_fn(row):
+            return None
+        # tahap 2: decode sisa kolom proyeksi buat row yang lolos
+        if has_rest:
+            deserialize_row(buffer, 0, schema, rest_mask, row, dictionaries, toast)
+        return {c: row[c] for c in output_columns} if reorder else row
+
+    return decode
+
+
+def normalize_storage_options(options: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Validasi dan normalisasi storage options tabel.
+
+    Options yang didukung:
+    - compression: None atau "zlib" (kompresi per-block)
+    - dictionary_columns: list kolom string low-cardinality yang di-encode
+      pake dictionary (disimpan di header tabel)
+    - toast_threshold: string yang ukuran UTF-8-nya di atas ini (byte)
+      disimpan out-of-line di side file TOAST
+
+    Args:
+        options: Storage options dari user (boleh None)
+
+    Returns:
+        Dict options yang udah dinormalisasi (kosong = format lama)
+
+    Raises:
+        ValueError: Jika option tidak dikenali atau tidak valid
+    """
+    if not options:
+        return {}
+
+    unknown = set(options) - {"compression", "dictionary_columns", "dictionaries", "toast_threshold"}
+    if unknown:
+        raise ValueError(f"Storage option tidak dikenali: {sorted(unknown)}")
+
+    compression = options.get("compression")
+    if compression not in SUPPORTED_COMPRESSION:
+        raise ValueError(f"Compression tidak didukung: {compression}")
+
+    normalized: Dict[str, Any] = {}
+    if compression:
+        normalized["compression"] = compression
+    dictionary_columns = list(options.get("dictionary_columns") or [])
+    if dictionary_columns:
+        normalized["dictionary_columns"] = dictionary_columns
+        normalized["dictionaries"] = dict(options.get("dictionaries") or {})
+    toast_threshold = options.get("toast_threshold")
+    if toast_threshold is not None:
+        if not isinstance(toast_threshold, int) or isinstance(toast_threshold, bool) or toast_threshold < TOAST_POINTER_SIZE:
+            raise ValueError(f"toast_threshold harus integer >= {TOAST_POINTER_SIZE}")
+        normalized["toast_threshold"] = toast_threshold
+    return normalized
 
-    return row, offset
 
+def build_dictionaries(rows: List[Dict[str, Any]], dictionary_columns: List[str]) -> Dict[str, List[str]]:
+    """Bangun dictionary (sorted) tiap kolom dari nilai string yang ada.
 
-def calculate_row_size(row: Dict[str, Any], schema: List[str]) -> int:
+    Kolom yang distinct value-nya lebih dari DICTIONARY_MAX_SIZE ga di-encode.
+
+    Args:
+        rows: Semua row tabel
+        dictionary_columns: Kolom yang mau di-encode
+
+    Returns:
+        Dict column_name -> list value (index = code)
+    """
+    dictionaries = {}
+    for column in dictionary_columns:
+        values = {row.get(column) for row in rows}
+        values = sorted(v for v in values if isinstance(v, str))
+        if len(values) <= DICTIONARY_MAX_SIZE:
+            dictionaries[column] = values
+    return dictionaries
+
+
+def dictionary_codes(dictionaries: Dict[str, List[str]]) -> Dict[str, Dict[str, int]]:
+    """Balik dictionary jadi mapping value -> code buat serialize_row."""
+    return {
+        column: {value: code for code, value in enumerate(values)}
+        for column, values in dictionaries.items()
+    }
+
+
+def calculate_row_size(row: Dict[str, Any], schema: List[str], toast_threshold: Optional[int] = None) -> int:
     """Hitung ukuran byte dari satu row.
 
     Args:
         row: Row data
         schema: List nama kolom
+        toast_threshold: Optional threshold TOAST tabel, string di atasnya
+            dihitung sebagai pointer (ukuran yang beneran ada di block)
 
     Returns:
         Ukuran row dalam bytes
     """
     row_bytes = serialize_row(row, schema)
-    return len(row_bytes)
+    size = len(row_bytes)
+    if toast_threshold:
+        for column_name in schema:
+            value = row.get(column_name)
+            if isinstance(value, str):
+                length = len(value.encode('utf-8'))
+                if length > toast_threshold:
+                    size -= 5 + length - TOAST_POINTER_SIZE
+    return size
 
 
 def calculate_average_row_size(rows: List[Dict[str, Any]], schema: List[str]) -> float:
@@ -326,72 +656,325 @@ def calculate_blocking_factor(block_size: int, avg_row_size: float) -> int:
     return int(usable_space / avg_row_size)
 
 
-def write_binary_table(file_path: str, rows: List[Dict[str, Any]], schema: List[str], block_size: int = 4096) -> None:
+def write_table_header(
+    f: BinaryIO,
+    schema: List[str],
+    block_size: int,
+    num_blocks: int,
+    options: Optional[Dict[str, Any]] = None
+) -> None:
+    """Tulis header binary table.
+
+    Tabel tanpa storage options ditulis pake format version 1 (sama persis
+    kayak sebelumnya). Kalo ada options, pake version 2 yang nyimpen options
+    sebagai JSON di antara schema dan block_size.
+
+    Args:
+        f: File object (mode 'wb' / 'r+b'), posisi di awal file
+        schema: List nama kolom
+        block_size: Ukuran block
+        num_blocks: Jumlah block
+        options: Optional storage options yang udah dinormalisasi
+    """
+    # 1. Magic bytes + 2. Version
+    f.write(MAGIC_BYTES)
+    f.write(struct.pack('<I', VERSION_WITH_OPTIONS if options else VERSION))
+
+    # 3. Schema (as JSON string)
+    schema_json = json.dumps(schema).encode('utf-8')
+    f.write(struct.pack('<I', len(schema_json)))
+    f.write(schema_json)
+
+    # 3b. Storage options (cuma version 2)
+    if options:
+        options_json = json.dumps(options).encode('utf-8')
+        f.write(struct.pack('<I', len(options_json)))
+        f.write(options_json)
+
+    # 4. Block size + 5. Number of blocks
+    f.write(struct.pack('<I', block_size))
+    f.write(struct.pack('<I', num_blocks))
+
+
+def group_rows_into_blocks(row_bytes_list: List[bytes], block_size: int) -> List[List[bytes]]:
+    """Kelompokin serialized rows jadi blocks sesuai block_size (ukuran sebelum kompresi).
+
+    Args:
+        row_bytes_list: Row yang udah diserialisasi
+        block_size: Ukuran maksimal per block
+
+    Returns:
+        List of blocks, tiap block = list row bytes
+    """
+    blocks = []
+    current_block = []
+    current_block_size = 4  # start with 4 bytes for row_count
+
+    for row_bytes in row_bytes_list:
+        row_size = len(row_bytes)
+
+        # Check if adding this row would exceed block_size
+        if current_block_size + row_size > block_size and current_block:
+            # Save current block and start new one
+            blocks.append(current_block)
+            current_block = []
+            current_block_size = 4
+
+        current_block.append(row_bytes)
+        current_block_size += row_size
+
+    # Don't forget the last block
+    if current_block:
+        blocks.append(current_block)
+
+    return blocks
+
+
+def encode_block(block: List[bytes], compression: Optional[str] = None) -> bytes:
+    """Encode satu block ke bytes.
+
+    Format:
+    - tanpa kompresi: row_count + rows
+    - zlib: row_count + compressed_length + zlib(rows)
+
+    Args:
+        block: List row bytes
+        compression: None atau "zlib"
+
+    Returns:
+        Bytes block siap ditulis
+    """
+    payload = b''.join(block)
+    if compression == "zlib":
+        compressed = zlib.compress(payload)
+        return struct.pack('<II', len(block), len(compressed)) + compressed
+    return struct.pack('<I', len(block)) + payload
+
+
+def write_binary_table(
+    file_path: str,
+    rows: List[Dict[str, Any]],
+    schema: List[str],
+    block_size: int = 4096,
+    options: Optional[Dict[str, Any]] = None
+) -> None:
     """Tulis tabel ke binary file dengan block-based structure.
 
     Format file:
-    - Header: magic bytes, version, schema, block_size, num_blocks
-    - Data: blocks (each block contains row_count + rows)
+    - Header: magic bytes, version, schema, [storage options], block_size, num_blocks
+    - Data: blocks (each block contains row_count + rows, optionally zlib-compressed)
 
     Args:
         file_path: Path ke file yang akan ditulis
         rows: List of row dictionaries
         schema: List nama kolom
         block_size: Ukuran maksimal per block (default 4096 bytes)
+        options: Optional storage options. None = pertahankan options file
+            lama (kalo ada), jadi rewrite tabel ga ngilangin kompresi/dictionary
     """
-    with open(file_path, 'wb') as f:
-        # 1. Magic bytes
-        f.write(MAGIC_BYTES)
-
-        # 2. Version
-        f.write(struct.pack('<I', VERSION))
-
-        # 3. Schema (as JSON string)
-        schema_json = json.dumps(schema).encode('utf-8')
-        schema_length = len(schema_json)
-        f.write(struct.pack('<I', schema_length))
-        f.write(schema_json)
-
-        # 4. Block size
-        f.write(struct.pack('<I', block_size))
-
-        # 5. Organize rows into blocks
-        blocks = []
-        current_block = []
-        current_block_size = 4  # start with 4 bytes for row_count
-
-        for row in rows:
-            row_bytes = serialize_row(row, schema)
-            row_size = len(row_bytes)
-
-            # Check if adding this row would exceed block_size
-            if current_block_size + row_size > block_size and current_block:
-                # Save current block and start new one
-                blocks.append(current_block)
-                current_block = []
-                current_block_size = 4
-
-            current_block.append(row_bytes)
-            current_block_size += row_size
-
-        # Don't forget the last block
-        if current_block:
-            blocks.append(current_block)
+    if options is None:
+        options = read_table_options(file_path) if os.path.exists(file_path) else {}
+    options = normalize_storage_options(options)
+
+    # dictionary dibangun ulang dari data tiap full rewrite
+    codes = None
+    if options.get("dictionary_columns"):
+        options["dictionaries"] = build_dictionaries(rows, options["dictionary_columns"])
+        codes = dictionary_codes(options["dictionaries"])
+
+    # side file TOAST dibangun ulang ke file sementara, di-swap setelah tabel ditulis
+    toast = None
+    if options.get("toast_threshold"):
+        toast = ToastWriter(
+            toast_file_path(file_path) + ".tmp", options["toast_threshold"], options.get("compression"), truncate=True
+        )
+    try:
+        blocks = group_rows_into_blocks([serialize_row(row, schema, codes, toast) for row in rows], block_size)
+        if toast is not None:
+            toast.flush()
+    except Exception:
+        if toast is not None:
+            toast.close()
+            os.remove(toast.file_path)
+        raise
+    if toast is not None:
+        toast.close()
 
-        # 6. Number of blocks
-        f.write(struct.pack('<I', len(blocks)))
+    with open(file_path, 'wb') as f:
+        write_table_header(f, schema, block_size, len(blocks), options)
 
-        # 7. Write each block
+        # Write each block
         for block in blocks:
-            # Row count in this block
-            f.write(struct.pack('<I', len(block)))
+            f.write(encode_block(block, options.get("compression")))
+
+    if toast is not None:
+        os.replace(toast.file_path, toast_file_path(file_path))
+
+
+def read_table_header(f: BinaryIO) -> Tuple[List[str], int, int, Dict[str, Any]]:
+    """Baca header binary table dari file yang udah dibuka.
+
+    Args:
+        f: File object (mode 'rb'), posisi di awal file
+
+    Returns:
+        Tuple (schema, block_size, num_blocks, options). Posisi file setelahnya
+        ada di awal block pertama. options kosong buat file version 1.
+
+    Raises:
+        ValueError: Jika format file tidak valid
+    """
+    # 1. Verify magic bytes
+    magic = f.read(4)
+    if magic != MAGIC_BYTES:
+        raise ValueError(f"Invalid file format. Expected {MAGIC_BYTES}, got {magic}")
+
+    # 2. Read version
+    version = struct.unpack('<I', f.read(4))[0]
+    if version not in (VERSION, VERSION_WITH_OPTIONS):
+        raise ValueError(f"Unsupported version: {version}")
+
+    # 3. Read schema
+    schema_length = struct.unpack('<I', f.read(4))[0]
+    schema_json = f.read(schema_length).decode('utf-8')
+    schema = json.loads(schema_json)
 
-            # Row data
-            for row_bytes in block:
-                f.write(row_bytes)
+    # 3b. Read storage options (version 2)
+    options: Dict[str, Any] = {}
+    if version == VERSION_WITH_OPTIONS:
+        options_length = struct.unpack('<I', f.read(4))[0]
+        options = json.loads(f.read(options_length).decode('utf-8'))
 
+    # 4. Read block size
+    block_size = struct.unpack('<I', f.read(4))[0]
 
-def read_binary_table_streaming(file_path: str, filter_fn=None):
+    # 5. Read number of blocks
+    num_blocks = struct.unpack('<I', f.read(4))[0]
+
+    return schema, block_size, num_blocks, options
+
+
+def read_table_options(file_path: str) -> Dict[str, Any]:
+    """Baca storage options dari header tabel (kosong kalo format lama)."""
+    with open(file_path, 'rb') as f:
+        return read_table_header(f)[3]
+
+
+def read_block_rows(f: BinaryIO, compression: Optional[str] = None) -> Optional[List[bytes]]:
+    """Baca satu block utuh dan pecah jadi row buffer (length + data).
+
+    Args:
+        f: File object yang posisinya di awal block
+        compression: Compression dari storage options (None = plain)
+
+    Returns:
+        List row buffer, atau None kalo file kepotong / udah habis
+    """
+    if compression == "zlib":
+        block_header = f.read(8)
+        if len(block_header) < 8:
+            return None
+        row_count, compressed_length = struct.unpack('<II', block_header)
+        payload = zlib.decompress(f.read(compressed_length))
+
+        rows = []
+        offset = 0
+        for _ in range(row_count):
+            row_length = struct.unpack_from('<I', payload, offset)[0]
+            end = offset + 4 + row_length
+            rows.append(payload[offset:end])
+            offset = end
+        return rows
+
+    row_count_bytes = f.read(4)
+    if len(row_count_bytes) < 4:
+        return None
+    row_count = struct.unpack('<I', row_count_bytes)[0]
+
+    rows = []
+    for _ in range(row_count):
+        row_length_bytes = f.read(4)
+        if len(row_length_bytes) < 4:
+            return None
+        row_length = struct.unpack('<I', row_length_bytes)[0]
+        row_data = f.read(row_length)
+        if len(row_data) < row_length:
+            return None
+        rows.append(row_length_bytes + row_data)
+    return rows
+
+
+def iter_row_buffers(
+    f: BinaryIO,
+    num_blocks: int,
+    compression: Optional[str] = None,
+    readahead: int = 0,
+    prefetch_stats: Optional[PrefetchStats] = None
+) -> Iterator[bytes]:
+    """Generator raw row buffer (length + data) per-block, tanpa decode.
+
+    Block yang dikompresi di-decompress sekali per block, terus row-nya
+    di-slice dari payload.
+
+    Args:
+        f: File object yang posisinya udah di awal block pertama
+        num_blocks: Jumlah block dari header
+        compression: Compression dari storage options (None = plain)
+        readahead: Jumlah block yang dibaca duluan di background thread (0 = off)
+        prefetch_stats: Optional PrefetchStats buat nyatet hit/miss readahead
+
+    Yields:
+        bytes: Buffer satu row (4 byte length + row data)
+    """
+    if readahead > 0 and num_blocks > 1:
+        # block berikutnya dibaca + decompress di background selagi block ini di-decode
+        blocks = iter_prefetched_blocks(lambda: read_block_rows(f, compression), num_blocks, readahead, prefetch_stats)
+        try:
+            for rows in blocks:
+                yield from rows
+        finally:
+            blocks.close()
+        return
+
+    for _ in range(num_blocks):
+        if compression == "zlib":
+            rows = read_block_rows(f, compression)
+            if rows is None:
+                return
+            yield from rows
+            continue
+
+        # Read row count for this block
+        row_count_bytes = f.read(4)
+        if len(row_count_bytes) < 4:
+            return
+        row_count = struct.unpack('<I', row_count_bytes)[0]
+
+        # Read all rows in this block
+        for _ in range(row_count):
+            # Read row length (4 bytes)
+            row_length_bytes = f.read(4)
+            if len(row_length_bytes) < 4:
+                return
+            row_length = struct.unpack('<I', row_length_bytes)[0]
+
+            # Read row data (actual content, without length header)
+            row_data = f.read(row_length)
+            if len(row_data) < row_length:
+                return
+
+            yield row_length_bytes + row_data
+
+
+def read_binary_table_streaming(
+    file_path: str,
+    filter_fn=None,
+    columns: Optional[List[str]] = None,
+    filter_columns: Optional[List[str]] = None,
+    equality_filters: Optional[List[Tuple[str, Any]]] = None,
+    readahead: int = 0,
+    prefetch_stats: Optional[PrefetchStats] = None
+):
     """Generator yang baca tabel per-block (MEMORY EFFICIENT - streaming).
 
     ✅ RECOMMENDED for READ operations!
@@ -400,6 +983,8 @@ def read_binary_table_streaming(file_path: str, filter_fn=None):
     - Reads data block-by-block (doesn't load all into memory)
     - Memory usage: ~1 row at a time vs entire table
     - Supports on-the-fly filtering
+    - Projection-aware: kolom yang ga diminta dilompati tanpa di-decode
+    - Compressed block di-decompress sekali per block
     - Scalable for large tables (tested with 20k+ rows)
 
     Use cases:
@@ -410,6 +995,13 @@ def read_binary_table_streaming(file_path: str, filter_fn=None):
     Args:
         file_path: Path ke file yang akan dibaca
         filter_fn: Optional function(row) -> bool untuk filter rows on-the-fly
+        columns: Optional kolom output (None = semua kolom)
+        filter_columns: Optional kolom yang dibaca filter_fn. Kalo dikasih,
+            cuma kolom ini yang di-decode sebelum filter (late materialization)
+        equality_filters: Optional list (column, operand) dari kondisi '='.
+            Buat kolom dictionary-encoded, dibandingin sebagai integer code
+        readahead: Jumlah block yang di-prefetch di background (0 = off)
+        prefetch_stats: Optional PrefetchStats buat nyatet hit/miss readahead
 
     Yields:
         Dict[str, Any]: Row data yang sudah di-filter (jika ada filter_fn)
@@ -418,55 +1010,172 @@ def read_binary_table_streaming(file_path: str, filter_fn=None):
         ValueError: Jika format file tidak valid
     """
     with open(file_path, 'rb') as f:
-        # 1. Verify magic bytes
-        magic = f.read(4)
-        if magic != MAGIC_BYTES:
-            raise ValueError(f"Invalid file format. Expected {MAGIC_BYTES}, got {magic}")
-
-        # 2. Read version
-        version = struct.unpack('<I', f.read(4))[0]
-        if version != VERSION:
-            raise ValueError(f"Unsupported version: {version}")
+        schema, _, num_blocks, options = read_table_header(f)
+        dictionaries = options.get("dictionaries")
+        row_buffers = iter_row_buffers(f, num_blocks, options.get("compression"), readahead, prefetch_stats)
+        toast = open_toast_reader(file_path, options)
+
+        try:
+            if columns is None and filter_columns is None:
+                # jalur lama: decode full row
+                for row_buffer in row_buffers:
+                    row, _ = deserialize_row(row_buffer, 0, schema, dictionaries=dictionaries, toast=toast)
+                    if filter_fn is None or filter_fn(row):
+                        yield row
+                return
+
+            decode = make_row_decoder(schema, columns, filter_fn, filter_columns, dictionaries, equality_filters, toast)
+            for row_buffer in row_buffers:
+                row = decode(row_buffer)
+                if row is not None:
+                    yield row
+        finally:
+            # stop prefetcher sebelum file-nya ditutup
+            row_buffers.close()
+            if toast is not None:
+                toast.close()
+
+
+def decode_columns(
+    row_buffers: List[bytes],
+    schema: List[str],
+    columns: List[str],
+    dictionaries: Optional[Dict[str, List[str]]] = None,
+    toast: Optional[ToastReader] = None
+) -> Dict[str, List[Any]]:
+    """Decode beberapa kolom dari sekumpulan row buffer jadi list per kolom.
+
+    Ga ada dict per row: tiap value langsung di-append ke list kolomnya.
+    Kolom yang ga diminta dilompati, dan walk tiap buffer berhenti setelah
+    kolom terakhir yang dibutuhkan. Int dan string plain di-decode inline,
+    tipe lain lewat deserialize_value.
 
-        # 3. Read schema
-        schema_length = struct.unpack('<I', f.read(4))[0]
-        schema_json = f.read(schema_length).decode('utf-8')
-        schema = json.loads(schema_json)
+    Args:
+        row_buffers: Row buffer (4 byte length + row data)
+        schema: List nama kolom tabel (urutan penting!)
+        columns: Kolom yang di-decode (yang ga ada di schema diabaikan)
+        dictionaries: Optional dictionary per kolom dari header tabel
+        toast: Optional ToastReader buat kolom yang disimpan out-of-line
 
-        # 4. Read block size
-        block_size = struct.unpack('<I', f.read(4))[0]
+    Returns:
+        Dict kolom -> list value (urutan schema), panjang list = len(row_buffers)
+    """
+    mask = build_column_mask(schema, columns)
+    decoded: Dict[str, List[Any]] = {c: [] for c, needed in zip(schema, mask) if needed}
+    if not decoded:
+        return decoded
+
+    last = max(position for position, needed in enumerate(mask) if needed)
+    # (append ke list kolom atau None = skip, dictionary kolom)
+    targets = [
+        (decoded[c].append if needed else None, dictionaries.get(c) if dictionaries else None)
+        for c, needed in zip(schema[:last + 1], mask)
+    ]
+    for buffer in row_buffers:
+        offset = 4
+        for append, dictionary in targets:
+            if append is None:
+                offset = skip_value(buffer, offset)
+                continue
+            type_indicator = buffer[offset]
+            if type_indicator == 1:  # int
+                append(_unpack_int(buffer, offset + 1)[0])
+                offset += 9
+            elif type_indicator == 3:  # str
+                start = offset + 5
+                offset = start + _unpack_length(buffer, offset + 1)[0]
+                append(buffer[start:offset].decode('utf-8'))
+            else:
+                value, offset = deserialize_value(buffer, offset, dictionary, toast)
+                append(value)
+    return decoded
+
+
+def read_binary_table_batches(
+    file_path: str,
+    columns: Optional[List[str]] = None,
+    conditions: Optional[List[Condition]] = None,
+    batch_rows: int = 1024,
+    readahead: int = 0,
+    prefetch_stats: Optional[PrefetchStats] = None
+) -> Iterator[Dict[str, List[Any]]]:
+    """Generator yang baca tabel jadi batch columnar (dict kolom -> list value).
+
+    Versi columnar dari read_binary_table_streaming: row buffer dari block
+    di-decode langsung ke list per kolom tanpa bikin dict per row. Kalo ada
+    kondisi, kolom filter di-decode duluan dan tiap kondisi dicek per kolom
+    buat nyempitin posisi yang lolos; sisa kolom proyeksi cuma di-decode buat
+    row yang lolos (late materialization). Kondisi di-AND, sama kayak
+    evaluate_condition (kolom yang ga ada di schema = ga ada row yang match).
 
-        # 5. Read number of blocks
-        num_blocks = struct.unpack('<I', f.read(4))[0]
+    Args:
+        file_path: Path ke file yang akan dibaca
+        columns: Optional kolom output (None/kosong = semua kolom)
+        conditions: Optional list Condition (di-AND)
+        batch_rows: Jumlah row buffer yang di-decode per batch
+        readahead: Jumlah block yang di-prefetch di background (0 = off)
+        prefetch_stats: Optional PrefetchStats buat nyatet hit/miss readahead
 
-        # 6. Read blocks ONE AT A TIME (streaming)
-        for _ in range(num_blocks):
-            # Read row count for this block
-            row_count_bytes = f.read(4)
-            if len(row_count_bytes) < 4:
-                break
-            row_count = struct.unpack('<I', row_count_bytes)[0]
+    Yields:
+        Dict[str, List[Any]]: Kolom output -> list value, batch kosong ga di-yield
 
-            # Read all rows in this block
-            for _ in range(row_count):
-                # Read row length (4 bytes)
-                row_length_bytes = f.read(4)
-                if len(row_length_bytes) < 4:
-                    return
-                row_length = struct.unpack('<I', row_length_bytes)[0]
+    Raises:
+        ValueError: Jika format file tidak valid atau operator tidak dikenali
+    """
+    conditions = conditions or []
+    for condition in conditions:
+        if condition.operation not in CONDITION_OPERATORS:
+            raise ValueError(f"Operator tidak dikenali: {condition.operation}")
 
-                # Read row data (actual content, without length header)
-                row_data = f.read(row_length)
-                if len(row_data) < row_length:
+    with open(file_path, 'rb') as f:
+        schema, _, num_blocks, options = read_table_header(f)
+        if any(condition.column not in schema for condition in conditions):
+            return
+        if columns:
+            output_columns = list(dict.fromkeys(c for c in columns if c in schema))
+        else:
+            output_columns = list(schema)
+        filter_columns = list(dict.fromkeys(condition.column for condition in conditions))
+        rest_columns = [c for c in output_columns if c not in filter_columns]
+
+        dictionaries = options.get("dictionaries")
+        row_buffers = iter_row_buffers(f, num_blocks, options.get("compression"), readahead, prefetch_stats)
+        toast = open_toast_reader(file_path, options)
+        try:
+            while True:
+                buffers = list(islice(row_buffers, batch_rows))
+                if not buffers:
                     return
+                if not conditions:
+                    decoded = decode_columns(buffers, schema, output_columns, dictionaries, toast)
+                    yield {c: decoded[c] for c in output_columns}
+                    continue
+
+                # tahap 1: decode kolom filter, cek kondisi satu kolom sekaligus
+                decoded = decode_columns(buffers, schema, filter_columns, dictionaries, toast)
+                selected: List[int] = list(range(len(buffers)))
+                for condition in conditions:
+                    values = decoded[condition.column]
+                    compare = CONDITION_OPERATORS[condition.operation]
+                    operand = condition.operand
+                    selected = [i for i in selected if compare(values[i], operand)]
+                    if not selected:
+                        break
+                if not selected:
+                    continue
+
+                # tahap 2: sisa kolom proyeksi cuma buat row yang lolos
+                if len(selected) < len(buffers):
+                    decoded = {c: [decoded[c][i] for i in selected] for c in output_columns if c in decoded}
+                    buffers = [buffers[i] for i in selected]
+                decoded.update(decode_columns(buffers, schema, rest_columns, dictionaries, toast))
+                yield {c: decoded[c] for c in output_columns}
+        finally:
+            # stop prefetcher sebelum file-nya ditutup
+            row_buffers.close()
+            if toast is not None:
+                toast.close()
 
-                # Deserialize row (pass full buffer: length + data)
-                full_row_buffer = row_length_bytes + row_data
-                row, _ = deserialize_row(full_row_buffer, 0, schema)
-
-                # Apply filter if provided
-                if filter_fn is None or filter_fn(row):
-                    yield row
 
 def append_row_to_table(file_path: str, row: Dict[str, Any], schema: List[str], block_size: int) -> None:
     """Append single row ke binary table tanpa load semua data (optimized).
@@ -487,6 +1196,12 @@ def append_row_to_table(file_path: str, row: Dict[str, Any], schema: List[str],
     Raises:
         ValueError: Jika file format invalid
     """
+    # tabel dengan storage options (kompresi/dictionary) punya jalur append sendiri
+    options = read_table_options(file_path)
+    if options:
+        _append_rows_with_options(file_path, [row], schema, block_size, options)
+        return
+
     row_bytes = serialize_row(row, schema)
     row_size = len(row_bytes)
 
@@ -592,6 +1307,12 @@ def append_block_to_table(file_path: str, rows: List[Dict[str, Any]], schema: Li
         write_binary_table(file_path, rows, schema, block_size)
         return len(rows)
 
+    # tabel dengan storage options (kompresi/dictionary) punya jalur append sendiri
+    options = read_table_options(file_path)
+    if options:
+        _append_rows_with_options(file_path, rows, schema, block_size, options)
+        return len(rows)
+
     with open(file_path, 'r+b') as f:
         # 1. Read header
         magic = f.read(4)
@@ -699,3 +1420,74 @@ def append_block_to_table(file_path: str, rows: List[Dict[str, Any]], schema: Li
             f.write(struct.pack('<I', num_blocks + blocks_added))
 
     return len(rows)
+
+
+def _append_rows_with_options(
+    file_path: str,
+    rows: List[Dict[str, Any]],
+    schema: List[str],
+    block_size: int,
+    options: Dict[str, Any]
+) -> None:
+    # append buat tabel version 2 (compressed / dictionary-encoded)
+    # block terakhir di-decode, digabung sama row baru, terus ditulis ulang dari posisinya
+    dictionaries = options.get("dictionaries") or {}
+    for column, values in dictionaries.items():
+        # kolom yang udah kebanyakan distinct value ga ada di dictionaries, disimpan plain
+        known = set(values)
+        new_values = {row.get(column) for row in rows if isinstance(row.get(column), str)} - known
+        if new_values and len(known) + len(new_values) <= DICTIONARY_MAX_SIZE:
+            # dictionary harus nambah: header berubah ukuran, jadi rewrite full
+            all_rows = list(read_binary_table_streaming(file_path)) + list(rows)
+            write_binary_table(file_path, all_rows, schema, block_size, options)
+            return
+
+    codes = dictionary_codes(dictionaries)
+    compression = options.get("compression")
+    toast = open_toast_writer(file_path, options)
+    try:
+        new_row_bytes = [serialize_row(row, schema, codes, toast) for row in rows]
+        if toast is not None:
+            # value TOAST udah di disk sebelum block yang nunjuk ke sana ditulis
+            toast.flush()
+    except Exception:
+        if toast is not None:
+            toast.rollback()
+        raise
+    finally:
+        if toast is not None:
+            toast.close()
+
+    with open(file_path, 'r+b') as f:
+        _, _, num_blocks, _ = read_table_header(f)
+        num_blocks_pos = f.tell() - 4
+
+        # navigate ke block terakhir
+        last_block_pos = None
+        for _ in range(num_blocks):
+            last_block_pos = f.tell()
+            if compression == "zlib":
+                _, compressed_length = struct.unpack('<II', f.read(8))
+                f.seek(compressed_length, 1)
+            else:
+                row_count = struct.unpack('<I', f.read(4))[0]
+                for _ in range(row_count):
+                    row_length = struct.unpack('<I', f.read(4))[0]
+                    f.seek(row_length, 1)
+
+        tail_rows = new_row_bytes
+        kept_blocks = num_blocks
+        if last_block_pos is not None:
+            f.seek(last_block_pos)
+            tail_rows = list(iter_row_buffers(f, 1, compression)) + new_row_bytes
+            f.seek(last_block_pos)
+            kept_blocks = num_blocks - 1
+
+        blocks = group_rows_into_blocks(tail_rows, block_size)
+        for block in blocks:
+            f.write(encode_block(block, compression))
+        f.truncate()
+
+        # update num_blocks di header
+        f.seek(num_blocks_pos)
+        f.write(struct.pack('<I', kept_blocks + len(blocks)))